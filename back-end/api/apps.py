@@ -4,3 +4,35 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        # Connect the hot-score refresh to counter flushes
+        import core.trending  # noqa: F401
+
+        # Drop cached stats and recommendations when their inputs change
+        from core.caching import invalidate_on_change
+        invalidate_on_change('api.User', 'user:{instance.id}')
+        for model in ('UserSkill', 'UserAchievement', 'UserCourseProgress', 'JobApplication', 'CommunityPost'):
+            invalidate_on_change(f'api.{model}', 'user:{instance.user_id}')
+        invalidate_on_change('api.JobOpportunity', 'jobs')
+        invalidate_on_change('api.Course', 'courses')
+        invalidate_on_change('api.Mentor', 'mentors')
+
+        # Two-tier reference data: drop local and shared copies on change
+        from core.reference import ReferenceDataService as reference, invalidate_on_change as invalidate_reference
+        invalidate_reference('api.Skill', reference.SKILLS, reference.SKILL_LIST)
+        invalidate_reference('api.Achievement', reference.ACHIEVEMENTS, reference.ACHIEVEMENT_LIST)
+        invalidate_reference('api.Course', reference.COURSES, reference.COURSE_LIST)
+        invalidate_reference('api.CourseModule', reference.COURSE_LIST)
+
+        # Record Celery task runtimes (no-op outside workers)
+        from core.metrics import instrument_celery
+        instrument_celery()
+
+        # Run analytics tasks against the read replica (when configured)
+        from core.routing import route_celery_tasks
+        route_celery_tasks()
+
+        from core.tracing import configure_tracing, get_tracing_settings
+        if get_tracing_settings()['ENABLED']:
+            configure_tracing()
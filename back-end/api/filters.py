@@ -1,10 +1,16 @@
 from django_filters import rest_framework as filters
 from .models import JobOpportunity, Course, Mentor
+from core.search import SearchService
+
+
+def filter_indexed_text(queryset, name, value):
+    """Match words in a full-text indexed column instead of an icontains scan"""
+    return SearchService.filter_field(queryset, name, value) if value else queryset
 
 
 class JobOpportunityFilter(filters.FilterSet):
     """Filter for job opportunities"""
-    location = filters.CharFilter(lookup_expr='icontains')
+    location = filters.CharFilter(method=filter_indexed_text)
     job_type = filters.ChoiceFilter(
         choices=[
             ('full_time', 'Full Time'),
@@ -24,7 +30,7 @@ class JobOpportunityFilter(filters.FilterSet):
 class CourseFilter(filters.FilterSet):
     """Filter for courses"""
     difficulty = filters.ChoiceFilter(field_name='difficulty_level', choices=Course.DIFFICULTY_CHOICES)
-    category = filters.CharFilter(lookup_expr='icontains')
+    category = filters.CharFilter(method=filter_indexed_text)
     duration_min = filters.NumberFilter(field_name='estimated_duration', lookup_expr='gte')
     duration_max = filters.NumberFilter(field_name='estimated_duration', lookup_expr='lte')
 
@@ -38,7 +44,7 @@ class MentorFilter(filters.FilterSet):
     hourly_rate_min = filters.NumberFilter(field_name='hourly_rate', lookup_expr='gte')
     hourly_rate_max = filters.NumberFilter(field_name='hourly_rate', lookup_expr='lte')
     rating_min = filters.NumberFilter(field_name='rating', lookup_expr='gte')
-    years_min = filters.NumberFilter(field_name='years_of_experience', lookup_expr='gte')
+    years_min = filters.NumberFilter(field_name='years_experience', lookup_expr='gte')
 
     class Meta:
         model = Mentor
@@ -0,0 +1,159 @@
+"""
+Before/after latency of the cache and database connection settings.
+
+Cache cases time get/set of a representative analytics payload on the old
+per-process LocMemCache and on the configured default cache (django-redis
+with a connection pool and zlib compression when REDIS_URL is set), and
+report the payload's size on the wire with and without compression.
+
+Database cases replay Django's request cycle (close_old_connections() on
+request start and finish around one query) with a new connection per
+request (CONN_MAX_AGE=0) and with persistent, health-checked connections.
+
+    python manage.py benchmark_backends
+    REDIS_URL=redis://localhost:6379/0 DATABASE_URL=postgres://... python manage.py benchmark_backends
+    python manage.py benchmark_backends --filter db --output backends.json
+"""
+
+import json
+import pickle
+import zlib
+from pathlib import Path
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+
+from .benchmark_resume import measure
+
+PAYLOAD_KEY = 'benchmark:payload'
+PERSISTENT_MAX_AGE = 600
+
+
+def analytics_payload(rows=200):
+    """A platform-stats sized dict: counters plus a ranked list of rows."""
+    return {
+        'users': {'total_users': 12045, 'active_users': 4210, 'mentors': 311, 'premium_users': 958},
+        'most_common_skills': [
+            {'skill__name': f'skill-{i}', 'skill__category': 'backend', 'user_count': 1000 - i}
+            for i in range(rows)
+        ],
+    }
+
+
+def cache_cases(payload):
+    """
+    get/set cases per cache backend.
+
+    Returns:
+        Dict mapping 'cache.op[backend]' to a zero-argument callable
+    """
+    backends = {'locmem': LocMemCache('benchmark', {})}
+    default = caches['default']
+    if not isinstance(default, LocMemCache):
+        backends[type(default).__name__] = default
+
+    cases = {}
+    for name, backend in backends.items():
+        backend.set(PAYLOAD_KEY, payload)
+        cases[f'cache.get[{name}]'] = lambda backend=backend: backend.get(PAYLOAD_KEY)
+        cases[f'cache.set[{name}]'] = lambda backend=backend: backend.set(PAYLOAD_KEY, payload)
+    return cases
+
+
+def request_cycle(alias, max_age, health_checks):
+    """One request's worth of connection handling: setup, a query, teardown."""
+    connection = connections[alias]
+
+    def run():
+        # Read when the connection is opened, like the settings would be
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        connection.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+        close_old_connections()  # request_started
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        close_old_connections()  # request_finished
+    return run
+
+
+def connection_cases(alias=DEFAULT_DB_ALIAS):
+    """
+    Request-cycle cases for a new connection per request and for persistent connections.
+
+    Returns:
+        Dict mapping 'db.request[mode]' to a zero-argument callable
+    """
+    return {
+        'db.request[connect per request]': request_cycle(alias, 0, False),
+        'db.request[persistent]': request_cycle(alias, PERSISTENT_MAX_AGE, False),
+        'db.request[persistent + health check]': request_cycle(alias, PERSISTENT_MAX_AGE, True),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare cache and database connection latency before/after the production settings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filter', default='', help='Only run cases whose name contains this text')
+        parser.add_argument('--rows', type=int, default=200, help='Rows in the cached payload')
+        parser.add_argument('--min-rounds', type=int, default=20)
+        parser.add_argument('--min-time', type=float, default=0.5, help='Minimum seconds spent timing each case')
+        parser.add_argument('--output', help='Also write the results JSON here')
+
+    def handle(self, *args, **options):
+        payload = analytics_payload(options['rows'])
+        cases = dict(cache_cases(payload))
+        connection = connections[DEFAULT_DB_ALIAS]
+        if connection.in_atomic_block:
+            self.stdout.write(self.style.WARNING('Skipping database cases inside a transaction'))
+        else:
+            cases.update(connection_cases())
+        cases = {name: case for name, case in cases.items() if options['filter'] in name}
+
+        pickled = pickle.dumps(payload, pickle.HIGHEST_PROTOCOL)
+        results = {
+            'cache_backend': type(caches['default']).__name__,
+            'database': connection.vendor,
+            'payload_bytes': len(pickled),
+            'payload_compressed_bytes': len(zlib.compress(pickled)),
+            'cases': {},
+        }
+        self.stdout.write(
+            f"Payload: {results['payload_bytes'] / 1024:.1f}KB pickled, "
+            f"{results['payload_compressed_bytes'] / 1024:.1f}KB zlib-compressed"
+        )
+        self.stdout.write(f"{'case':<44} {'rounds':>7} {'min':>10} {'median':>10} {'stddev':>9}")
+
+        saved = {key: connection.settings_dict[key] for key in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+        try:
+            for name, case in cases.items():
+                stats = measure(case, options['min_rounds'], options['min_time'])
+                results['cases'][name] = stats
+                self.stdout.write(
+                    f"{name:<44} {stats['rounds']:>7} {self.format_time(stats['min_us']):>10} "
+                    f"{self.format_time(stats['median_us']):>10} {self.format_time(stats['stddev_us']):>9}"
+                )
+        finally:
+            connection.settings_dict.update(saved)
+            connection.close()
+
+        before = results['cases'].get('db.request[connect per request]')
+        after = results['cases'].get('db.request[persistent + health check]')
+        if before and after and after['median_us'] > 0:
+            self.stdout.write(self.style.SUCCESS(
+                f"Persistent connections: {self.format_time(before['median_us'])} -> "
+                f"{self.format_time(after['median_us'])} per request "
+                f"({before['median_us'] / after['median_us']:.1f}x, {connection.vendor})"
+            ))
+
+        if options['output']:
+            path = Path(options['output'])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(results, indent=2) + '\n')
+
+    @staticmethod
+    def format_time(microseconds):
+        if microseconds >= 1000:
+            return f"{microseconds / 1000:.2f}ms"
+        return f"{microseconds:.1f}us"
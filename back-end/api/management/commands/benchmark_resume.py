@@ -0,0 +1,288 @@
+"""
+Microbenchmarks for the resume analysis pipeline.
+
+Builds a deterministic corpus of synthetic TXT, DOCX and PDF resumes in
+several sizes and times each stage (text extraction, extract_skills,
+identify_skill_gaps, extract_experience_level and the full analyze_resume)
+with pytest-benchmark style statistics, plus tracemalloc allocation for one
+run. A stored baseline turns it into a regression check.
+
+    python manage.py benchmark_resume
+    python manage.py benchmark_resume --save-baseline
+    python manage.py benchmark_resume --compare --threshold 20
+"""
+
+import io
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from docx import Document
+
+from api.ml_utils import (
+    SKILLS_DATABASE, analyze_resume, extract_experience_level, extract_skills,
+    extract_text_from_file, identify_skill_gaps
+)
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'resume_pipeline.json'
+FORMATS = ('txt', 'docx', 'pdf')
+# Experience bullets per resume: about 1 page, 5 pages and 40 pages of text
+SIZES = {'small': 8, 'medium': 60, 'large': 500}
+PDF_LINES_PER_PAGE = 60
+
+FILLER = ('designed implemented shipped optimized migrated scaled reviewed mentored the a '
+          'service platform pipeline dashboard feature team users latency costs release').split()
+
+
+# ==================== CORPUS ====================
+
+def resume_lines(size, rng):
+    """Plain-text lines of a synthetic resume with `size` experience bullets."""
+    skills = rng.sample(sorted(SKILLS_DATABASE), 15)
+    lines = [
+        'Jane Doe - Software Engineer',
+        f'Summary: engineer with {rng.randint(1, 15)} years of experience building products.',
+        'Skills: ' + ', '.join(skills),
+        'Experience',
+    ]
+    for _ in range(size):
+        words = rng.choices(FILLER, k=14) + [rng.choice(skills)]
+        rng.shuffle(words)
+        lines.append('- ' + ' '.join(words).capitalize() + '.')
+    lines.append('Education: BSc Computer Science')
+    return lines
+
+
+def make_txt(lines):
+    return '\n'.join(lines).encode('utf-8')
+
+
+def make_docx(lines):
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def make_pdf(lines):
+    """Minimal multi-page PDF (Helvetica text) that PyPDF2 can extract."""
+    def escape(text):
+        return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)').encode('latin-1', 'replace')
+
+    pages = [lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)]
+    font_id = 3
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = {
+        1: b'<< /Type /Catalog /Pages 2 0 R >>',
+        2: b'<< /Type /Pages /Kids [' + b' '.join(b'%d 0 R' % pid for pid in page_ids)
+           + b'] /Count %d >>' % len(pages),
+        font_id: b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    }
+    for page_id, page_lines in zip(page_ids, pages):
+        stream = b'BT /F1 9 Tf 40 770 Td 12 TL ' + b' '.join(
+            b'(' + escape(line) + b') Tj T*' for line in page_lines
+        ) + b' ET'
+        objects[page_id] = (
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>' % (font_id, page_id + 1)
+        )
+        objects[page_id + 1] = b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream'
+
+    output = io.BytesIO()
+    output.write(b'%PDF-1.4\n')
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = output.tell()
+        output.write(b'%d 0 obj\n' % object_id + objects[object_id] + b'\nendobj\n')
+    xref = output.tell()
+    output.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for object_id in sorted(objects):
+        output.write(b'%010d 00000 n \n' % offsets[object_id])
+    output.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return output.getvalue()
+
+
+def build_corpus(sizes=tuple(SIZES), formats=FORMATS, seed=42):
+    """
+    Build the synthetic resume corpus.
+
+    Returns:
+        Dict mapping 'size.format' (e.g. 'medium.pdf') to file bytes
+    """
+    builders = {'txt': make_txt, 'docx': make_docx, 'pdf': make_pdf}
+    corpus = {}
+    for size in sizes:
+        lines = resume_lines(SIZES[size], random.Random(f'{seed}-{size}'))
+        for file_format in formats:
+            corpus[f'{size}.{file_format}'] = builders[file_format](lines)
+    return corpus
+
+
+# ==================== MEASUREMENT ====================
+
+def measure(function, min_rounds=5, min_time=0.2, max_rounds=10000):
+    """
+    Time `function` pytest-benchmark style and measure one run's allocations.
+
+    Returns:
+        Dict with rounds, min/max/mean/median/stddev in microseconds and
+        tracemalloc peak/allocated bytes
+    """
+    function()  # Warm-up: imports, regex compilation, caches
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_rounds and (len(timings) < min_rounds or time.perf_counter() - started < min_time):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1e6)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        function()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'rounds': len(timings),
+        'min_us': round(min(timings), 2),
+        'max_us': round(max(timings), 2),
+        'mean_us': round(statistics.fmean(timings), 2),
+        'median_us': round(statistics.median(timings), 2),
+        'stddev_us': round(statistics.pstdev(timings), 2),
+        'peak_bytes': peak - before,
+        'retained_bytes': max(after - before, 0),
+    }
+
+
+def pipeline_cases(corpus):
+    """
+    Benchmark cases for each corpus document.
+
+    Returns:
+        Dict mapping 'stage[document]' to a zero-argument callable
+    """
+    cases = {}
+    for name, content in corpus.items():
+        upload = SimpleUploadedFile(f'resume.{name.split(".")[-1]}', content)
+        text = extract_text_from_file(upload)
+        skills = extract_skills(text)
+
+        cases[f'extract_text[{name}]'] = lambda upload=upload: extract_text_from_file(upload)
+        cases[f'analyze_resume[{name}]'] = lambda upload=upload: analyze_resume(upload)
+        # Text stages only depend on the text, so run them once per size
+        if name.endswith('.txt'):
+            size = name.split('.')[0]
+            cases[f'extract_skills[{size}]'] = lambda text=text: extract_skills(text)
+            cases[f'identify_skill_gaps[{size}]'] = lambda skills=skills: identify_skill_gaps(skills)
+            cases[f'extract_experience_level[{size}]'] = lambda text=text: extract_experience_level(text)
+    return cases
+
+
+def compare(baseline, results, threshold):
+    """
+    Find cases slower (min time) or allocating more (peak) than the baseline by more than threshold percent.
+
+    Returns:
+        List of (case, metric, baseline_value, current_value, change_percent) tuples
+    """
+    regressions = []
+    for case, current in results['cases'].items():
+        before = baseline.get('cases', {}).get(case)
+        if not before:
+            continue
+        # min is the least noisy timing statistic on shared machines
+        for metric in ('min_us', 'peak_bytes'):
+            if before[metric] <= 0:
+                continue
+            change = (current[metric] - before[metric]) / before[metric] * 100
+            if change > threshold:
+                regressions.append((case, metric, before[metric], current[metric], round(change, 1)))
+    return regressions
+
+
+class Command(BaseCommand):
+    help = 'Benchmark resume analysis stages on a synthetic PDF/DOCX/TXT corpus'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default=','.join(SIZES), help=f"Comma-separated subset of {', '.join(SIZES)}")
+        parser.add_argument('--filter', default='', help='Only run cases whose name contains this text')
+        parser.add_argument('--min-rounds', type=int, default=5)
+        parser.add_argument('--min-time', type=float, default=0.2, help='Minimum seconds spent timing each case')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+        parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+        parser.add_argument('--compare', action='store_true', help='Fail when a case regresses against the baseline')
+        parser.add_argument('--threshold', type=float, default=20, help='Allowed slowdown/growth in percent')
+        parser.add_argument('--output', help='Also write the results JSON here')
+
+    def handle(self, *args, **options):
+        sizes = [size.strip() for size in options['sizes'].split(',') if size.strip()]
+        unknown = set(sizes) - set(SIZES)
+        if unknown:
+            raise CommandError(f"Unknown sizes: {', '.join(sorted(unknown))}")
+
+        corpus = build_corpus(sizes)
+        cases = {
+            name: case for name, case in pipeline_cases(corpus).items() if options['filter'] in name
+        }
+
+        results = {
+            'corpus': {name: len(content) for name, content in corpus.items()},
+            'cases': {},
+        }
+        self.stdout.write(
+            f"{'case':<44} {'rounds':>7} {'min':>10} {'median':>10} {'stddev':>9} {'peak mem':>10}"
+        )
+        for name, case in cases.items():
+            stats = measure(case, options['min_rounds'], options['min_time'])
+            results['cases'][name] = stats
+            self.stdout.write(
+                f"{name:<44} {stats['rounds']:>7} {self.format_time(stats['min_us']):>10} "
+                f"{self.format_time(stats['median_us']):>10} {self.format_time(stats['stddev_us']):>9} "
+                f"{stats['peak_bytes'] / 1024:>8.1f}KB"
+            )
+
+        if options['output']:
+            self.write_json(Path(options['output']), results)
+
+        baseline_path = Path(options['baseline'])
+        if options['compare']:
+            self.check_regressions(baseline_path, results, options['threshold'])
+        if options['save_baseline']:
+            self.write_json(baseline_path, results)
+            self.stdout.write(self.style.SUCCESS(f"Saved baseline to {baseline_path}"))
+
+    def check_regressions(self, baseline_path, results, threshold):
+        try:
+            baseline = json.loads(baseline_path.read_text())
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read baseline {baseline_path}: {e}")
+
+        regressions = compare(baseline, results, threshold)
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(f"No regressions beyond {threshold:g}% against {baseline_path}"))
+            return
+        for case, metric, before, after, change in regressions:
+            self.stdout.write(self.style.ERROR(f"  {case} {metric}: {before:g} -> {after:g} (+{change:g}%)"))
+        raise CommandError(f"{len(regressions)} benchmark regression(s) beyond {threshold:g}%")
+
+    @staticmethod
+    def write_json(path, results):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2) + '\n')
+
+    @staticmethod
+    def format_time(microseconds):
+        if microseconds >= 1000:
+            return f"{microseconds / 1000:.2f}ms"
+        return f"{microseconds:.1f}us"
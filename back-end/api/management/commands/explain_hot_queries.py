@@ -0,0 +1,77 @@
+"""
+Check that the hottest queries are served by an index.
+
+Each entry in HOT_QUERIES mirrors a query issued on every request to one of
+the busiest endpoints or services. The command EXPLAINs them against the
+configured database (no rows are read) and reports those whose plan still
+contains a sequential scan.
+
+    python manage.py explain_hot_queries
+    python manage.py explain_hot_queries --fail       # exit non-zero on any seq scan (CI)
+    python manage.py explain_hot_queries -v 2         # print every plan
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.models import (
+    CommunityPost, JobApplication, JobOpportunity, Notification, UserCourseProgress, UserSkill,
+)
+from core.plans import explain, seq_scans
+
+# Any id works: EXPLAIN plans the query without executing it
+SAMPLE_ID = 1
+
+HOT_QUERIES = {
+    # UserSkillViewSet, profile serializers, recommendations
+    'user_skills': lambda now: UserSkill.objects.filter(user_id=SAMPLE_ID),
+    'user_skill': lambda now: UserSkill.objects.filter(user_id=SAMPLE_ID, skill_id=SAMPLE_ID),
+    # Profile stats, achievements
+    'completed_courses': lambda now: UserCourseProgress.objects.filter(
+        user_id=SAMPLE_ID, completed_at__isnull=False
+    ),
+    # Application tracking and per-status stats
+    'applications_by_status': lambda now: JobApplication.objects.filter(user_id=SAMPLE_ID, status='applied'),
+    # Job listings (JobOpportunityViewSet)
+    'active_jobs': lambda now: JobOpportunity.objects.filter(expires_at__gte=now).order_by('-posted_date')[:20],
+    # Community listings: newest, ?ordering=-likes_count, trending
+    'recent_posts': lambda now: CommunityPost.objects.order_by('-created_at', '-id')[:20],
+    'top_posts': lambda now: CommunityPost.objects.order_by('-likes_count', '-id')[:20],
+    'trending_posts': lambda now: CommunityPost.objects.filter(
+        created_at__gte=now - timedelta(days=7)
+    ).order_by('-hot_score', '-id')[:20],
+    # Notification center
+    'user_notifications': lambda now: Notification.objects.filter(user_id=SAMPLE_ID)[:20],
+    'unread_notifications': lambda now: Notification.objects.filter(user_id=SAMPLE_ID, is_read=False)[:20],
+}
+
+
+class Command(BaseCommand):
+    help = 'Report hot queries whose EXPLAIN plan contains a sequential scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filter', default='', help='Only check queries whose name contains this text')
+        parser.add_argument('--fail', action='store_true', help='Exit with an error if any query seq-scans')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        scanning = {}
+        for name, build in HOT_QUERIES.items():
+            if options['filter'] not in name:
+                continue
+            queryset = build(now)
+            tables = seq_scans(queryset)
+            if tables:
+                scanning[name] = tables
+                self.stdout.write(self.style.WARNING(f"{name:<28} SEQ SCAN {', '.join(tables)}"))
+            else:
+                self.stdout.write(f"{name:<28} ok")
+            if options['verbosity'] >= 2:
+                self.stdout.write('    ' + explain(queryset).replace('\n', '\n    '))
+
+        if not scanning:
+            self.stdout.write(self.style.SUCCESS('Every hot query uses an index'))
+        elif options['fail']:
+            raise CommandError(f"{len(scanning)} hot queries seq-scan: {', '.join(scanning)}")
@@ -0,0 +1,325 @@
+"""
+Replay a weighted API scenario against a running server.
+
+Each virtual user picks a flow by weight (e.g. "open the dashboard"),
+authenticates as a random synthetic user and runs the flow's steps with
+think time in between. The report gives requests/s, error rate and
+p50/p95/p99 latency per endpoint; results are saved as JSON so runs can be
+compared over time.
+
+    python manage.py seed_synthetic_data --users 100000
+    RATE_LIMIT_BURST_SIZE=1000000 RATE_LIMIT_ANONYMOUS_PER_HOUR=1000000 gunicorn backend.wsgi -w 4
+    python manage.py loadtest --concurrency 50 --duration 120 --label 4-workers
+    python manage.py loadtest --compare latest
+"""
+
+import json
+import math
+import random
+import subprocess
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.models import User, Skill, Course, JobOpportunity, CommunityPost, Comment, Resume
+from core.pagination import estimate_count
+from .seed_synthetic_data import SYNTHETIC_PREFIX
+
+DEFAULT_SCENARIO = Path(settings.BASE_DIR) / 'loadtest' / 'frontend_mix.json'
+DEFAULT_OUTPUT_DIR = Path(settings.BASE_DIR) / 'loadtest' / 'results'
+ID_SAMPLE_SIZE = 1000
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+def summarize(samples, elapsed):
+    """
+    Aggregate (status, latency_seconds) samples.
+
+    Returns:
+        Dict with requests, rps, errors, error_rate, latency percentiles (ms) and status counts
+    """
+    latencies = sorted(latency * 1000 for _, latency in samples)
+    statuses = {}
+    for status_code, _ in samples:
+        statuses[str(status_code)] = statuses.get(str(status_code), 0) + 1
+    errors = sum(1 for status_code, _ in samples if not 200 <= status_code < 400)
+    return {
+        'requests': len(samples),
+        'rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'mean_ms': round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        'max_ms': round(latencies[-1], 2) if latencies else 0.0,
+        'statuses': statuses,
+    }
+
+
+class VirtualUser(threading.Thread):
+    """Runs weighted flows until the deadline, recording (step, status, latency)."""
+
+    def __init__(self, runner, index):
+        super().__init__(daemon=True)
+        self.runner = runner
+        self.index = index
+        self.rng = random.Random(runner.seed + index)
+        self.samples = []
+
+    def run(self):
+        runner = self.runner
+        # Stagger start-up over the ramp-up period
+        time.sleep(runner.ramp_up * self.index / max(runner.concurrency, 1))
+        session = requests.Session()
+
+        while time.monotonic() < runner.deadline:
+            flow = self.rng.choices(runner.flows, weights=runner.weights)[0]
+            user_id, token = self.rng.choice(runner.users)
+            session.headers['Authorization'] = f'Bearer {token}'
+            values = runner.placeholder_values(self.rng, user_id)
+
+            for step in flow['steps']:
+                if time.monotonic() >= runner.deadline:
+                    break
+                self.samples.append((step['name'], *self.request(session, step, values)))
+                if runner.think_time:
+                    time.sleep(self.rng.uniform(*runner.think_time))
+
+    def request(self, session, step, values):
+        url = self.runner.base_url + step['path'].format(**values)
+        method = step.get('method', 'GET').upper()
+        files = None
+        if step.get('upload'):
+            files = {step['upload']: (f'resume_{self.index}.txt', self.runner.resume_body(self.rng), 'text/plain')}
+
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, files=files, timeout=self.runner.timeout)
+            status_code = response.status_code
+        except requests.RequestException:
+            # Connection errors and timeouts count as failures with status 0
+            status_code = 0
+        return status_code, time.perf_counter() - start
+
+
+class Command(BaseCommand):
+    help = 'Replay a weighted API scenario against a running server and report RPS and latency percentiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenario', nargs='?', default=str(DEFAULT_SCENARIO), help='Scenario JSON file')
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--concurrency', type=int, default=20, help='Virtual users')
+        parser.add_argument('--duration', type=float, default=60, help='Test length in seconds')
+        parser.add_argument('--ramp-up', type=float, default=5, help='Seconds over which virtual users start')
+        parser.add_argument('--user-pool', type=int, default=500, help='Synthetic users to authenticate as')
+        parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout in seconds')
+        parser.add_argument('--no-think', action='store_true', help='Skip think time (closed-loop maximum throughput)')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--label', default='', help='Tag stored with the results, e.g. "4-workers"')
+        parser.add_argument('--output-dir', default=str(DEFAULT_OUTPUT_DIR))
+        parser.add_argument('--compare', help='Results file to compare against, or "latest"')
+
+    def handle(self, *args, **options):
+        self.load_scenario(options['scenario'])
+        self.base_url = options['base_url'].rstrip('/')
+        self.concurrency = options['concurrency']
+        self.duration = options['duration']
+        self.ramp_up = min(options['ramp_up'], options['duration'])
+        self.timeout = options['timeout']
+        self.seed = options['seed']
+        if options['no_think']:
+            self.think_time = None
+        self.prepare_data(options['user_pool'])
+
+        output_dir = Path(options['output_dir'])
+        baseline = self.find_baseline(options['compare'], output_dir) if options['compare'] else None
+
+        self.stdout.write(
+            f"Running '{self.scenario['name']}' against {self.base_url}: "
+            f"{self.concurrency} virtual users for {self.duration:g}s"
+        )
+        started_at = timezone.now()
+        started = time.monotonic()
+        self.deadline = started + self.duration
+        workers = [VirtualUser(self, index) for index in range(self.concurrency)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.monotonic() - started
+
+        results = self.build_results(workers, elapsed, started_at, options['label'])
+        self.print_results(results)
+        path = self.save_results(results, output_dir)
+        self.stdout.write(self.style.SUCCESS(f"Saved results to {path}"))
+
+        if baseline:
+            self.print_comparison(baseline, results)
+
+    # ==================== SETUP ====================
+
+    def load_scenario(self, path):
+        try:
+            with open(path) as scenario_file:
+                self.scenario = json.load(scenario_file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read scenario {path}: {e}")
+
+        self.flows = self.scenario.get('flows') or []
+        if not self.flows or not all(flow.get('steps') for flow in self.flows):
+            raise CommandError(f"Scenario {path} needs at least one flow with steps")
+        self.weights = [flow.get('weight', 1) for flow in self.flows]
+        self.think_time = self.scenario.get('think_time')
+        self.search_terms = self.scenario.get('search_terms') or ['python']
+
+    def prepare_data(self, pool_size):
+        """Mint tokens for synthetic users and sample ids for path placeholders."""
+        try:
+            from rest_framework_simplejwt.tokens import AccessToken
+        except ImportError:
+            raise CommandError('djangorestframework-simplejwt is required to authenticate virtual users')
+
+        users = list(User.objects.filter(username__startswith=SYNTHETIC_PREFIX).order_by('id')[:pool_size])
+        if not users:
+            raise CommandError('No synthetic users found; run "manage.py seed_synthetic_data" first')
+
+        # Tokens must outlive the run
+        lifetime = timedelta(seconds=self.duration + self.ramp_up + 300)
+        self.users = []
+        for user in users:
+            token = AccessToken.for_user(user)
+            token.set_exp(lifetime=lifetime)
+            self.users.append((user.id, str(token)))
+
+        self.ids = {
+            'job_id': list(JobOpportunity.objects.filter(expires_at__gte=timezone.now())
+                           .values_list('id', flat=True)[:ID_SAMPLE_SIZE]),
+            'post_id': list(CommunityPost.objects.order_by('-created_at', '-id')
+                            .values_list('id', flat=True)[:ID_SAMPLE_SIZE]),
+            'course_id': list(Course.objects.values_list('id', flat=True)[:ID_SAMPLE_SIZE]),
+        }
+        self.skill_names = list(Skill.objects.values_list('name', flat=True)[:200]) or self.search_terms
+
+    def placeholder_values(self, rng, user_id):
+        values = {name: rng.choice(ids) if ids else 0 for name, ids in self.ids.items()}
+        values['user_id'] = user_id
+        values['search_term'] = rng.choice(self.search_terms)
+        return values
+
+    def resume_body(self, rng):
+        skills = ', '.join(rng.sample(self.skill_names, min(12, len(self.skill_names))))
+        years = rng.randint(0, 15)
+        return (
+            f"Software engineer with {years} years of experience.\n"
+            f"Skills: {skills}.\n"
+            + "Built and maintained production APIs, led code reviews and mentored juniors.\n" * 20
+        ).encode()
+
+    # ==================== RESULTS ====================
+
+    def build_results(self, workers, elapsed, started_at, label):
+        by_endpoint = {}
+        for worker in workers:
+            for name, status_code, latency in worker.samples:
+                by_endpoint.setdefault(name, []).append((status_code, latency))
+        all_samples = [sample for samples in by_endpoint.values() for sample in samples]
+
+        return {
+            'scenario': self.scenario['name'],
+            'label': label,
+            'started_at': started_at.isoformat(),
+            'base_url': self.base_url,
+            'concurrency': self.concurrency,
+            'duration_seconds': round(elapsed, 2),
+            'git_commit': self.git_commit(),
+            'dataset': {
+                model._meta.db_table: estimate_count(model.objects.all())
+                for model in (User, Skill, Course, JobOpportunity, CommunityPost, Comment, Resume)
+            },
+            'total': summarize(all_samples, elapsed),
+            'endpoints': {name: summarize(samples, elapsed) for name, samples in sorted(by_endpoint.items())},
+        }
+
+    @staticmethod
+    def git_commit():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, timeout=5
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ''
+
+    def print_results(self, results):
+        header = f"{'endpoint':<28} {'reqs':>7} {'rps':>8} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        rows = list(results['endpoints'].items()) + [('TOTAL', results['total'])]
+        for name, stats in rows:
+            self.stdout.write(
+                f"{name:<28} {stats['requests']:>7} {stats['rps']:>8.1f} {stats['error_rate'] * 100:>5.1f}% "
+                f"{stats['p50_ms']:>7.0f}ms {stats['p95_ms']:>6.0f}ms {stats['p99_ms']:>6.0f}ms"
+            )
+        throttled = results['total']['statuses'].get('429', 0)
+        if throttled:
+            self.stdout.write(self.style.WARNING(
+                f"{throttled} requests were rate limited (429); raise RATE_LIMIT_BURST_SIZE and "
+                f"RATE_LIMIT_ANONYMOUS_PER_HOUR on the target server"
+            ))
+
+    def save_results(self, results, output_dir):
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+        label = f"_{results['label']}" if results['label'] else ''
+        path = output_dir / f"{stamp}_{results['scenario']}{label}.json"
+        with open(path, 'w') as results_file:
+            json.dump(results, results_file, indent=2)
+        return path
+
+    def find_baseline(self, compare, output_dir):
+        if compare == 'latest':
+            candidates = sorted(output_dir.glob(f"*_{self.scenario['name']}*.json"))
+            if not candidates:
+                raise CommandError(f"No previous results for '{self.scenario['name']}' in {output_dir}")
+            compare = candidates[-1]
+        try:
+            with open(compare) as baseline_file:
+                return json.load(baseline_file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read baseline {compare}: {e}")
+
+    def print_comparison(self, baseline, results):
+        self.stdout.write(
+            f"\nCompared with {baseline.get('started_at', '?')} {baseline.get('label', '')} "
+            f"({baseline.get('git_commit', '?')}):"
+        )
+        self.stdout.write(f"{'endpoint':<28} {'rps':>20} {'p95':>24}")
+        rows = list(results['endpoints'].items()) + [('TOTAL', results['total'])]
+        for name, stats in rows:
+            before = baseline['total'] if name == 'TOTAL' else baseline.get('endpoints', {}).get(name)
+            if not before:
+                continue
+            self.stdout.write(
+                f"{name:<28} {before['rps']:>8.1f} -> {stats['rps']:<8.1f} "
+                f"{before['p95_ms']:>7.0f} -> {stats['p95_ms']:<6.0f}ms ({self.change(before['p95_ms'], stats['p95_ms'])})"
+            )
+
+    @staticmethod
+    def change(before, after):
+        if not before:
+            return 'n/a'
+        return f"{(after - before) / before * 100:+.0f}%"
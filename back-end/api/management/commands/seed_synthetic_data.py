@@ -0,0 +1,364 @@
+"""
+Generate a synthetic dataset for load testing and query benchmarks.
+
+Row counts scale with --users (roughly 11 rows per user, so --users 1000 gives
+~11k rows and --users 1000000 gives ~11M). Popularity is Zipf-distributed:
+a few skills, authors and posts account for most rows, the way real traffic
+concentrates on them.
+
+    python manage.py seed_synthetic_data --users 10000
+    python manage.py seed_synthetic_data --users 100000 --skew 1.2 --seed 7
+    python manage.py seed_synthetic_data --clear
+"""
+
+import itertools
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from api.ml_utils import SKILLS_DATABASE
+from api.models import (
+    User, Skill, UserSkill, Course, JobOpportunity, CommunityPost, Comment, Resume
+)
+from core.trending import hot_score
+
+# Marks synthetic rows so --clear never touches real data
+SYNTHETIC_PREFIX = 'synthetic_'
+SYNTHETIC_MARKER = '[synthetic] '
+CLEAR_BATCH_SIZE = 1000
+# Pareto shape for per-row counts (skills per user, comments per post, likes)
+TAIL_ALPHA = 1.5
+
+SKILL_CATEGORIES = {
+    'Backend': 'backend',
+    'Frontend': 'frontend',
+    'Frontend/Backend': 'fullstack',
+    'Mobile': 'mobile',
+    'Data Science': 'data',
+    'DevOps': 'devops',
+    'Soft Skills': 'soft',
+}
+LOCATIONS = ['Remote', 'Kyiv', 'Berlin', 'London', 'New York', 'Warsaw', 'Lisbon', 'Toronto']
+JOB_TITLES = ['Backend Engineer', 'Frontend Developer', 'Full Stack Developer', 'Data Scientist',
+              'DevOps Engineer', 'Mobile Developer', 'ML Engineer', 'QA Engineer']
+COURSE_CATEGORIES = ['web', 'backend', 'data', 'devops', 'mobile', 'career']
+EXPERIENCE_LEVELS = ['entry-level', 'junior', 'mid-level', 'senior']
+WORDS = ('react python django api docker deploy performance cache query index hooks state '
+         'interview resume career junior senior remote team review test refactor design').split()
+
+
+class ZipfSampler:
+    """Draw items with probability proportional to 1 / rank ** skew."""
+
+    def __init__(self, items, skew, rng):
+        self.items = list(items)
+        # Popular ranks land on random items, not on the first ids created
+        rng.shuffle(self.items)
+        self.cum_weights = list(itertools.accumulate(1 / (rank ** skew) for rank in range(1, len(self.items) + 1)))
+        self.rng = rng
+
+    def sample(self, k=1):
+        return self.rng.choices(self.items, cum_weights=self.cum_weights, k=k)
+
+    def sample_unique(self, k):
+        """Up to k distinct items (popular ones still dominate)."""
+        k = min(k, len(self.items))
+        chosen = set()
+        while len(chosen) < k:
+            chosen.update(self.sample(k - len(chosen)))
+        return list(chosen)
+
+
+@contextmanager
+def explicit_timestamps(model, *field_names):
+    """Let bulk_create store back-dated auto_now_add timestamps."""
+    fields = [model._meta.get_field(name) for name in field_names]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users, skills, jobs, courses, posts and resumes for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000, help='Number of users; other tables scale from it')
+        parser.add_argument('--skills', type=int, default=500, help='Size of the skill catalog')
+        parser.add_argument('--skew', type=float, default=1.1, help='Zipf exponent for popularity of skills, authors and locations (0 = uniform)')
+        parser.add_argument('--days', type=int, default=730, help='History to spread timestamps over')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducible datasets')
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated synthetic data and exit')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            self.clear()
+            return
+        if options['users'] < 1:
+            raise CommandError('--users must be at least 1')
+
+        self.rng = random.Random(options['seed'])
+        self.skew = options['skew']
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.history = timedelta(days=options['days'])
+        self.counts = {}
+
+        started = time.perf_counter()
+        users = options['users']
+        skills = self.seed_skills(options['skills'])
+        user_ids = self.seed_users(users)
+        self.seed_user_skills(user_ids, skills)
+        self.seed_courses(max(users // 200, 20))
+        self.seed_jobs(max(users // 10, 10), skills)
+        post_ids = self.seed_posts(user_ids, users * 2)
+        self.seed_comments(user_ids, post_ids)
+        self.seed_resumes(user_ids[:max(users // 2, 1)], skills)
+        elapsed = time.perf_counter() - started
+
+        total = sum(self.counts.values())
+        for table, count in self.counts.items():
+            self.stdout.write(f"  {table:<36} {count:>12,}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)"
+        ))
+
+    # ==================== HELPERS ====================
+
+    def timestamp(self, recency=2):
+        """Random past datetime; higher recency skews towards now (a growing platform)."""
+        return self.now - self.history * (self.rng.random() ** recency)
+
+    def zipf_count(self, low, high, scale=1):
+        """Heavy-tailed count in [low, high]: most rows small, a few large."""
+        value = low + int(scale * (self.rng.paretovariate(TAIL_ALPHA) - 1))
+        return min(value, high)
+
+    def bulk_insert(self, model, rows, label=None):
+        """Insert an iterable of unsaved instances in batches, returning their pks."""
+        pks = []
+        for batch in self.batches(rows):
+            with transaction.atomic():
+                created = model.objects.bulk_create(batch, batch_size=self.batch_size)
+            pks.extend(obj.pk for obj in created)
+        label = label or model._meta.db_table
+        self.counts[label] = self.counts.get(label, 0) + len(pks)
+        self.stdout.write(f"{label}: {self.counts[label]:,}")
+        return pks
+
+    def batches(self, rows):
+        iterator = iter(rows)
+        while True:
+            batch = list(itertools.islice(iterator, self.batch_size))
+            if not batch:
+                return
+            yield batch
+
+    # ==================== TABLES ====================
+
+    def seed_skills(self, count):
+        catalog = [
+            (name.title(), SKILL_CATEGORIES.get(category, 'backend'))
+            for name, category in SKILLS_DATABASE.items()
+        ]
+        categories = list(SKILL_CATEGORIES.values())
+        catalog += [(f'Skill {i}', categories[i % len(categories)]) for i in range(max(count - len(catalog), 0))]
+        existing = set(Skill.objects.values_list('name', flat=True))
+        self.bulk_insert(Skill, (
+            Skill(name=name, category=category) for name, category in catalog[:count] if name not in existing
+        ))
+        return list(Skill.objects.order_by('id').values_list('id', flat=True)[:count])
+
+    def seed_users(self, count):
+        offset = User.objects.filter(username__startswith=SYNTHETIC_PREFIX).count()
+        password = make_password('loadtest')
+        titles = [choice for choice, _ in User.TITLE_CHOICES]
+        points = ZipfSampler(range(0, 50000, 10), self.skew, self.rng)
+
+        def rows():
+            for i in range(offset, offset + count):
+                created_at = self.timestamp()
+                yield User(
+                    username=f'{SYNTHETIC_PREFIX}{i}',
+                    email=f'{SYNTHETIC_PREFIX}{i}@example.com',
+                    password=password,
+                    title=self.rng.choice(titles),
+                    location=self.rng.choice(LOCATIONS),
+                    points=points.sample()[0],
+                    is_mentor=self.rng.random() < 0.02,
+                    date_joined=created_at,
+                    created_at=created_at,
+                )
+
+        with explicit_timestamps(User, 'created_at'):
+            return self.bulk_insert(User, rows())
+
+    def seed_user_skills(self, user_ids, skill_ids):
+        sampler = ZipfSampler(skill_ids, self.skew, self.rng)
+
+        def rows():
+            for user_id in user_ids:
+                for skill_id in sampler.sample_unique(self.zipf_count(3, 25)):
+                    yield UserSkill(user_id=user_id, skill_id=skill_id, proficiency_level=self.rng.randint(1, 100))
+
+        self.bulk_insert(UserSkill, rows())
+
+    def seed_courses(self, count):
+        difficulties = [choice for choice, _ in Course.DIFFICULTY_CHOICES]
+
+        def rows():
+            for i in range(count):
+                category = self.rng.choice(COURSE_CATEGORIES)
+                yield Course(
+                    title=f'{category.title()} {" ".join(self.rng.sample(WORDS, 3))} {i}',
+                    description=SYNTHETIC_MARKER + ' '.join(self.rng.choices(WORDS, k=40)),
+                    category=category,
+                    difficulty_level=self.rng.choice(difficulties),
+                    estimated_duration=self.rng.randint(2, 60),
+                    created_at=self.timestamp(),
+                )
+
+        with explicit_timestamps(Course, 'created_at'):
+            self.bulk_insert(Course, rows())
+
+    def seed_jobs(self, count, skill_ids):
+        sampler = ZipfSampler(skill_ids, self.skew, self.rng)
+        # A few locations carry most openings
+        locations = ZipfSampler(LOCATIONS, self.skew, self.rng)
+
+        def rows():
+            for i in range(count):
+                posted_date = self.timestamp(recency=3)
+                # ~80% of jobs are still open
+                expires_at = posted_date + timedelta(days=self.rng.randint(14, 120))
+                if self.rng.random() < 0.8:
+                    expires_at = max(expires_at, self.now + timedelta(days=self.rng.randint(1, 60)))
+                salary_min = self.rng.randrange(30000, 150000, 5000)
+                yield JobOpportunity(
+                    company_name=f'Company {self.rng.randint(1, max(count // 5, 1))}',
+                    job_title=self.rng.choice(JOB_TITLES),
+                    description=SYNTHETIC_MARKER + ' '.join(self.rng.choices(WORDS, k=80)),
+                    location=locations.sample()[0],
+                    salary_min=salary_min,
+                    salary_max=salary_min + self.rng.randrange(5000, 60000, 5000),
+                    job_url=f'https://jobs.example.com/{SYNTHETIC_PREFIX}{i}',
+                    posted_date=posted_date,
+                    expires_at=expires_at,
+                )
+
+        with explicit_timestamps(JobOpportunity, 'posted_date'):
+            job_ids = self.bulk_insert(JobOpportunity, rows())
+
+        through = JobOpportunity.required_skills.through
+        self.bulk_insert(through, (
+            through(jobopportunity_id=job_id, skill_id=skill_id)
+            for job_id in job_ids
+            for skill_id in sampler.sample_unique(self.rng.randint(2, 8))
+        ), label='api_jobopportunity_required_skills')
+
+    def seed_posts(self, user_ids, count):
+        # Power users write most posts
+        authors = ZipfSampler(user_ids, self.skew, self.rng)
+
+        def rows():
+            for author_id in authors.sample(count):
+                created_at = self.timestamp(recency=4)
+                likes = self.zipf_count(0, 50000, scale=10)
+                yield CommunityPost(
+                    user_id=author_id,
+                    title=' '.join(self.rng.choices(WORDS, k=6)).capitalize(),
+                    content=' '.join(self.rng.choices(WORDS, k=self.rng.randint(20, 200))),
+                    likes_count=likes,
+                    hot_score=hot_score(likes, 0, created_at),
+                    created_at=created_at,
+                )
+
+        with explicit_timestamps(CommunityPost, 'created_at'):
+            return self.bulk_insert(CommunityPost, rows())
+
+    def seed_comments(self, user_ids, post_ids):
+        commenters = ZipfSampler(user_ids, self.skew, self.rng)
+        # Comments pile up on a few viral posts; only commented posts are kept
+        per_post = {}
+        for post_id in post_ids:
+            count = self.zipf_count(0, 2000)
+            if count:
+                per_post[post_id] = count
+
+        def rows():
+            for post_id, count in per_post.items():
+                for author_id in commenters.sample(count):
+                    yield Comment(
+                        user_id=author_id,
+                        post_id=post_id,
+                        content=' '.join(self.rng.choices(WORDS, k=self.rng.randint(5, 40))),
+                    )
+
+        self.bulk_insert(Comment, rows())
+
+        # Denormalized counters and hot scores, grouped to keep UPDATEs few
+        by_count = {}
+        for post_id, count in per_post.items():
+            by_count.setdefault(count, []).append(post_id)
+        for count, ids in by_count.items():
+            for batch in self.batches(ids):
+                CommunityPost.objects.filter(pk__in=batch).update(comments_count=count)
+
+        for batch in self.batches(per_post):
+            posts = list(CommunityPost.objects.filter(pk__in=batch).only(
+                'id', 'likes_count', 'comments_count', 'created_at'
+            ))
+            for post in posts:
+                post.hot_score = hot_score(post.likes_count, post.comments_count, post.created_at)
+            CommunityPost.objects.bulk_update(posts, ['hot_score'])
+
+    def seed_resumes(self, user_ids, skill_ids):
+        names = dict(Skill.objects.filter(pk__in=skill_ids).values_list('id', 'name'))
+        sampler = ZipfSampler(skill_ids, self.skew, self.rng)
+
+        def rows():
+            for user_id in user_ids:
+                skills = [{'name': names[skill_id]} for skill_id in sampler.sample_unique(self.zipf_count(2, 30))]
+                skill_score = min(100, len(skills) * 10)
+                yield Resume(
+                    user_id=user_id,
+                    file=f'resumes/{SYNTHETIC_PREFIX}{user_id}.txt',
+                    original_filename=f'{SYNTHETIC_PREFIX}{user_id}.txt',
+                    file_size=self.rng.randint(20000, 2000000),
+                    skills=skills,
+                    experience_level=self.rng.choice(EXPERIENCE_LEVELS),
+                    skill_score=skill_score,
+                    total_score=skill_score * 0.6,
+                    analysis_status='completed',
+                )
+
+        self.bulk_insert(Resume, rows())
+
+    def clear(self):
+        """Delete synthetic rows (posts, comments, skills and resumes cascade from users)."""
+        started = time.perf_counter()
+        deleted = 0
+        for queryset in (
+            JobOpportunity.objects.filter(job_url__contains=f'/{SYNTHETIC_PREFIX}'),
+            Course.objects.filter(description__startswith=SYNTHETIC_MARKER),
+            User.objects.filter(username__startswith=SYNTHETIC_PREFIX),
+        ):
+            # Delete in chunks so cascades don't build one huge transaction
+            while True:
+                pks = list(queryset.values_list('pk', flat=True)[:CLEAR_BATCH_SIZE])
+                if not pks:
+                    break
+                deleted += queryset.model.objects.filter(pk__in=pks).delete()[0]
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted:,} synthetic rows in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.9 on 2026-10-18 22:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_alter_resume_options_remove_resume_extracted_text_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='ranking_score',
+            field=models.FloatField(db_index=True, default=0, help_text='Bayesian average used to order top-rated lists'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating',
+            field=models.FloatField(default=0, help_text='Average rating score'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_sum',
+            field=models.FloatField(default=0, help_text='Sum of all rating votes'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='total_ratings',
+            field=models.IntegerField(default=0, help_text='Total number of ratings'),
+        ),
+        migrations.AddField(
+            model_name='mentor',
+            name='ranking_score',
+            field=models.FloatField(db_index=True, default=0, help_text='Bayesian average used to order top-rated lists'),
+        ),
+        migrations.AddField(
+            model_name='mentor',
+            name='rating_sum',
+            field=models.FloatField(default=0, help_text='Sum of all rating votes'),
+        ),
+        migrations.AddField(
+            model_name='mentor',
+            name='total_ratings',
+            field=models.IntegerField(default=0, help_text='Total number of ratings'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.9 on 2026-10-18 22:15
+
+import math
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+
+# Frozen copy of core.trending's formula and constants at the time of this migration
+HOT_SCORE_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+HOT_SCORE_DECAY = 45000
+COMMENT_WEIGHT = 2
+
+
+def hot_score(likes_count, comments_count, created_at):
+    engagement = max(likes_count + COMMENT_WEIGHT * comments_count, 1)
+    age_seconds = (created_at - HOT_SCORE_EPOCH).total_seconds()
+    return round(math.log10(engagement) + age_seconds / HOT_SCORE_DECAY, 7)
+
+
+def backfill_hot_scores(apps, schema_editor):
+    CommunityPost = apps.get_model('api', 'CommunityPost')
+    posts = list(CommunityPost.objects.only('id', 'likes_count', 'comments_count', 'created_at'))
+    for post in posts:
+        post.hot_score = hot_score(post.likes_count, post.comments_count, post.created_at)
+    CommunityPost.objects.bulk_update(posts, ['hot_score'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_course_mentor_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='communitypost',
+            name='hot_score',
+            field=models.FloatField(default=0, help_text='Time-decayed trending score, refreshed on likes/comments'),
+        ),
+        migrations.AddIndex(
+            model_name='communitypost',
+            index=models.Index(fields=['-hot_score', '-id'], name='api_post_hot_score_idx'),
+        ),
+        migrations.RunPython(backfill_hot_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,135 @@
+# Generated by Django 5.2.9 on 2026-10-18 22:45
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# Frozen copies of each model's search_document / search_filter_fields
+SEARCH_TABLES = [
+    ('api_communitypost', {'title': 'A', 'content': 'B'}, ()),
+    ('api_course', {'title': 'A', 'category': 'B', 'description': 'C'}, ('category',)),
+    ('api_jobopportunity', {'job_title': 'A', 'company_name': 'A', 'location': 'B', 'description': 'C'}, ('location',)),
+]
+
+# Frozen copy of core.search's trigger DDL at the time of this migration
+SEARCH_CONFIG = 'english'
+FIELD_FILTER_CONFIG = 'simple'
+
+
+def document_sql(fields, row='NEW'):
+    return ' || '.join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({row}.{column}, '')), '{weight}')"
+        for column, weight in fields.items()
+    )
+
+
+def install_search_triggers(schema_editor, table, fields, filter_fields):
+    vendor = schema_editor.connection.vendor
+    columns = list(fields)
+
+    if vendor == 'postgresql':
+        function = f"{table}_search_update"
+        schema_editor.execute(f"""
+            CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {document_sql(fields)};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+        """)
+        schema_editor.execute(f"""
+            CREATE TRIGGER {function}
+            BEFORE INSERT OR UPDATE OF {', '.join(columns)} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {function}();
+        """)
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_search_gin ON {table} USING gin (search_vector)"
+        )
+        for column in filter_fields:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_{column}_fts_gin ON {table} "
+                f"USING gin (to_tsvector('{FIELD_FILTER_CONFIG}', {column}))"
+            )
+        schema_editor.execute(f"UPDATE {table} SET search_vector = {document_sql(fields, row=table)}")
+
+    elif vendor == 'sqlite':
+        fts = f"{table}_fts"
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f"new.{column}" for column in columns)
+        old_values = ', '.join(f"old.{column}" for column in columns)
+
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{column_list}, content='{table}', content_rowid='id')"
+        )
+        schema_editor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """)
+        schema_editor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+            END
+        """)
+        schema_editor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """)
+        schema_editor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def uninstall_search_triggers(schema_editor, table, fields, filter_fields):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        function = f"{table}_search_update"
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {function} ON {table}")
+        schema_editor.execute(f"DROP FUNCTION IF EXISTS {function}()")
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_search_gin")
+        for column in filter_fields:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{column}_fts_gin")
+
+    elif vendor == 'sqlite':
+        fts = f"{table}_fts"
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+def install(apps, schema_editor):
+    for table, fields, filter_fields in SEARCH_TABLES:
+        install_search_triggers(schema_editor, table, fields, filter_fields)
+
+
+def uninstall(apps, schema_editor):
+    for table, fields, filter_fields in SEARCH_TABLES:
+        uninstall_search_triggers(schema_editor, table, fields, filter_fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_userfollow'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='communitypost',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobopportunity',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-18 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_full_text_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-created_at', '-id'], name='api_user_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobopportunity',
+            index=models.Index(fields=['-posted_date', '-id'], name='api_job_posted_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='communitypost',
+            index=models.Index(fields=['-created_at', '-id'], name='api_post_created_id_idx'),
+        ),
+    ]
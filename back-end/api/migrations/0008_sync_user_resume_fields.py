@@ -0,0 +1,126 @@
+# Generated by Django 5.2.9 on 2026-10-18 22:25
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def move_telegram_url_to_website(apps, schema_editor):
+    """Keep users' Telegram links: the field is gone, so they become the website when none is set."""
+    User = apps.get_model('api', 'User')
+    User.objects.filter(website='').exclude(telegram_url='').update(website=models.F('telegram_url'))
+
+
+def restore_telegram_url(apps, schema_editor):
+    User = apps.get_model('api', 'User')
+    User.objects.filter(website__startswith='https://t.me/').update(telegram_url=models.F('website'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_keyset_pagination_indexes'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='user',
+            old_name='avatar',
+            new_name='profile_picture',
+        ),
+        migrations.RenameField(
+            model_name='user',
+            old_name='total_points',
+            new_name='points',
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='website',
+            field=models.URLField(blank=True),
+        ),
+        migrations.RunPython(move_telegram_url_to_website, restore_telegram_url),
+        migrations.RemoveField(
+            model_name='user',
+            name='telegram_url',
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='analysis_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('analyzing', 'Analyzing'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='experience_level',
+            field=models.CharField(blank=True, choices=[('entry-level', 'Entry-level'), ('junior', 'Junior'), ('mid-level', 'Mid-level'), ('senior', 'Senior')], default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='extracted_text',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='skill_gaps',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='skill_score',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='skills',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='total_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='is_mentor',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='is_premium',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='points',
+            field=models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='twitter_url',
+            field=models.URLField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='bio',
+            field=models.TextField(blank=True, max_length=500),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='groups',
+            field=models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.group', verbose_name='groups'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='location',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='title',
+            field=models.CharField(choices=[('student', 'Student'), ('junior', 'Junior Developer'), ('mid-level', 'Mid-Level Developer'), ('senior', 'Senior Developer'), ('lead', 'Lead Developer'), ('manager', 'Engineering Manager'), ('other', 'Other')], default='student', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='user_permissions',
+            field=models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.permission', verbose_name='user permissions'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-18 23:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_daily_metric_rollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='communitypost',
+            index=models.Index(fields=['-likes_count', '-id'], name='api_post_likes_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['user', 'status'], name='api_application_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobopportunity',
+            index=models.Index(condition=models.Q(('expires_at__isnull', False)), fields=['expires_at', '-posted_date'], name='api_job_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usercourseprogress',
+            index=models.Index(condition=models.Q(('completed_at__isnull', False)), fields=['user', 'completed_at'], name='api_progress_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userskill',
+            index=models.Index(fields=['user', '-proficiency_level'], name='api_userskill_user_level_idx'),
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 5.2.9 on 2026-10-18 23:31
+
+from datetime import datetime, timezone
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def add_months(start, months):
+    index = start.year * 12 + start.month - 1 + months
+    return start.replace(year=index // 12, month=index % 12 + 1)
+
+
+def create_notification_table(apps, schema_editor):
+    """
+    Create the table range-partitioned by month on created_at (PostgreSQL); a
+    plain table elsewhere. Frozen copy of core.partitions.create_partitioned_table.
+
+    The primary key becomes (id, created_at), as PostgreSQL requires the
+    partition key in every unique constraint; ids still come from one
+    sequence, so they stay unique.
+    """
+    model = apps.get_model('api', 'Notification')
+    schema_editor.create_model(model)
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    # Rebuild the (empty) table as a partitioned one; PostgreSQL cannot convert in place
+    table = model._meta.db_table
+    schema_editor.execute(
+        f"CREATE TABLE {table}_partitioned (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE (created_at)"
+    )
+    schema_editor.execute(f"DROP TABLE {table}")
+    schema_editor.execute(f"ALTER TABLE {table}_partitioned RENAME TO {table}")
+    schema_editor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)")
+    # Identity columns are not supported on partitioned tables before PostgreSQL 17
+    schema_editor.execute(f"CREATE SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    schema_editor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')")
+    # Foreign keys and indexes are still in schema_editor.deferred_sql; they
+    # run by table name at the end of the migration, on the partitioned table
+
+    schema_editor.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    now = datetime.now(timezone.utc)
+    start = datetime(now.year, now.month, 1, tzinfo=timezone.utc)
+    for months in range(3):  # This month and the next two
+        month = add_months(start, months)
+        schema_editor.execute(
+            f"CREATE TABLE IF NOT EXISTS {table}_p{month:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM (%s) TO (%s)",
+            [month.isoformat(), add_months(month, 1).isoformat()],
+        )
+
+
+def drop_notification_table(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model('api', 'Notification'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_query_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='unread_notifications',
+            field=models.PositiveIntegerField(default=0, help_text='Denormalized unread Notification count, maintained by NotificationService'),
+        ),
+        # The table itself is created below, partitioned where supported
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='Notification',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('notification_type', models.CharField(choices=[('achievement', 'Achievement Unlocked'), ('mention', 'Mentioned'), ('like', 'Post Liked'), ('comment', 'Comment Added'), ('job_match', 'Job Match'), ('mentor_request', 'Mentor Request'), ('system', 'System Alert')], max_length=20)),
+                        ('title', models.CharField(max_length=200)),
+                        ('message', models.TextField()),
+                        ('is_read', models.BooleanField(default=False)),
+                        ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                        ('related_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sent_notifications', to=settings.AUTH_USER_MODEL)),
+                        ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'ordering': ['-created_at'],
+                        'indexes': [models.Index(fields=['user', '-created_at'], name='api_notif_user_created_idx'), models.Index(condition=models.Q(('is_read', False)), fields=['user', '-created_at'], name='api_notif_unread_idx')],
+                    },
+                ),
+            ],
+        ),
+        migrations.RunPython(create_notification_table, drop_notification_table),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:16
+
+import core.models
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_rating_aggregates(apps, schema_editor):
+    """
+    Seed the vote aggregates added in 0003 from the legacy data.
+    A mentor's legacy rating counts as one vote so the first real vote no
+    longer overwrites it, and every row gets the Bayesian ranking_score
+    (the prior mean when unrated) instead of 0.
+    """
+    rating_settings = getattr(settings, 'RATING_SETTINGS', {})
+    prior_mean = rating_settings.get('PRIOR_MEAN', 3.0)
+    prior_weight = rating_settings.get('PRIOR_WEIGHT', 5)
+
+    Mentor = apps.get_model('api', 'Mentor')
+    Mentor.objects.filter(total_ratings=0, rating__gt=0).update(rating_sum=F('rating'), total_ratings=1)
+
+    for model_name in ('Course', 'Mentor'):
+        apps.get_model('api', model_name).objects.update(
+            ranking_score=(F('rating_sum') + prior_mean * prior_weight) / (F('total_ratings') + prior_weight)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_notification_store'),
+    ]
+
+    operations = [
+        # Only the Python-side default changed, so there is nothing to run
+        # against the database; on SQLite an AlterField would rebuild
+        # api_course and drop the full-text triggers installed by 0006.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='course',
+                    name='ranking_score',
+                    field=models.FloatField(db_index=True, default=core.models.default_ranking_score, help_text='Bayesian average used to order top-rated lists'),
+                ),
+                migrations.AlterField(
+                    model_name='mentor',
+                    name='ranking_score',
+                    field=models.FloatField(db_index=True, default=core.models.default_ranking_score, help_text='Bayesian average used to order top-rated lists'),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CourseRating',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='api.course')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_ratings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'course')},
+            },
+        ),
+        migrations.CreateModel(
+            name='MentorRating',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('mentor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='api.mentor')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mentor_ratings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'mentor')},
+            },
+        ),
+        migrations.RunPython(backfill_rating_aggregates, migrations.RunPython.noop),
+    ]
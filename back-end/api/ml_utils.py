@@ -122,6 +122,14 @@ def extract_text_from_file(file):
     else:
         raise ValueError("Unsupported file type")
 
+def extract_text_from_resume(file, file_type=None):
+    """Extract text from a resume, using file_type ('pdf', 'docx', 'txt') when the name has no extension"""
+    if file_type and '.' not in file.name.rsplit('/', 1)[-1]:
+        extractors = {'pdf': extract_text_from_pdf, 'docx': extract_text_from_docx, 'doc': extract_text_from_docx}
+        if file_type in extractors:
+            return extractors[file_type](file)
+    return extract_text_from_file(file)
+
 def extract_skills(text):
     """Extract skills from resume text using pattern matching"""
     text_lower = text.lower()
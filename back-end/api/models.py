@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from core.models import RatableModel, SearchableModel
 
 
 # ==================== EXTENDED USER MODEL ====================
@@ -29,17 +30,40 @@ class User(AbstractUser):
     points = models.IntegerField(default=0, validators=[MinValueValidator(0)])
     is_mentor = models.BooleanField(default=False)
     is_premium = models.BooleanField(default=False)
+    unread_notifications = models.PositiveIntegerField(
+        default=0, help_text='Denormalized unread Notification count, maintained by NotificationService'
+    )
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='api_user_created_id_idx'),
+        ]
     
     def __str__(self):
         return self.get_full_name() or self.username
 
 
+# User Follow Model
+class UserFollow(models.Model):
+    """One user following another's community posts"""
+    follower = models.ForeignKey(User, on_delete=models.CASCADE, related_name='following')
+    following = models.ForeignKey(User, on_delete=models.CASCADE, related_name='followers')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('follower', 'following')
+        indexes = [
+            models.Index(fields=['following', 'follower'], name='api_follow_following_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.follower.username} follows {self.following.username}"
+
+
 # Skill Model
 class Skill(models.Model):
     """Skills that users can have"""
@@ -82,14 +106,21 @@ class UserSkill(models.Model):
     class Meta:
         unique_together = ('user', 'skill')
         ordering = ['-proficiency_level']
+        indexes = [
+            # A user's skills in default order; (user, skill) lookups use the unique index
+            models.Index(fields=['user', '-proficiency_level'], name='api_userskill_user_level_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.skill.name}"
 
 
 # Course Model
-class Course(models.Model):
+class Course(RatableModel, SearchableModel):
     """Learning courses"""
+    search_document = {'title': 'A', 'category': 'B', 'description': 'C'}
+    search_filter_fields = ('category',)
+
     DIFFICULTY_CHOICES = [
         ('beginner', 'Beginner'),
         ('intermediate', 'Intermediate'),
@@ -113,6 +144,19 @@ class Course(models.Model):
         return self.title
 
 
+# Course Rating Model
+class CourseRating(models.Model):
+    """One rating per user and course (see RatableModel.rate)"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='course_ratings')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='votes')
+    score = models.FloatField(validators=[MinValueValidator(1), MaxValueValidator(5)])
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('user', 'course')
+
+
 # Course Module Model
 class CourseModule(models.Model):
     """Modules within courses"""
@@ -157,6 +201,13 @@ class UserCourseProgress(models.Model):
 
     class Meta:
         unique_together = ('user', 'course')
+        indexes = [
+            # Completed-course counts per user (stats, achievements)
+            models.Index(
+                fields=['user', 'completed_at'], name='api_progress_completed_idx',
+                condition=models.Q(completed_at__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.course.title}"
@@ -279,8 +330,11 @@ class UserAchievement(models.Model):
 
 
 # Job Opportunity Model
-class JobOpportunity(models.Model):
+class JobOpportunity(SearchableModel):
     """Job postings"""
+    search_document = {'job_title': 'A', 'company_name': 'A', 'location': 'B', 'description': 'C'}
+    search_filter_fields = ('location',)
+
     company_name = models.CharField(max_length=200)
     job_title = models.CharField(max_length=200)
     description = models.TextField()
@@ -306,6 +360,14 @@ class JobOpportunity(models.Model):
 
     class Meta:
         ordering = ['-posted_date']
+        indexes = [
+            models.Index(fields=['-posted_date', '-id'], name='api_job_posted_id_idx'),
+            # Open listings: expires_at >= now() implies expires_at IS NOT NULL
+            models.Index(
+                fields=['expires_at', '-posted_date'], name='api_job_active_idx',
+                condition=models.Q(expires_at__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.job_title} at {self.company_name}"
@@ -330,28 +392,45 @@ class JobApplication(models.Model):
 
     class Meta:
         unique_together = ('user', 'job')
+        indexes = [
+            models.Index(fields=['user', 'status'], name='api_application_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.job.job_title}"
 
 
 # Community Post Model
-class CommunityPost(models.Model):
+class CommunityPost(SearchableModel):
     """Community discussion posts"""
+    search_document = {'title': 'A', 'content': 'B'}
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='community_posts')
     title = models.CharField(max_length=300)
     content = models.TextField()
     likes_count = models.IntegerField(default=0)
     comments_count = models.IntegerField(default=0)
+    hot_score = models.FloatField(default=0, help_text='Time-decayed trending score, refreshed on likes/comments')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-hot_score', '-id'], name='api_post_hot_score_idx'),
+            models.Index(fields=['-created_at', '-id'], name='api_post_created_id_idx'),
+            models.Index(fields=['-likes_count', '-id'], name='api_post_likes_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.title}"
 
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.hot_score:
+            from core.trending import TrendingService
+            self.hot_score = TrendingService.initial_score(self.created_at)
+        super().save(*args, **kwargs)
+
 
 # Post Tag Model
 class PostTag(models.Model):
@@ -401,7 +480,7 @@ class Comment(models.Model):
 
 
 # Mentor Model
-class Mentor(models.Model):
+class Mentor(RatableModel):
     """User profile for mentors"""
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='mentor_profile')
     bio = models.TextField()
@@ -421,6 +500,19 @@ class Mentor(models.Model):
         return f"Mentor: {self.user.username}"
 
 
+# Mentor Rating Model
+class MentorRating(models.Model):
+    """One rating per user and mentor (see RatableModel.rate)"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='mentor_ratings')
+    mentor = models.ForeignKey(Mentor, on_delete=models.CASCADE, related_name='votes')
+    score = models.FloatField(validators=[MinValueValidator(1), MaxValueValidator(5)])
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('user', 'mentor')
+
+
 # Resume Model
 class Resume(models.Model):
     """User resume"""
@@ -497,6 +589,63 @@ class Resume(models.Model):
         return f"Resume - {self.original_filename or self.file.name}"
 
 
+# Analytics Rollup Model
+class DailyMetric(models.Model):
+    """Daily event count for an analytics series (see core.timeseries)"""
+    metric = models.CharField(max_length=50)
+    date = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('metric', 'date')
+        ordering = ['metric', 'date']
+
+    def __str__(self):
+        return f"{self.metric} {self.date}: {self.count}"
+
+
+# Notification Model
+class Notification(models.Model):
+    """
+    In-app notification. On PostgreSQL the table is range-partitioned by
+    month on created_at (core.partitions), so retention drops partitions.
+    """
+    NOTIFICATION_TYPES = [
+        ('achievement', 'Achievement Unlocked'),
+        ('mention', 'Mentioned'),
+        ('like', 'Post Liked'),
+        ('comment', 'Comment Added'),
+        ('job_match', 'Job Match'),
+        ('mentor_request', 'Mentor Request'),
+        ('system', 'System Alert'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    notification_type = models.CharField(max_length=20, choices=NOTIFICATION_TYPES)
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+    related_user = models.ForeignKey(
+        User, null=True, blank=True, on_delete=models.SET_NULL, related_name='sent_notifications'
+    )
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)  # The partition key
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='api_notif_user_created_idx'),
+            # Unread lists and counts only touch the (small) unread slice
+            models.Index(
+                fields=['user', '-created_at'], name='api_notif_unread_idx',
+                condition=models.Q(is_read=False),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.title}"
+
+
 # Post Model (Original - kept for reference)
 class Post(models.Model):
     """Generic posts (deprecated - use CommunityPost instead)"""
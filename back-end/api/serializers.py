@@ -1,4 +1,7 @@
+from django.db.models import Prefetch
+from django.db.models.manager import BaseManager
 from rest_framework import serializers
+from core.counters import CounterService
 from .models import (
     User, Skill, UserSkill, Resume, Course, CourseModule, UserCourseProgress,
     Project, UserProjectProgress, JobOpportunity, JobApplication,
@@ -20,16 +23,41 @@ class UserSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'skills', 'achievements'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'points']
+        # Top 5 of each, fetched for the whole page by core.prefetch
+        prefetch_related = [
+            Prefetch(
+                'skills',
+                queryset=UserSkill.objects.select_related('skill').order_by('-proficiency_level', 'id')[:5],
+                to_attr='top_skills'
+            ),
+            Prefetch(
+                'achievements',
+                queryset=UserAchievement.objects.select_related('achievement').order_by('-earned_date', 'id')[:5],
+                to_attr='top_achievements'
+            ),
+        ]
 
     def get_skills(self, obj):
-        skills = obj.skills.all()[:5]
+        skills = getattr(obj, 'top_skills', None)
+        if skills is None:
+            skills = obj.skills.select_related('skill').order_by('-proficiency_level', 'id')[:5]
         return UserSkillSerializer(skills, many=True).data
 
     def get_achievements(self, obj):
-        achievements = obj.achievements.all()[:5]
+        achievements = getattr(obj, 'top_achievements', None)
+        if achievements is None:
+            achievements = obj.achievements.select_related('achievement').order_by('-earned_date', 'id')[:5]
         return UserAchievementSerializer(achievements, many=True).data
 
 
+class CurrentUserSerializer(UserSerializer):
+    """The authenticated user's own profile, with private fields such as the unread badge count"""
+
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + ['unread_notifications']
+        read_only_fields = UserSerializer.Meta.read_only_fields + ['unread_notifications']
+
+
 class UserCreateSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
 
@@ -49,18 +77,20 @@ class UserCreateSerializer(serializers.ModelSerializer):
 class SkillSerializer(serializers.ModelSerializer):
     class Meta:
         model = Skill
-        fields = ['id', 'name', 'category', 'description']
+        fields = ['id', 'name', 'category']
 
 
 class UserSkillSerializer(serializers.ModelSerializer):
     skill = SkillSerializer(read_only=True)
     skill_id = serializers.IntegerField(write_only=True)
+    endorsements_count = serializers.IntegerField(source='endorsed_by_count', read_only=True)
+    last_updated = serializers.DateTimeField(source='updated_at', read_only=True)
 
     class Meta:
         model = UserSkill
         fields = [
-            'id', 'skill', 'skill_id', 'proficiency_level', 
-            'years_of_experience', 'endorsements_count', 'last_updated'
+            'id', 'skill', 'skill_id', 'proficiency_level',
+            'endorsements_count', 'last_updated'
         ]
         read_only_fields = ['id', 'endorsements_count', 'last_updated']
 
@@ -103,9 +133,9 @@ class CourseSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'description', 'difficulty_level', 'category',
             'estimated_duration', 'color_gradient', 'thumbnail',
-            'modules', 'created_at', 'updated_at'
+            'rating', 'total_ratings', 'modules', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'rating', 'total_ratings', 'created_at', 'updated_at']
 
 
 class UserCourseProgressSerializer(serializers.ModelSerializer):
@@ -177,7 +207,7 @@ class JobApplicationSerializer(serializers.ModelSerializer):
         model = JobApplication
         fields = [
             'id', 'user', 'job', 'job_id', 'job_title', 'company_name',
-            'status', 'cover_letter', 'applied_at', 'updated_at'
+            'status', 'applied_at', 'updated_at'
         ]
         read_only_fields = ['id', 'user', 'applied_at', 'updated_at']
 
@@ -196,9 +226,20 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'author', 'likes_count', 'created_at', 'updated_at']
 
 
+class CommunityPostListSerializer(serializers.ListSerializer):
+    """Reads the pending counter deltas of a whole page in one backend round trip."""
+
+    def to_representation(self, data):
+        posts = list(data.all() if isinstance(data, BaseManager) else data)
+        self.child.counter_values = CounterService.get_values(posts, CommunityPostSerializer.COUNTER_FIELDS)
+        return super().to_representation(posts)
+
+
 class CommunityPostSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
+    COUNTER_FIELDS = ('likes_count', 'comments_count')
+
     class Meta:
         model = CommunityPost
         fields = [
@@ -206,31 +247,46 @@ class CommunityPostSerializer(serializers.ModelSerializer):
             'comments_count', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'user', 'likes_count', 'comments_count', 'created_at', 'updated_at']
+        list_serializer_class = CommunityPostListSerializer
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Merge increments not yet flushed so users see their own likes and comments
+        values = getattr(self, 'counter_values', {}).get(instance.pk)
+        if values is None:
+            values = CounterService.get_values([instance], self.COUNTER_FIELDS)[instance.pk]
+        data.update(values)
+        return data
 
 
 # ==================== MENTOR SERIALIZERS ====================
 class MentorSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
+    reviews_count = serializers.IntegerField(source='total_ratings', read_only=True)
+    years_of_experience = serializers.IntegerField(source='years_experience')
 
     class Meta:
         model = Mentor
         fields = [
             'id', 'user', 'specializations', 'hourly_rate', 'bio',
             'total_mentees', 'rating', 'reviews_count', 'years_of_experience',
-            'availability_hours_per_week', 'sessions', 'created_at', 'updated_at'
+            'availability', 'verified', 'created_at'
         ]
         read_only_fields = [
             'id', 'user', 'total_mentees', 'rating', 'reviews_count',
-            'created_at', 'updated_at'
+            'verified', 'created_at'
         ]
 
 
 # ==================== ACHIEVEMENT SERIALIZERS ====================
 class AchievementSerializer(serializers.ModelSerializer):
+    name = serializers.CharField(source='title')
+    points_awarded = serializers.IntegerField(source='points_value')
+
     class Meta:
         model = Achievement
         fields = [
-            'id', 'name', 'description', 'icon', 'rarity',
+            'id', 'name', 'description', 'icon',
             'points_awarded', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
@@ -238,6 +294,7 @@ class AchievementSerializer(serializers.ModelSerializer):
 
 class UserAchievementSerializer(serializers.ModelSerializer):
     achievement = AchievementSerializer(read_only=True)
+    earned_at = serializers.DateTimeField(source='earned_date', read_only=True)
 
     class Meta:
         model = UserAchievement
@@ -252,6 +309,7 @@ class ResumeSerializer(serializers.ModelSerializer):
         model = Resume
         fields = [
             'id',
+            'file',
             'original_filename',
             'file_url',
             'file_size',
@@ -264,7 +322,8 @@ class ResumeSerializer(serializers.ModelSerializer):
             'total_score',
             'analysis_status'
         ]
-        read_only_fields = ['id', 'uploaded_at', 'extracted_text', 'skills', 'skill_gaps', 'experience_level', 'skill_score', 'total_score', 'analysis_status']
+        read_only_fields = ['id', 'original_filename', 'file_size', 'uploaded_at', 'extracted_text', 'skills', 'skill_gaps', 'experience_level', 'skill_score', 'total_score', 'analysis_status']
+        extra_kwargs = {'file': {'write_only': True}}
     
     def get_file_url(self, obj):
         request = self.context.get('request')
@@ -0,0 +1,342 @@
+"""
+Query budget regression suite.
+
+Seeds a realistic dataset, hits every GET route registered on the API router
+and fails when an endpoint runs more queries than its budget in
+ENDPOINT_BUDGETS. Query counts, SQL time and serialization time are written
+to the file named by the PERF_REPORT environment variable when it is set.
+
+    python manage.py test api.test_performance
+    PERF_REPORT=perf.json python manage.py test api.test_performance
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from core.feed import FeedService
+from core.profiling import ProfileStore
+from core.querylog import QueryRecorder
+from .models import (
+    User, Skill, UserSkill, Resume, Course, CourseModule, UserCourseProgress,
+    Project, UserProjectProgress, JobOpportunity, JobApplication,
+    CommunityPost, Comment, Mentor, Achievement, UserAchievement, UserFollow
+)
+from .urls import router
+
+
+# Maximum queries per GET route, keyed by URL name. Every GET route on the
+# router must be listed; raise a budget only with a reason in the review.
+ENDPOINT_BUDGETS = {
+    'user-list': 4,
+    'user-detail': 4,
+    'user-skills': 5,
+    'user-achievements': 5,
+    'user-stats': 10,
+    'user-leaderboard': 4,
+    'user-me': 3,
+    'skill-list': 3,
+    'skill-categories': 0,
+    'skill-detail': 2,
+    'user-skill-list': 3,
+    'user-skill-detail': 2,
+    'user-skill-gaps': 2,
+    'resume-list': 3,
+    'resume-detail': 2,
+    'resume-analysis': 2,
+    'course-list': 4,
+    'course-detail': 3,
+    'course-modules': 4,
+    'course-progress': 6,
+    'course-top': 3,
+    'course-module-list': 3,
+    'course-module-detail': 2,
+    'course-progress-list': 4,
+    'course-progress-detail': 3,
+    'project-list': 3,
+    'project-detail': 2,
+    'project-leaderboard': 5,
+    'project-progress-list': 5,
+    'project-progress-detail': 4,
+    'job-list': 3,
+    'job-detail': 3,
+    'job-matching': 3,
+    'job-application-list': 6,
+    'job-application-detail': 5,
+    'community-post-list': 4,
+    'community-post-detail': 4,
+    'community-post-feed': 3,
+    'community-post-comments': 7,
+    'community-post-trending': 4,
+    'comment-list': 5,
+    'comment-detail': 4,
+    'mentor-list': 6,
+    'mentor-detail': 5,
+    'mentor-reviews': 1,
+    'mentor-top': 5,
+    'achievement-list': 3,
+    'achievement-detail': 2,
+    'user-achievement-list': 3,
+    'user-achievement-detail': 2,
+    'profile-list': 1,
+    'profile-detail': 1,
+    'profile-collapsed': 1,
+}
+
+
+def get_routes():
+    """
+    List every GET route on the API router.
+
+    Returns:
+        List of (url_name, basename, detail) tuples
+    """
+    routes = []
+    for _, viewset, basename in router.registry:
+        if hasattr(viewset, 'list'):
+            routes.append((f'{basename}-list', basename, False))
+        if hasattr(viewset, 'retrieve'):
+            routes.append((f'{basename}-detail', basename, True))
+        for extra in viewset.get_extra_actions():
+            if 'get' in extra.mapping:
+                routes.append((f'{basename}-{extra.url_name}', basename, extra.detail))
+    return routes
+
+
+@contextmanager
+def time_serialization():
+    """Measure time spent in serializer .data (outermost serializer only)."""
+    timings = {'seconds': 0.0}
+    depth = {'value': 0}
+    patches = []
+
+    for serializer_class in (serializers.Serializer, serializers.ListSerializer):
+        original = serializer_class.data
+
+        def timed(self, original=original):
+            depth['value'] += 1
+            start = time.perf_counter()
+            try:
+                return original.fget(self)
+            finally:
+                depth['value'] -= 1
+                if depth['value'] == 0:
+                    timings['seconds'] += time.perf_counter() - start
+
+        patches.append(mock.patch.object(serializer_class, 'data', property(timed)))
+
+    for patch in patches:
+        patch.start()
+    try:
+        yield timings
+    finally:
+        for patch in patches:
+            patch.stop()
+
+
+class EndpointQueryBudgetTests(TestCase):
+    """Hit every router GET endpoint against a seeded dataset and enforce query budgets."""
+
+    USERS = 15
+    POSTS = 20
+    JOBS = 15
+    COURSES = 8
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.skills = [
+            Skill.objects.create(name=f'Skill {i}', category='backend') for i in range(12)
+        ]
+        cls.achievements = [
+            Achievement.objects.create(
+                title=f'Badge {i}', description='-', icon='a.png',
+                points_value=10 * i, unlock_condition='-'
+            ) for i in range(8)
+        ]
+
+        cls.users = []
+        for i in range(cls.USERS):
+            user = User.objects.create_user(username=f'user{i}', password='pass', points=i * 10)
+            UserSkill.objects.bulk_create(
+                UserSkill(user=user, skill=skill, proficiency_level=(i + j) % 100)
+                for j, skill in enumerate(cls.skills[:8])
+            )
+            UserAchievement.objects.bulk_create(
+                UserAchievement(user=user, achievement=achievement)
+                for achievement in cls.achievements[:6]
+            )
+            cls.users.append(user)
+        cls.viewer = cls.users[0]
+
+        cls.courses = []
+        for i in range(cls.COURSES):
+            course = Course.objects.create(
+                title=f'Course {i}', description='Learn things', category='web',
+                difficulty_level='beginner', estimated_duration=10
+            )
+            CourseModule.objects.bulk_create(
+                CourseModule(course=course, title=f'Module {m}', content_type='text', order=m, duration=15)
+                for m in range(4)
+            )
+            course.update_rating(4)
+            UserCourseProgress.objects.create(user=cls.users[i], course=course, progress=50)
+            cls.courses.append(course)
+
+        cls.jobs = []
+        for i in range(cls.JOBS):
+            job = JobOpportunity.objects.create(
+                company_name=f'Company {i}', job_title=f'Engineer {i}', description='Build APIs',
+                location='Remote', job_url='https://example.com', expires_at=now + timedelta(days=30)
+            )
+            job.required_skills.set(cls.skills[i % 4:i % 4 + 3])
+            cls.jobs.append(job)
+        for job in cls.jobs[:5]:
+            JobApplication.objects.create(user=cls.viewer, job=job)
+
+        UserFollow.objects.bulk_create(
+            UserFollow(follower=cls.viewer, following=user) for user in cls.users[1:6]
+        )
+        cls.posts = []
+        for i in range(cls.POSTS):
+            post = CommunityPost.objects.create(user=cls.users[i % cls.USERS], title=f'Post {i}', content='-')
+            Comment.objects.bulk_create(
+                Comment(user=cls.users[(i + c) % cls.USERS], post=post, content='-') for c in range(3)
+            )
+            FeedService.publish(post)
+            cls.posts.append(post)
+
+        cls.mentors = []
+        for user in cls.users[1:6]:
+            mentor = Mentor.objects.create(user=user, bio='-', years_experience=5)
+            mentor.specializations.set(cls.skills[:3])
+            mentor.update_rating(5)
+            cls.mentors.append(mentor)
+
+        cls.project = Project.objects.create(
+            title='Project', description='-', category='backend', difficulty_level='beginner'
+        )
+        for user in cls.users:
+            UserProjectProgress.objects.create(user=user, project=cls.project, status='in_progress')
+
+        cls.resume = Resume.objects.create(user=cls.viewer, file='resumes/cv.pdf', original_filename='cv.pdf')
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Set outside setUpTestData, which deep-copies its attributes per test
+        cls.report = []
+
+    @classmethod
+    def tearDownClass(cls):
+        report_path = os.environ.get('PERF_REPORT')
+        if report_path:
+            with open(report_path, 'w') as report_file:
+                json.dump(sorted(cls.report, key=lambda row: row['endpoint']), report_file, indent=2)
+        super().tearDownClass()
+
+    def setUp(self):
+        # Throttle counters live in the cache and would leak between requests
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def detail_object(self, basename):
+        """Object owned by (or visible to) the viewer for each detail route."""
+        return {
+            'user': self.viewer,
+            'skill': self.skills[0],
+            'user-skill': UserSkill.objects.filter(user=self.viewer).first(),
+            'resume': self.resume,
+            'course': self.courses[0],
+            'course-module': CourseModule.objects.first(),
+            'course-progress': UserCourseProgress.objects.filter(user=self.viewer).first(),
+            'project': self.project,
+            'project-progress': UserProjectProgress.objects.filter(user=self.viewer).first(),
+            'job': self.jobs[0],
+            'job-application': JobApplication.objects.filter(user=self.viewer).first(),
+            'community-post': self.posts[0],
+            'comment': Comment.objects.first(),
+            'mentor': self.mentors[0],
+            'achievement': self.achievements[0],
+            'user-achievement': UserAchievement.objects.filter(user=self.viewer).first(),
+            'profile': SimpleNamespace(pk=ProfileStore.save({'collapsed': ''})),
+        }[basename]
+
+    def measure(self, url):
+        # RateLimitMiddleware keeps its burst window in the cache
+        cache.clear()
+        with time_serialization() as serialization, QueryRecorder(capture_call_sites=True) as recorder:
+            start = time.perf_counter()
+            response = self.client.get(url)
+            elapsed = time.perf_counter() - start
+        return response, recorder, serialization['seconds'], elapsed
+
+    def test_every_route_has_a_budget(self):
+        missing = [name for name, _, _ in get_routes() if name not in ENDPOINT_BUDGETS]
+        self.assertEqual(missing, [], f"Declare a query budget for: {', '.join(missing)}")
+
+    def test_endpoints_within_query_budget(self):
+        for url_name, basename, detail in get_routes():
+            budget = ENDPOINT_BUDGETS.get(url_name)
+            if budget is None:
+                continue
+
+            with self.subTest(endpoint=url_name):
+                kwargs = {'pk': self.detail_object(basename).pk} if detail else {}
+                url = reverse(url_name, kwargs=kwargs)
+                response, recorder, serialization_time, elapsed = self.measure(url)
+
+                self.report.append({
+                    'endpoint': url_name,
+                    'url': url,
+                    'status': response.status_code,
+                    'queries': recorder.count,
+                    'budget': budget,
+                    'sql_ms': round(recorder.total_time * 1000, 2),
+                    'serialization_ms': round(serialization_time * 1000, 2),
+                    'total_ms': round(elapsed * 1000, 2),
+                })
+
+                self.assertLess(response.status_code, 500, f"{url} returned {response.status_code}")
+                call_sites = '\n'.join(
+                    f"  {count:>4}  {site or '(framework)'}" for site, count in recorder.top_call_sites()
+                )
+                self.assertLessEqual(
+                    recorder.count, budget,
+                    f"{url} ran {recorder.count} queries (budget {budget}). Top call sites:\n{call_sites}"
+                )
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+    """The dev middleware reports query counts and warns with call sites over the threshold."""
+
+    def setUp(self):
+        cache.clear()
+        for i in range(3):
+            User.objects.create_user(username=f'user{i}', password='pass')
+
+    @override_settings(QUERY_BUDGET_SETTINGS={'ENABLED': True, 'WARN_THRESHOLD': 1, 'CALL_SITES': 3})
+    def test_warns_over_threshold(self):
+        with self.assertLogs('middleware.analytics_middleware', level='WARNING') as logs:
+            response = APIClient().get('/api/users/')
+
+        self.assertGreater(int(response['X-Query-Count']), 1)
+        self.assertIn('Query budget exceeded: GET /api/users/', logs.output[0])
+        self.assertIn('Top call sites', logs.output[0])
+
+    @override_settings(QUERY_BUDGET_SETTINGS={'ENABLED': False})
+    def test_disabled(self):
+        response = APIClient().get('/api/users/')
+        self.assertNotIn('X-Query-Count', response)
@@ -0,0 +1,83 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from api.models import CommunityPost, JobApplication, JobOpportunity, Skill, User, UserSkill
+from core.reference import local_cache
+from services import AnalyticsService, RecommendationService
+from tasks import analytics_tasks
+
+
+class AnalyticsServiceTests(TestCase):
+    """Dashboard analytics are aggregated per table and served from the stampede-protected cache."""
+
+    def setUp(self):
+        cache.clear()
+        local_cache().clear()
+        self.user = User.objects.create_user(username='member', password='pass', points=10, is_mentor=True)
+        User.objects.create_user(username='premium', password='pass', points=30, is_premium=True)
+        self.skill = Skill.objects.create(name='Python', category='backend')
+        UserSkill.objects.create(user=self.user, skill=self.skill, proficiency_level=90)
+        CommunityPost.objects.create(user=self.user, title='Hello', content='-')
+        job = JobOpportunity.objects.create(
+            company_name='Acme', job_title='Dev', description='-', location='Remote',
+            job_url='https://example.com/jobs/1'
+        )
+        job.required_skills.add(self.skill)
+        JobApplication.objects.create(user=self.user, job=job)
+
+    def test_platform_stats_are_computed_once_then_cached(self):
+        stats = AnalyticsService.get_platform_stats()
+        self.assertEqual(stats['users'], {'total_users': 2, 'active_users': 0, 'mentors': 1, 'premium_users': 1})
+        self.assertEqual(stats['engagement']['average_user_points'], 20)
+        self.assertEqual(stats['jobs']['total_applications'], 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(AnalyticsService.get_platform_stats(), stats)
+
+    def test_user_stats_follow_the_users_changes(self):
+        stats = AnalyticsService.get_user_stats(self.user)
+        self.assertEqual(stats['skills'], {'total_skills': 1, 'expert_skills': 1, 'endorsed_skills': 0})
+        self.assertEqual(stats['community']['total_posts'], 1)
+        self.assertEqual(stats['jobs']['pending_applications'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserSkill.objects.create(user=self.user, skill=Skill.objects.create(name='Go', category='backend'))
+        self.assertEqual(AnalyticsService.get_user_stats(self.user)['skills']['total_skills'], 2)
+
+    def test_last_active_is_not_cached_with_the_stats(self):
+        self.assertIsNone(AnalyticsService.get_user_stats(self.user)['profile']['last_active'])
+        cache.set(f'user_last_activity:{self.user.id}', '2026-10-19T12:00:00+00:00')
+        with self.assertNumQueries(0):
+            stats = AnalyticsService.get_user_stats(self.user)
+        self.assertEqual(stats['profile']['last_active'], '2026-10-19T12:00:00+00:00')
+        self.assertEqual(stats['profile']['points'], 10)
+
+    def test_hourly_task_refreshes_every_entry(self):
+        analytics_tasks.cache_platform_analytics()
+        self.assertIsNotNone(cache.get('platform_stats'))
+        self.assertEqual(
+            sorted(AnalyticsService.cache_analytics()), sorted(AnalyticsService.cached_analytics())
+        )
+
+
+class RecommendationServiceTests(TestCase):
+    """Skill recommendations rank market demand against the in-process skill catalogue."""
+
+    def setUp(self):
+        cache.clear()
+        local_cache().clear()
+        self.user = User.objects.create_user(username='learner', password='pass')
+        self.python, self.rust = (
+            Skill.objects.create(name=name, category='backend') for name in ('Python', 'Rust')
+        )
+        UserSkill.objects.create(user=self.user, skill=self.python, proficiency_level=50)
+        job = JobOpportunity.objects.create(
+            company_name='Acme', job_title='Dev', description='-', location='Remote',
+            job_url='https://example.com/jobs/1'
+        )
+        job.required_skills.add(self.python, self.rust)
+
+    def test_recommends_missing_skills_in_demand(self):
+        recommendations = RecommendationService.recommend_skills(self.user)
+        self.assertEqual([skill['skill_name'] for skill in recommendations], ['Rust'])
+        with self.assertNumQueries(0):
+            self.assertEqual(RecommendationService.recommend_skills(self.user), recommendations)
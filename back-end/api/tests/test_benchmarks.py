@@ -0,0 +1,64 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+
+class ResumeBenchmarkTests(SimpleTestCase):
+    """The resume pipeline benchmark runs on every corpus format and flags regressions."""
+
+    def run_benchmark(self, *args):
+        out = StringIO()
+        call_command('benchmark_resume', '--sizes', 'small', '--min-rounds', '1', '--min-time', '0', *args, stdout=out)
+        return out.getvalue()
+
+    def test_corpus_formats_analyze_identically(self):
+        from api.ml_utils import analyze_resume
+        from api.management.commands.benchmark_resume import build_corpus
+
+        corpus = build_corpus(('small',))
+        analyses = [
+            analyze_resume(SimpleUploadedFile(f'resume.{name.split(".")[-1]}', content))
+            for name, content in corpus.items()
+        ]
+        self.assertEqual(len(analyses), 3)
+        self.assertTrue(analyses[0]['skills'])
+        for analysis in analyses[1:]:
+            self.assertEqual(analysis['skills'], analyses[0]['skills'])
+
+    def test_compare_flags_regressions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = Path(directory) / 'baseline.json'
+            self.run_benchmark('--save-baseline', '--baseline', str(baseline))
+            self.assertIn('No regressions', self.run_benchmark('--compare', '--threshold', '100000', '--baseline', str(baseline)))
+
+            # Pretend everything used to be 100x faster
+            data = json.loads(baseline.read_text())
+            for stats in data['cases'].values():
+                stats['min_us'] /= 100
+            baseline.write_text(json.dumps(data))
+            with self.assertRaisesMessage(CommandError, 'benchmark regression'):
+                self.run_benchmark('--compare', '--baseline', str(baseline))
+
+
+class BackendBenchmarkTests(SimpleTestCase):
+    """The cache/connection benchmark reports payload sizes and per-backend timings."""
+
+    def test_cache_cases(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / 'backends.json'
+            out = StringIO()
+            call_command(
+                'benchmark_backends', '--filter', 'cache', '--min-rounds', '1', '--min-time', '0',
+                '--output', str(output), stdout=out
+            )
+            results = json.loads(output.read_text())
+
+        self.assertIn('zlib-compressed', out.getvalue())
+        self.assertLess(results['payload_compressed_bytes'], results['payload_bytes'])
+        self.assertEqual(set(results['cases']), {'cache.get[locmem]', 'cache.set[locmem]'})
@@ -0,0 +1,111 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from prometheus_client import REGISTRY
+
+from api.models import Skill, User, UserSkill
+from core import caching
+
+
+class CachingTests(TestCase):
+    """Cached values are recomputed by one caller while the others keep reading."""
+
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return self.calls
+
+    def test_cold_miss_computes_once(self):
+        self.assertEqual(caching.get_or_refresh('stats', self.compute, 60, 60), 1)
+        self.assertEqual(caching.get_or_refresh('stats', self.compute, 60, 60), 1)
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_value_served_while_refreshing(self):
+        caching.set_entry('stats', 'old', fresh_for=0, stale_for=60)
+        self.assertEqual(caching.get_or_refresh('stats', self.compute, 60, 60, background=False), 1)
+
+        caching.set_entry('stats', 'old', fresh_for=0, stale_for=60)
+        with mock.patch.object(caching, '_refresh_in_background') as background:
+            self.assertEqual(caching.get_or_refresh('stats', self.compute, 60, 60), 'old')
+        background.assert_called_once()
+
+    def test_refresh_is_single_flight(self):
+        cache.add(caching.LOCK_KEY.format('stats'), 1)
+        self.assertEqual(caching.refresh('stats', self.compute, 60, 60), (False, None))
+        self.assertEqual(self.calls, 0)
+
+        # A cold-miss caller waits for the lock holder, then computes itself
+        self.assertEqual(caching.get_or_refresh('stats', self.compute, 60, 60, wait=0.1), 1)
+        cache.delete(caching.LOCK_KEY.format('stats'))
+        self.assertEqual(caching.refresh('stats', self.compute, 60, 60), (True, 2))
+
+    def test_cache_outage_computes_without_waiting(self):
+        # django-redis with IGNORE_EXCEPTIONS returns None from add() when Redis is down
+        with mock.patch.object(cache, 'add', return_value=None), \
+                mock.patch.object(cache, 'delete') as delete, \
+                mock.patch('core.caching.time.sleep') as sleep:
+            self.assertEqual(caching.get_or_refresh('stats', self.compute, 60, 60, wait=5), 1)
+        sleep.assert_not_called()
+        delete.assert_not_called()  # No lock was taken, so none is released
+
+    def test_expensive_entries_refresh_early(self):
+        caching.refresh('stats', self.compute, 60, 60)
+        entry = cache.get('stats')
+        entry['delta'] = 30.0  # The last computation took 30s
+        now = entry['fresh_until'] - 10
+
+        with mock.patch('core.caching.random.random', return_value=0.9):
+            self.assertTrue(caching.refresh_due(entry, beta=1.0, now=now))
+            self.assertFalse(caching.refresh_due(entry, beta=0, now=now))
+        with mock.patch('core.caching.random.random', return_value=0.1):
+            self.assertFalse(caching.refresh_due(entry, beta=1.0, now=now))
+
+    def test_decorator_keys_tags_and_refresh(self):
+        @caching.cached('report:{user_id}:{limit}', fresh_for=60, tags=['user:{user_id}'])
+        def report(user_id, limit=5):
+            self.calls += 1
+            return [user_id] * limit
+
+        self.assertEqual(report.key(7), 'report:7:5')
+        self.assertEqual(report(7), [7] * 5)
+        self.assertEqual(report(7, limit=5), [7] * 5)
+        self.assertEqual(self.calls, 1)
+
+        caching.invalidate_tags('user:8')
+        report(7)
+        self.assertEqual(self.calls, 1)
+        caching.invalidate_tags('user:7')
+        report(7)
+        self.assertEqual(self.calls, 2)
+
+        self.assertEqual(report.refresh(7), (True, [7] * 5))
+        self.assertEqual(self.calls, 3)
+        report.invalidate(7)
+        self.assertIsNone(cache.get('report:7:5'))
+
+    def test_model_changes_invalidate_tags(self):
+        user = User.objects.create_user(username='cached', password='pass')
+        caching.get_or_refresh('user_stats:x', self.compute, 60, 60, tags=[f'user:{user.id}'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserSkill.objects.create(user=user, skill=Skill.objects.create(name='Go', category='backend'))
+        self.assertEqual(caching.get_or_refresh('user_stats:x', self.compute, 60, 60, tags=[f'user:{user.id}']), 2)
+
+    def test_lookup_and_recompute_timings(self):
+        def sample(name, **labels):
+            return REGISTRY.get_sample_value(name, labels) or 0
+
+        misses = sample('cached_lookup_duration_seconds_count', cache='stats', result='miss')
+        hits = sample('cached_lookup_duration_seconds_count', cache='stats', result='hit')
+        recomputes = sample('cache_recompute_duration_seconds_count', cache='stats')
+
+        caching.get_or_refresh('stats:1', self.compute, 60, 60, beta=0)
+        caching.get_or_refresh('stats:1', self.compute, 60, 60, beta=0)
+
+        self.assertEqual(sample('cached_lookup_duration_seconds_count', cache='stats', result='miss'), misses + 1)
+        self.assertEqual(sample('cached_lookup_duration_seconds_count', cache='stats', result='hit'), hits + 1)
+        self.assertEqual(sample('cache_recompute_duration_seconds_count', cache='stats'), recomputes + 1)
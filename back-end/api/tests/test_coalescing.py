@@ -0,0 +1,66 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.coalescing import Coalescer, MemoryCoalescingBackend
+
+
+class CoalescingTests(SimpleTestCase):
+    """Events are grouped per key within a window, in bounded memory."""
+
+    def setUp(self):
+        self.backend = MemoryCoalescingBackend(max_groups=2, sample_actors=2, max_tracked_actors=3)
+
+    def test_groups_count_events_and_distinct_actors(self):
+        for actor in (1, 2, 1, 3, 4, 5):
+            self.backend.add('7:like:post:1', actor, now=100)
+
+        [group] = self.backend.drain(opened_before=100)
+        self.assertEqual(group['count'], 6)
+        # Exact up to max_tracked_actors, then every new event counts as an actor
+        self.assertEqual(group['actor_count'], 5)
+        self.assertEqual(group['actors'], [1, 2])
+        self.assertEqual(self.backend.drain(opened_before=100), [])
+
+    def test_drains_only_expired_groups_and_evicts_the_oldest_when_full(self):
+        self.backend.add('a', 1, now=100)
+        self.backend.add('b', 1, now=110)
+        self.assertEqual([group['key'] for group in self.backend.drain(opened_before=105)], ['a'])
+
+        self.backend.add('c', 1, now=120)
+        self.backend.add('d', 1, now=130)  # Third open group: 'b' is closed early
+        self.assertEqual(list(self.backend.groups), ['c', 'd'])
+        self.assertEqual([group['key'] for group in self.backend.drain(opened_before=0)], ['b'])
+
+    def test_closed_groups_are_capped_while_flushes_fail(self):
+        for index in range(6):
+            self.backend.add(str(index), 1, now=index)
+        self.backend.restore([{'key': 'restored', 'count': 1, 'actor_count': 1, 'actors': [1]}])
+        with self.assertLogs('core.coalescing', level='WARNING') as logs:
+            self.backend.add('6', 1, now=6)
+        self.assertIn('Dropped 1 closed coalescing groups', logs.output[0])
+        # Two open and two closed groups at most; the oldest closed ones were dropped
+        self.assertEqual([group['key'] for group in self.backend.closed], ['3', '4'])
+        self.assertEqual(list(self.backend.groups), ['5', '6'])
+
+    def test_flusher_logs_errors(self):
+        with mock.patch.object(Coalescer, '_backend', self.backend), \
+                mock.patch.object(Coalescer, '_flusher_started', False), \
+                mock.patch('core.coalescing.threading.Thread') as thread, \
+                mock.patch('core.coalescing.time.sleep', side_effect=[None, SystemExit]), \
+                mock.patch.object(Coalescer, 'flush', side_effect=RuntimeError('db down')):
+            Coalescer.start_memory_flusher(mock.Mock())
+            run = thread.call_args.kwargs['target']
+            with self.assertLogs('core.coalescing', level='ERROR') as logs, self.assertRaises(SystemExit):
+                run()
+        self.assertIn('Coalescing flusher error: db down', logs.output[0])
+
+    def test_flush_restores_groups_when_emitting_fails(self):
+        with mock.patch.object(Coalescer, '_backend', self.backend):
+            Coalescer.add('7:like:post:1', 1)
+            with self.assertRaises(RuntimeError):
+                Coalescer.flush(mock.Mock(side_effect=RuntimeError('db down')), force=True)
+
+            emit = mock.Mock()
+            self.assertEqual(Coalescer.flush(emit, force=True), 1)
+        self.assertEqual(emit.call_args.args[0][0]['count'], 1)
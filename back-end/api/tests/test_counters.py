@@ -0,0 +1,249 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.functions import Greatest
+from django.test import TestCase
+from rest_framework import viewsets
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from api.models import CommunityPost, PostLike, User
+from api.serializers import CommunityPostSerializer
+from core import LikeDislikeMixin
+from core.counters import CounterService, MemoryCounterBackend, RedisCounterBackend, make_counter_key
+
+
+class FakeRedis:
+    """The handful of hash, key and lock commands RedisCounterBackend uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.locked = False
+        self.round_trips = 0
+
+    def hincrby(self, name, key, delta):
+        shard = self.data.setdefault(name, {})
+        shard[key.encode()] = shard.get(key.encode(), 0) + delta
+
+    def hget(self, name, key):
+        self.round_trips += 1
+        return self.data.get(name, {}).get(key.encode())
+
+    def hmget(self, name, keys):
+        return [self.data.get(name, {}).get(key.encode()) for key in keys]
+
+    def hgetall(self, name):
+        return dict(self.data.get(name, {}))
+
+    def exists(self, name):
+        return int(name in self.data)
+
+    def rename(self, src, dst):
+        if src not in self.data:
+            raise Exception('ERR no such key')
+        self.data[dst] = self.data.pop(src)
+
+    def delete(self, *names):
+        for name in names:
+            self.data.pop(name, None)
+
+    def pipeline(self, transaction=True):
+        client = self
+
+        class Pipeline:
+            calls = []
+
+            def hmget(self, name, keys):
+                self.calls.append((name, keys))
+
+            def execute(self):
+                client.round_trips += 1
+                return [client.hmget(name, keys) for name, keys in self.calls]
+
+        Pipeline.calls = []
+        return Pipeline()
+
+    def lock(self, name, timeout=None):
+        client = self
+
+        class Lock:
+            def acquire(self, blocking=True):
+                if client.locked:
+                    return False
+                client.locked = self
+                return True
+
+            def owned(self):
+                return client.locked is self
+
+            def reacquire(self):
+                if not self.owned():
+                    raise Exception('Cannot reacquire a lock that is no longer owned')
+
+            def release(self):
+                if not self.owned():
+                    raise Exception('Cannot release a lock that is no longer owned')
+                client.locked = False
+
+        return Lock()
+
+
+class CounterTestCase(TestCase):
+    backend_class = MemoryCounterBackend
+
+    def setUp(self):
+        cache.clear()
+        self.redis = FakeRedis()
+        if self.backend_class is RedisCounterBackend:
+            backend = RedisCounterBackend(self.redis, 4)
+        else:
+            backend = MemoryCounterBackend(4)
+        patcher = mock.patch.object(CounterService, '_backend', backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.backend = backend
+
+        self.author = User.objects.create_user(username='author', password='pass')
+        self.fans = [User.objects.create_user(username=f'fan{index}', password='pass') for index in range(2)]
+        self.posts = [
+            CommunityPost.objects.create(user=self.author, title=f'Post {index}', content='-')
+            for index in range(3)
+        ]
+
+    def stored(self, post, field='likes_count'):
+        return getattr(CommunityPost.objects.get(pk=post.pk), field)
+
+
+class CounterFlushTests(CounterTestCase):
+    """Buffered deltas reach the database once, and survive a failed flush."""
+
+    def test_flush_applies_grouped_deltas(self):
+        for post in self.posts:
+            CounterService.increment(post, 'likes_count', 2)
+        CounterService.increment(self.posts[0], 'comments_count')
+
+        with self.assertNumQueries(4):  # Savepoint, two grouped UPDATEs, release
+            self.assertEqual(CounterService.flush(), 3)
+        self.assertEqual([self.stored(post) for post in self.posts], [2, 2, 2])
+        self.assertEqual(self.stored(self.posts[0], 'comments_count'), 1)
+        self.assertEqual(CounterService.flush(), 0)
+
+    def test_failed_flush_is_retried(self):
+        CounterService.increment(self.posts[0], 'likes_count', 3)
+        with mock.patch('core.counters.transaction.atomic', side_effect=RuntimeError('db down')):
+            with self.assertLogs('core.counters', level='ERROR'), self.assertRaises(RuntimeError):
+                CounterService.flush()
+        self.assertEqual(self.stored(self.posts[0]), 0)
+
+        CounterService.flush()
+        self.assertEqual(self.stored(self.posts[0]), 3)
+
+    def test_drained_deltas_are_read_until_commit(self):
+        CounterService.increment(self.posts[0], 'likes_count', 3)
+        self.backend.drain()
+        CounterService.increment(self.posts[0], 'likes_count', 1)
+        self.assertEqual(CounterService.get_pending(self.posts[0], 'likes_count'), 4)
+        self.assertEqual(
+            CounterService.get_values(self.posts[:1], ['likes_count']), {self.posts[0].pk: {'likes_count': 4}}
+        )
+
+
+class RedisCounterFlushTests(CounterFlushTests):
+    backend_class = RedisCounterBackend
+
+    def test_flushing_hash_is_kept_until_commit(self):
+        CounterService.increment(self.posts[0], 'likes_count', 3)
+        with mock.patch('core.counters.transaction.atomic', side_effect=RuntimeError('db down')):
+            with self.assertLogs('core.counters', level='ERROR'), self.assertRaises(RuntimeError):
+                CounterService.flush()
+        self.assertTrue(any(name.endswith(':flushing') for name in self.redis.data))
+        self.assertFalse(self.redis.locked)
+
+        # Increments during the outage stay in the live shard for the flush after
+        CounterService.increment(self.posts[0], 'likes_count', 1)
+        CounterService.flush()
+        self.assertEqual(self.stored(self.posts[0]), 3)
+        CounterService.flush()
+        self.assertEqual(self.stored(self.posts[0]), 4)
+        self.assertEqual(self.redis.data, {})
+
+    def test_expired_drain_lock_does_not_commit(self):
+        CounterService.increment(self.posts[0], 'likes_count', 3)
+
+        def expire_lock(*expressions):
+            self.redis.locked = False  # LOCK_TIMEOUT passed; another worker may drain the same hashes
+            return Greatest(*expressions)
+
+        with mock.patch('core.counters.Greatest', side_effect=expire_lock):
+            with self.assertLogs('core.counters', level='ERROR'), self.assertRaises(Exception):
+                CounterService.flush()
+        self.assertEqual(self.stored(self.posts[0]), 0)
+
+        CounterService.flush()
+        self.assertEqual(self.stored(self.posts[0]), 3)
+
+    def test_concurrent_drain_is_skipped(self):
+        CounterService.increment(self.posts[0], 'likes_count')
+        self.redis.locked = True
+        self.assertEqual(CounterService.flush(), 0)
+        self.assertEqual(CounterService.get_pending(self.posts[0], 'likes_count'), 1)
+
+
+class CounterReadTests(CounterTestCase):
+    """A page of posts merges its pending deltas with one backend read."""
+
+    backend_class = RedisCounterBackend
+
+    def test_page_reads_pending_deltas_in_one_round_trip(self):
+        for post in self.posts:
+            CounterService.increment(post, 'likes_count')
+        CounterService.increment(self.posts[1], 'comments_count', -1)  # Clamped at zero
+
+        data = CommunityPostSerializer(CommunityPost.objects.order_by('pk'), many=True).data
+        self.assertEqual(self.redis.round_trips, 1)
+        self.assertEqual([post['likes_count'] for post in data], [1, 1, 1])
+        self.assertEqual([post['comments_count'] for post in data], [0, 0, 0])
+
+        self.assertEqual(CommunityPostSerializer(self.posts[0]).data['likes_count'], 1)
+        self.assertEqual(
+            CounterService.get_values(self.posts[:1], ['likes_count']), {self.posts[0].pk: {'likes_count': 1}}
+        )
+
+
+class LikeTests(CounterTestCase):
+    """Likes are recorded once per user; only a removed like decrements."""
+
+    def test_like_and_unlike_are_idempotent_per_user(self):
+        post = self.posts[0]
+        client = APIClient()
+        client.force_authenticate(self.fans[0])
+        self.assertTrue(client.post(f'/api/community/posts/{post.pk}/like/').data['liked'])
+        self.assertFalse(client.post(f'/api/community/posts/{post.pk}/like/').data['liked'])
+        CounterService.like_post(self.fans[1], post)
+
+        self.assertTrue(client.post(f'/api/community/posts/{post.pk}/unlike/').data['unliked'])
+        response = client.post(f'/api/community/posts/{post.pk}/unlike/')
+        self.assertFalse(response.data['unliked'])
+        self.assertEqual(response.data['likes_count'], 1)
+        self.assertEqual(CounterService.get_pending(post, 'likes_count'), 1)
+        self.assertEqual(list(PostLike.objects.values_list('user', flat=True)), [self.fans[1].pk])
+
+    def test_mixin_uses_the_like_model(self):
+        class PostViewSet(LikeDislikeMixin, viewsets.GenericViewSet):
+            queryset = CommunityPost.objects.all()
+            like_model = PostLike
+            like_target_field = 'post'
+
+        post = self.posts[0]
+        for action in ('like', 'like', 'unlike', 'unlike'):
+            request = APIRequestFactory().post('/')
+            force_authenticate(request, self.fans[0])
+            PostViewSet.as_view({'post': action})(request, pk=post.pk)
+        self.assertEqual(CounterService.get_pending(post, 'likes_count'), 0)
+        self.assertEqual(self.backend.get(make_counter_key(post, 'likes_count')), 0)
+
+        PostViewSet.like_model = None
+        request = APIRequestFactory().post('/')
+        force_authenticate(request, self.fans[0])
+        with self.assertRaises(ImproperlyConfigured):
+            PostViewSet.as_view({'post': 'like'})(request, pk=post.pk)
@@ -0,0 +1,119 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.models import CommunityPost, Skill, User, UserFollow, UserSkill
+from core.feed import FeedService, MemoryFeedBackend, RedisFeedBackend
+
+
+class FakeRedis:
+    """Sorted-set and set commands used by RedisFeedBackend; records each read."""
+
+    def __init__(self):
+        self.zsets = {}
+        self.sets = {}
+        self.reads = []
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+    def zadd(self, name, mapping):
+        self.zsets.setdefault(name, {}).update(mapping)
+
+    def zremrangebyrank(self, name, start, end):
+        members = sorted(self.zsets.get(name, {}).items(), key=lambda item: item[1])
+        stop = max(len(members) + end + 1, 0) if end < 0 else end + 1
+        for member, _ in members[start:stop]:
+            del self.zsets[name][member]
+
+    def zrevrangebyscore(self, name, max, min, start=None, num=None):
+        self.reads.append((name, max, min, start, num))
+        upper = float(max.lstrip('(')) if max != '+inf' else float('inf')
+        members = sorted(self.zsets.get(name, {}).items(), key=lambda item: -item[1])
+        members = [
+            str(member).encode() for member, score in members
+            if score < upper or (score == upper and not max.startswith('('))
+        ]
+        return members[start:start + num] if num is not None else members
+
+    def sadd(self, name, value):
+        self.sets.setdefault(name, set()).add(str(value).encode())
+
+    def srem(self, name, value):
+        self.sets.get(name, set()).discard(str(value).encode())
+
+    def smembers(self, name):
+        return set(self.sets.get(name, set()))
+
+
+class FeedTests(TestCase):
+    """Feed pages read a bounded slice of the timeline, not the whole list."""
+
+    def setUp(self):
+        cache.clear()
+        self.redis = FakeRedis()
+        patcher = mock.patch.object(FeedService, '_backend', RedisFeedBackend(self.redis, 4))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.author = User.objects.create_user(username='author', password='pass')
+        self.reader = User.objects.create_user(username='reader', password='pass')
+        UserFollow.objects.create(follower=self.reader, following=self.author)
+        self.posts = []
+        for index in range(6):
+            post = CommunityPost.objects.create(user=self.author, title=f'Post {index}', content='-')
+            FeedService.publish(post)
+            self.posts.append(post)
+
+    def test_timeline_is_capped_and_paged_by_cursor(self):
+        newest = [post.pk for post in reversed(self.posts)]
+        self.assertEqual(FeedService.get_backend().range(self.reader.pk), newest[:4])
+
+        self.redis.reads.clear()
+        page = FeedService.get_feed(self.reader, limit=2)
+        self.assertEqual([post.pk for post in page], newest[:2])
+        page = FeedService.get_feed(self.reader, before=page[-1].pk, limit=2)
+        self.assertEqual([post.pk for post in page], newest[2:4])
+        self.assertEqual(
+            self.redis.reads,
+            [
+                (f'feed:timeline:{self.reader.pk}', '+inf', '-inf', 0, 2),
+                (f'feed:timeline:{self.reader.pk}', f'({newest[1]}', '-inf', 0, 2),
+            ]
+        )
+
+    def test_feed_endpoint_returns_a_cursor(self):
+        client = APIClient()
+        client.force_authenticate(self.reader)
+        response = client.get('/api/community/posts/feed/', {'page_size': 3})
+        self.assertEqual([post['id'] for post in response.data['results']], [post.pk for post in self.posts[:2:-1]])
+        self.assertEqual(response.data['next_before'], self.posts[3].pk)
+
+    @override_settings(FEED_SETTINGS={'SKILL_MATCH_LIMIT': 2})
+    def test_skill_matches_are_limited_per_user(self):
+        skills = [Skill.objects.create(name=name, category='backend') for name in ('Django', 'Redis')]
+        for skill in skills:
+            UserSkill.objects.create(user=self.author, skill=skill, proficiency_level=50)
+        matches = [User.objects.create_user(username=f'match{index}', password='pass') for index in range(3)]
+        # match0 matches both skills, which must not take two of the limited places
+        for user, skill, level in [
+            (matches[0], skills[0], 90), (matches[0], skills[1], 80),
+            (matches[1], skills[0], 70), (matches[2], skills[1], 60),
+        ]:
+            UserSkill.objects.create(user=user, skill=skill, proficiency_level=level)
+
+        audience, _ = FeedService.get_audience(self.posts[0])
+        self.assertEqual(audience, {self.author.pk, self.reader.pk, matches[0].pk, matches[1].pk})
+
+    def test_memory_backend_stops_at_the_page(self):
+        backend = MemoryFeedBackend(10)
+        backend.push([1], 1)
+        backend.push([1], 2)
+        backend.push([1], 3)
+        self.assertEqual(backend.range(1, before=3, limit=1), [2])
+        self.assertEqual(backend.range(1), [3, 2, 1])
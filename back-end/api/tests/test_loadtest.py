@@ -0,0 +1,35 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import LiveServerTestCase, override_settings
+
+from api.models import CommunityPost, User
+
+
+@override_settings(RATE_LIMIT_SETTINGS={'BURST_SIZE': 100000, 'ANONYMOUS_REQUESTS_PER_HOUR': 100000})
+class LoadTestHarnessTests(LiveServerTestCase):
+    """Seed a tiny synthetic dataset and replay the front-end scenario against a live server."""
+
+    def test_seed_replay_and_clear(self):
+        out = StringIO()
+        call_command('seed_synthetic_data', users=40, skills=80, stdout=out)
+        self.assertEqual(User.objects.filter(username__startswith='synthetic_').count(), 40)
+        self.assertEqual(CommunityPost.objects.count(), 80)
+
+        with tempfile.TemporaryDirectory() as output_dir, override_settings(MEDIA_ROOT=output_dir):
+            call_command(
+                'loadtest', base_url=self.live_server_url, concurrency=2, duration=2,
+                ramp_up=0, no_think=True, output_dir=output_dir, stdout=out
+            )
+            results = json.loads(next(Path(output_dir).glob('*_frontend_mix.json')).read_text())
+
+        self.assertGreater(results['total']['requests'], 0)
+        self.assertEqual(results['total']['errors'], 0, results['endpoints'])
+        self.assertIn('p99_ms', results['total'])
+
+        call_command('seed_synthetic_data', clear=True, stdout=out)
+        self.assertFalse(User.objects.filter(username__startswith='synthetic_').exists())
+        self.assertFalse(CommunityPost.objects.exists())
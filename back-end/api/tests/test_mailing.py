@@ -0,0 +1,114 @@
+import smtplib
+import threading
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend as LocMemEmailBackend
+from django.test import TestCase, override_settings
+from prometheus_client import REGISTRY
+
+from api.models import User
+from core import mailing
+
+
+class FlakyEmailBackend(LocMemEmailBackend):
+    """locmem backend whose third send drops the connection once."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+        self.opened = 0
+
+    def open(self):
+        self.opened += 1
+
+    def send_messages(self, messages):
+        self.calls += 1
+        if self.calls == 3:
+            raise ConnectionResetError('connection dropped')
+        return super().send_messages(messages)
+
+
+class RefusingEmailBackend(LocMemEmailBackend):
+    """locmem backend that refuses one address, as an SMTP server would."""
+
+    def __init__(self, *args, refused=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.refused = refused
+        self.opened = 0
+
+    def open(self):
+        self.opened += 1
+
+    def send_messages(self, messages):
+        if self.refused in messages[0].to:
+            raise smtplib.SMTPRecipientsRefused({self.refused: (550, b'No such user')})
+        return super().send_messages(messages)
+
+
+@override_settings(BULK_EMAIL_SETTINGS={'CHUNK_SIZE': 2, 'WORKERS': 2, 'RETRIES': 2, 'RETRY_DELAY': 0})
+class BulkEmailTests(TestCase):
+    """Digests are streamed in chunks and sent over one reused connection."""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create(username=f'reader{index}', email=f'reader{index}@example.com') for index in range(5)
+        ]
+
+    @staticmethod
+    def build(user):
+        if user.username == 'reader1':
+            return None  # Nothing to send
+        if user.username == 'reader2':
+            raise ValueError('template error')
+        return EmailMessage('Digest', f'Hello {user.username}', 'noreply@localhost', [user.email])
+
+    def test_streams_chunks_and_counts_results(self):
+        with self.assertNumQueries(4):  # Three chunks and the empty read ending the stream
+            result = mailing.send_bulk('test_digest', User.objects.all(), self.build)
+
+        self.assertEqual(
+            {key: result[key] for key in ('sent', 'failed', 'skipped', 'chunks')},
+            {'sent': 3, 'failed': 1, 'skipped': 1, 'chunks': 3},
+        )
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [
+            'reader0@example.com', 'reader3@example.com', 'reader4@example.com',
+        ])
+        self.assertEqual(REGISTRY.get_sample_value(
+            'bulk_emails_total', {'campaign': 'test_digest', 'result': 'sent'}
+        ), 3)
+
+    def test_send_failure_resumes_the_chunk_without_duplicates(self):
+        connection = FlakyEmailBackend()
+        result = mailing.send_bulk('test_retry', User.objects.all(), self.build, connection=connection)
+
+        self.assertEqual((result['sent'], result['failed']), (3, 1))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(len({message.to[0] for message in mail.outbox}), 3)
+        # Opened for each chunk with messages, plus once to reconnect
+        self.assertEqual(connection.opened, 4)
+
+    @override_settings(BULK_EMAIL_SETTINGS={'CHUNK_SIZE': 5, 'WORKERS': 1, 'RETRIES': 2, 'RETRY_DELAY': 1})
+    def test_refused_recipient_fails_alone(self):
+        connection = RefusingEmailBackend(refused='reader0@example.com')
+        with mock.patch.object(mailing.time, 'sleep') as sleep, self.assertLogs('core.mailing', level='WARNING'):
+            result = mailing.send_bulk('test_refused', User.objects.all(), self.build, connection=connection)
+
+        # The rest of the chunk still goes out over the same connection
+        self.assertEqual((result['sent'], result['failed']), (2, 2))
+        self.assertEqual([message.to[0] for message in mail.outbox], ['reader3@example.com', 'reader4@example.com'])
+        self.assertEqual(connection.opened, 1)
+        sleep.assert_not_called()
+
+    def test_renders_in_worker_threads_outside_transactions(self):
+        threads = set()
+
+        def build(user):
+            threads.add(threading.get_ident())
+            return EmailMessage('Digest', 'Hello', 'noreply@localhost', [user.email])
+
+        with mock.patch.object(mailing.db_connection, 'in_atomic_block', False):
+            result = mailing.send_bulk('test_threads', User.objects.all(), build)
+        self.assertEqual(result['sent'], 5)
+        self.assertNotIn(threading.get_ident(), threads)
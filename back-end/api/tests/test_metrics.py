@@ -0,0 +1,71 @@
+from celery import Celery
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+from core.reference import local_cache
+
+
+class MetricsTests(TestCase):
+    """Request, cache and Celery metrics are recorded and exposed at /metrics."""
+
+    def setUp(self):
+        cache.clear()
+        local_cache().clear()  # /api/skills/ must reach the database
+
+    @staticmethod
+    def sample(name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_request_metrics_by_route(self):
+        labels = {'method': 'GET', 'route': 'skill-list'}
+        before = self.sample('http_request_duration_seconds_count', **labels)
+        queries_before = self.sample('http_request_db_queries_sum', **labels)
+
+        APIClient().get('/api/skills/')
+
+        self.assertEqual(self.sample('http_request_duration_seconds_count', **labels), before + 1)
+        self.assertGreater(self.sample('http_request_db_queries_sum', **labels), queries_before)
+        self.assertGreaterEqual(self.sample('http_requests_total', status='200', **labels), 1)
+
+        with self.settings(METRICS_SETTINGS={'AUTH_TOKEN': 'scrape-token'}):
+            body = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-token').content.decode()
+        self.assertIn('http_request_duration_seconds_bucket{le="0.005",method="GET",route="skill-list"}', body)
+        self.assertIn('# TYPE celery_queue_length gauge', body)
+
+    def test_cache_hit_ratio_by_key_space(self):
+        hits = self.sample('cache_requests_total', cache='analytics', result='hit')
+        misses = self.sample('cache_requests_total', cache='analytics', result='miss')
+
+        self.assertIsNone(cache.get('platform_stats'))
+        cache.set('platform_stats', {'total_users': 1})
+        self.assertEqual(cache.get('platform_stats'), {'total_users': 1})
+        cache.get('unrelated_key')
+
+        self.assertEqual(self.sample('cache_requests_total', cache='analytics', result='hit'), hits + 1)
+        self.assertEqual(self.sample('cache_requests_total', cache='analytics', result='miss'), misses + 1)
+
+    def test_celery_task_runtime(self):
+        app = Celery('metrics-test')
+
+        @app.task(name='metrics_test.noop')
+        def noop():
+            return None
+
+        labels = {'task': 'metrics_test.noop', 'state': 'SUCCESS'}
+        before = self.sample('celery_task_duration_seconds_count', **labels)
+        noop.apply()
+        self.assertEqual(self.sample('celery_task_duration_seconds_count', **labels), before + 1)
+
+    @override_settings(METRICS_SETTINGS={'AUTH_TOKEN': 'scrape-token'})
+    def test_scrape_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_SETTINGS={'AUTH_TOKEN': ''})
+    def test_no_token_is_only_open_in_debug(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        with self.settings(DEBUG=True):
+            self.assertEqual(self.client.get('/metrics').status_code, 200)
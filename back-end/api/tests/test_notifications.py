@@ -0,0 +1,159 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import Notification, User
+from core import push
+from core.coalescing import Coalescer, MemoryCoalescingBackend
+from services import NotificationService
+from tasks import notification_tasks
+
+
+class UnreadCountTests(TestCase):
+    """User.unread_notifications follows every write that changes the unread rows."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', password='pass')
+        self.other = User.objects.create_user(username='other', password='pass')
+
+    def unread(self, user=None):
+        return User.objects.get(pk=(user or self.user).pk).unread_notifications
+
+    def notify(self, user=None, **fields):
+        return NotificationService.create_notification(
+            user=user or self.user, notification_type='system', title='Hello', message='-', **fields
+        )
+
+    def test_create_increments(self):
+        self.notify()
+        NotificationService.notify_users([self.user.pk, self.other.pk, self.user.pk], 'system', 'Hi', '-')
+        self.assertEqual(self.unread(), 2)
+        self.assertEqual(self.unread(self.other), 1)
+
+    def test_repeated_mark_read_decrements_once(self):
+        notification = self.notify()
+        self.notify()
+        NotificationService.mark_notification_read(notification.pk)
+        NotificationService.mark_notification_read(notification.pk)
+        self.assertEqual(self.unread(), 1)
+        with self.assertRaises(Notification.DoesNotExist):
+            NotificationService.mark_notification_read(0)
+
+    def test_mark_all_read_subtracts_the_rows_it_flipped(self):
+        for _ in range(2):
+            self.notify()
+        # A notification committed by another worker after the UPDATE is still counted
+        User.objects.filter(pk=self.user.pk).update(unread_notifications=3)
+        self.assertEqual(NotificationService.mark_all_read(self.user), 2)
+        self.assertEqual(self.unread(), 1)
+        self.assertEqual(NotificationService.mark_all_read(self.user.pk), 0)
+        self.assertEqual(self.unread(), 1)
+
+    def test_retention_adjusts_the_count(self):
+        old_unread, old_read, recent = self.notify(), self.notify(), self.notify()
+        NotificationService.mark_notification_read(old_read.pk)
+        Notification.objects.filter(pk__in=[old_unread.pk, old_read.pk]).update(
+            created_at=timezone.now() - timedelta(days=40)
+        )
+
+        notification_tasks.cleanup_old_notifications(days=30)
+        self.assertEqual(list(Notification.objects.values_list('pk', flat=True)), [recent.pk])
+        self.assertEqual(self.unread(), 1)
+
+    def test_reconcile_repairs_drift(self):
+        self.notify()
+        self.notify(user=self.other)
+        User.objects.filter(pk=self.user.pk).update(unread_notifications=7)
+        User.objects.filter(pk=self.other.pk).update(unread_notifications=0)
+
+        with override_settings(NOTIFICATION_SETTINGS={'BATCH_SIZE': 1}):
+            self.assertEqual(NotificationService.reconcile_unread_counts(), 2)
+        self.assertEqual((self.unread(), self.unread(self.other)), (1, 1))
+        notification_tasks.reconcile_unread_counts()
+        self.assertEqual(NotificationService.reconcile_unread_counts(), 0)
+
+    def test_count_of_a_loaded_user_needs_no_query(self):
+        self.notify()
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(NotificationService.get_notification_count(user), 1)
+        self.assertEqual(NotificationService.get_notification_count(self.user.pk), 1)
+
+    def test_count_is_private_to_its_user(self):
+        self.notify()
+        cache.clear()
+        client = APIClient()
+        profile = client.get(f'/api/users/{self.user.pk}/').data
+        self.assertNotIn('unread_notifications', profile)
+
+        client.force_authenticate(User.objects.get(pk=self.user.pk))  # As loaded per request
+        self.assertEqual(client.get('/api/users/me/').data['unread_notifications'], 1)
+        client.force_authenticate(None)
+        self.assertEqual(client.get('/api/users/me/').status_code, 401)
+
+
+@override_settings(PUSH_SETTINGS={'BACKEND': 'memory'})
+class NotificationPushTests(TestCase):
+    """New notifications and read receipts reach the user's streams once committed."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='listener', password='pass')
+
+    def test_events_are_published_on_commit(self):
+        with mock.patch.object(push.hub, 'dispatch') as dispatch:
+            with self.captureOnCommitCallbacks(execute=True):
+                notification = NotificationService.create_notification(
+                    user=self.user, notification_type='system', title='Hello', message='-'
+                )
+                dispatch.assert_not_called()
+            with self.captureOnCommitCallbacks(execute=True):
+                NotificationService.mark_notification_read(notification.pk)
+            with self.captureOnCommitCallbacks(execute=True):
+                NotificationService.mark_all_read(self.user)  # Nothing left to flip: no event
+
+        frames = [call.args for call in dispatch.call_args_list]
+        self.assertEqual([user_id for user_id, _ in frames], [self.user.pk, self.user.pk])
+        self.assertTrue(frames[0][1].startswith('event: notification\n'))
+        self.assertEqual(frames[1][1], push.format_event('read', {'id': notification.pk}))
+
+
+@override_settings(COALESCING_SETTINGS={'WINDOW': 60})
+class CoalescedNotificationTests(TestCase):
+    """Like and comment tasks buffer events; a flush writes one notification per target."""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', password='pass')
+        self.fans = [
+            User.objects.create_user(username=f'fan{index}', password='pass', first_name=f'Fan{index}')
+            for index in range(3)
+        ]
+        backend = MemoryCoalescingBackend(max_groups=100, sample_actors=2, max_tracked_actors=100)
+        patcher = mock.patch.object(Coalescer, '_backend', backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # The periodic task flushes in tests, not a background thread
+        patcher = mock.patch.object(Coalescer, 'start_memory_flusher')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_likes_coalesce_into_one_notification(self):
+        for fan in self.fans + self.fans[:1]:
+            notification_tasks.send_like_notifications(self.author.pk, fan.pk, 'post', 7)
+        notification_tasks.send_comment_notifications(self.author.pk, self.fans[1].pk, 'post', 7)
+        self.assertFalse(Notification.objects.exists())
+
+        notification_tasks.flush_coalesced_notifications()  # Window still open
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(NotificationService.flush_coalesced(force=True), 2)
+
+        titles = sorted(Notification.objects.values_list('title', flat=True))
+        self.assertEqual(titles, ['Fan0 and 2 others liked your post', 'Fan1 commented on your post'])
+        self.assertEqual(User.objects.get(pk=self.author.pk).unread_notifications, 2)
+
+    def test_unknown_type_is_rejected(self):
+        with self.assertRaises(ValueError):
+            NotificationService.notify_coalesced(self.author.pk, 'mention', self.fans[0].pk, 'post')
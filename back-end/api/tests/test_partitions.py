@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.models import Notification, User
+from core.partitions import add_months, month_start, purge_before, retention_boundary
+
+
+class PartitionTests(TestCase):
+    """Retention purges by month on PostgreSQL and in primary-key batches elsewhere."""
+
+    def test_month_arithmetic(self):
+        start = month_start(timezone.now().replace(year=2026, month=11, day=15))
+        self.assertEqual((start.month, start.day, start.hour), (11, 1, 0))
+        self.assertEqual((add_months(start, 2).year, add_months(start, 2).month), (2027, 1))
+        self.assertEqual((add_months(start, -11).year, add_months(start, -11).month), (2025, 12))
+
+    def test_purge_without_partitions_deletes_in_batches(self):
+        user = User.objects.create_user(username='reader', password='x')
+        now = timezone.now()
+        for age in (40, 40, 40, 1):
+            Notification.objects.create(
+                user=user, notification_type='system', title='t', message='m', created_at=now - timedelta(days=age)
+            )
+
+        cutoff = now - timedelta(days=30)
+        self.assertEqual(retention_boundary(Notification, cutoff), cutoff)
+        batches = []
+
+        def before_delete(rows):
+            batches.append(list(rows.values_list('pk', flat=True)))
+
+        with CaptureQueriesContext(connection) as context:
+            removed = purge_before(Notification, cutoff, batch_size=2, before_delete=before_delete)
+        self.assertEqual(removed, 3)
+        self.assertEqual(Notification.objects.count(), 1)
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        # Each batch commits on its own instead of holding every row lock until the end
+        statements = [query['sql'].split()[0] for query in context.captured_queries]
+        self.assertEqual(statements.count('DELETE'), 2)
+        self.assertEqual(statements.count('SAVEPOINT'), 3)
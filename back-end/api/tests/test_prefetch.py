@@ -0,0 +1,188 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from datetime import timedelta
+from rest_framework.test import APIClient
+
+from api.models import (
+    User, Skill, UserSkill, Course, CourseModule, UserCourseProgress,
+    Project, UserProjectProgress, JobOpportunity, JobApplication,
+    CommunityPost, Comment, Mentor, Achievement, UserAchievement
+)
+
+
+class QueryCountTestCase(TestCase):
+    """
+    Base class asserting that list endpoints run a constant number of queries:
+    the count must not change when the number of rows (and their relations) grows.
+    """
+
+    def setUp(self):
+        # Throttle counters live in the cache and would leak between tests
+        cache.clear()
+        self.viewer = User.objects.create_user(username='viewer', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+        self.skills = [
+            Skill.objects.create(name=f'Skill {i}', category='backend') for i in range(8)
+        ]
+        self.achievements = [
+            Achievement.objects.create(
+                title=f'Badge {i}', description='-', icon='a.png', unlock_condition='-'
+            ) for i in range(8)
+        ]
+        self.sequence = 0
+
+    def make_user(self):
+        """Create a user with more skills and achievements than the serializer shows"""
+        self.sequence += 1
+        user = User.objects.create_user(username=f'user{self.sequence}', password='pass')
+        for i, skill in enumerate(self.skills):
+            UserSkill.objects.create(user=user, skill=skill, proficiency_level=i * 10)
+        for achievement in self.achievements:
+            UserAchievement.objects.create(user=user, achievement=achievement)
+        return user
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content[:500])
+        return len(context), response
+
+    def assertConstantQueries(self, url, seed, small=2, large=6):
+        """
+        Seed `small` rows, count the queries for `url`, grow to `large` rows and
+        assert the count is unchanged.
+        """
+        for _ in range(small):
+            seed()
+        small_count, _ = self.count_queries(url)
+
+        for _ in range(large - small):
+            seed()
+        large_count, response = self.count_queries(url)
+
+        self.assertEqual(
+            small_count, large_count,
+            f"{url} ran {small_count} queries for {small} rows but {large_count} for {large}"
+        )
+        return response
+
+
+class UserEndpointQueryTests(QueryCountTestCase):
+
+    def test_user_list(self):
+        response = self.assertConstantQueries('/api/users/', self.make_user)
+        user = next(u for u in response.data['results'] if u['username'] != 'viewer')
+        # Top 5 by proficiency, not all 8
+        self.assertEqual(len(user['skills']), 5)
+        self.assertEqual(user['skills'][0]['proficiency_level'], 70)
+        self.assertEqual(len(user['achievements']), 5)
+
+    def test_leaderboard(self):
+        self.assertConstantQueries('/api/users/leaderboard/', self.make_user)
+
+    def test_user_skills(self):
+        user = self.make_user()
+        self.assertConstantQueries(
+            f'/api/users/{user.id}/skills/',
+            lambda: UserSkill.objects.create(
+                user=user, skill=Skill.objects.create(name=f'Extra {Skill.objects.count()}')
+            )
+        )
+
+
+class CourseEndpointQueryTests(QueryCountTestCase):
+
+    def make_course(self):
+        self.sequence += 1
+        course = Course.objects.create(
+            title=f'Course {self.sequence}', description='-', category='web',
+            difficulty_level='beginner', estimated_duration=5
+        )
+        for order in range(3):
+            CourseModule.objects.create(
+                course=course, title=f'Module {order}', content_type='text', order=order, duration=10
+            )
+        return course
+
+    def test_course_list(self):
+        self.assertConstantQueries('/api/courses/', self.make_course)
+
+    def test_course_progress_list(self):
+        self.assertConstantQueries(
+            '/api/course-progress/',
+            lambda: UserCourseProgress.objects.create(user=self.viewer, course=self.make_course())
+        )
+
+
+class JobEndpointQueryTests(QueryCountTestCase):
+
+    def make_job(self):
+        self.sequence += 1
+        job = JobOpportunity.objects.create(
+            company_name='Acme', job_title=f'Engineer {self.sequence}', description='-',
+            location='Remote', job_url='https://example.com',
+            expires_at=timezone.now() + timedelta(days=30)
+        )
+        job.required_skills.set(self.skills[:3])
+        return job
+
+    def test_job_list(self):
+        self.assertConstantQueries('/api/jobs/', self.make_job)
+
+    def test_job_applications(self):
+        self.assertConstantQueries(
+            '/api/job-applications/',
+            lambda: JobApplication.objects.create(user=self.viewer, job=self.make_job())
+        )
+
+
+class CommunityEndpointQueryTests(QueryCountTestCase):
+
+    def make_post(self):
+        return CommunityPost.objects.create(user=self.make_user(), title='Post', content='-')
+
+    def test_post_list(self):
+        self.assertConstantQueries('/api/community/posts/', self.make_post)
+
+    def test_trending(self):
+        self.assertConstantQueries('/api/community/posts/trending/', self.make_post)
+
+    def test_comments(self):
+        post = self.make_post()
+        self.assertConstantQueries(
+            f'/api/community/comments/?post={post.id}',
+            lambda: Comment.objects.create(user=self.make_user(), post=post, content='-')
+        )
+        self.assertConstantQueries(
+            f'/api/community/posts/{post.id}/comments/',
+            lambda: Comment.objects.create(user=self.make_user(), post=post, content='-')
+        )
+
+
+class MentorAndProjectEndpointQueryTests(QueryCountTestCase):
+
+    def make_mentor(self):
+        mentor = Mentor.objects.create(user=self.make_user(), bio='-', years_experience=3)
+        mentor.specializations.set(self.skills[:2])
+        return mentor
+
+    def test_mentor_list(self):
+        self.assertConstantQueries('/api/mentors/', self.make_mentor)
+
+    def test_project_leaderboard(self):
+        project = Project.objects.create(
+            title='Project', description='-', category='backend', difficulty_level='beginner'
+        )
+        self.assertConstantQueries(
+            f'/api/projects/{project.id}/leaderboard/',
+            lambda: UserProjectProgress.objects.create(
+                user=self.make_user(), project=project, status='in_progress'
+            )
+        )
+
+    def test_user_achievements(self):
+        self.assertConstantQueries('/api/user-achievements/', self.make_user)
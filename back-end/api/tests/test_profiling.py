@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.models import User
+from core.profiling import ProfileStore
+
+
+class ProfilingMiddlewareTests(TestCase):
+    """Staff can profile a request on demand; everyone else pays nothing."""
+
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create_user(username='staff', password='pass', is_staff=True)
+        self.member = User.objects.create_user(username='member', password='pass')
+
+    def get(self, user, url, **headers):
+        # The middleware sees request.user, so authenticate with a real JWT
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        return client.get(url, **headers)
+
+    def test_staff_header_records_profile(self):
+        response = self.get(self.staff, '/api/users/', HTTP_X_PROFILE='1')
+        profile_id = response['X-Profile-Id']
+
+        profile = self.get(self.staff, f'/api/profiles/{profile_id}/').json()
+        self.assertEqual(profile['path'], '/api/users/')
+        self.assertEqual(profile['trigger'], 'header')
+        self.assertEqual(profile['mode'], 'sample')
+        self.assertGreater(profile['query_count'], 0)
+        self.assertTrue(all('sql' in query for query in profile['queries']))
+
+        listed = self.get(self.staff, '/api/profiles/').json()
+        self.assertEqual([summary['id'] for summary in listed], [profile_id])
+
+        collapsed = self.get(self.staff, f'/api/profiles/{profile_id}/collapsed/')
+        self.assertEqual(collapsed['Content-Type'], 'text/plain; charset=utf-8')
+        for line in collapsed.content.decode().splitlines():
+            stack, count = line.rsplit(' ', 1)
+            self.assertTrue(stack and int(count) > 0)
+
+    def test_cprofile_mode_reports_top_functions(self):
+        response = self.get(self.staff, '/api/users/', HTTP_X_PROFILE='cprofile')
+        profile = ProfileStore.get(response['X-Profile-Id'])
+        self.assertEqual(profile['mode'], 'cprofile')
+        self.assertTrue(profile['top_functions'])
+
+    def test_header_ignored_for_non_staff(self):
+        response = self.get(self.member, '/api/users/', HTTP_X_PROFILE='1')
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(ProfileStore.list(), [])
+        self.assertEqual(self.get(self.member, '/api/profiles/').status_code, 403)
+
+    @override_settings(PROFILING_SETTINGS={'SAMPLE_RATE': 1})
+    def test_sampling(self):
+        response = APIClient().get('/api/skills/')
+        self.assertEqual(ProfileStore.get(response['X-Profile-Id'])['trigger'], 'sampled')
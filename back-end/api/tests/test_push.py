@@ -0,0 +1,94 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.models import User
+from core import push
+from core.push import PushApplication, format_event
+
+
+class PushStreamTests(TestCase):
+    """The ASGI event stream authenticates, sends the unread count, then published events."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='listener', password='x', unread_notifications=3)
+        self.app = PushApplication(self.fail_if_called)
+
+    async def fail_if_called(self, scope, receive, send):
+        raise AssertionError('Stream requests must not reach Django')
+
+    def run_stream(self, query_string, while_open=None):
+        """Open the stream, run while_open() once it is live, then disconnect; returns the sent messages."""
+        sent = []
+        disconnect = asyncio.Event()
+
+        async def receive():
+            await disconnect.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+
+        async def client():
+            task = asyncio.ensure_future(self.app(
+                {'type': 'http', 'path': '/api/notifications/stream/', 'query_string': query_string, 'headers': []},
+                receive, send,
+            ))
+            while len(sent) < 2 and not task.done():
+                await asyncio.sleep(0.01)
+            if while_open:
+                while_open()
+                await asyncio.sleep(0.05)
+            disconnect.set()
+            await asyncio.wait_for(task, 5)
+
+        # async_to_sync runs the stream's database reads on this thread, inside the test transaction
+        async_to_sync(client)()
+        return sent
+
+    def test_rejects_missing_or_invalid_token(self):
+        for query_string in (b'', b'token=not-a-jwt'):
+            sent = self.run_stream(query_string)
+            self.assertEqual(sent[0]['status'], 401)
+
+    def test_streams_unread_count_then_published_events(self):
+        token = str(AccessToken.for_user(self.user))
+        with override_settings(PUSH_SETTINGS={'BACKEND': 'memory'}):
+            sent = self.run_stream(
+                f'token={token}'.encode(),
+                while_open=lambda: push._send([(self.user.pk, format_event('read', {'id': 7}))]),
+            )
+
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), sent[0]['headers'])
+        self.assertIn(b'event: unread\ndata: {"count": 3}', sent[1]['body'])
+        self.assertEqual(sent[2]['body'], b'event: read\ndata: {"id": 7}\n\n')
+        self.assertFalse(push.hub._subscriptions)
+
+    def test_publish_waits_for_commit_and_batches_on_redis(self):
+        client = mock.MagicMock()
+        with override_settings(PUSH_SETTINGS={'BACKEND': 'redis'}), \
+                mock.patch.object(push, 'get_redis_client', return_value=client):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                push.publish_many([(1, 'notification', {'id': 1}), (2, 'notification', {'id': 2})])
+                client.pipeline.assert_not_called()
+
+        self.assertEqual(len(callbacks), 1)
+        pipeline = client.pipeline.return_value
+        self.assertEqual(
+            [call.args[0] for call in pipeline.publish.call_args_list], ['push:user:1', 'push:user:2']
+        )
+        pipeline.execute.assert_called_once()
+
+    def test_slow_client_keeps_only_newest_events(self):
+        async def fill():
+            subscription = push.Subscription('1', asyncio.get_running_loop(), 2)
+            for frame in ('a', 'b', 'c'):
+                subscription.put(frame)
+            await asyncio.sleep(0)
+            return [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+
+        self.assertEqual(asyncio.run(fill()), ['b', 'c'])
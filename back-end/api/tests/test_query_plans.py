@@ -0,0 +1,35 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import JobOpportunity, User
+
+
+class QueryPlanTests(TestCase):
+    """Hot queries are planned through an index; table scans are reported."""
+
+    def test_hot_queries_use_indexes(self):
+        out = StringIO()
+        call_command('explain_hot_queries', '--fail', stdout=out)
+        self.assertIn('Every hot query uses an index', out.getvalue())
+
+    def test_seq_scan_reported(self):
+        from core.plans import seq_scans
+
+        self.assertEqual(seq_scans(User.objects.filter(bio='x').order_by()), ['api_user'])
+        self.assertEqual(seq_scans(User.objects.filter(pk=1)), [])
+
+    def test_job_listing_filters_at_request_time(self):
+        job = JobOpportunity.objects.create(
+            company_name='Acme', job_title='Engineer', description='Build', location='Remote',
+            job_url='https://example.com/job', expires_at=timezone.now() + timedelta(seconds=1)
+        )
+        self.assertEqual(APIClient().get(reverse('job-list')).data['results'][0]['id'], job.id)
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(days=1)):
+            self.assertEqual(APIClient().get(reverse('job-list')).data['results'], [])
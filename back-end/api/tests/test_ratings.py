@@ -0,0 +1,74 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.models import Course, CourseRating, Mentor, User
+from core.search import SearchService
+
+backfill = import_module('api.migrations.0012_rating_votes_and_backfill').backfill_rating_aggregates
+
+
+class RatingTests(TestCase):
+    """Votes are kept per user and ranked against the prior (mean 3.0, weight 5)."""
+
+    def setUp(self):
+        cache.clear()
+        self.voters = [User.objects.create_user(username=f'voter{index}', password='pass') for index in range(2)]
+        self.course = Course.objects.create(
+            title='Course', description='-', category='web', difficulty_level='beginner', estimated_duration=1
+        )
+
+    def rate(self, user, score, course=None):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.post(f'/api/courses/{(course or self.course).pk}/rate/', {'rating': score})
+
+    def test_rating_again_replaces_the_vote(self):
+        self.assertEqual(self.rate(self.voters[0], 5).data['status'], 'rated')
+        response = self.rate(self.voters[0], 1)
+        self.assertEqual(response.data, {'status': 'updated', 'rating': 1.0, 'total_ratings': 1})
+        self.rate(self.voters[1], 4)
+
+        self.course.refresh_from_db()
+        self.assertEqual((self.course.rating_sum, self.course.total_ratings, self.course.rating), (5, 2, 2.5))
+        self.assertAlmostEqual(self.course.ranking_score, 20 / 7)
+        self.assertEqual(CourseRating.objects.get(user=self.voters[0]).score, 1)
+        self.assertEqual(self.rate(self.voters[0], 9).status_code, 400)
+
+    def test_unrated_objects_rank_at_the_prior_mean(self):
+        unrated = Course.objects.create(
+            title='Unrated', description='-', category='web', difficulty_level='beginner', estimated_duration=1
+        )
+        self.assertEqual(unrated.ranking_score, 3.0)
+        self.rate(self.voters[0], 1)
+        self.assertEqual(list(Course.objects.order_by('-ranking_score')), [unrated, self.course])
+
+    def test_backfill_seeds_legacy_ratings(self):
+        mentor = Mentor.objects.create(
+            user=self.voters[0], bio='-', years_experience=3, rating=4.0, ranking_score=0
+        )
+        Course.objects.filter(pk=self.course.pk).update(ranking_score=0)
+        backfill(apps, None)
+
+        mentor.refresh_from_db()
+        self.assertEqual((mentor.rating_sum, mentor.total_ratings), (4.0, 1))
+        self.assertAlmostEqual(mentor.ranking_score, 19 / 6)
+        self.assertEqual(Course.objects.get(pk=self.course.pk).ranking_score, 3.0)
+
+        # The first real vote adds to the legacy rating instead of replacing it
+        client = APIClient()
+        client.force_authenticate(self.voters[1])
+        response = client.post(f'/api/mentors/{mentor.pk}/rate/', {'rating': 2})
+        self.assertEqual((response.data['rating'], response.data['total_ratings']), (3.0, 2))
+
+    def test_courses_created_after_migrating_are_searchable(self):
+        # 0012 must not rebuild api_course, which would drop its search triggers
+        course = Course.objects.create(
+            title='Kubernetes in production', description='-', category='devops',
+            difficulty_level='advanced', estimated_duration=1
+        )
+        self.assertEqual(list(SearchService.search(Course.objects.all(), 'kubernetes')), [course])
+        self.assertEqual(list(SearchService.filter_field(Course.objects.all(), 'category', 'devops')), [course])
@@ -0,0 +1,76 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.models import Skill
+from core import reference
+from core.reference import LocalCache, ReferenceDataService, local_cache
+
+
+class ReferenceCacheTests(TestCase):
+    """Reference data is served from the process-local tier and invalidated everywhere on change."""
+
+    def setUp(self):
+        cache.clear()
+        local_cache().clear()
+        Skill.objects.create(name='Python', category='backend')
+
+    def test_local_lru_evicts_and_expires(self):
+        local = LocalCache(max_entries=2, ttl=60)
+        local.set('a', 1)
+        local.set('b', 2)
+        local.get('a')
+        local.set('c', 3)
+        self.assertIsNone(local.get('b'))  # Least recently used
+        self.assertEqual(local.get('a'), 1)
+        local.set('d', 4, ttl=0)
+        self.assertIsNone(local.get('d'))
+
+    def test_reads_skip_the_shared_cache_and_database(self):
+        self.assertEqual([skill['name'] for skill in ReferenceDataService.skills()], ['Python'])
+        cache.clear()  # Only the local tier is left
+        with self.assertNumQueries(0):
+            self.assertEqual(len(ReferenceDataService.skills()), 1)
+
+        Skill.objects.create(name='Rust', category='backend')
+        self.assertEqual([skill['name'] for skill in ReferenceDataService.skills()], ['Python', 'Rust'])
+
+    def test_skill_list_endpoint(self):
+        client = APIClient()
+        self.assertEqual(client.get('/api/skills/').data['count'], 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(client.get('/api/skills/').data['count'], 1)
+        # Filtered requests bypass the cache
+        self.assertEqual(client.get('/api/skills/', {'category': 'frontend'}).data['count'], 0)
+
+        Skill.objects.filter(name='Python').delete()
+        self.assertEqual(client.get('/api/skills/').data['count'], 0)
+
+        categories = client.get('/api/skills/categories/').data
+        self.assertIn('python', categories['Backend'])
+
+    def test_invalidation_is_broadcast(self):
+        client = mock.Mock()
+        with override_settings(REFERENCE_CACHE_SETTINGS={'BACKEND': 'redis'}), \
+                mock.patch('core.reference.get_redis_client', return_value=client):
+            reference.invalidate(ReferenceDataService.SKILLS)
+        client.publish.assert_called_once_with('cache:invalidate', json.dumps([ReferenceDataService.SKILLS]))
+
+        # Another process receiving the message drops its local copy
+        local_cache().set(ReferenceDataService.SKILLS, ['stale'])
+        pubsub = mock.Mock()
+        pubsub.listen.return_value = [{'data': json.dumps([ReferenceDataService.SKILLS])}]
+        local_cache().set('other', 1)
+        reference.consume(pubsub)
+        self.assertIsNone(local_cache().get(ReferenceDataService.SKILLS))
+
+    def test_invalidation_during_read_is_not_cached_locally(self):
+        def compute():
+            reference.invalidate(ReferenceDataService.SKILLS)  # Arrives mid-read
+            return ['old']
+
+        self.assertEqual(reference.get_or_set(ReferenceDataService.SKILLS, compute), ['old'])
+        self.assertIsNone(local_cache().get(ReferenceDataService.SKILLS))
@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from api.models import Skill
+from core import routing
+from core.routing import pinning_scope, replica_reads, use_replica
+from middleware.database_middleware import ReplicaPinningMiddleware
+
+
+@override_settings(REPLICA_SETTINGS={
+    'ALIAS': 'replica', 'SERVICES': ['api.tests.test_routing'], 'TASKS': ['tasks.analytics_tasks.'], 'PIN_SECONDS': 5,
+})
+class ReplicaRoutingTests(TestCase):
+    """Replica-scoped reads leave the primary until the request or task writes."""
+
+    def outside_transaction(self):
+        # Tests run inside a transaction, which always reads from the primary
+        return mock.patch.object(connections['default'], 'in_atomic_block', False)
+
+    def test_reads_use_replica_only_in_scope(self):
+        with self.outside_transaction():
+            self.assertEqual(Skill.objects.all().db, 'default')
+            with use_replica():
+                self.assertEqual(Skill.objects.all().db, 'replica')
+        with use_replica():
+            self.assertEqual(Skill.objects.all().db, 'default')
+        with override_settings(REPLICA_SETTINGS={'ALIAS': None}), self.outside_transaction(), use_replica():
+            self.assertEqual(Skill.objects.all().db, 'default')
+
+    def test_write_pins_scope_to_primary(self):
+        with pinning_scope(), use_replica():
+            Skill.objects.create(name='Python', category='backend')
+            with self.outside_transaction():
+                self.assertEqual(Skill.objects.all().db, 'default')
+        with pinning_scope(), use_replica(), self.outside_transaction():
+            self.assertEqual(Skill.objects.all().db, 'replica')
+
+    def test_service_modules_are_configurable(self):
+        @replica_reads
+        class ReportService:
+            @staticmethod
+            def database():
+                return Skill.objects.all().db
+
+        with self.outside_transaction():
+            self.assertEqual(ReportService.database(), 'replica')
+            with override_settings(REPLICA_SETTINGS={'ALIAS': 'replica', 'SERVICES': []}):
+                self.assertEqual(ReportService.database(), 'default')
+
+    def test_middleware_pins_after_unsafe_requests(self):
+        databases = []
+
+        def view(request):
+            with use_replica():
+                databases.append(Skill.objects.all().db)
+            return HttpResponse()
+
+        middleware = ReplicaPinningMiddleware(view)
+        factory = RequestFactory()
+        with self.outside_transaction():
+            self.assertNotIn('db_pinned', middleware(factory.get('/')).cookies)
+            response = middleware(factory.post('/'))
+            self.assertEqual(response.cookies['db_pinned']['max-age'], 5)
+            pinned = factory.get('/')
+            pinned.COOKIES['db_pinned'] = '1'
+            middleware(pinned)
+        self.assertEqual(databases, ['replica', 'default', 'default'])
+
+    async def test_async_middleware_keeps_scope_for_the_awaited_view(self):
+        databases = []
+
+        async def view(request):
+            with use_replica():
+                databases.append(Skill.objects.all().db)
+            return HttpResponse()
+
+        middleware = ReplicaPinningMiddleware(view)
+        factory = RequestFactory()
+        with self.outside_transaction():
+            self.assertNotIn('db_pinned', (await middleware(factory.get('/'))).cookies)
+            response = await middleware(factory.post('/'))
+            self.assertEqual(response.cookies['db_pinned']['max-age'], 5)
+        self.assertEqual(databases, ['replica', 'default'])
+
+    def test_analytics_tasks_read_from_replica(self):
+        task = SimpleNamespace(name='tasks.analytics_tasks.cache_platform_analytics')
+        with self.outside_transaction():
+            routing._task_prerun(task_id='t1', task=task)
+            self.assertEqual(Skill.objects.all().db, 'replica')
+            routing._task_postrun(task_id='t1', task=task)
+            self.assertEqual(Skill.objects.all().db, 'default')
+
+            routing._task_prerun(task_id='t2', task=SimpleNamespace(name='tasks.email_tasks.send'))
+            self.assertEqual(Skill.objects.all().db, 'default')
+            routing._task_postrun(task_id='t2')
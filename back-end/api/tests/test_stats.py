@@ -0,0 +1,61 @@
+import threading
+from unittest import mock
+
+from django.db.models import Avg, Q
+from django.test import TestCase
+
+from api.models import JobApplication, JobOpportunity, User
+from core.stats import StatsEngine, count
+
+
+class StatsEngineTests(TestCase):
+    """Dashboard counters take one aggregate query per table."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='stats', password='pass', is_mentor=True, points=10)
+        other = User.objects.create_user(username='other', password='pass', is_premium=True, points=30)
+        job = JobOpportunity.objects.create(
+            company_name='Acme', job_title='Dev', description='-', location='Remote',
+            job_type='full-time', job_url='https://example.com/jobs/1'
+        )
+        for user, status in ((self.user, 'applied'), (other, 'interview')):
+            JobApplication.objects.create(user=user, job=job, status=status)
+
+    def test_all_counters_in_one_query(self):
+        with self.assertNumQueries(1):
+            counters = StatsEngine.aggregate(
+                User.objects.all(),
+                total=count(),
+                mentors=count(Q(is_mentor=True)),
+                premium=count(Q(is_premium=True)),
+                average_points=Avg('points'),
+            )
+        self.assertEqual(counters, {'total': 2, 'mentors': 1, 'premium': 1, 'average_points': 20})
+
+    def test_tables_run_serially_inside_a_transaction(self):
+        # TestCase wraps each test in a transaction, so the passes share its connection
+        with self.assertNumQueries(2):
+            tables = StatsEngine.tables(
+                users=(User.objects.all(), {'total': count()}),
+                applications=(JobApplication.objects.all(), {
+                    'applied': count(Q(status='applied')),
+                    'interview': count(Q(status='interview')),
+                }),
+            )
+        self.assertEqual(tables, {'users': {'total': 2}, 'applications': {'applied': 1, 'interview': 1}})
+
+    def test_passes_run_on_worker_threads(self):
+        threads = {}
+
+        def record(name):
+            threads[name] = threading.get_ident()
+            return name
+
+        # Outside a transaction each pass gets a worker thread (and its own connection)
+        with mock.patch('core.stats.connection') as caller_connection, \
+                mock.patch('core.stats.connections') as worker_connections:
+            caller_connection.in_atomic_block = False
+            results = StatsEngine.run({'a': lambda: record('a'), 'b': lambda: record('b')})
+        self.assertEqual(results, {'a': 'a', 'b': 'b'})
+        self.assertNotIn(threading.get_ident(), threads.values())
+        self.assertEqual(worker_connections.close_all.call_count, 2)
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import CommunityPost, DailyMetric, User
+from core.timeseries import TimeSeriesService
+
+
+class TimeSeriesTests(TestCase):
+    """Analytics series come from one GROUP BY per series and a daily rollup."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='author', password='pass')
+        self.today = timezone.localdate()
+        for days_ago, posts in ((0, 2), (1, 1), (3, 4), (40, 1)):
+            created = timezone.now() - timedelta(days=days_ago)
+            for i in range(posts):
+                post = CommunityPost.objects.create(user=self.user, title=f'{days_ago}-{i}', content='-')
+                CommunityPost.objects.filter(pk=post.pk).update(created_at=created)
+
+    def expected_days(self, days):
+        return [(self.today - timedelta(days=n)).isoformat() for n in reversed(range(days))]
+
+    def test_raw_series_is_one_query(self):
+        with self.assertNumQueries(1):
+            heatmap = TimeSeriesService.series('posts', periods=30, use_rollup=False)
+        self.assertEqual(list(heatmap), self.expected_days(30))
+        self.assertEqual(heatmap[self.today.isoformat()], 2)
+        self.assertEqual(heatmap[(self.today - timedelta(days=2)).isoformat()], 0)
+        self.assertEqual(heatmap[(self.today - timedelta(days=3)).isoformat()], 4)
+        self.assertEqual(sum(heatmap.values()), 7)
+
+    def test_rollup_serves_closed_days(self):
+        first = TimeSeriesService.series('posts', periods=30)
+        self.assertEqual(DailyMetric.objects.filter(metric='posts').count(), 29)
+
+        # Closed days come from the rollup; only today is counted from raw rows
+        with self.assertNumQueries(2):
+            second = TimeSeriesService.series('posts', periods=30)
+        self.assertEqual(first, second)
+        self.assertEqual(first, TimeSeriesService.series('posts', periods=30, use_rollup=False))
+
+    def test_monthly_series(self):
+        raw = TimeSeriesService.series('posts', periods=3, granularity='month', use_rollup=False)
+        self.assertEqual(list(raw)[-1], self.today.strftime('%Y-%m'))
+        self.assertEqual(len(raw), 3)
+        self.assertEqual(sum(raw.values()), 8)
+        self.assertEqual(raw, TimeSeriesService.series('posts', periods=3, granularity='month'))
+
+    def test_unknown_series(self):
+        with self.assertRaises(ValueError):
+            TimeSeriesService.series('nope')
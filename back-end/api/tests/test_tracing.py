@@ -0,0 +1,94 @@
+from celery import Celery, signals
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from rest_framework.test import APIClient
+
+from core import tracing
+from core.reference import local_cache
+
+
+class TracingTests(TestCase):
+    """Requests, middleware, SQL, services and Celery tasks are traced as one trace."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.exporter = InMemorySpanExporter()
+        tracing.configure_tracing(span_processor=SimpleSpanProcessor(cls.exporter))
+
+    @classmethod
+    def tearDownClass(cls):
+        tracing.disable_tracing()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        local_cache().clear()  # /api/skills/ must reach the database
+        self.exporter.clear()
+
+    def spans(self, name_prefix=''):
+        return [span for span in self.exporter.get_finished_spans() if span.name.startswith(name_prefix)]
+
+    def test_request_middleware_and_query_spans(self):
+        response = APIClient().get('/api/skills/')
+
+        server, = self.spans('GET skill-list')
+        self.assertEqual(server.attributes['http.status_code'], 200)
+        trace_id = server.context.trace_id
+        self.assertEqual(response['X-Trace-Id'], format(trace_id, '032x'))
+
+        middleware = self.spans('middleware ')
+        self.assertIn('middleware RateLimitMiddleware', [span.name for span in middleware])
+        queries = self.spans('db SELECT')
+        self.assertTrue(queries)
+        for span in middleware + queries:
+            self.assertEqual(span.context.trace_id, trace_id)
+        self.assertIn('api_skill', ' '.join(span.attributes['db.statement'] for span in queries))
+
+    async def test_async_request_keeps_spans_open(self):
+        response = await AsyncClient().get('/api/skills/')
+
+        server, = self.spans('GET skill-list')
+        self.assertEqual(server.attributes['http.status_code'], 200)
+        self.assertEqual(response['X-Trace-Id'], format(server.context.trace_id, '032x'))
+        middleware, = [span for span in self.spans('middleware ') if span.name.endswith('RateLimitMiddleware')]
+        # The span ends after the awaited response, with the queries nested under the request
+        self.assertGreater(middleware.end_time - middleware.start_time, 0)
+        self.assertEqual(middleware.context.trace_id, server.context.trace_id)
+        self.assertTrue(self.spans('db SELECT'))
+
+    def test_incoming_traceparent_is_continued(self):
+        trace_id = '4bf92f3577b34da6a3ce929d0e0e4736'
+        response = APIClient().get('/api/skills/', HTTP_TRACEPARENT=f'00-{trace_id}-00f067aa0ba902b7-01')
+        self.assertEqual(response['X-Trace-Id'], trace_id)
+
+    def test_service_methods(self):
+        @tracing.trace_service
+        class ExampleService:
+            @staticmethod
+            def compute(value):
+                return value * 2
+
+        self.assertEqual(ExampleService.compute(2), 4)
+        self.assertEqual([span.name for span in self.spans('ExampleService')], ['ExampleService.compute'])
+
+    def test_context_propagates_into_tasks(self):
+        app = Celery('tracing-test')
+
+        @app.task(name='tracing_test.analyze')
+        def analyze():
+            return None
+
+        headers = {}
+        with tracing.get_tracer().start_as_current_span('request') as request_span:
+            signals.before_task_publish.send(sender=analyze.name, headers=headers, body=None)
+        self.assertIn('traceparent', headers)
+
+        analyze.apply(headers=headers)
+
+        task_span, = self.spans('celery.task tracing_test.analyze')
+        publish_span, = self.spans('celery.publish')
+        self.assertEqual(task_span.context.trace_id, request_span.get_span_context().trace_id)
+        self.assertEqual(task_span.parent.span_id, publish_span.context.span_id)
@@ -39,6 +39,9 @@ router.register(r'mentors', views.MentorViewSet, basename='mentor')
 router.register(r'achievements', views.AchievementViewSet, basename='achievement')
 router.register(r'user-achievements', views.UserAchievementViewSet, basename='user-achievement')
 
+# Diagnostics
+router.register(r'profiles', views.ProfileViewSet, basename='profile')
+
 urlpatterns = [
     path('', include(router.urls)),
 ]
@@ -1,21 +1,24 @@
+import logging
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 from django_filters.rest_framework import DjangoFilterBackend
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 from django.db.models import Q, Avg
 from django.utils import timezone
 from datetime import timedelta
 
 from .models import (
-    User, Skill, UserSkill, Resume, Course, CourseModule, UserCourseProgress,
+    User, UserFollow, Skill, UserSkill, Resume, Course, CourseRating, CourseModule, UserCourseProgress,
     Project, UserProjectProgress, JobOpportunity, JobApplication,
-    CommunityPost, Comment, Mentor, Achievement, UserAchievement
+    CommunityPost, Comment, Mentor, MentorRating, Achievement, UserAchievement
 )
 from .serializers import (
-    UserSerializer, SkillSerializer, UserSkillSerializer, ResumeSerializer,
+    UserSerializer, CurrentUserSerializer, SkillSerializer, UserSkillSerializer, ResumeSerializer,
     CourseSerializer, CourseModuleSerializer, UserCourseProgressSerializer,
     ProjectSerializer, UserProjectProgressSerializer, JobOpportunitySerializer,
     JobApplicationSerializer, CommunityPostSerializer, CommentSerializer,
@@ -25,6 +28,16 @@ from .serializers import (
 from .permissions import IsOwner, IsMentor, IsAuthorOrReadOnly
 from .filters import JobOpportunityFilter, CourseFilter, MentorFilter
 from .ml_utils import analyze_resume
+from core.counters import CounterService
+from core.feed import FeedService
+from core.mixins import RatingMixin, ReferenceListMixin
+from core.pagination import KeysetPagination
+from core.prefetch import PrefetchPlannerMixin, optimize_queryset
+from core.profiling import ProfileStore
+from core.reference import ReferenceDataService
+from core.search import FullTextSearchFilter
+
+logger = logging.getLogger(__name__)
 
 
 # ==================== PAGINATION ====================
@@ -34,8 +47,32 @@ class StandardPagination(PageNumberPagination):
     max_page_size = 100
 
 
+class CreatedAtKeysetPagination(KeysetPagination):
+    """Keyset pagination on the (created_at, id) index"""
+    ordering = ('-created_at', '-id')
+    page_size = 10
+
+
+class PostedDateKeysetPagination(KeysetPagination):
+    """Keyset pagination on the (posted_date, id) index"""
+    ordering = ('-posted_date', '-id')
+    page_size = 10
+
+
+class TrendingCursorPagination(CursorPagination):
+    """Cursor pagination over the (hot_score, id) index; each page costs O(page_size)."""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-hot_score', '-id')
+
+    def get_ordering(self, request, queryset, view):
+        # Ignore the viewset's ?ordering= so the cursor always follows the index
+        return self.ordering
+
+
 # ==================== USER MANAGEMENT ====================
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     """
     User management endpoints:
     - List all users
@@ -46,11 +83,11 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = StandardPagination
+    pagination_class = CreatedAtKeysetPagination
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['username', 'first_name', 'last_name', 'title', 'location']
     ordering_fields = ['points', 'created_at']
-    ordering = ['-points']
+    ordering = ['-created_at']
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -65,7 +102,7 @@ class UserViewSet(viewsets.ModelViewSet):
     def skills(self, request, pk=None):
         """Get user's skills"""
         user = self.get_object()
-        skills = user.skills.all()
+        skills = optimize_queryset(user.skills.all(), UserSkillSerializer)
         serializer = UserSkillSerializer(skills, many=True)
         return Response(serializer.data)
 
@@ -73,7 +110,7 @@ class UserViewSet(viewsets.ModelViewSet):
     def achievements(self, request, pk=None):
         """Get user's achievements"""
         user = self.get_object()
-        achievements = user.achievements.all()
+        achievements = optimize_queryset(user.achievements.all(), UserAchievementSerializer)
         serializer = UserAchievementSerializer(achievements, many=True)
         return Response(serializer.data)
 
@@ -85,7 +122,7 @@ class UserViewSet(viewsets.ModelViewSet):
             'total_points': user.points,
             'total_skills': user.skills.count(),
             'total_achievements': user.achievements.count(),
-            'courses_completed': user.course_progress.filter(status='completed').count(),
+            'courses_completed': user.course_progress.filter(completed_at__isnull=False).count(),
             'projects_completed': user.project_progress.filter(status='completed').count(),
             'job_applications': user.job_applications.count(),
             'community_posts': user.community_posts.count(),
@@ -93,26 +130,57 @@ class UserViewSet(viewsets.ModelViewSet):
         }
         return Response(stats)
 
+    @action(detail=False, methods=['get'])
+    def me(self, request):
+        """Get the current user's profile, including their unread notification count"""
+        serializer = CurrentUserSerializer(request.user, context=self.get_serializer_context())
+        return Response(serializer.data)
+
     @action(detail=False, methods=['get'])
     def leaderboard(self, request):
         """Get top users by points"""
-        top_users = User.objects.order_by('-points')[:100]
+        top_users = self.optimize_queryset(User.objects.order_by('-points'))[:100]
         serializer = self.get_serializer(top_users, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['post'])
+    def follow(self, request, pk=None):
+        """Follow a user's community posts"""
+        user = self.get_object()
+        if user == request.user:
+            return Response(
+                {'error': 'You cannot follow yourself'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        _, created = UserFollow.objects.get_or_create(follower=request.user, following=user)
+        return Response({'following': True, 'created': created})
+
+    @action(detail=True, methods=['post'])
+    def unfollow(self, request, pk=None):
+        """Stop following a user"""
+        user = self.get_object()
+        deleted, _ = UserFollow.objects.filter(follower=request.user, following=user).delete()
+        return Response({'following': False, 'removed': bool(deleted)})
+
 
 # ==================== SKILLS MANAGEMENT ====================
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(ReferenceListMixin, PrefetchPlannerMixin, viewsets.ModelViewSet):
     """Predefined skills database"""
     queryset = Skill.objects.all()
+    reference_key = ReferenceDataService.SKILL_LIST
     serializer_class = SkillSerializer
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['category']
     search_fields = ['name']
 
+    @action(detail=False, methods=['get'])
+    def categories(self, request):
+        """Resume-analysis skill keywords grouped by category"""
+        return Response(ReferenceDataService.skill_categories())
 
-class UserSkillViewSet(viewsets.ModelViewSet):
+
+class UserSkillViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     """
     User skill management:
     - Add/remove skills from user profile
@@ -152,7 +220,7 @@ class UserSkillViewSet(viewsets.ModelViewSet):
 
 
 # ==================== RESUME MANAGEMENT ====================
-class ResumeViewSet(viewsets.ModelViewSet):
+class ResumeViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     """
     Resume management with ML analysis:
     - Upload and analyze resumes
@@ -167,47 +235,61 @@ class ResumeViewSet(viewsets.ModelViewSet):
         return Resume.objects.filter(user=self.request.user)
 
     def perform_create(self, serializer):
-        resume = serializer.save(user=self.request.user)
+        # A user has one resume: uploading again replaces it
+        Resume.objects.filter(user=self.request.user).delete()
+        upload = serializer.validated_data['file']
+        resume = serializer.save(
+            user=self.request.user,
+            original_filename=upload.name,
+            file_size=upload.size,
+            analysis_status='analyzing'
+        )
         # Trigger ML analysis
         try:
-            analysis_result = analyze_resume(resume.file)
-            resume.extracted_text = analysis_result.get('extracted_text')
-            resume.extracted_skills = analysis_result.get('skills', {})
+            upload.seek(0)
+            analysis_result = analyze_resume(upload)
+            resume.extracted_text = analysis_result.get('extracted_text', '')
+            resume.skills = analysis_result.get('skills', [])
             resume.skill_gaps = analysis_result.get('skill_gaps', [])
-            resume.experience_level = analysis_result.get('experience_level')
+            resume.experience_level = analysis_result.get('experience_level', '').lower()
             resume.skill_score = analysis_result.get('skill_score', 0)
-            resume.total_score = int(analysis_result.get('total_score', 0))
-            resume.analyzed_at = timezone.now()
-            resume.save()
+            resume.total_score = float(analysis_result.get('total_score', 0))
+            resume.analysis_status = 'completed'
         except Exception as e:
-            # Log error but don't fail
-            pass
+            # Log error but don't fail the upload
+            logger.error(f"Resume analysis failed for resume {resume.id}: {str(e)}")
+            resume.analysis_status = 'failed'
+        resume.save()
 
     @action(detail=True, methods=['get'])
     def analysis(self, request, pk=None):
         """Get detailed resume analysis"""
         resume = self.get_object()
         return Response({
-            'skills': resume.extracted_skills,
+            'skills': resume.skills,
             'skill_gaps': resume.skill_gaps,
             'experience_level': resume.experience_level,
             'skill_score': resume.skill_score,
             'total_score': resume.total_score,
-            'analyzed_at': resume.analyzed_at,
+            'analysis_status': resume.analysis_status,
+            'analyzed_at': resume.updated_at,
         })
 
 
 # ==================== LEARNING SYSTEM ====================
-class CourseViewSet(viewsets.ModelViewSet):
-    """Course management with filtering and progress tracking"""
+class CourseViewSet(RatingMixin, ReferenceListMixin, PrefetchPlannerMixin, viewsets.ModelViewSet):
+    """Course management with filtering, ratings and progress tracking"""
     queryset = Course.objects.all()
+    reference_key = ReferenceDataService.COURSE_LIST
     serializer_class = CourseSerializer
+    rating_model = CourseRating
+    rating_target_field = 'course'
     permission_classes = [AllowAny]
     pagination_class = StandardPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_class = CourseFilter
     search_fields = ['title', 'description', 'category']
-    ordering_fields = ['created_at', 'estimated_duration']
+    ordering_fields = ['created_at', 'estimated_duration', 'rating', 'ranking_score']
     ordering = ['-created_at']
 
     @action(detail=True, methods=['get'])
@@ -239,7 +321,7 @@ class CourseViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class CourseModuleViewSet(viewsets.ReadOnlyModelViewSet):
+class CourseModuleViewSet(PrefetchPlannerMixin, viewsets.ReadOnlyModelViewSet):
     """Course module content"""
     serializer_class = CourseModuleSerializer
     permission_classes = [AllowAny]
@@ -251,7 +333,7 @@ class CourseModuleViewSet(viewsets.ReadOnlyModelViewSet):
         return CourseModule.objects.all()
 
 
-class UserCourseProgressViewSet(viewsets.ModelViewSet):
+class UserCourseProgressViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     """User course progress tracking"""
     serializer_class = UserCourseProgressSerializer
     permission_classes = [IsAuthenticated]
@@ -279,7 +361,7 @@ class UserCourseProgressViewSet(viewsets.ModelViewSet):
 
 
 # ==================== PROJECTS SYSTEM ====================
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     """Coding projects management"""
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
@@ -306,15 +388,15 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def leaderboard(self, request, pk=None):
         """Get project submissions leaderboard"""
         project = self.get_object()
-        submissions = UserProjectProgress.objects.filter(
+        submissions = optimize_queryset(UserProjectProgress.objects.filter(
             project=project,
             status__in=['in_progress', 'completed']
-        ).order_by('-progress')[:50]
+        ), UserProjectProgressSerializer).order_by('-progress')[:50]
         serializer = UserProjectProgressSerializer(submissions, many=True)
         return Response(serializer.data)
 
 
-class UserProjectProgressViewSet(viewsets.ModelViewSet):
+class UserProjectProgressViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     """User project progress and submissions"""
     serializer_class = UserProjectProgressSerializer
     permission_classes = [IsAuthenticated]
@@ -335,17 +417,21 @@ class UserProjectProgressViewSet(viewsets.ModelViewSet):
 
 
 # ==================== JOB OPPORTUNITIES ====================
-class JobOpportunityViewSet(viewsets.ModelViewSet):
+class JobOpportunityViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     """Job listings with skill matching"""
-    queryset = JobOpportunity.objects.filter(expires_at__gte=timezone.now()).order_by('-posted_date')
+    queryset = JobOpportunity.objects.order_by('-posted_date')
     serializer_class = JobOpportunitySerializer
     permission_classes = [AllowAny]
-    pagination_class = StandardPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = PostedDateKeysetPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_class = JobOpportunityFilter
     search_fields = ['job_title', 'company_name', 'description', 'location']
     ordering_fields = ['posted_date', 'salary_min', 'salary_max']
 
+    def get_queryset(self):
+        # Evaluated per request: a class-level filter would freeze now() at import
+        return super().get_queryset().filter(expires_at__gte=timezone.now())
+
     @action(detail=True, methods=['post'])
     def apply(self, request, pk=None):
         """Apply for a job"""
@@ -358,20 +444,20 @@ class JobOpportunityViewSet(viewsets.ModelViewSet):
         serializer = JobApplicationSerializer(application)
         return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
-    @action(detail=True, methods=['get'])
+    @action(detail=False, methods=['get'])
     def matching(self, request):
         """Get recommended jobs based on user skills"""
         user = request.user
         user_skill_ids = user.skills.values_list('skill_id', flat=True)
-        matching_jobs = JobOpportunity.objects.filter(
+        matching_jobs = self.optimize_queryset(JobOpportunity.objects.filter(
             required_skills__in=user_skill_ids,
             expires_at__gte=timezone.now()
-        ).distinct().order_by('-posted_date')[:20]
+        )).distinct().order_by('-posted_date')[:20]
         serializer = self.get_serializer(matching_jobs, many=True)
         return Response(serializer.data)
 
 
-class JobApplicationViewSet(viewsets.ModelViewSet):
+class JobApplicationViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     """Job application tracking"""
     serializer_class = JobApplicationSerializer
     permission_classes = [IsAuthenticated]
@@ -392,19 +478,19 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
 
 
 # ==================== COMMUNITY ====================
-class CommunityPostViewSet(viewsets.ModelViewSet):
+class CommunityPostViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     """Community discussion posts"""
     queryset = CommunityPost.objects.all()
     serializer_class = CommunityPostSerializer
     permission_classes = [AllowAny]
-    pagination_class = StandardPagination
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = CreatedAtKeysetPagination
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter]
     search_fields = ['title', 'content']
     ordering_fields = ['created_at', 'likes_count', 'comments_count']
     ordering = ['-created_at']
 
     def get_permissions(self):
-        if self.action in ['create']:
+        if self.action in ['create', 'like', 'unlike', 'feed']:
             permission_classes = [IsAuthenticated]
         elif self.action in ['update', 'partial_update', 'destroy']:
             permission_classes = [IsAuthorOrReadOnly]
@@ -413,36 +499,82 @@ class CommunityPostViewSet(viewsets.ModelViewSet):
         return [permission() for permission in permission_classes]
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        post = serializer.save(user=self.request.user)
+        transaction.on_commit(lambda: self._publish_to_feeds(post))
+
+    @staticmethod
+    def _publish_to_feeds(post):
+        try:
+            FeedService.publish(post)
+        except Exception as e:
+            # The post is saved; a missed fan-out only affects personalized feeds
+            logger.error(f"Error publishing post {post.id} to feeds: {str(e)}")
+
+    @action(detail=False, methods=['get'])
+    def feed(self, request):
+        """Get the current user's personalized feed, paginated with ?before=<post id>"""
+        try:
+            before = int(request.query_params['before']) if 'before' in request.query_params else None
+            limit = min(int(request.query_params.get('page_size', 20)), 100)
+        except ValueError:
+            return Response(
+                {'error': 'before and page_size must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        posts = FeedService.get_feed(
+            request.user, before=before, limit=limit,
+            queryset=self.optimize_queryset(CommunityPost.objects.all())
+        )
+        serializer = self.get_serializer(posts, many=True)
+        return Response({
+            'next_before': posts[-1].id if len(posts) == limit else None,
+            'results': serializer.data,
+        })
 
     @action(detail=True, methods=['post'])
     def like(self, request, pk=None):
-        """Like a post"""
+        """Like a post (once per user)"""
         post = self.get_object()
-        post.likes_count += 1
-        post.save()
-        return Response({'likes_count': post.likes_count})
+        liked = CounterService.like_post(request.user, post)
+        return Response({
+            'liked': liked,
+            'likes_count': CounterService.get_value(post, 'likes_count')
+        })
+
+    @action(detail=True, methods=['post'])
+    def unlike(self, request, pk=None):
+        """Remove the current user's like from a post"""
+        post = self.get_object()
+        unliked = CounterService.unlike_post(request.user, post)
+        return Response({
+            'unliked': unliked,
+            'likes_count': CounterService.get_value(post, 'likes_count')
+        })
 
     @action(detail=True, methods=['get'])
     def comments(self, request, pk=None):
         """Get post comments"""
         post = self.get_object()
-        comments = post.comments.all()
+        comments = optimize_queryset(post.comments.all(), CommentSerializer)
         serializer = CommentSerializer(comments, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def trending(self, request):
-        """Get trending posts"""
+        """Get trending posts ranked by hot score, paginated with ?cursor="""
         week_ago = timezone.now() - timedelta(days=7)
-        trending = CommunityPost.objects.filter(
+        trending = self.optimize_queryset(CommunityPost.objects.filter(
             created_at__gte=week_ago
-        ).order_by('-likes_count', '-comments_count')[:20]
-        serializer = self.get_serializer(trending, many=True)
-        return Response(serializer.data)
+        ))
 
+        paginator = TrendingCursorPagination()
+        page = paginator.paginate_queryset(trending, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     """Post comments"""
     serializer_class = CommentSerializer
     permission_classes = [AllowAny]
@@ -466,22 +598,23 @@ class CommentViewSet(viewsets.ModelViewSet):
         post_id = self.request.data.get('post')
         post = get_object_or_404(CommunityPost, id=post_id)
         comment = serializer.save(user=self.request.user, post=post)
-        post.comments_count += 1
-        post.save()
+        CounterService.increment(post, 'comments_count')
 
 
 # ==================== MENTORSHIP ====================
-class MentorViewSet(viewsets.ModelViewSet):
-    """Mentor profiles and management"""
+class MentorViewSet(RatingMixin, PrefetchPlannerMixin, viewsets.ModelViewSet):
+    """Mentor profiles, ratings and management"""
     queryset = Mentor.objects.all()
     serializer_class = MentorSerializer
+    rating_model = MentorRating
+    rating_target_field = 'mentor'
     permission_classes = [AllowAny]
     pagination_class = StandardPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_class = MentorFilter
     search_fields = ['user__first_name', 'user__last_name', 'specializations', 'bio']
-    ordering_fields = ['rating', 'hourly_rate', 'years_of_experience']
-    ordering = ['-rating']
+    ordering_fields = ['rating', 'ranking_score', 'hourly_rate', 'years_of_experience']
+    ordering = ['-ranking_score']
 
     @action(detail=True, methods=['get'])
     def reviews(self, request, pk=None):
@@ -491,17 +624,18 @@ class MentorViewSet(viewsets.ModelViewSet):
 
 
 # ==================== ACHIEVEMENTS ====================
-class AchievementViewSet(viewsets.ReadOnlyModelViewSet):
+class AchievementViewSet(ReferenceListMixin, PrefetchPlannerMixin, viewsets.ReadOnlyModelViewSet):
     """Available achievements and badges"""
     queryset = Achievement.objects.all()
+    reference_key = ReferenceDataService.ACHIEVEMENT_LIST
     serializer_class = AchievementSerializer
     permission_classes = [AllowAny]
     pagination_class = StandardPagination
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['rarity']
+    filterset_fields = ['points_value']
 
 
-class UserAchievementViewSet(viewsets.ReadOnlyModelViewSet):
+class UserAchievementViewSet(PrefetchPlannerMixin, viewsets.ReadOnlyModelViewSet):
     """User earned achievements"""
     serializer_class = UserAchievementSerializer
     permission_classes = [AllowAny]
@@ -509,6 +643,30 @@ class UserAchievementViewSet(viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self):
         user_id = self.request.query_params.get('user')
+        queryset = UserAchievement.objects.order_by('-earned_date', 'id')
         if user_id:
-            return UserAchievement.objects.filter(user_id=user_id)
-        return UserAchievement.objects.all()
+            return queryset.filter(user_id=user_id)
+        return queryset
+
+
+# ==================== DIAGNOSTICS ====================
+class ProfileViewSet(viewsets.ViewSet):
+    """Stored request profiles (staff only). Send 'X-Profile: 1' or 'X-Profile: cprofile' to record one."""
+    permission_classes = [IsAdminUser]
+
+    def list(self, request):
+        return Response(ProfileStore.list())
+
+    def retrieve(self, request, pk=None):
+        profile = ProfileStore.get(pk)
+        if profile is None:
+            return Response({'error': 'Profile not found or expired'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(profile)
+
+    @action(detail=True, methods=['get'])
+    def collapsed(self, request, pk=None):
+        """Collapsed stacks for flamegraph.pl, speedscope or inferno"""
+        profile = ProfileStore.get(pk)
+        if profile is None:
+            return Response({'error': 'Profile not found or expired'}, status=status.HTTP_404_NOT_FOUND)
+        return HttpResponse(profile['collapsed'] + '\n', content_type='text/plain; charset=utf-8')
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,6 +46,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Tracing and Prometheus request metrics (first, so they cover the whole stack)
+    'middleware.analytics_middleware.TracingMiddleware',
+    'middleware.analytics_middleware.MetricsMiddleware',
+    
+    # Read-your-writes for replica routing (before anything that may write)
+    'middleware.database_middleware.ReplicaPinningMiddleware',
+    
     # Security & CORS
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -71,6 +79,8 @@ MIDDLEWARE = [
     'middleware.analytics_middleware.AnalyticsMiddleware',
     'middleware.analytics_middleware.UserActivityMiddleware',
     'middleware.analytics_middleware.PerformanceMonitoringMiddleware',
+    'middleware.analytics_middleware.QueryBudgetMiddleware',
+    'middleware.analytics_middleware.ProfilingMiddleware',
     
     # Rate limiting
     'middleware.rate_limiting_middleware.IPWhitelistMiddleware',
@@ -102,11 +112,67 @@ AUTH_USER_MODEL = 'api.User'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# PostgreSQL from DATABASE_URL (docker-compose), SQLite otherwise. Connections
+# persist across requests for DB_CONN_MAX_AGE seconds and are health-checked
+# before reuse, so a restarted database or pooler costs one failed check
+# instead of a failed request.
+DATABASE_URL = os.environ.get('DATABASE_URL', '')
+
+if DATABASE_URL:
+    import dj_database_url
+
+    DATABASES = {
+        'default': dj_database_url.parse(
+            DATABASE_URL,
+            conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+            conn_health_checks=True,
+        )
+    }
+    if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+        # libpq connection options; other engines reject these keyword arguments
+        DATABASES['default']['OPTIONS'] = {'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 5))}
+        if os.environ.get('DB_PGBOUNCER', 'False') == 'True':
+            # Transaction pooling: a server connection is only ours for one
+            # transaction, so named (server-side) cursors cannot outlive it and
+            # startup parameters such as statement_timeout are rejected
+            DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+        else:
+            DATABASES['default']['OPTIONS']['options'] = (
+                f"-c statement_timeout={int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))}"
+            )
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
     }
+
+# Optional read replica for analytics and recommendation reads (core.routing).
+# Any URL works locally, e.g. sqlite:///db.sqlite3 to stand in for a replica;
+# under test it mirrors the default database.
+DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL', '')
+
+if DATABASE_REPLICA_URL:
+    import dj_database_url
+
+    DATABASES['replica'] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        conn_health_checks=True,
+    )
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['core.routing.ReplicaRouter']
+
+# Which reads go to the replica: service modules (every public method of
+# their services) and Celery task name prefixes. A request that writes, and
+# the same client for PIN_SECONDS afterwards, reads from the primary.
+REPLICA_SETTINGS = {
+    'ALIAS': 'replica' if DATABASE_REPLICA_URL else None,
+    'SERVICES': ['services.analytics_service', 'services.recommendation_service'],
+    'TASKS': ['tasks.analytics_tasks.'],
+    'PIN_SECONDS': int(os.environ.get('DB_REPLICA_PIN_SECONDS', 5)),
 }
 
 
@@ -155,6 +221,27 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Email (.env.example); the SMTP connection is reused for a whole bulk send
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'False') == 'True'
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_TIMEOUT = 30  # Seconds; a hung SMTP server fails the send instead of blocking the worker
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@localhost')
+
+# Links in emails
+FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
+
+# Digest and report emails (core.mailing.send_bulk)
+BULK_EMAIL_SETTINGS = {
+    'CHUNK_SIZE': 200,  # Recipients per chunk
+    'WORKERS': 4,  # Render threads; each holds a database connection while rendering
+    'RETRIES': 3,  # Send attempts per chunk
+    'RETRY_DELAY': 5,  # Seconds, doubled per retry
+}
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -189,11 +276,152 @@ REST_FRAMEWORK = {
 # Rate Limiting Configuration
 RATE_LIMIT_SETTINGS = {
     'AUTHENTICATED_REQUESTS_PER_HOUR': 1000,
-    'ANONYMOUS_REQUESTS_PER_HOUR': 100,
-    'BURST_SIZE': 20,  # Requests per minute
+    # Raise both for load tests, which send every request from one IP
+    'ANONYMOUS_REQUESTS_PER_HOUR': int(os.environ.get('RATE_LIMIT_ANONYMOUS_PER_HOUR', 100)),
+    'BURST_SIZE': int(os.environ.get('RATE_LIMIT_BURST_SIZE', 20)),  # Requests per minute
     'BURST_WINDOW': 60,  # Seconds
 }
 
+# Redis connection shared by counters and other write-behind buffers
+REDIS_URL = os.environ.get('REDIS_URL', '')
+
+# Write-behind counters (likes, comments, views)
+COUNTER_SETTINGS = {
+    'BACKEND': 'redis' if REDIS_URL else 'memory',
+    'SHARDS': 16,
+    'FLUSH_INTERVAL': 5,  # Seconds between flushes to the database
+}
+
+# Personalized community feed (fan-out-on-write timelines)
+FEED_SETTINGS = {
+    'BACKEND': 'redis' if REDIS_URL else 'memory',
+    'MAX_LENGTH': 500,  # Post IDs kept per user timeline
+    'POPULAR_AUTHOR_FOLLOWERS': 1000,  # Followers of larger authors pull on read
+    'SKILL_MATCH_LIMIT': 200,  # Skill-matched users pushed per post
+}
+
+# Per-request SQL query budget warnings (development only)
+QUERY_BUDGET_SETTINGS = {
+    'ENABLED': DEBUG,
+    'WARN_THRESHOLD': 30,  # Log a warning above this many queries per request
+    'CALL_SITES': 5,  # Call sites listed in the warning
+}
+
+# Request profiling: staff send "X-Profile: 1" (or "cprofile"); browse at /api/profiles/
+PROFILING_SETTINGS = {
+    'SAMPLE_RATE': int(os.environ.get('PROFILE_SAMPLE_RATE', 0)),  # Profile 1 in N requests; 0 = off
+    'MODE': 'sample',  # Stack sampling for sampled requests ('cprofile' adds overhead)
+    'INTERVAL': 0.002,  # Seconds between stack samples
+    'KEEP': 100,  # Profiles kept
+}
+
+# Prometheus metrics at /metrics. Under gunicorn, set PROMETHEUS_MULTIPROC_DIR
+# (see gunicorn.conf.py) so every worker's samples are aggregated on scrape.
+METRICS_SETTINGS = {
+    'AUTH_TOKEN': os.environ.get('METRICS_TOKEN', ''),  # Bearer token required to scrape; empty = DEBUG only
+    'CELERY_QUEUES': ['celery'],  # Queues whose depth is reported
+    'CELERY_PORT': int(os.environ.get('CELERY_METRICS_PORT', 0)),  # Worker /metrics port; 0 = off
+}
+
+# OpenTelemetry tracing of requests, middleware, services, SQL and Celery tasks
+TRACING_SETTINGS = {
+    'ENABLED': os.environ.get('TRACING_ENABLED', 'False') == 'True',
+    'EXPORTER': os.environ.get('TRACING_EXPORTER', 'file'),  # 'file', 'otlp' or 'console'
+    'FILE': 'logs/traces.jsonl',
+    'OTLP_ENDPOINT': os.environ.get('OTEL_EXPORTER_OTLP_TRACES_ENDPOINT', 'http://localhost:4318/v1/traces'),
+    'SAMPLE_RATIO': float(os.environ.get('TRACING_SAMPLE_RATIO', 1.0)),
+}
+
+STATS_SETTINGS = {
+    'CONCURRENT': True,  # Run per-table aggregate passes in parallel threads
+    'MAX_WORKERS': 4,  # Each concurrent pass holds its own database connection
+}
+
+CACHING_SETTINGS = {
+    'XFETCH_BETA': 1.0,  # Probabilistic early refresh; higher refreshes sooner, 0 = off
+    'LOCK_TIMEOUT': 60,  # Seconds before an abandoned recompute lock expires
+    'WAIT': 5.0,  # Seconds a cold-miss request waits for another worker's recompute
+}
+
+# Per-process LRU in front of the shared cache for skills, achievements and
+# courses; invalidations are broadcast over Redis pub/sub
+REFERENCE_CACHE_SETTINGS = {
+    'BACKEND': 'redis' if REDIS_URL else 'memory',
+    'MAX_ENTRIES': 256,  # Local entries per worker process
+    'LOCAL_TTL': 300,  # Upper bound on local staleness if an invalidation is missed
+    'SHARED_TTL': 3600,
+}
+
+# Default cache with hit/miss counters for the recommendation, analytics and
+# leaderboard key spaces (METRICS_SETTINGS['CACHES']). With Redis configured it
+# is shared by every gunicorn and Celery process (rate limits, analytics,
+# locks); otherwise each process has its own LocMemCache.
+CACHE_URL = os.environ.get('CACHE_URL', REDIS_URL)
+
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.metrics.InstrumentedDjangoRedisCache',
+            'LOCATION': CACHE_URL,
+            'KEY_PREFIX': 'career',
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                # One pool per process, shared by its threads
+                'CONNECTION_POOL_KWARGS': {
+                    'max_connections': int(os.environ.get('CACHE_MAX_CONNECTIONS', 50)),
+                    'retry_on_timeout': True,
+                    'health_check_interval': 30,
+                },
+                'SOCKET_CONNECT_TIMEOUT': 1,  # Seconds
+                'SOCKET_TIMEOUT': 1,
+                # Analytics and recommendation payloads are JSON-like and compress well
+                'COMPRESSOR': 'django_redis.compressors.zlib.ZlibCompressor',
+                # A Redis outage degrades to cache misses instead of 500s
+                'IGNORE_EXCEPTIONS': True,
+            },
+        }
+    }
+    DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = True
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.metrics.InstrumentedLocMemCache',
+        }
+    }
+
+# Bayesian ranking for rated courses and mentors:
+# score = (sum + PRIOR_MEAN * PRIOR_WEIGHT) / (count + PRIOR_WEIGHT)
+RATING_SETTINGS = {
+    'PRIOR_MEAN': 3.0,
+    'PRIOR_WEIGHT': 5,
+}
+
+# Notification store (services.notification_service): retention drops whole
+# monthly partitions on PostgreSQL; fan-out and unread counts are batched
+NOTIFICATION_SETTINGS = {
+    'RETENTION_DAYS': 30,
+    'PARTITIONS_AHEAD': 2,
+    'BATCH_SIZE': 1000,
+}
+
+# Likes and comments become one "Alice and N others ..." notification per
+# recipient and target per window (core.coalescing)
+COALESCING_SETTINGS = {
+    'BACKEND': 'redis' if REDIS_URL else 'memory',
+    'WINDOW': 60,  # Seconds; 0 notifies every event
+    'FLUSH_INTERVAL': 10,  # Matches the flush-coalesced-notifications beat entry
+    'MAX_GROUPS': 10000,  # Open groups per process (memory backend)
+}
+
+# Notification and read-receipt push over Server-Sent Events (core.push),
+# served by the ASGI application in backend/asgi.py
+PUSH_SETTINGS = {
+    'BACKEND': 'redis' if REDIS_URL else 'memory',
+    'PATH': '/api/notifications/stream/',
+    'KEEPALIVE': 15,  # Seconds; below proxy read timeouts
+    'QUEUE_SIZE': 100,  # Events buffered per slow client
+}
+
 # IP Whitelist for rate limiting bypass
 RATE_LIMIT_WHITELIST = [
     '127.0.0.1',
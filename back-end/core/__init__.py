@@ -7,14 +7,70 @@ from .models import (
     StatusModel,
     RatableModel,
     CountableModel,
+    SearchableModel,
 )
 
+# Write-behind Counters
+from .counters import CounterService, counters_flushed
+
+# Trending
+from .trending import TrendingService, hot_score
+
+# Personalized Feed
+from .feed import FeedService
+
+# Time Series Analytics
+from .timeseries import TimeSeriesService, register_series
+
+# Statistics and Caching
+from .stats import StatsEngine, count
+from .caching import cached, get_or_refresh, invalidate_tags
+from .reference import ReferenceDataService
+
+# Pagination
+from .pagination import KeysetPagination, estimate_count
+
+# Query Planning
+from .prefetch import PrefetchPlannerMixin, optimize_queryset, plan_for
+
+# Query Logging
+from .querylog import QueryRecorder
+
+# Database Routing
+from .routing import ReplicaRouter, replica_reads, use_replica
+
+# Table Partitioning
+from .partitions import ensure_partitions, purge_before, retention_boundary
+
+# Event Coalescing
+from .coalescing import Coalescer
+
+# Bulk Email
+from .mailing import send_bulk
+
+# Real-time Push
+from .push import PushApplication, publish, publish_many
+
+# Request Profiling
+from .profiling import RequestProfile, ProfileStore, StackSampler
+
+# Prometheus Metrics
+from .metrics import QueryCounter, metrics_view, instrument_celery
+
+# Tracing
+from .tracing import configure_tracing, trace_service, traced
+
+# Full-text Search
+from .search import SearchService, FullTextSearchFilter
+
 # View Mixins
 from .mixins import (
     OwnerFilterMixin,
     CreateUserMixin,
     UpdateTimestampMixin,
     LikeDislikeMixin,
+    RatingMixin,
+    ReferenceListMixin,
     BulkActionMixin,
     SearchFilterMixin,
     ExportMixin,
@@ -46,12 +102,90 @@ __all__ = [
     'StatusModel',
     'RatableModel',
     'CountableModel',
+    'SearchableModel',
+    
+    # Counters
+    'CounterService',
+    'counters_flushed',
+    
+    # Trending
+    'TrendingService',
+    'hot_score',
+    
+    # Feed
+    'FeedService',
+    
+    # Time Series
+    'TimeSeriesService',
+    'register_series',
+    
+    # Statistics and Caching
+    'StatsEngine',
+    'count',
+    'cached',
+    'get_or_refresh',
+    'invalidate_tags',
+    'ReferenceDataService',
+    
+    # Pagination
+    'KeysetPagination',
+    'estimate_count',
+    
+    # Query Planning
+    'PrefetchPlannerMixin',
+    'optimize_queryset',
+    'plan_for',
+    
+    # Query Logging
+    'QueryRecorder',
+    
+    # Database Routing
+    'ReplicaRouter',
+    'replica_reads',
+    'use_replica',
+    
+    # Partitioning
+    'ensure_partitions',
+    'purge_before',
+    'retention_boundary',
+    
+    # Coalescing
+    'Coalescer',
+    
+    # Bulk Email
+    'send_bulk',
+    
+    # Push
+    'PushApplication',
+    'publish',
+    'publish_many',
+    
+    # Profiling
+    'RequestProfile',
+    'ProfileStore',
+    'StackSampler',
+    
+    # Metrics
+    'QueryCounter',
+    'metrics_view',
+    'instrument_celery',
+    
+    # Tracing
+    'configure_tracing',
+    'trace_service',
+    'traced',
+    
+    # Search
+    'SearchService',
+    'FullTextSearchFilter',
     
     # Mixins
     'OwnerFilterMixin',
     'CreateUserMixin',
     'UpdateTimestampMixin',
     'LikeDislikeMixin',
+    'RatingMixin',
+    'ReferenceListMixin',
     'BulkActionMixin',
     'SearchFilterMixin',
     'ExportMixin',
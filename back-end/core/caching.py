@@ -0,0 +1,305 @@
+"""
+Stampede-safe caching with stale-while-revalidate.
+
+Entries are stored as an envelope with a soft expiry ("fresh until") inside
+a longer hard cache timeout. Past the soft expiry the stale value is still
+served while exactly one worker, the holder of a short cache.add() lock,
+recomputes it, in a background thread for readers or inline for refresh
+tasks. A cold miss is also computed under the lock; concurrent callers
+wait briefly for the winner instead of all hitting the database at once.
+
+Shortly before the soft expiry, readers also refresh early with a
+probability that grows as expiry nears and with the cost of the last
+computation (XFetch), so hot keys are usually recomputed before they go
+stale at all. Entries can carry tags ('user:42', 'jobs'); invalidate_tags()
+bumps a tag's version, and entries stored under an older version are
+treated as misses from then on.
+
+    @cached('user_stats:{user.id}', fresh_for=3600, stale_for=3600, tags=['user:{user.id}'])
+    def get_user_stats(user): ...
+
+    get_user_stats(user)            # read-through
+    get_user_stats.refresh(user)    # recompute now (single-flight), e.g. from a task
+    invalidate_tags('user:42')      # drop every entry tagged user:42
+"""
+
+import contextvars
+import functools
+import inspect
+import logging
+import math
+import random
+import threading
+import time
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_save
+from .metrics import CACHE_LOOKUP_LATENCY, CACHE_RECOMPUTE_LATENCY
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = 'lock:{}'
+TAG_KEY = 'tag:{}'
+
+DEFAULT_CACHING_SETTINGS = {
+    'XFETCH_BETA': 1.0,  # Early-refresh eagerness; 0 disables probabilistic early refresh
+    'LOCK_TIMEOUT': 60,  # Seconds before an abandoned recompute lock expires
+    'WAIT': 5.0,  # Seconds a cold-miss caller waits for another worker's computation
+}
+
+
+def get_caching_settings():
+    """Merge CACHING_SETTINGS from settings.py over the defaults."""
+    return {**DEFAULT_CACHING_SETTINGS, **getattr(settings, 'CACHING_SETTINGS', {})}
+
+
+def cache_name(key):
+    """Low-cardinality metrics label for a key: its prefix ('user_stats:42' -> 'user_stats')."""
+    return key.split(':', 1)[0]
+
+
+# ==================== TAGS ====================
+
+def tag_versions(tags):
+    """Current version of each tag (0 for tags never invalidated)."""
+    if not tags:
+        return {}
+    stored = cache.get_many([TAG_KEY.format(tag) for tag in tags])
+    return {tag: stored.get(TAG_KEY.format(tag), 0) for tag in tags}
+
+
+def invalidate_tags(*tags):
+    """Invalidate every entry stored under any of the tags."""
+    version = time.time_ns()
+    cache.set_many({TAG_KEY.format(tag): version for tag in tags}, timeout=None)
+
+
+def invalidate_on_change(model, *tags):
+    """
+    Invalidate tags whenever a model instance is saved or deleted (after commit).
+
+    Args:
+        model: Model class or 'app_label.ModelName'
+        *tags: Tag templates formatted with the instance, e.g. 'user:{instance.user_id}'
+    """
+    if isinstance(model, str):
+        model = apps.get_model(model)
+
+    def handler(sender, instance, **kwargs):
+        names = [tag.format(instance=instance) for tag in tags]
+        transaction.on_commit(lambda: invalidate_tags(*names))
+
+    uid = f'cache_invalidation:{model._meta.label}'
+    post_save.connect(handler, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(handler, sender=model, weak=False, dispatch_uid=uid)
+
+
+# ==================== ENTRIES ====================
+
+def _envelope(value, fresh_for, delta=0.0, versions=None):
+    return {
+        'value': value,
+        'fresh_until': time.time() + fresh_for,
+        'delta': delta,  # Seconds the computation took (XFetch)
+        'tags': versions or {},
+    }
+
+
+def set_entry(key, value, fresh_for, stale_for, tags=()):
+    """Store `value`, fresh for `fresh_for` seconds and servable stale for `stale_for` more."""
+    cache.set(key, _envelope(value, fresh_for, versions=tag_versions(tags)), timeout=fresh_for + stale_for)
+
+
+def is_current(entry):
+    """False once any of the entry's tags has been invalidated."""
+    versions = entry.get('tags')
+    return not versions or tag_versions(list(versions)) == versions
+
+
+def refresh_due(entry, beta, now=None):
+    """
+    XFetch: refresh early with probability rising towards the soft expiry.
+
+    The expected head start is delta * beta seconds, where delta is how long
+    the value took to compute, so expensive entries are renewed earlier.
+    """
+    if not beta or not entry.get('delta'):
+        return False
+    now = time.time() if now is None else now
+    return now - entry['delta'] * beta * math.log(1.0 - random.random()) >= entry['fresh_until']
+
+
+def refresh(key, compute, fresh_for, stale_for, lock_timeout=None, tags=(), name=None):
+    """
+    Recompute and store an entry unless another worker is already doing so (single-flight).
+
+    Args:
+        key: Cache key
+        compute: Zero-argument callable producing the value
+        fresh_for: Seconds the value counts as fresh
+        stale_for: Extra seconds a stale value may be served while refreshing
+        lock_timeout: Seconds before an abandoned lock expires
+        tags: Tags the entry is invalidated by
+        name: Metrics label (defaults to the key prefix)
+
+    Returns:
+        (refreshed, value): value is None when another worker held the lock
+    """
+    if lock_timeout is None:
+        lock_timeout = get_caching_settings()['LOCK_TIMEOUT']
+    lock_key = LOCK_KEY.format(key)
+    # False: another worker holds the lock. None: the cache backend is down and
+    # swallowed the error (django-redis IGNORE_EXCEPTIONS), so nobody can hold
+    # it and waiting would only stall; compute without the lock instead.
+    locked = cache.add(lock_key, 1, timeout=lock_timeout)
+    if locked is False:
+        return False, None
+    try:
+        # Versions are read first, so an invalidation during compute() wins
+        versions = tag_versions(tags)
+        started = time.perf_counter()
+        value = compute()
+        delta = time.perf_counter() - started
+        CACHE_RECOMPUTE_LATENCY.labels(cache=name or cache_name(key)).observe(delta)
+        cache.set(key, _envelope(value, fresh_for, delta, versions), timeout=fresh_for + stale_for)
+        return True, value
+    finally:
+        if locked:
+            cache.delete(lock_key)
+
+
+def _refresh_in_background(key, compute, fresh_for, stale_for, lock_timeout, tags=(), name=None):
+    def run():
+        try:
+            refresh(key, compute, fresh_for, stale_for, lock_timeout, tags, name)
+        except Exception as e:
+            logger.error(f"Background refresh of {key} failed: {str(e)}")
+        finally:
+            connections.close_all()  # This thread's own connections
+
+    # Carry the caller's context (replica routing) into the thread
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(run,), daemon=True, name=f'refresh:{key}').start()
+
+
+def get_or_refresh(key, compute, fresh_for, stale_for, lock_timeout=None, wait=None, background=True,
+                   tags=(), beta=None, name=None):
+    """
+    Read-through cache with stale-while-revalidate and single-flight recomputation.
+
+    Args:
+        key: Cache key
+        compute: Zero-argument callable producing the value
+        fresh_for: Seconds the value counts as fresh
+        stale_for: Extra seconds a stale value may be served while refreshing
+        lock_timeout: Seconds before an abandoned lock expires
+        wait: Seconds a cold-miss caller waits for another worker's computation
+        background: Refresh stale entries in a background thread (else inline)
+        tags: Tags the entry is invalidated by
+        beta: XFetch eagerness (CACHING_SETTINGS['XFETCH_BETA'] by default)
+        name: Metrics label (defaults to the key prefix)
+
+    Returns:
+        The cached or freshly computed value
+    """
+    config = get_caching_settings()
+    lock_timeout = config['LOCK_TIMEOUT'] if lock_timeout is None else lock_timeout
+    wait = config['WAIT'] if wait is None else wait
+    beta = config['XFETCH_BETA'] if beta is None else beta
+    name = name or cache_name(key)
+    started = time.perf_counter()
+
+    def observe(result):
+        CACHE_LOOKUP_LATENCY.labels(cache=name, result=result).observe(time.perf_counter() - started)
+
+    entry = cache.get(key)
+    result = 'miss'
+    if entry is not None and not is_current(entry):
+        entry, result = None, 'invalidated'
+
+    if entry is not None:
+        now = time.time()
+        stale = entry['fresh_until'] <= now
+        if stale or refresh_due(entry, beta, now):
+            result = 'stale' if stale else 'early'
+            if background:
+                if not cache.get(LOCK_KEY.format(key)):
+                    _refresh_in_background(key, compute, fresh_for, stale_for, lock_timeout, tags, name)
+            else:
+                refreshed, value = refresh(key, compute, fresh_for, stale_for, lock_timeout, tags, name)
+                if refreshed:
+                    observe(result)
+                    return value
+        else:
+            result = 'hit'
+        observe(result)
+        return entry['value']
+
+    # Cold miss: one worker computes, the others poll for its result
+    refreshed, value = refresh(key, compute, fresh_for, stale_for, lock_timeout, tags, name)
+    if refreshed:
+        observe(result)
+        return value
+    deadline = time.time() + wait
+    while time.time() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(key)
+        if entry is not None and is_current(entry):
+            observe(result)
+            return entry['value']
+    logger.warning(f"Timed out waiting for {key}; computing it directly")
+    value = compute()
+    observe(result)
+    return value
+
+
+# ==================== DECORATOR ====================
+
+def cached(key, fresh_for, stale_for=0, tags=(), name=None, **options):
+    """
+    Decorator: cache a function's result under a key built from its arguments.
+
+    Args:
+        key: Key template formatted with the call's arguments, e.g. 'user_stats:{user.id}'
+        fresh_for: Seconds the value counts as fresh
+        stale_for: Extra seconds a stale value may be served while refreshing
+        tags: Tag templates formatted like the key, e.g. ['user:{user.id}', 'jobs']
+        name: Metrics label (defaults to the key prefix)
+        **options: Passed to get_or_refresh (lock_timeout, wait, background, beta)
+
+    The wrapper also gets .refresh(*args, **kwargs) returning (refreshed, value),
+    .invalidate(*args, **kwargs), .key(*args, **kwargs) and .uncached.
+    """
+    def decorator(function):
+        signature = inspect.signature(function)
+        label = name or cache_name(key)
+
+        def bind(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            return key.format(**arguments), [tag.format(**arguments) for tag in tags]
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            entry_key, entry_tags = bind(args, kwargs)
+            return get_or_refresh(
+                entry_key, lambda: function(*args, **kwargs), fresh_for, stale_for,
+                tags=entry_tags, name=label, **options
+            )
+
+        def refresh_entry(*args, **kwargs):
+            entry_key, entry_tags = bind(args, kwargs)
+            return refresh(
+                entry_key, lambda: function(*args, **kwargs), fresh_for, stale_for,
+                options.get('lock_timeout'), entry_tags, label
+            )
+
+        wrapper.refresh = refresh_entry
+        wrapper.invalidate = lambda *args, **kwargs: cache.delete(bind(args, kwargs)[0])
+        wrapper.key = lambda *args, **kwargs: bind(args, kwargs)[0]
+        wrapper.uncached = function
+        return wrapper
+    return decorator
@@ -0,0 +1,282 @@
+"""
+Coalescing buffer for high-volume events.
+
+Events are grouped by key (for notifications: recipient, type and target).
+A group opens with its first event and stays open for WINDOW seconds while
+later events only bump its counters, then drain() hands it over for one
+aggregated write ("Alice and 312 others liked your post"). A viral post thus
+costs one notification per window instead of one row, one task and one push
+per like.
+
+Each group keeps the event count, the number of distinct actors and the first
+SAMPLE_ACTORS of them, so its size does not grow with its events. The
+in-process backend holds at most MAX_GROUPS open groups; when it is full the
+oldest group is closed early and emitted on the next flush. Closed groups
+awaiting a flush (or put back after a failed one) are capped at MAX_GROUPS
+too; past that the oldest are dropped with a warning. The Redis backend
+shares groups across every gunicorn and Celery process, counting distinct
+actors with a HyperLogLog.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from utils.helpers import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COALESCING_SETTINGS = {
+    'BACKEND': 'memory',  # 'redis' shares groups between processes
+    'WINDOW': 60,  # Seconds a group collects events before it is emitted; 0 = no coalescing
+    'FLUSH_INTERVAL': 10,  # Seconds between flushes of expired groups
+    'MAX_GROUPS': 10000,  # Open groups, and separately closed ones awaiting a flush, per process (memory backend)
+    'SAMPLE_ACTORS': 2,  # Distinct actors remembered per group, for naming them
+    'MAX_TRACKED_ACTORS': 1000,  # Actor IDs kept per group to count them exactly (memory backend)
+}
+
+
+def get_coalescing_settings():
+    """Merge COALESCING_SETTINGS from settings.py over the defaults."""
+    return {**DEFAULT_COALESCING_SETTINGS, **getattr(settings, 'COALESCING_SETTINGS', {})}
+
+
+class MemoryCoalescingBackend:
+    """
+    In-process groups, oldest first.
+    Used for local development and when Redis is unavailable.
+    """
+
+    def __init__(self, max_groups, sample_actors, max_tracked_actors):
+        self.max_groups = max_groups
+        self.sample_actors = sample_actors
+        self.max_tracked_actors = max_tracked_actors
+        self.groups = OrderedDict()  # key -> group, in order of opening
+        self.closed = []  # Groups evicted to respect max_groups, emitted on the next drain
+        self.lock = threading.Lock()
+
+    def add(self, key, actor_id, now):
+        with self.lock:
+            group = self.groups.get(key)
+            if group is None:
+                if len(self.groups) >= self.max_groups:
+                    self._close([self._result(self.groups.popitem(last=False)[1])])
+                group = self.groups[key] = {
+                    'key': key, 'opened_at': now, 'count': 0, 'actors': [], 'tracked': set(), 'untracked': 0,
+                }
+            group['count'] += 1
+            if actor_id in group['tracked']:
+                return
+            if len(group['tracked']) < self.max_tracked_actors:
+                group['tracked'].add(actor_id)
+            else:
+                # Past the limit, every event counts as a new actor
+                group['untracked'] += 1
+            if len(group['actors']) < self.sample_actors:
+                group['actors'].append(actor_id)
+
+    def _close(self, groups):
+        """Queue groups for the next drain, keeping at most max_groups (caller holds the lock)."""
+        self.closed.extend(groups)
+        overflow = len(self.closed) - self.max_groups
+        if overflow > 0:
+            # Flushes are failing or falling behind; losing the oldest beats unbounded memory
+            del self.closed[:overflow]
+            logger.warning(f"Dropped {overflow} closed coalescing groups over the {self.max_groups} limit")
+
+    @staticmethod
+    def _result(group):
+        return {
+            'key': group['key'],
+            'count': group['count'],
+            'actor_count': len(group['tracked']) + group['untracked'],
+            'actors': group['actors'],
+        }
+
+    def drain(self, opened_before):
+        """Take every group opened before `opened_before`, and the ones closed early."""
+        with self.lock:
+            due, self.closed = self.closed, []
+            while self.groups:
+                key, group = next(iter(self.groups.items()))
+                if group['opened_at'] > opened_before:
+                    break
+                del self.groups[key]
+                due.append(self._result(group))
+        return due
+
+    def restore(self, groups):
+        """Put drained groups back after a failed flush."""
+        with self.lock:
+            self.closed[:0] = groups  # Older than anything closed since the drain
+            self._close([])
+
+
+class RedisCoalescingBackend:
+    """
+    Groups stored in Redis and shared by every gunicorn and Celery worker.
+
+    Per group: a hash with the event count (coalesce:group:<key>), a sorted
+    set keeping the first distinct actors (coalesce:actors:<key>) and a
+    HyperLogLog of all actors (coalesce:hll:<key>). coalesce:open orders the
+    groups by opening time. add() and the per-group read-and-delete in drain()
+    are MULTI/EXEC transactions, so an event lands wholly before or after a
+    drain.
+    """
+
+    KEY_PREFIX = 'coalesce'
+
+    def __init__(self, client, sample_actors, expire):
+        self.client = client
+        self.sample_actors = sample_actors
+        self.expire = expire  # Safety net for groups nobody drains
+
+    def _keys(self, key):
+        return (
+            f"{self.KEY_PREFIX}:group:{key}", f"{self.KEY_PREFIX}:actors:{key}", f"{self.KEY_PREFIX}:hll:{key}"
+        )
+
+    def add(self, key, actor_id, now):
+        group_key, actors_key, hll_key = self._keys(key)
+        pipeline = self.client.pipeline()
+        pipeline.zadd(f"{self.KEY_PREFIX}:open", {key: now}, nx=True)
+        pipeline.hincrby(group_key, 'count', 1)
+        pipeline.zadd(actors_key, {actor_id: now}, nx=True)
+        pipeline.zremrangebyrank(actors_key, self.sample_actors, -1)
+        pipeline.pfadd(hll_key, actor_id)
+        for name in (group_key, actors_key, hll_key):
+            pipeline.expire(name, self.expire)
+        pipeline.execute()
+
+    def drain(self, opened_before):
+        """Take every group opened before `opened_before` (one drainer at a time)."""
+        lock = self.client.lock(f"{self.KEY_PREFIX}:lock", timeout=60)
+        if not lock.acquire(blocking=False):
+            return []
+
+        due = []
+        try:
+            keys = self.client.zrangebyscore(
+                f"{self.KEY_PREFIX}:open", '-inf', '+inf' if opened_before == float('inf') else opened_before
+            )
+            for key in (key.decode() for key in keys):
+                group_key, actors_key, hll_key = self._keys(key)
+                pipeline = self.client.pipeline()
+                pipeline.hmget(group_key, 'count', 'restored_actors')
+                pipeline.zrange(actors_key, 0, -1)
+                pipeline.pfcount(hll_key)
+                pipeline.delete(group_key, actors_key, hll_key)
+                pipeline.zrem(f"{self.KEY_PREFIX}:open", key)
+                (count, restored_actors), actors, actor_count, _, _ = pipeline.execute()
+                if count:
+                    due.append({
+                        'key': key,
+                        'count': int(count),
+                        'actor_count': actor_count + int(restored_actors or 0),
+                        'actors': [int(actor) for actor in actors],
+                    })
+        finally:
+            lock.release()
+        return due
+
+    def restore(self, groups):
+        """Put drained groups back after a failed flush (as fresh groups, already due)."""
+        for group in groups:
+            group_key, actors_key, hll_key = self._keys(group['key'])
+            pipeline = self.client.pipeline()
+            pipeline.zadd(f"{self.KEY_PREFIX}:open", {group['key']: 0}, nx=True)
+            pipeline.hincrby(group_key, 'count', group['count'])
+            # Only the sampled actors go back into the HyperLogLog
+            pipeline.hincrby(group_key, 'restored_actors', group['actor_count'] - len(group['actors']))
+            pipeline.zadd(actors_key, {actor: index for index, actor in enumerate(group['actors'])}, nx=True)
+            pipeline.pfadd(hll_key, *group['actors'])
+            pipeline.execute()
+
+
+class Coalescer:
+    """Buffer of coalesced event groups with a periodic flush."""
+
+    _backend = None
+    _backend_lock = threading.Lock()
+    _flusher_started = False
+
+    @staticmethod
+    def get_backend():
+        """Get (and lazily create) the configured coalescing backend."""
+        if Coalescer._backend is None:
+            with Coalescer._backend_lock:
+                if Coalescer._backend is None:
+                    config = get_coalescing_settings()
+                    client = get_redis_client() if config['BACKEND'] == 'redis' else None
+
+                    if client is not None:
+                        Coalescer._backend = RedisCoalescingBackend(
+                            client, config['SAMPLE_ACTORS'], expire=config['WINDOW'] * 10 + 3600
+                        )
+                    else:
+                        Coalescer._backend = MemoryCoalescingBackend(
+                            config['MAX_GROUPS'], config['SAMPLE_ACTORS'], config['MAX_TRACKED_ACTORS']
+                        )
+        return Coalescer._backend
+
+    @staticmethod
+    def add(key, actor_id):
+        """
+        Record one event in its group.
+
+        Args:
+            key: Group key (colon-separated string)
+            actor_id: ID of whoever caused the event
+        """
+        Coalescer.get_backend().add(key, actor_id, time.time())
+
+    @staticmethod
+    def flush(emit, force=False):
+        """
+        Hand every expired group to `emit`.
+
+        Args:
+            emit: Callable receiving the list of groups, each a dict with
+                key, count, actor_count and actors (the first distinct actor IDs)
+            force: Emit all groups, expired or not
+
+        Returns:
+            Number of groups emitted
+        """
+        backend = Coalescer.get_backend()
+        opened_before = float('inf') if force else time.time() - get_coalescing_settings()['WINDOW']
+        groups = backend.drain(opened_before)
+        if not groups:
+            return 0
+        try:
+            emit(groups)
+        except Exception as e:
+            backend.restore(groups)
+            logger.error(f"Error emitting {len(groups)} coalesced groups: {str(e)}")
+            raise
+        return len(groups)
+
+    @staticmethod
+    def start_memory_flusher(emit):
+        """Start a daemon thread flushing in-process groups every FLUSH_INTERVAL seconds."""
+        from django.db import close_old_connections
+
+        config = get_coalescing_settings()
+        if not isinstance(Coalescer.get_backend(), MemoryCoalescingBackend) or Coalescer._flusher_started:
+            return
+        if not config['FLUSH_INTERVAL']:
+            return
+        Coalescer._flusher_started = True
+
+        def run():
+            while True:
+                time.sleep(config['FLUSH_INTERVAL'])
+                try:
+                    Coalescer.flush(emit)
+                except Exception as e:
+                    logger.error(f"Coalescing flusher error: {str(e)}")
+                finally:
+                    close_old_connections()
+
+        threading.Thread(target=run, name='coalescing-flusher', daemon=True).start()
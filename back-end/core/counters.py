@@ -0,0 +1,424 @@
+"""
+Write-behind counters for likes, comments and views.
+
+Increments are buffered in Redis hashes (or in-process shards when Redis is
+not configured) and flushed to the database in batched F() updates, so hot
+rows are written once per flush interval instead of once per request.
+"""
+
+import logging
+import threading
+import time
+import zlib
+from collections import defaultdict
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.dispatch import Signal
+from utils.helpers import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Sent once per model after a flush commits: sender=model, pks=[...], fields={...}
+counters_flushed = Signal()
+
+
+DEFAULT_COUNTER_SETTINGS = {
+    'BACKEND': 'memory',
+    'SHARDS': 16,
+    'FLUSH_INTERVAL': 5,  # Seconds
+}
+
+
+def get_counter_settings():
+    """Merge COUNTER_SETTINGS from settings.py over the defaults."""
+    return {**DEFAULT_COUNTER_SETTINGS, **getattr(settings, 'COUNTER_SETTINGS', {})}
+
+
+def make_counter_key(instance, field):
+    """Build the buffer key for a model instance field, e.g. 'api.communitypost:12:likes_count'."""
+    return f"{instance._meta.label_lower}:{instance.pk}:{field}"
+
+
+class MemoryCounterBackend:
+    """
+    In-process counter shards, each guarded by its own lock.
+    Used for local development and when Redis is unavailable.
+    """
+
+    def __init__(self, shard_count):
+        self.shards = [defaultdict(int) for _ in range(shard_count)]
+        self.locks = [threading.Lock() for _ in range(shard_count)]
+        self.flushing = {}  # Drained deltas not yet committed, still counted by reads
+
+    def _shard_index(self, key):
+        return zlib.crc32(key.encode()) % len(self.shards)
+
+    def incr(self, key, delta):
+        index = self._shard_index(key)
+        with self.locks[index]:
+            self.shards[index][key] += delta
+
+    def get(self, key):
+        index = self._shard_index(key)
+        with self.locks[index]:
+            return self.shards[index].get(key, 0) + self.flushing.get(key, 0)
+
+    def get_many(self, keys):
+        return {key: self.get(key) for key in keys}
+
+    def drain(self):
+        """Take all pending deltas, leaving the shards empty."""
+        drained = self.flushing = {}
+        for index, lock in enumerate(self.locks):
+            with lock:
+                drained.update(self.shards[index])
+                self.shards[index] = defaultdict(int)
+        return drained
+
+    def confirm(self):
+        """Nothing to check: only this process drains its shards."""
+
+    def commit(self):
+        """Forget the drained deltas once they are in the database."""
+        self.flushing = {}
+
+    def rollback(self, drained):
+        """Put the drained deltas back so the next flush retries them."""
+        self.flushing = {}
+        for key, delta in drained.items():
+            self.incr(key, delta)
+
+
+class RedisCounterBackend:
+    """
+    Counter shards stored as Redis hashes (counters:pending:<n>).
+    Shared by every gunicorn and Celery worker.
+
+    Reads add the shard's :flushing hash, so counts stay whole while a
+    flush is between drain() and commit().
+    """
+
+    KEY_PREFIX = 'counters:pending'
+    LOCK_TIMEOUT = 60  # Seconds; a flush must commit within this window
+
+    def __init__(self, client, shard_count):
+        self.client = client
+        self.shard_count = shard_count
+        self._draining = None
+
+    def _shard_key(self, key):
+        return f"{self.KEY_PREFIX}:{zlib.crc32(key.encode()) % self.shard_count}"
+
+    def incr(self, key, delta):
+        self.client.hincrby(self._shard_key(key), key, delta)
+
+    def get(self, key):
+        return self.get_many([key])[key]
+
+    def get_many(self, keys):
+        """
+        Read several pending deltas in a single round trip: one HMGET per
+        shard and one per shard's :flushing hash.
+        """
+        by_shard = defaultdict(list)
+        for key in keys:
+            by_shard[self._shard_key(key)].append(key)
+
+        pipeline = self.client.pipeline(transaction=False)
+        for shard_key, shard_keys in by_shard.items():
+            pipeline.hmget(shard_key, shard_keys)
+            pipeline.hmget(f"{shard_key}:flushing", shard_keys)
+
+        results = iter(pipeline.execute())
+        pending = {}
+        for shard_keys in by_shard.values():
+            for key, value, flushing in zip(shard_keys, next(results), next(results)):
+                pending[key] = int(value or 0) + int(flushing or 0)
+        return pending
+
+    def drain(self):
+        """
+        Atomically hand each shard over to the flusher by renaming it,
+        so increments arriving during the flush land in a fresh hash.
+
+        The :flushing hashes and the drain lock are kept until commit(), so
+        a flush that fails (or a worker that dies) before the database
+        commits leaves them to be drained again by the next flush. The lock
+        expires after LOCK_TIMEOUT so a dead worker cannot hold it forever;
+        confirm() stops a flush that outlived it from committing the same
+        hashes another worker has drained since.
+        """
+        lock = self.client.lock(f"{self.KEY_PREFIX}:lock", timeout=self.LOCK_TIMEOUT)
+        if not lock.acquire(blocking=False):
+            # Another worker is draining right now
+            return {}
+
+        drained = defaultdict(int)
+        flushing_keys = []
+        try:
+            for index in range(self.shard_count):
+                shard_key = f"{self.KEY_PREFIX}:{index}"
+                flushing_key = f"{shard_key}:flushing"
+
+                if not self.client.exists(flushing_key):
+                    try:
+                        self.client.rename(shard_key, flushing_key)
+                    except Exception:
+                        # Shard is empty (RENAME on a missing key raises)
+                        continue
+
+                for key, value in self.client.hgetall(flushing_key).items():
+                    drained[key.decode()] += int(value)
+                flushing_keys.append(flushing_key)
+        except Exception:
+            lock.release()
+            raise
+
+        if not flushing_keys:
+            lock.release()
+            return {}
+
+        self._draining = (lock, flushing_keys)
+        return dict(drained)
+
+    def confirm(self):
+        """
+        Check the last drain is still ours right before its deltas commit,
+        renewing the lock for another LOCK_TIMEOUT to cover the commit.
+
+        Raises:
+            LockNotOwnedError: The lock expired and may have been taken over
+        """
+        lock, _ = self._draining
+        lock.reacquire()
+
+    def commit(self):
+        """Drop the hashes of the last drain once its deltas are in the database."""
+        lock, flushing_keys = self._draining
+        self._draining = None
+        try:
+            self.client.delete(*flushing_keys)
+        finally:
+            lock.release()
+
+    def rollback(self, drained):
+        """Keep the :flushing hashes for the next drain and let another worker take over."""
+        lock, _ = self._draining
+        self._draining = None
+        if lock.owned():
+            lock.release()
+
+
+class CounterService:
+    """Service for buffered counter increments and their periodic flush."""
+
+    _backend = None
+    _backend_lock = threading.Lock()
+    _flusher_started = False
+
+    @staticmethod
+    def get_backend():
+        """Get (and lazily create) the configured counter backend."""
+        if CounterService._backend is None:
+            with CounterService._backend_lock:
+                if CounterService._backend is None:
+                    config = get_counter_settings()
+                    client = get_redis_client() if config['BACKEND'] == 'redis' else None
+
+                    if client is not None:
+                        CounterService._backend = RedisCounterBackend(client, config['SHARDS'])
+                    else:
+                        CounterService._backend = MemoryCounterBackend(config['SHARDS'])
+                        CounterService._start_memory_flusher(config['FLUSH_INTERVAL'])
+
+        return CounterService._backend
+
+    @staticmethod
+    def increment(instance, field, delta=1):
+        """
+        Buffer an increment for a counter field.
+
+        Args:
+            instance: Model instance owning the counter
+            field: Counter field name (e.g. 'likes_count')
+            delta: Amount to add (negative to decrement)
+        """
+        CounterService.get_backend().incr(make_counter_key(instance, field), delta)
+
+    @staticmethod
+    def get_pending(instance, field):
+        """
+        Get the not-yet-flushed delta for a counter field.
+
+        Returns:
+            Pending delta (int)
+        """
+        return CounterService.get_backend().get(make_counter_key(instance, field))
+
+    @staticmethod
+    def get_value(instance, field):
+        """
+        Get a counter value including pending increments (read-your-writes).
+
+        Returns:
+            Stored value plus pending delta, never below zero
+        """
+        return max(0, (getattr(instance, field) or 0) + CounterService.get_pending(instance, field))
+
+    @staticmethod
+    def get_values(instances, fields):
+        """
+        Get counter values for a page of instances with one backend read.
+
+        Returns:
+            Dict of {pk: {field: value}}, each value never below zero
+        """
+        keys = {
+            (instance.pk, field): make_counter_key(instance, field)
+            for instance in instances for field in fields
+        }
+        pending = CounterService.get_backend().get_many(keys.values()) if keys else {}
+        values = defaultdict(dict)
+        for instance in instances:
+            for field in fields:
+                stored = getattr(instance, field) or 0
+                values[instance.pk][field] = max(0, stored + pending[keys[instance.pk, field]])
+        return dict(values)
+
+    @staticmethod
+    def flush():
+        """
+        Apply all pending increments with batched F() updates.
+        Rows that share the same deltas are updated in a single statement.
+        Drained deltas are only released by the backend once the updates
+        commit; on failure (including a drain lock that expired mid-flush)
+        they are handed back for the next flush.
+
+        Returns:
+            Number of rows updated
+        """
+        backend = CounterService.get_backend()
+        pending = backend.drain()
+        if not pending:
+            return 0
+
+        grouped = defaultdict(lambda: defaultdict(dict))
+        for key, delta in pending.items():
+            if not delta:
+                continue
+            label, pk, field = key.split(':')
+            grouped[label][int(pk)][field] = delta
+
+        updated = 0
+        try:
+            with transaction.atomic():
+                for label, rows in grouped.items():
+                    model = apps.get_model(label)
+
+                    batches = defaultdict(list)
+                    for pk, deltas in rows.items():
+                        batches[tuple(sorted(deltas.items()))].append(pk)
+
+                    for deltas, pks in batches.items():
+                        updated += model.objects.filter(pk__in=sorted(pks)).update(**{
+                            field: Greatest(F(field) + delta, Value(0))
+                            for field, delta in deltas
+                        })
+
+                    fields = {field for deltas in rows.values() for field in deltas}
+                    transaction.on_commit(
+                        lambda model=model, pks=list(rows), fields=fields: counters_flushed.send(
+                            sender=model, pks=pks, fields=fields
+                        )
+                    )
+
+                backend.confirm()
+        except Exception as e:
+            backend.rollback(pending)
+            logger.error(f"Error flushing counters: {str(e)}")
+            raise
+
+        backend.commit()
+        logger.debug(f"Flushed {len(pending)} counter deltas into {updated} rows")
+        return updated
+
+    @staticmethod
+    def like(user, obj, like_model, target_field):
+        """
+        Like an object once per user.
+        Deduplication relies on a unique (user, <target_field>) pair on
+        like_model, so concurrent requests record (and count) one like.
+
+        Args:
+            user: User liking the object
+            obj: Object owning the likes_count counter
+            like_model: Model recording one row per like (e.g. PostLike)
+            target_field: Foreign key on like_model pointing at obj
+
+        Returns:
+            True if a new like was recorded, False if already liked
+        """
+        _, created = like_model.objects.get_or_create(user=user, **{target_field: obj})
+        if created:
+            CounterService.increment(obj, 'likes_count')
+        return created
+
+    @staticmethod
+    def unlike(user, obj, like_model, target_field):
+        """
+        Remove a user's like from an object.
+        Only the request whose DELETE removed the row decrements the counter.
+
+        Returns:
+            True if a like was removed, False if there was none
+        """
+        deleted, _ = like_model.objects.filter(user=user, **{target_field: obj}).delete()
+        if deleted:
+            CounterService.increment(obj, 'likes_count', -1)
+        return bool(deleted)
+
+    @staticmethod
+    def like_post(user, post):
+        """
+        Like a community post once per user (PostLike (user, post) pair).
+
+        Returns:
+            True if a new like was recorded, False if already liked
+        """
+        from api.models import PostLike
+
+        return CounterService.like(user, post, PostLike, 'post')
+
+    @staticmethod
+    def unlike_post(user, post):
+        """
+        Remove a user's like from a community post.
+
+        Returns:
+            True if a like was removed, False if there was none
+        """
+        from api.models import PostLike
+
+        return CounterService.unlike(user, post, PostLike, 'post')
+
+    @staticmethod
+    def _start_memory_flusher(interval):
+        """Start a daemon thread flushing the in-process shards every `interval` seconds."""
+        if not interval or CounterService._flusher_started:
+            return
+        CounterService._flusher_started = True
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    CounterService.flush()
+                except Exception as e:
+                    logger.error(f"Counter flusher error: {str(e)}")
+                finally:
+                    close_old_connections()
+
+        threading.Thread(target=run, name='counter-flusher', daemon=True).start()
@@ -0,0 +1,227 @@
+"""
+Personalized community feed with fan-out-on-write.
+
+Each user has a capped timeline of post IDs (a Redis sorted set scored by
+post ID, or an in-process deque when Redis is not configured). New posts
+are pushed to the author's followers and to users sharing the author's
+skills. Authors with very many followers are not fanned out; their posts
+are pulled at read time instead.
+"""
+
+import logging
+import threading
+from collections import defaultdict, deque
+from itertools import islice
+from django.conf import settings
+from django.db.models import Max, Q
+from utils.helpers import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_FEED_SETTINGS = {
+    'BACKEND': 'memory',
+    'MAX_LENGTH': 500,  # Post IDs kept per timeline
+    'POPULAR_AUTHOR_FOLLOWERS': 1000,  # Above this, followers pull instead of receiving pushes
+    'SKILL_MATCH_LIMIT': 200,  # Max skill-matched users pushed per post
+}
+
+
+def get_feed_settings():
+    """Merge FEED_SETTINGS from settings.py over the defaults."""
+    return {**DEFAULT_FEED_SETTINGS, **getattr(settings, 'FEED_SETTINGS', {})}
+
+
+class MemoryFeedBackend:
+    """In-process timelines for local development and when Redis is unavailable."""
+
+    def __init__(self, max_length):
+        self.max_length = max_length
+        self.timelines = defaultdict(lambda: deque(maxlen=self.max_length))
+        self.popular_authors = set()
+        self.lock = threading.Lock()
+
+    def push(self, user_ids, post_id):
+        with self.lock:
+            for user_id in user_ids:
+                self.timelines[user_id].appendleft(post_id)
+
+    def range(self, user_id, before=None, limit=None):
+        with self.lock:
+            timeline = self.timelines.get(user_id, ())
+            return list(islice(
+                (post_id for post_id in timeline if before is None or post_id < before), limit
+            ))
+
+    def mark_popular(self, author_id, popular):
+        with self.lock:
+            if popular:
+                self.popular_authors.add(author_id)
+            else:
+                self.popular_authors.discard(author_id)
+
+    def get_popular(self):
+        with self.lock:
+            return set(self.popular_authors)
+
+
+class RedisFeedBackend:
+    """
+    Timelines stored as capped Redis sorted sets (feed:timeline:<user_id>)
+    scored by post ID, so a page is one bounded ZREVRANGEBYSCORE.
+    """
+
+    KEY_PREFIX = 'feed:timeline'
+    POPULAR_KEY = 'feed:popular_authors'
+
+    def __init__(self, client, max_length):
+        self.client = client
+        self.max_length = max_length
+
+    def push(self, user_ids, post_id):
+        pipe = self.client.pipeline(transaction=False)
+        for user_id in user_ids:
+            key = f"{self.KEY_PREFIX}:{user_id}"
+            pipe.zadd(key, {post_id: post_id})
+            # Drop the oldest entries beyond max_length
+            pipe.zremrangebyrank(key, 0, -self.max_length - 1)
+        pipe.execute()
+
+    def range(self, user_id, before=None, limit=None):
+        post_ids = self.client.zrevrangebyscore(
+            f"{self.KEY_PREFIX}:{user_id}",
+            '+inf' if before is None else f"({before}",
+            '-inf',
+            start=0 if limit is not None else None,
+            num=limit,
+        )
+        return [int(post_id) for post_id in post_ids]
+
+    def mark_popular(self, author_id, popular):
+        if popular:
+            self.client.sadd(self.POPULAR_KEY, author_id)
+        else:
+            self.client.srem(self.POPULAR_KEY, author_id)
+
+    def get_popular(self):
+        return {int(author_id) for author_id in self.client.smembers(self.POPULAR_KEY)}
+
+
+class FeedService:
+    """Service for writing and reading personalized community feeds."""
+
+    _backend = None
+    _backend_lock = threading.Lock()
+
+    @staticmethod
+    def get_backend():
+        """Get (and lazily create) the configured feed backend."""
+        if FeedService._backend is None:
+            with FeedService._backend_lock:
+                if FeedService._backend is None:
+                    config = get_feed_settings()
+                    client = get_redis_client() if config['BACKEND'] == 'redis' else None
+
+                    if client is not None:
+                        FeedService._backend = RedisFeedBackend(client, config['MAX_LENGTH'])
+                    else:
+                        FeedService._backend = MemoryFeedBackend(config['MAX_LENGTH'])
+
+        return FeedService._backend
+
+    @staticmethod
+    def get_audience(post):
+        """
+        Get the users a new post should be pushed to.
+
+        Args:
+            post: CommunityPost instance
+
+        Returns:
+            Tuple (set of user IDs, whether the author is popular)
+        """
+        from api.models import UserFollow, UserSkill
+
+        config = get_feed_settings()
+        follower_ids = set(
+            UserFollow.objects.filter(following_id=post.user_id).values_list('follower_id', flat=True)
+        )
+        popular = len(follower_ids) >= config['POPULAR_AUTHOR_FOLLOWERS']
+
+        # Popular authors' followers pull on read, so only push to skill matches
+        audience = set() if popular else follower_ids
+
+        author_skills = UserSkill.objects.filter(user_id=post.user_id).values('skill_id')
+        # One row per user (their best matching skill), so the limit counts users
+        audience.update(
+            UserSkill.objects.filter(skill_id__in=author_skills)
+            .exclude(user_id=post.user_id)
+            .values('user_id')
+            .annotate(best_level=Max('proficiency_level'))
+            .order_by('-best_level', 'user_id')
+            .values_list('user_id', flat=True)[:config['SKILL_MATCH_LIMIT']]
+        )
+
+        # Authors always see their own posts
+        audience.add(post.user_id)
+        return audience, popular
+
+    @staticmethod
+    def publish(post):
+        """
+        Fan a new post out to its audience's timelines.
+
+        Args:
+            post: CommunityPost instance
+
+        Returns:
+            Number of timelines written
+        """
+        audience, popular = FeedService.get_audience(post)
+        backend = FeedService.get_backend()
+        backend.mark_popular(post.user_id, popular)
+        backend.push(audience, post.id)
+
+        logger.debug(f"Fanned out post {post.id} to {len(audience)} timelines")
+        return len(audience)
+
+    @staticmethod
+    def get_feed(user, before=None, limit=20, queryset=None):
+        """
+        Read a page of a user's feed: one bounded timeline read plus one
+        hydration query that also pulls posts from followed popular authors.
+
+        Args:
+            user: User instance
+            before: Only return posts with an ID lower than this (cursor)
+            limit: Page size
+            queryset: Base CommunityPost queryset for hydration (e.g. with prefetches)
+
+        Returns:
+            List of CommunityPost instances, newest first
+        """
+        from api.models import CommunityPost, UserFollow
+
+        backend = FeedService.get_backend()
+        post_ids = backend.range(user.id, before=before, limit=limit)
+
+        condition = Q(id__in=post_ids)
+
+        popular = backend.get_popular()
+        if popular:
+            pulled = Q(
+                user_id__in=UserFollow.objects.filter(
+                    follower=user, following_id__in=popular
+                ).values('following_id')
+            )
+            if before is not None:
+                pulled &= Q(id__lt=before)
+            condition |= pulled
+
+        if not post_ids and not popular:
+            return []
+
+        if queryset is None:
+            queryset = CommunityPost.objects.select_related('user')
+
+        return list(queryset.filter(condition).order_by('-id')[:limit])
@@ -0,0 +1,191 @@
+"""
+Chunked bulk email delivery (digests, reports).
+
+send_bulk() streams recipients from a queryset in primary-key chunks of
+CHUNK_SIZE, so memory holds one chunk of users and messages at a time. Each
+chunk's messages are rendered by WORKERS threads (rendering usually queries
+per user), then sent over one SMTP connection kept open for the whole run
+instead of one connection per batch.
+
+A user whose message fails to render is skipped and counted, as is a message
+the server refuses (recipient, sender or data error). A dropped connection
+reconnects and resumes the chunk at the message that failed, up to RETRIES
+attempts with exponential backoff; only the remaining messages of that chunk
+count as failed, and the run continues with the next chunk. Results are
+counted per campaign in bulk_emails_total and timed per chunk in
+bulk_email_chunk_duration_seconds.
+"""
+
+import contextvars
+import logging
+import smtplib
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import connection as db_connection, connections
+from .metrics import BULK_EMAIL_CHUNK_DURATION, BULK_EMAILS
+
+logger = logging.getLogger(__name__)
+
+# Refusals of one message (bad recipient, sender or content); the session stays usable
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+# The connection itself went away: reconnect and resume
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, OSError)
+
+DEFAULT_BULK_EMAIL_SETTINGS = {
+    'CHUNK_SIZE': 200,  # Recipients loaded, rendered and sent per chunk
+    'WORKERS': 4,  # Render threads, each with its own database connection
+    'RETRIES': 3,  # Send attempts per chunk
+    'RETRY_DELAY': 5,  # Seconds before the first retry, doubled after each
+}
+
+
+def get_bulk_email_settings():
+    """Merge BULK_EMAIL_SETTINGS from settings.py over the defaults."""
+    return {**DEFAULT_BULK_EMAIL_SETTINGS, **getattr(settings, 'BULK_EMAIL_SETTINGS', {})}
+
+
+def iterate_chunks(queryset, chunk_size):
+    """Yield lists of rows in primary-key order, one chunk query at a time (no OFFSET)."""
+    last_pk = None
+    while True:
+        page = queryset.order_by('pk')
+        if last_pk is not None:
+            page = page.filter(pk__gt=last_pk)
+        chunk = list(page[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1].pk
+
+
+def _render(users, build):
+    """Build each user's message: (messages, number of users whose build failed)."""
+    messages, failed = [], 0
+    for user in users:
+        try:
+            message = build(user)
+        except Exception as e:
+            failed += 1
+            logger.warning(f"Error preparing email for user {user.pk}: {str(e)}")
+            continue
+        if message is not None:
+            messages.append(message)
+    return messages, failed
+
+
+def _render_concurrently(executor, users, build, workers):
+    def run(part):
+        try:
+            return _render(part, build)
+        finally:
+            connections.close_all()  # The worker thread's own connections
+
+    # Each slice runs in a copy of the caller's context, keeping its replica routing
+    futures = [
+        executor.submit(contextvars.copy_context().run, run, users[index::workers]) for index in range(workers)
+    ]
+    messages, failed = [], 0
+    for future in futures:
+        part_messages, part_failed = future.result()
+        messages.extend(part_messages)
+        failed += part_failed
+    return messages, failed
+
+
+def _send_chunk(mail_connection, messages, config):
+    """
+    Send messages in order: (sent, failed).
+    A message the server refuses is counted failed and the chunk goes on; a
+    dropped connection reconnects and resumes at the message that failed.
+    """
+    sent = rejected = position = 0
+    delay = config['RETRY_DELAY']
+    for attempt in range(1, config['RETRIES'] + 1):
+        try:
+            if messages:
+                mail_connection.open()  # No-op while the connection is up
+            while position < len(messages):
+                message = messages[position]
+                try:
+                    mail_connection.send_messages([message])
+                except MESSAGE_ERRORS as e:
+                    rejected += 1
+                    logger.warning(f"Email to {', '.join(message.recipients())} rejected: {str(e)}")
+                else:
+                    sent += 1
+                position += 1
+            return sent, rejected
+        except CONNECTION_ERRORS as e:
+            logger.warning(f"Bulk email send failed (attempt {attempt}/{config['RETRIES']}): {str(e)}")
+            try:
+                mail_connection.close()
+            except Exception:
+                pass
+            if attempt < config['RETRIES']:
+                time.sleep(delay)
+                delay *= 2
+    return sent, rejected + len(messages) - position
+
+
+def send_bulk(campaign, users, build, connection=None):
+    """
+    Render and send one email per user, chunk by chunk.
+
+    Args:
+        campaign: Label for logs and metrics ('daily_digest')
+        users: QuerySet of recipients (iterated in primary-key order)
+        build: Callable(user) returning an EmailMessage, or None to skip the user
+        connection: Mail backend connection (default: a new one from EMAIL_BACKEND)
+
+    Returns:
+        Dict with sent, failed, skipped, chunks and seconds
+    """
+    config = get_bulk_email_settings()
+    mail_connection = connection or get_connection()
+    # Worker threads cannot see the caller's uncommitted rows
+    workers = 1 if db_connection.in_atomic_block else max(1, config['WORKERS'])
+    totals = Counter()
+    start = time.monotonic()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for chunk in iterate_chunks(users, config['CHUNK_SIZE']):
+                chunk_start = time.monotonic()
+                if workers > 1:
+                    messages, render_failed = _render_concurrently(executor, chunk, build, workers)
+                else:
+                    messages, render_failed = _render(chunk, build)
+                BULK_EMAIL_CHUNK_DURATION.labels(campaign, 'render').observe(time.monotonic() - chunk_start)
+
+                send_start = time.monotonic()
+                sent, send_failed = _send_chunk(mail_connection, messages, config)
+                BULK_EMAIL_CHUNK_DURATION.labels(campaign, 'send').observe(time.monotonic() - send_start)
+
+                chunk_totals = {
+                    'sent': sent,
+                    'failed': render_failed + send_failed,
+                    'skipped': len(chunk) - len(messages) - render_failed,
+                }
+                for result, count in chunk_totals.items():
+                    if count:
+                        BULK_EMAILS.labels(campaign, result).inc(count)
+                totals.update(chunk_totals)
+                totals['chunks'] += 1
+    finally:
+        mail_connection.close()
+
+    seconds = time.monotonic() - start
+    logger.info(
+        f"Bulk email {campaign}: {totals['sent']} sent, {totals['failed']} failed, {totals['skipped']} skipped "
+        f"in {totals['chunks']} chunks, {seconds:.1f}s ({totals['sent'] / seconds if seconds else 0:.1f}/s)"
+    )
+    return {
+        'sent': totals['sent'],
+        'failed': totals['failed'],
+        'skipped': totals['skipped'],
+        'chunks': totals['chunks'],
+        'seconds': seconds,
+    }
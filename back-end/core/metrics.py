@@ -0,0 +1,260 @@
+"""
+Prometheus metrics for the API, the cache and Celery.
+
+MetricsMiddleware records request latency, status codes and SQL query counts
+per route; the Instrumented*Cache backends count hits and misses for the
+named key spaces in METRICS_SETTINGS['CACHES']; core.caching times its
+read-through lookups by result and its recomputations; Celery signals record
+task runtimes; queue depths are read from the broker at scrape time.
+
+Under gunicorn (or Celery prefork) set PROMETHEUS_MULTIPROC_DIR to a shared,
+empty directory before the processes start: every worker then writes its
+samples to mmap files there and metrics_view() aggregates them on scrape.
+"""
+
+import hmac
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+from django.db import connections
+from django_redis.cache import RedisCache as DjangoRedisCache
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from prometheus_client.core import GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_SETTINGS = {
+    'ENABLED': True,
+    'AUTH_TOKEN': '',  # Require "Authorization: Bearer <token>" on /metrics; unset = DEBUG only
+    'CELERY_QUEUES': ['celery'],  # Queues whose depth is reported
+    'CELERY_PORT': 0,  # Port for the Celery worker's own /metrics; 0 = off
+    # Named cache key spaces whose hit ratio is reported, by key prefix
+    'CACHES': {
+        'recommendation': (
+            'user_recommendations:', 'user_job_recommendations:', 'user_course_recommendations:',
+            'user_mentor_recommendations:', 'user_skill_recommendations:', 'user_connection_recommendations:',
+        ),
+        'analytics': (
+            'platform_stats', 'skill_analytics', 'course_analytics', 'job_analytics', 'mentoring_analytics',
+            'user_stats:', 'trending_skills', 'skill_demand', 'activity_heatmap', 'user_growth', 'daily_report', 'analytics_snapshot:',
+        ),
+        'leaderboard': ('achievement_leaderboard',),
+    },
+}
+
+LATENCY_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+CACHE_BUCKETS = (.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+TASK_BUCKETS = (.01, .05, .1, .5, 1, 5, 10, 30, 60, 300, 1800)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency by route', ['method', 'route'], buckets=LATENCY_BUCKETS
+)
+REQUESTS = Counter('http_requests', 'Requests by route and status code', ['method', 'route', 'status'])
+REQUEST_QUERIES = Histogram(
+    'http_request_db_queries', 'SQL queries per request by route', ['method', 'route'], buckets=QUERY_BUCKETS
+)
+CACHE_REQUESTS = Counter('cache_requests', 'Cache lookups by key space and result', ['cache', 'result'])
+CACHE_LOOKUP_LATENCY = Histogram(
+    'cached_lookup_duration_seconds', 'Read-through cache lookups by cache and result (hit, early, stale, miss, invalidated)',
+    ['cache', 'result'], buckets=CACHE_BUCKETS
+)
+CACHE_RECOMPUTE_LATENCY = Histogram(
+    'cache_recompute_duration_seconds', 'Time spent recomputing cached values', ['cache'], buckets=TASK_BUCKETS
+)
+TASK_DURATION = Histogram(
+    'celery_task_duration_seconds', 'Celery task runtime', ['task', 'state'], buckets=TASK_BUCKETS
+)
+PUSH_STREAMS = Gauge('push_open_streams', 'Open notification event streams', multiprocess_mode='livesum')
+PUSH_EVENTS = Counter('push_events', 'Events published to notification streams')
+BULK_EMAILS = Counter('bulk_emails', 'Bulk email recipients by campaign and result', ['campaign', 'result'])
+BULK_EMAIL_CHUNK_DURATION = Histogram(
+    'bulk_email_chunk_duration_seconds', 'Time to render or send one bulk email chunk', ['campaign', 'stage'],
+    buckets=TASK_BUCKETS
+)
+
+
+def get_metrics_settings():
+    """Merge METRICS_SETTINGS from settings.py over the defaults."""
+    return {**DEFAULT_METRICS_SETTINGS, **getattr(settings, 'METRICS_SETTINGS', {})}
+
+
+def route_name(request):
+    """Low-cardinality route label: the URL name ('user-detail'), never the raw path."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route or 'unnamed'
+
+
+# ==================== DB QUERIES ====================
+
+class QueryCounter:
+    """execute_wrapper that only counts queries (no SQL capture, unlike QueryRecorder)."""
+
+    def __init__(self):
+        self.count = 0
+        self._wrappers = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        for connection in connections.all():
+            wrapper = connection.execute_wrapper(self)
+            wrapper.__enter__()
+            self._wrappers.append(wrapper)
+        return self
+
+    def __exit__(self, *exc_info):
+        while self._wrappers:
+            self._wrappers.pop().__exit__(*exc_info)
+
+
+# ==================== CACHE ====================
+
+class InstrumentedCacheMixin:
+    """Count hits and misses on get() for the key spaces in METRICS_SETTINGS['CACHES']."""
+
+    _missing = object()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._key_spaces = [
+            (name, tuple(prefixes)) for name, prefixes in get_metrics_settings()['CACHES'].items()
+        ]
+
+    def key_space(self, key):
+        if isinstance(key, str):
+            for name, prefixes in self._key_spaces:
+                if key.startswith(prefixes):
+                    return name
+        return None
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, self._missing, version)
+        name = self.key_space(key)
+        if name:
+            CACHE_REQUESTS.labels(name, 'miss' if value is self._missing else 'hit').inc()
+        return default if value is self._missing else value
+
+    def get_many(self, keys, version=None):
+        values = super().get_many(keys, version)
+        for key in keys:
+            name = self.key_space(key)
+            if name:
+                CACHE_REQUESTS.labels(name, 'hit' if key in values else 'miss').inc()
+        return values
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    pass
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    pass
+
+
+class InstrumentedDjangoRedisCache(InstrumentedCacheMixin, DjangoRedisCache):
+    pass
+
+
+# ==================== CELERY ====================
+
+_task_started = {}
+
+
+def _task_prerun(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        TASK_DURATION.labels(task.name, state or 'UNKNOWN').observe(time.perf_counter() - started)
+
+
+def _worker_ready(**kwargs):
+    port = get_metrics_settings()['CELERY_PORT']
+    if port:
+        from prometheus_client import start_http_server
+        start_http_server(port, registry=scrape_registry())
+        logger.info(f"Serving Celery metrics on port {port}")
+
+
+def _worker_process_shutdown(**kwargs):
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def instrument_celery():
+    """Connect the Celery signal handlers (task runtimes, worker /metrics)."""
+    from celery import signals
+    signals.task_prerun.connect(_task_prerun, weak=False)
+    signals.task_postrun.connect(_task_postrun, weak=False)
+    signals.worker_ready.connect(_worker_ready, weak=False)
+    signals.worker_process_shutdown.connect(_worker_process_shutdown, weak=False)
+
+
+class CeleryQueueCollector:
+    """Reports broker queue depths when scraped."""
+
+    def collect(self):
+        depth = GaugeMetricFamily('celery_queue_length', 'Messages waiting in the Celery queue', labels=['queue'])
+        try:
+            from tasks.celery import app
+            with app.connection_for_read() as connection:
+                connection.ensure_connection(max_retries=1)
+                for queue in get_metrics_settings()['CELERY_QUEUES']:
+                    depth.add_metric([queue], self.queue_length(connection, queue))
+        except Exception as e:
+            logger.debug(f"Could not read Celery queue depths: {str(e)}")
+        yield depth
+
+    @staticmethod
+    def queue_length(connection, queue):
+        # A fresh channel per queue: a failed passive declare closes the channel on AMQP
+        with connection.channel() as channel:
+            try:
+                return channel.queue_declare(queue=queue, passive=True).message_count
+            except Exception:
+                return 0  # The broker drops empty queues (Redis deletes empty lists)
+
+
+# ==================== EXPOSITION ====================
+
+def scrape_registry():
+    """The registry to expose: aggregated over processes in multiprocess mode."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return registry
+
+
+def metrics_view(request):
+    """Prometheus text exposition of the API, cache and Celery metrics."""
+    config = get_metrics_settings()
+    token = config['AUTH_TOKEN']
+    if not token:
+        # Without a token only local development may scrape
+        if not settings.DEBUG:
+            return HttpResponse('Forbidden: set METRICS_TOKEN', status=403, content_type='text/plain')
+    elif not hmac.compare_digest(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}'):
+        return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+
+    registry = scrape_registry()
+    output = generate_latest(registry)
+    queues = CollectorRegistry()
+    queues.register(CeleryQueueCollector())
+    output += generate_latest(queues)
+    return HttpResponse(output, content_type=CONTENT_TYPE_LATEST)
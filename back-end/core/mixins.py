@@ -1,7 +1,11 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from django.core.exceptions import ImproperlyConfigured
 from django.shortcuts import get_object_or_404
+from .counters import CounterService
+from .reference import get_or_set, invalidate_model
 
 
 class OwnerFilterMixin:
@@ -41,32 +45,115 @@ class UpdateTimestampMixin:
 class LikeDislikeMixin:
     """
     Mixin to handle like/dislike functionality.
-    Subclass must implement get_object() and have a model with likes_count.
+    Subclass must implement get_object(), have a model with likes_count and
+    set like_model to a model with a unique (user, like_target_field) pair,
+    e.g. like_model = PostLike, like_target_field = 'post'.
+    Increments go through CounterService instead of saving the whole row.
     """
-    
-    @action(detail=True, methods=['post'])
+    like_model = None
+    like_target_field = None
+
+    def get_like_model(self):
+        if self.like_model is None or self.like_target_field is None:
+            raise ImproperlyConfigured(
+                f"{type(self).__name__} must set like_model and like_target_field"
+            )
+        return self.like_model
+
+    @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def like(self, request, *args, **kwargs):
-        """Like an object"""
+        """Like an object (once per user)"""
         obj = self.get_object()
-        obj.likes_count = (obj.likes_count or 0) + 1
-        obj.save()
+        liked = CounterService.like(request.user, obj, self.get_like_model(), self.like_target_field)
         return Response({
-            'status': 'liked',
-            'likes_count': obj.likes_count
+            'liked': liked,
+            'likes_count': CounterService.get_value(obj, 'likes_count')
         })
 
-    @action(detail=True, methods=['post'])
+    @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def unlike(self, request, *args, **kwargs):
-        """Unlike an object"""
+        """Remove the current user's like from an object"""
+        obj = self.get_object()
+        unliked = CounterService.unlike(request.user, obj, self.get_like_model(), self.like_target_field)
+        return Response({
+            'unliked': unliked,
+            'likes_count': CounterService.get_value(obj, 'likes_count')
+        })
+
+
+class RatingMixin:
+    """
+    Mixin to rate objects and list the top-rated ones.
+    Subclass must use a model inheriting from core.models.RatableModel and
+    set rating_model to its per-user vote model, e.g.
+    rating_model = CourseRating, rating_target_field = 'course'.
+    """
+    rating_model = None
+    rating_target_field = None
+
+    @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
+    def rate(self, request, *args, **kwargs):
+        """Rate an object (1-5); rating again replaces the user's vote"""
+        if self.rating_model is None or self.rating_target_field is None:
+            raise ImproperlyConfigured(
+                f"{type(self).__name__} must set rating_model and rating_target_field"
+            )
+
+        try:
+            score = float(request.data.get('rating'))
+        except (TypeError, ValueError):
+            score = None
+        
+        if score is None or not 1 <= score <= 5:
+            return Response(
+                {'error': 'Rating must be a number between 1 and 5'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         obj = self.get_object()
-        if obj.likes_count > 0:
-            obj.likes_count -= 1
-            obj.save()
+        created = obj.rate(request.user, score, self.rating_model, self.rating_target_field)
+        invalidate_model(type(obj))  # update_rating() bypasses save signals
         return Response({
-            'status': 'unliked',
-            'likes_count': obj.likes_count
+            'status': 'rated' if created else 'updated',
+            'rating': obj.rating,
+            'total_ratings': obj.total_ratings
         })
 
+    @action(detail=False, methods=['get'])
+    def top(self, request):
+        """Get top-rated objects by ranking score"""
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), 100)
+        except ValueError:
+            limit = 10
+        # filter_queryset() applies query-param filters and the prefetch plan
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.model.top_rated(limit, queryset=queryset)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+
+class ReferenceListMixin:
+    """
+    Serve unfiltered list requests from the two-tier reference cache.
+    The cached value is the filtered, prefetched list of model instances, so
+    serialization still sees the request. Set reference_key and invalidate it
+    with core.reference.invalidate_on_change() for the model.
+    """
+    reference_key = None
+
+    def list(self, request, *args, **kwargs):
+        paginator = self.paginator
+        page_params = {getattr(paginator, 'page_query_param', None), getattr(paginator, 'page_size_query_param', None)}
+        if self.reference_key is None or set(request.query_params) - page_params:
+            return super().list(request, *args, **kwargs)
+
+        objects = get_or_set(self.reference_key, lambda: list(self.filter_queryset(self.get_queryset())))
+        page = self.paginate_queryset(objects)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(objects, many=True).data)
+
 
 class BulkActionMixin:
     """
@@ -121,7 +208,11 @@ class SearchFilterMixin:
         queryset = super().get_queryset()
         search_term = self.request.query_params.get('search')
         
-        if search_term and hasattr(self, 'search_fields'):
+        if search_term and hasattr(queryset.model, 'search_document'):
+            # Full-text indexed models: ranked tsvector / FTS5 search
+            from .search import SearchService
+            queryset = SearchService.search(queryset, search_term)
+        elif search_term and hasattr(self, 'search_fields'):
             from django.db.models import Q
             q_objects = Q()
             for field in self.search_fields:
@@ -1,5 +1,9 @@
-from django.db import models
+from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
+from django.db.models import F
 from django.utils import timezone
+from .counters import CounterService
 
 
 class TimeStampedModel(models.Model):
@@ -55,8 +59,25 @@ class StatusModel(models.Model):
         abstract = True
 
 
+def get_rating_prior():
+    """Get (prior_mean, prior_weight) for Bayesian ranking from RATING_SETTINGS."""
+    rating_settings = getattr(settings, 'RATING_SETTINGS', {})
+    return rating_settings.get('PRIOR_MEAN', 3.0), rating_settings.get('PRIOR_WEIGHT', 5)
+
+
+def default_ranking_score():
+    """Unrated objects rank at the prior mean, below well-rated and above poorly rated ones."""
+    return get_rating_prior()[0]
+
+
 class RatableModel(models.Model):
-    """Base model for rateable content"""
+    """
+    Base model for rateable content.
+    Sum and count are updated atomically with F() expressions and the
+    average plus a Bayesian ranking score are derived in the same UPDATE.
+    Votes are recorded one per user in a vote model with a unique
+    (user, <target field>) pair and a score field; see rate().
+    """
     rating = models.FloatField(
         default=0,
         help_text="Average rating score"
@@ -65,19 +86,88 @@ class RatableModel(models.Model):
         default=0,
         help_text="Total number of ratings"
     )
+    rating_sum = models.FloatField(
+        default=0,
+        help_text="Sum of all rating votes"
+    )
+    ranking_score = models.FloatField(
+        default=default_ranking_score,
+        db_index=True,
+        help_text="Bayesian average used to order top-rated lists"
+    )
 
     class Meta:
         abstract = True
 
-    def update_rating(self, new_rating):
-        """Update rating with new vote"""
-        self.total_ratings += 1
-        self.rating = (self.rating * (self.total_ratings - 1) + new_rating) / self.total_ratings
-        self.save()
+    def update_rating(self, new_rating, replaces=None):
+        """
+        Add a vote (or change one) without a read-modify-write of the row.
+
+        Args:
+            new_rating: Score of the vote
+            replaces: Previous score of the same voter, whose vote is swapped
+                out instead of counting a new one
+        """
+        prior_mean, prior_weight = get_rating_prior()
+        new_sum = F('rating_sum') + (new_rating - (replaces or 0))
+        new_count = F('total_ratings') + (0 if replaces is not None else 1)
+
+        # Right-hand sides see the pre-update row, so all four columns stay consistent
+        type(self).objects.filter(pk=self.pk).update(
+            rating_sum=new_sum,
+            total_ratings=new_count,
+            rating=new_sum / new_count,
+            ranking_score=(new_sum + prior_mean * prior_weight) / (new_count + prior_weight),
+        )
+        self.refresh_from_db(fields=['rating', 'total_ratings', 'rating_sum', 'ranking_score'])
+
+    def rate(self, user, score, vote_model, target_field):
+        """
+        Record a user's vote, replacing their previous one.
+        The vote row is locked so concurrent re-votes by the same user
+        each swap out the score they actually replaced.
+
+        Args:
+            user: Voting user
+            score: Rating (1-5)
+            vote_model: Model with user, score and a unique (user, target_field) pair
+            target_field: Foreign key on vote_model pointing at this object
+
+        Returns:
+            True if this was the user's first vote
+        """
+        with transaction.atomic():
+            vote, created = vote_model.objects.select_for_update().get_or_create(
+                user=user, defaults={'score': score}, **{target_field: self}
+            )
+            if created:
+                self.update_rating(score)
+            elif vote.score != score:
+                previous, vote.score = vote.score, score
+                vote.save(update_fields=['score'])
+                self.update_rating(score, replaces=previous)
+        return created
+
+    @classmethod
+    def top_rated(cls, limit=10, queryset=None):
+        """Get the best-ranked objects (index scan on ranking_score)"""
+        queryset = cls.objects.all() if queryset is None else queryset
+        return queryset.filter(total_ratings__gt=0).order_by('-ranking_score')[:limit]
+
+    @classmethod
+    def recompute_ranking_scores(cls):
+        """Recompute every ranking score in one UPDATE (e.g. after changing the prior)"""
+        prior_mean, prior_weight = get_rating_prior()
+        return cls.objects.update(
+            ranking_score=(F('rating_sum') + prior_mean * prior_weight) / (F('total_ratings') + prior_weight)
+        )
 
 
 class CountableModel(models.Model):
-    """Base model for countable metrics (likes, views, etc.)"""
+    """
+    Base model for countable metrics (likes, views, etc.)
+    Increments are buffered by CounterService and flushed in batches.
+    """
     views_count = models.IntegerField(default=0)
     likes_count = models.IntegerField(default=0)
 
@@ -86,16 +176,33 @@ class CountableModel(models.Model):
 
     def increment_views(self):
         """Increment view count"""
-        self.views_count += 1
-        self.save(update_fields=['views_count'])
+        CounterService.increment(self, 'views_count')
 
     def increment_likes(self):
         """Increment like count"""
-        self.likes_count += 1
-        self.save(update_fields=['likes_count'])
+        CounterService.increment(self, 'likes_count')
 
     def decrement_likes(self):
-        """Decrement like count"""
-        if self.likes_count > 0:
-            self.likes_count -= 1
-            self.save(update_fields=['likes_count'])
+        """Decrement like count (never below zero once flushed)"""
+        CounterService.increment(self, 'likes_count', -1)
+
+    def get_counter_value(self, field):
+        """Get a counter value including increments not yet flushed"""
+        return CounterService.get_value(self, field)
+
+
+class SearchableModel(models.Model):
+    """
+    Base model for full-text searchable content.
+    Subclasses set search_document ({field: weight}, 'A' ranks highest) and
+    optionally search_filter_fields; a migration installs the triggers from a
+    frozen copy of core.search.install_search_triggers(). Query through
+    SearchService.
+    """
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    search_document = {}
+    search_filter_fields = ()
+
+    class Meta:
+        abstract = True
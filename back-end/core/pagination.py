@@ -0,0 +1,172 @@
+"""
+Keyset (cursor) pagination for large list endpoints.
+
+Pages are selected with WHERE (key, id) < (last_key, last_id) on a composite
+index instead of COUNT(*) + OFFSET, so every page costs the same regardless
+of depth. Totals are opt-in and come from planner statistics.
+"""
+
+import base64
+import json
+import logging
+from django.db import connections
+from django.db.models import Q
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_count(queryset):
+    """
+    Estimate the number of rows a queryset returns without running COUNT(*).
+    Uses pg_class.reltuples for unfiltered tables and the planner's row
+    estimate otherwise; other databases fall back to an exact count.
+
+    Returns:
+        Estimated row count (int)
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    queryset = queryset.order_by()
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+            # reltuples is -1 for tables never analyzed
+            if row and row[0] >= 0:
+                return int(row[0])
+
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination on (key, id), newest first by default.
+
+    Falls back to page-number pagination when the client asks for ?page=
+    or when another ordering (?ordering=, search ranking) has been applied,
+    since the keyset only works in index order.
+
+    Query parameters:
+        cursor: Opaque cursor from the previous page's "next" link
+        page_size: Results per page (max max_page_size)
+        approximate_count: "true" to include a planner-estimated total
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    approximate_count_query_param = 'approximate_count'
+    ordering = ('-created_at', '-id')
+    fallback_class = PageNumberPagination
+
+    def __init__(self):
+        self.fallback = None
+        self.next_cursor = None
+        self.approximate_count = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+
+        if self._use_fallback(queryset, request):
+            self.fallback = self.fallback_class()
+            self.fallback.page_size = self.page_size
+            self.fallback.page_size_query_param = self.page_size_query_param
+            self.fallback.max_page_size = self.max_page_size
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        key_field, pk_field = (field.lstrip('-') for field in self.ordering)
+        descending = self.ordering[0].startswith('-')
+
+        if request.query_params.get(self.approximate_count_query_param) == 'true':
+            self.approximate_count = estimate_count(queryset)
+
+        queryset = queryset.order_by(*self.ordering)
+
+        position = self.decode_cursor(request, queryset.model, key_field)
+        if position is not None:
+            key, pk = position
+            op = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{key_field}__{op}': key}) |
+                Q(**{key_field: key, f'{pk_field}__{op}': pk})
+            )
+
+        results = list(queryset[:page_size + 1])
+        if len(results) > page_size:
+            results = results[:page_size]
+            self.next_cursor = self.encode_cursor(results[-1], key_field, pk_field)
+
+        return results
+
+    def _use_fallback(self, queryset, request):
+        if request.query_params.get('page') and self.cursor_query_param not in request.query_params:
+            return True
+        # Any ordering other than ours (e.g. ?ordering=, ranked search) can't use the keyset
+        order_by = queryset.query.order_by
+        return bool(order_by) and order_by[0] != self.ordering[0]
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, instance, key_field, pk_field):
+        value = instance._meta.get_field(key_field).value_to_string(instance)
+        payload = json.dumps([value, getattr(instance, pk_field)]).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def decode_cursor(self, request, model, key_field):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return model._meta.get_field(key_field).to_python(value), int(pk)
+        except Exception:
+            logger.warning(f"Ignoring invalid pagination cursor: {cursor}")
+            return None
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.approximate_count_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+
+        payload = {'next': self.get_next_link(), 'previous': None}
+        if self.approximate_count is not None:
+            payload['approximate_count'] = self.approximate_count
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'approximate_count': {'type': 'integer'},
+                'results': schema,
+            },
+        }
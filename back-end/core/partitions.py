@@ -0,0 +1,213 @@
+"""
+Monthly range partitions for append-mostly tables.
+
+On PostgreSQL, create_partitioned_table() builds a model's table
+range-partitioned on a timestamp column, with a DEFAULT partition for rows
+outside the created months. ensure_partitions() adds the coming months
+ahead of time (<table>_pYYYY_MM), and purge_before() detaches and drops
+whole months instead of running DELETE ... WHERE created_at < cutoff, which
+is instantaneous and leaves no dead tuples to vacuum.
+
+Other databases get a plain table; purge_before() deletes the same rows in
+primary-key batches there.
+"""
+
+import logging
+import re
+from datetime import datetime, timezone as dt_timezone
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def month_start(value):
+    """First instant (UTC) of the month containing value."""
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(start, months):
+    index = start.year * 12 + start.month - 1 + months
+    return start.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table, start):
+    return f"{table}_p{start:%Y_%m}"
+
+
+def is_partitioned(model, using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s",
+            [model._meta.db_table],
+        )
+        return cursor.fetchone() is not None
+
+
+def partitions(model, using=DEFAULT_DB_ALIAS):
+    """
+    Monthly partitions of a model's table.
+
+    Returns:
+        Dict mapping partition name -> first instant of its month, oldest first
+    """
+    table = model._meta.db_table
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s",
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    pattern = re.compile(rf'^{re.escape(table)}_p(\d{{4}})_(\d{{2}})$')
+    months = {}
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            months[name] = datetime(int(match[1]), int(match[2]), 1, tzinfo=dt_timezone.utc)
+    return dict(sorted(months.items(), key=lambda item: item[1]))
+
+
+def create_partitioned_table(schema_editor, model, column, months_ahead=2):
+    """
+    Create a model's table, range-partitioned by month on `column` on PostgreSQL.
+
+    For migrations. The primary key becomes (pk, column), as PostgreSQL
+    requires the partition key in every unique constraint; ids still come
+    from one sequence, so they stay unique.
+
+    Args:
+        schema_editor: Migration schema editor
+        model: Model (historical) whose table to create
+        column: Timestamp column to partition on
+        months_ahead: Monthly partitions to create after the current one
+    """
+    schema_editor.create_model(model)
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    # Rebuild the (empty) table as a partitioned one; PostgreSQL cannot convert in place
+    table = model._meta.db_table
+    pk = model._meta.pk.column
+    staging = f"{table}_partitioned"
+    schema_editor.execute(
+        f"CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE ({column})"
+    )
+    schema_editor.execute(f"DROP TABLE {table}")
+    schema_editor.execute(f"ALTER TABLE {staging} RENAME TO {table}")
+    schema_editor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({pk}, {column})")
+    # Identity columns are not supported on partitioned tables before PostgreSQL 17
+    schema_editor.execute(f"CREATE SEQUENCE {table}_{pk}_seq OWNED BY {table}.{pk}")
+    schema_editor.execute(f"ALTER TABLE {table} ALTER COLUMN {pk} SET DEFAULT nextval('{table}_{pk}_seq')")
+    # Foreign keys and indexes are still in schema_editor.deferred_sql; they
+    # run by table name at the end of the migration, on the partitioned table
+
+    schema_editor.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    start = month_start(datetime.now(dt_timezone.utc))
+    for months in range(months_ahead + 1):
+        _create_partition(schema_editor.execute, table, add_months(start, months))
+
+
+def _create_partition(execute, table, start):
+    name = partition_name(table, start)
+    execute(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)",
+        [start.isoformat(), add_months(start, 1).isoformat()],
+    )
+    return name
+
+
+def ensure_partitions(model, months_ahead=2, now=None, using=DEFAULT_DB_ALIAS):
+    """
+    Create the current and next `months_ahead` monthly partitions if missing.
+
+    Returns:
+        Names of the partitions that were created
+    """
+    if not is_partitioned(model, using):
+        return []
+    existing = partitions(model, using)
+    start = month_start(now or datetime.now(dt_timezone.utc))
+    created = []
+    with connections[using].cursor() as cursor:
+        for months in range(months_ahead + 1):
+            month = add_months(start, months)
+            if partition_name(model._meta.db_table, month) not in existing:
+                created.append(_create_partition(cursor.execute, model._meta.db_table, month))
+    if created:
+        logger.info(f"Created partitions {', '.join(created)}")
+    return created
+
+
+def retention_boundary(model, cutoff, using=DEFAULT_DB_ALIAS):
+    """
+    Where purging rows older than `cutoff` actually stops.
+
+    Partitions are dropped whole, so on a partitioned table this is the start
+    of cutoff's month (rows up to a month past the cutoff are kept); otherwise
+    it is cutoff itself.
+    """
+    return month_start(cutoff) if is_partitioned(model, using) else cutoff
+
+
+def purge_before(model, boundary, column='created_at', batch_size=5000, using=DEFAULT_DB_ALIAS,
+                 before_delete=None):
+    """
+    Remove every row whose `column` is before `boundary` (see retention_boundary()).
+
+    Each batch (or the partition drop) is its own transaction, so callers must
+    not wrap this in one: a single transaction would hold every row lock until
+    the end. Rows are locked before `before_delete` sees them.
+
+    Args:
+        model: Model whose rows to remove
+        boundary: Rows older than this go; a month start on partitioned tables
+        column: Timestamp column (the partition key)
+        batch_size: Rows per DELETE on unpartitioned tables
+        before_delete: Callable(queryset) run inside each deleting transaction
+            with the rows about to go, e.g. to adjust denormalized counts
+
+    Returns:
+        Number of rows removed (estimated from planner statistics for dropped partitions)
+    """
+    queryset = model._base_manager.using(using)
+    expired = queryset.filter(**{f'{column}__lt': boundary})
+    if not is_partitioned(model, using):
+        deleted = 0
+        while True:
+            with transaction.atomic(using=using):
+                pks = list(expired.select_for_update().order_by().values_list('pk', flat=True)[:batch_size])
+                if not pks:
+                    return deleted
+                batch = queryset.filter(pk__in=pks)
+                if before_delete is not None:
+                    before_delete(batch)
+                deleted += batch.delete()[0]
+
+    table = model._meta.db_table
+    dropped = {name: start for name, start in partitions(model, using).items() if add_months(start, 1) <= boundary}
+    removed = 0
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        if before_delete is not None:
+            # Block writes to the expiring rows until they are gone
+            for name in dropped:
+                cursor.execute(f"LOCK TABLE {name} IN EXCLUSIVE MODE")
+            cursor.execute(f"SELECT 1 FROM {table}_default WHERE {column} < %s FOR UPDATE", [boundary])
+            before_delete(expired)
+        for name in dropped:
+            cursor.execute("SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE relname = %s", [name])
+            removed += cursor.fetchone()[0]
+            cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+            cursor.execute(f"DROP TABLE {name}")
+        # Stragglers parked in the DEFAULT partition
+        cursor.execute(f"DELETE FROM {table}_default WHERE {column} < %s", [boundary])
+        removed += cursor.rowcount
+    if dropped:
+        logger.info(f"Dropped partitions {', '.join(dropped)}")
+    return removed
@@ -0,0 +1,45 @@
+"""
+Query plan inspection.
+
+seq_scans() runs EXPLAIN for a queryset and returns the tables the database
+would read in full instead of through an index. On PostgreSQL the check runs
+with enable_seqscan off: tiny development tables are always cheaper to scan,
+so a sequential scan that survives means no usable index exists, not that
+the planner preferred one.
+"""
+
+import re
+from django.db import connections, transaction
+
+SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    # 'SCAN t USING [COVERING] INDEX i' walks an index in order; a bare 'SCAN t' reads the table
+    'sqlite': re.compile(r'\bSCAN (\w+)(?!\w| USING)'),
+}
+
+
+def explain(queryset):
+    """The queryset's plan as text, with sequential scans priced out on PostgreSQL."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.explain()
+    with transaction.atomic(using=queryset.db):
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+
+def seq_scans(queryset):
+    """
+    Tables a queryset reads without an index.
+
+    Args:
+        queryset: QuerySet to explain (not evaluated)
+
+    Returns:
+        Table names in plan order, empty when every table is reached through an index
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor not in SEQ_SCAN_PATTERNS:
+        raise NotImplementedError(f"No plan parser for {vendor}")
+    return SEQ_SCAN_PATTERNS[vendor].findall(explain(queryset))
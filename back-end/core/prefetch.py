@@ -0,0 +1,167 @@
+"""
+Automatic select_related / prefetch_related planning for serializers.
+
+Walks a serializer's declared fields and builds the joins and prefetches
+needed to render a list with a constant number of queries. Relations that
+a SerializerMethodField reads can be declared on the serializer's Meta:
+
+    class Meta:
+        select_related = ['user']
+        prefetch_related = [
+            Prefetch('skills', queryset=UserSkill.objects.order_by('-proficiency_level')[:5],
+                     to_attr='top_skills'),
+        ]
+"""
+
+import logging
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+_plan_cache = {}
+
+
+class PrefetchPlan:
+    """select_related paths and prefetch lookups for one serializer class."""
+
+    def __init__(self, select_related=None, prefetch_related=None):
+        self.select_related = list(select_related or [])
+        # (lookup, queryset or None, to_attr or None), lookups relative to the root model
+        self.prefetch_related = list(prefetch_related or [])
+
+    def prefetches(self):
+        """Build fresh Prefetch objects (they are stateful and can't be shared)."""
+        return [
+            Prefetch(lookup, queryset=queryset.all() if queryset is not None else None, to_attr=to_attr)
+            for lookup, queryset, to_attr in self.prefetch_related
+        ]
+
+    def apply(self, queryset):
+        """Apply the plan to a queryset."""
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetches())
+        return queryset
+
+    def __repr__(self):
+        lookups = [lookup for lookup, _, _ in self.prefetch_related]
+        return f"PrefetchPlan(select_related={self.select_related}, prefetch_related={lookups})"
+
+
+def _relation(model, name):
+    """Return the model field/relation called `name`, or None."""
+    try:
+        return model._meta.get_field(name)
+    except Exception:
+        return None
+
+
+def _is_single_join(field):
+    """Forward FK/OneToOne or reverse OneToOne: joinable with select_related."""
+    return field is not None and field.is_relation and (field.many_to_one or field.one_to_one)
+
+
+def _is_multi(field):
+    return field is not None and field.is_relation and (field.many_to_many or field.one_to_many)
+
+
+def _walk(serializer, model, prefix, plan):
+    meta = getattr(serializer, 'Meta', None)
+    for path in getattr(meta, 'select_related', ()):
+        plan.select_related.append(prefix + path)
+    for item in getattr(meta, 'prefetch_related', ()):
+        if isinstance(item, Prefetch):
+            plan.prefetch_related.append((prefix + item.prefetch_through, item.queryset, item.to_attr))
+        else:
+            plan.prefetch_related.append((prefix + item, None, None))
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+
+        source = field.source_attrs
+        if not source:
+            continue
+
+        # Dotted sources (e.g. 'job.job_title') walk forward relations
+        current, path = model, []
+        for attr in source[:-1]:
+            relation = _relation(current, attr)
+            if not _is_single_join(relation):
+                break
+            path.append(attr)
+            current = relation.related_model
+        else:
+            if path:
+                plan.select_related.append(prefix + '__'.join(path))
+
+        if len(source) > 1:
+            continue
+
+        name = source[0]
+        relation = _relation(model, name)
+
+        if isinstance(field, serializers.ListSerializer) and _is_multi(relation):
+            child = field.child
+            child_plan = PrefetchPlan()
+            if isinstance(child, serializers.ModelSerializer):
+                _walk(child, relation.related_model, '', child_plan)
+            queryset = child_plan.apply(relation.related_model._default_manager.all())
+            plan.prefetch_related.append((prefix + name, queryset, None))
+
+        elif isinstance(field, serializers.ManyRelatedField) and _is_multi(relation):
+            plan.prefetch_related.append((prefix + name, None, None))
+
+        elif isinstance(field, serializers.ModelSerializer) and _is_single_join(relation):
+            plan.select_related.append(prefix + name)
+            _walk(field, relation.related_model, f"{prefix}{name}__", plan)
+
+
+def plan_for(serializer_class):
+    """
+    Get the (cached) prefetch plan for a ModelSerializer class.
+
+    Returns:
+        PrefetchPlan
+    """
+    plan = _plan_cache.get(serializer_class)
+    if plan is None:
+        plan = PrefetchPlan()
+        _walk(serializer_class(), serializer_class.Meta.model, '', plan)
+        plan.select_related = list(dict.fromkeys(plan.select_related))
+        _plan_cache[serializer_class] = plan
+        logger.debug(f"Prefetch plan for {serializer_class.__name__}: {plan}")
+    return plan
+
+
+def optimize_queryset(queryset, serializer_class):
+    """
+    Apply the serializer's prefetch plan to a queryset.
+
+    Args:
+        queryset: QuerySet to render with serializer_class
+        serializer_class: ModelSerializer subclass
+
+    Returns:
+        QuerySet with select_related/prefetch_related applied
+    """
+    if not (isinstance(serializer_class, type) and issubclass(serializer_class, serializers.ModelSerializer)):
+        return queryset
+    return plan_for(serializer_class).apply(queryset)
+
+
+class PrefetchPlannerMixin:
+    """
+    ViewSet mixin that applies the serializer's prefetch plan in filter_queryset(),
+    so list and detail endpoints render in a constant number of queries even
+    when the viewset overrides get_queryset(). Custom actions that build their
+    own querysets call self.optimize_queryset().
+    """
+
+    def filter_queryset(self, queryset):
+        return self.optimize_queryset(super().filter_queryset(queryset))
+
+    def optimize_queryset(self, queryset):
+        return optimize_queryset(queryset, self.get_serializer_class())
@@ -0,0 +1,193 @@
+"""
+On-demand request profiling.
+
+RequestProfile samples the request thread's stack (statistical profile,
+exported as flamegraph-ready collapsed stacks), optionally runs cProfile,
+and records the SQL the request executed. ProfileStore keeps recent
+profiles in the cache for the /api/profiles/ endpoints.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .querylog import QueryRecorder
+
+DEFAULT_PROFILING_SETTINGS = {
+    'HEADER': 'X-Profile',  # Staff send "X-Profile: 1" (stack sampling) or "X-Profile: cprofile"
+    'SAMPLE_RATE': 0,  # Also profile 1 in N requests; 0 disables sampling
+    'MODE': 'sample',  # Mode for sampled requests: 'sample' or 'cprofile'
+    'INTERVAL': 0.002,  # Seconds between stack samples
+    'MAX_QUERIES': 200,  # SQL statements kept per profile
+    'TOP_FUNCTIONS': 40,  # cProfile rows kept per profile
+    'KEEP': 100,  # Profiles kept in the index
+    'TTL': 86400,  # Seconds
+}
+
+PROFILE_KEY = 'profile:{}'
+INDEX_KEY = 'profile:index'
+
+
+def get_profiling_settings():
+    """Merge PROFILING_SETTINGS from settings.py over the defaults."""
+    return {**DEFAULT_PROFILING_SETTINGS, **getattr(settings, 'PROFILING_SETTINGS', {})}
+
+
+def frame_label(frame):
+    """'path/to/module.py:function' with project and library paths shortened."""
+    filename = frame.f_code.co_filename
+    base_dir = str(settings.BASE_DIR)
+    if filename.startswith(base_dir):
+        filename = os.path.relpath(filename, base_dir)
+    elif 'site-packages' in filename:
+        filename = filename.split('site-packages' + os.sep, 1)[1]
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{frame.f_code.co_name}"
+
+
+class StackSampler(threading.Thread):
+    """Samples another thread's stack at a fixed interval and counts collapsed stacks."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True, name='request-profiler')
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+        return self.stacks
+
+
+def collapse(stacks):
+    """Collapsed stack text ('a;b;c 12' per line) for flamegraph.pl, speedscope or inferno."""
+    return '\n'.join(f"{stack} {count}" for stack, count in stacks.most_common())
+
+
+class RequestProfile:
+    """
+    Profile the current thread: stack samples, optional cProfile and SQL.
+
+    Usage:
+        profile = RequestProfile(mode='sample').start()
+        ...
+        data = profile.stop()
+    """
+
+    def __init__(self, mode='sample', config=None):
+        self.mode = mode
+        self.config = config or get_profiling_settings()
+        self.recorder = QueryRecorder(capture_call_sites=True)
+        self.profiler = cProfile.Profile() if mode == 'cprofile' else None
+        self.sampler = None
+
+    def start(self):
+        self.started_at = timezone.now()
+        self.recorder.__enter__()
+        self.sampler = StackSampler(threading.get_ident(), self.config['INTERVAL'])
+        self.sampler.start()
+        self.start_time = time.perf_counter()
+        if self.profiler:
+            self.profiler.enable()
+        return self
+
+    def stop(self):
+        """
+        Stop profiling.
+
+        Returns:
+            Dict with timing, SQL queries, collapsed stacks and (cProfile mode) top functions
+        """
+        if self.profiler:
+            self.profiler.disable()
+        duration = time.perf_counter() - self.start_time
+        stacks = self.sampler.stop()
+        self.recorder.__exit__(None, None, None)
+
+        data = {
+            'mode': self.mode,
+            'started_at': self.started_at.isoformat(),
+            'duration_ms': round(duration * 1000, 2),
+            'query_count': self.recorder.count,
+            'sql_ms': round(self.recorder.total_time * 1000, 2),
+            'queries': [
+                {'sql': query['sql'], 'time_ms': round(query['time'] * 1000, 3), 'call_site': query['call_site']}
+                for query in self.recorder.queries[:self.config['MAX_QUERIES']]
+            ],
+            'samples': sum(stacks.values()),
+            'collapsed': collapse(stacks),
+        }
+        if self.profiler:
+            data['top_functions'] = self.top_functions()
+        return data
+
+    def top_functions(self):
+        stats = pstats.Stats(self.profiler, stream=io.StringIO())
+        rows = []
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({
+                'function': f"{os.path.basename(filename)}:{line}({name})",
+                'calls': calls,
+                'tottime_ms': round(tottime * 1000, 3),
+                'cumtime_ms': round(cumtime * 1000, 3),
+            })
+        rows.sort(key=lambda row: row['cumtime_ms'], reverse=True)
+        return rows[:self.config['TOP_FUNCTIONS']]
+
+
+class ProfileStore:
+    """Recent request profiles in the cache (shared across workers with a Redis cache)."""
+
+    @staticmethod
+    def save(data, config=None):
+        """
+        Store a profile.
+
+        Args:
+            data: Profile dict (RequestProfile.stop() plus request details)
+
+        Returns:
+            Profile ID
+        """
+        config = config or get_profiling_settings()
+        profile_id = uuid.uuid4().hex[:12]
+        data = {'id': profile_id, **data}
+        cache.set(PROFILE_KEY.format(profile_id), data, timeout=config['TTL'])
+
+        summary = {key: data.get(key) for key in (
+            'id', 'method', 'path', 'status_code', 'trigger', 'mode', 'started_at', 'duration_ms', 'query_count', 'sql_ms'
+        )}
+        index = [summary] + cache.get(INDEX_KEY, [])
+        cache.set(INDEX_KEY, index[:config['KEEP']], timeout=config['TTL'])
+        return profile_id
+
+    @staticmethod
+    def get(profile_id):
+        return cache.get(PROFILE_KEY.format(profile_id))
+
+    @staticmethod
+    def list():
+        """Summaries of stored profiles, newest first."""
+        return cache.get(INDEX_KEY, [])
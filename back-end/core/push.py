@@ -0,0 +1,281 @@
+"""
+Real-time push of per-user events over Server-Sent Events.
+
+publish() sends an event (a new notification, a read receipt) to a user's
+open browser tabs once the current transaction commits. With the 'redis'
+backend events go through Redis pub/sub (one channel per user,
+CHANNEL_PREFIX + user id), so any gunicorn or Celery process can publish;
+the 'memory' backend only reaches streams served by the same process.
+
+PushApplication wraps the Django ASGI application (backend/asgi.py) and
+serves PUSH_SETTINGS['PATH'] itself as a text/event-stream: the client
+authenticates with its JWT access token (?token=... since EventSource cannot
+set headers, or an Authorization header), receives its unread count, then
+every event published for it. Each ASGI worker process holds a single Redis
+subscription (a pattern over all user channels) and fans messages out to its
+open streams, so the number of Redis connections does not grow with clients.
+
+    const events = new EventSource(`${API_URL}/notifications/stream/?token=${access}`);
+    events.addEventListener('notification', e => prepend(JSON.parse(e.data)));
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from utils.helpers import get_redis_client
+from .metrics import PUSH_EVENTS, PUSH_STREAMS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PUSH_SETTINGS = {
+    'BACKEND': 'memory',  # 'redis' delivers events published by any process
+    'PATH': '/api/notifications/stream/',
+    'CHANNEL_PREFIX': 'push:user:',
+    'KEEPALIVE': 15,  # Seconds between comments that keep idle streams open through proxies
+    'QUEUE_SIZE': 100,  # Events buffered per stream; the oldest are dropped beyond this
+    'RETRY': 3000,  # Milliseconds the browser waits before reconnecting
+}
+
+
+def get_push_settings():
+    """Merge PUSH_SETTINGS from settings.py over the defaults."""
+    return {**DEFAULT_PUSH_SETTINGS, **getattr(settings, 'PUSH_SETTINGS', {})}
+
+
+def format_event(event, data):
+    """One Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+# ==================== PUBLISHING ====================
+
+def publish(user_id, event, data):
+    """
+    Push an event to a user's open streams after the current transaction commits.
+
+    Args:
+        user_id: Recipient user ID
+        event: Event name ('notification', 'read', ...)
+        data: JSON-serializable payload
+    """
+    publish_many([(user_id, event, data)])
+
+
+def publish_many(events):
+    """
+    Push several (user_id, event, data) events with one Redis round trip.
+
+    Delivery is best effort: failures are logged, never raised, and streams
+    opened later receive the current unread count instead of missed events.
+    """
+    frames = [(user_id, format_event(event, data)) for user_id, event, data in events]
+    if frames:
+        transaction.on_commit(lambda: _send(frames))
+
+
+def _send(frames):
+    config = get_push_settings()
+    client = get_redis_client() if config['BACKEND'] == 'redis' else None
+    try:
+        if client is None:
+            for user_id, frame in frames:
+                hub.dispatch(user_id, frame)
+        else:
+            pipeline = client.pipeline(transaction=False)
+            for user_id, frame in frames:
+                pipeline.publish(f"{config['CHANNEL_PREFIX']}{user_id}", frame)
+            pipeline.execute()
+        PUSH_EVENTS.inc(len(frames))
+    except Exception as e:
+        logger.error(f"Failed to publish {len(frames)} push events: {str(e)}")
+
+
+# ==================== SUBSCRIBING ====================
+
+class Subscription:
+    """A stream's bounded event queue, fed from any thread."""
+
+    def __init__(self, user_id, loop, size):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(size)
+
+    def put(self, frame):
+        self.loop.call_soon_threadsafe(self._put, frame)
+
+    def _put(self, frame):
+        # A client that stopped reading loses its oldest events, not the server's memory
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(frame)
+
+
+class PushHub:
+    """This process's open streams by user, and the Redis subscription feeding them."""
+
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def subscribe(self, user_id):
+        """Register a stream for user_id in the running event loop."""
+        subscription = Subscription(str(user_id), asyncio.get_running_loop(), get_push_settings()['QUEUE_SIZE'])
+        with self._lock:
+            self._subscriptions[subscription.user_id].add(subscription)
+        self._ensure_listener()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def dispatch(self, user_id, frame):
+        """Queue a frame on every local stream of user_id."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(str(user_id), ()))
+        for subscription in subscriptions:
+            subscription.put(frame)
+
+    def _ensure_listener(self):
+        config = get_push_settings()
+        if config['BACKEND'] != 'redis' or not getattr(settings, 'REDIS_URL', ''):
+            return
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen(config['CHANNEL_PREFIX']))
+
+    async def _listen(self, prefix):
+        from redis import asyncio as aioredis
+
+        while True:
+            client = aioredis.from_url(settings.REDIS_URL)
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.psubscribe(f"{prefix}*")
+                async for message in pubsub.listen():
+                    channel = message['channel'].decode()
+                    self.dispatch(channel[len(prefix):], message['data'].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Push listener reconnecting: {str(e)}")
+                await asyncio.sleep(1)
+            finally:
+                await client.aclose()
+
+
+hub = PushHub()
+
+
+# ==================== ASGI ====================
+
+def authenticate(scope):
+    """
+    User ID from the JWT access token in ?token= or the Authorization header.
+
+    Returns:
+        User ID, or None if the token is missing or invalid
+    """
+    from rest_framework_simplejwt.exceptions import TokenError
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    token = parse_qs(scope.get('query_string', b'').decode()).get('token', [None])[0]
+    if token is None:
+        header = dict(scope.get('headers', ())).get(b'authorization', b'').decode().split()
+        if len(header) == 2 and header[0].lower() == 'bearer':
+            token = header[1]
+    if not token:
+        return None
+    try:
+        return AccessToken(token).get('user_id')
+    except TokenError:
+        return None
+
+
+def _unread_count(user_id):
+    User = apps.get_model('api', 'User')
+    return User.objects.filter(pk=user_id).values_list('unread_notifications', flat=True).first() or 0
+
+
+async def _disconnected(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def stream(scope, receive, send):
+    """ASGI handler for one client's event stream."""
+    user_id = authenticate(scope)
+    if user_id is None:
+        await send({'type': 'http.response.start', 'status': 401, 'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': b'{"error": "Authentication required"}'})
+        return
+
+    config = get_push_settings()
+    subscription = hub.subscribe(user_id)
+    disconnect = asyncio.ensure_future(_disconnected(receive))
+    next_event = None
+    PUSH_STREAMS.inc()
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),  # nginx must not buffer the stream
+            ],
+        })
+        # Subscribed first, so nothing published from here on is missed
+        unread = await sync_to_async(_unread_count)(user_id)
+        await send({
+            'type': 'http.response.body',
+            'body': (f"retry: {config['RETRY']}\n\n" + format_event('unread', {'count': unread})).encode(),
+            'more_body': True,
+        })
+
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(subscription.queue.get())
+            done, _ = await asyncio.wait(
+                {next_event, disconnect}, timeout=config['KEEPALIVE'], return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnect in done:
+                break
+            if next_event in done:
+                body, next_event = next_event.result(), None
+            else:
+                body = ': keepalive\n\n'
+            await send({'type': 'http.response.body', 'body': body.encode(), 'more_body': True})
+    finally:
+        PUSH_STREAMS.dec()
+        hub.unsubscribe(subscription)
+        for future in (next_event, disconnect):
+            if future is not None:
+                future.cancel()
+
+
+class PushApplication:
+    """ASGI application serving the event stream and passing every other request to Django."""
+
+    def __init__(self, application):
+        self.application = application
+        self.path = get_push_settings()['PATH']
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == self.path:
+            await stream(scope, receive, send)
+        else:
+            await self.application(scope, receive, send)
@@ -0,0 +1,100 @@
+"""
+SQL query recording for budgets, profiling and metrics.
+
+QueryRecorder hooks every database connection with execute_wrapper and
+records each query's SQL, duration and (optionally) the project call site
+that issued it.
+"""
+
+import os
+import time
+import traceback
+from collections import Counter
+from django.conf import settings
+from django.db import connections
+
+# Frames from these paths are never reported as call sites
+_IGNORED_PATHS = ('site-packages', 'dist-packages', os.path.join('core', 'querylog.py'))
+
+
+def get_call_site(limit=3):
+    """
+    Find the innermost project frames that led to the current query.
+
+    Returns:
+        'path/to/file.py:123 in function' strings joined with ' <- ', or '' if none
+    """
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-1]
+        if frame.filename.startswith(base_dir)
+        and not any(ignored in frame.filename for ignored in _IGNORED_PATHS)
+    ]
+    return ' <- '.join(
+        f"{os.path.relpath(frame.filename, base_dir)}:{frame.lineno} in {frame.name}"
+        for frame in reversed(frames[-limit:])
+    )
+
+
+class QueryRecorder:
+    """
+    Context manager recording the queries run on every database alias.
+
+    Usage:
+        with QueryRecorder(capture_call_sites=True) as recorder:
+            ...
+        recorder.count, recorder.total_time, recorder.top_call_sites()
+    """
+
+    def __init__(self, capture_call_sites=False, using=None):
+        self.capture_call_sites = capture_call_sites
+        self.aliases = [using] if using else list(connections)
+        self.queries = []
+        self._contexts = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'sql': sql,
+                'time': time.perf_counter() - start,
+                'alias': context['connection'].alias,
+                'call_site': get_call_site() if self.capture_call_sites else '',
+            })
+
+    def __enter__(self):
+        for alias in self.aliases:
+            wrapper = connections[alias].execute_wrapper(self)
+            wrapper.__enter__()
+            self._contexts.append(wrapper)
+        return self
+
+    def __exit__(self, *exc_info):
+        while self._contexts:
+            self._contexts.pop().__exit__(*exc_info)
+        return False
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_time(self):
+        """Total SQL time in seconds"""
+        return sum(query['time'] for query in self.queries)
+
+    def top_call_sites(self, limit=5):
+        """
+        Get the call sites that issued the most queries.
+
+        Returns:
+            List of (call_site, query_count) tuples, most queries first
+        """
+        return Counter(query['call_site'] for query in self.queries).most_common(limit)
+
+    def duplicates(self, limit=5):
+        """Get the most repeated SQL statements as (sql, count) tuples"""
+        repeated = Counter(query['sql'] for query in self.queries).most_common(limit)
+        return [(sql, count) for sql, count in repeated if count > 1]
@@ -0,0 +1,292 @@
+"""
+Two-tier cache for hot, rarely changing reference data.
+
+Each gunicorn and Celery worker keeps a bounded LRU with a TTL in process
+memory in front of the shared Django cache (Redis in production), so reads
+of the skill catalogue, achievement definitions or course list are a dict
+lookup instead of a network round trip or a query. Misses fall through to
+core.caching.get_or_refresh, keeping its single-flight protection.
+
+invalidate() deletes the shared entry and publishes the keys on a Redis
+pub/sub channel; a listener thread in every process drops them from its
+local tier. Without Redis ('memory' backend) invalidation is process-local.
+The local TTL bounds how stale a process can get if a message is lost, and
+the local tier is cleared whenever the subscription reconnects.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from utils.helpers import get_redis_client
+from .caching import get_or_refresh
+from .metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFERENCE_CACHE_SETTINGS = {
+    'BACKEND': 'memory',  # 'redis' broadcasts invalidations to every process
+    'MAX_ENTRIES': 256,  # Local entries per process (least recently used are evicted)
+    'LOCAL_TTL': 300,  # Seconds a local entry is trusted without hearing from Redis
+    'SHARED_TTL': 3600,  # Seconds an entry lives in the shared cache
+    'CHANNEL': 'cache:invalidate',
+}
+
+
+def get_reference_cache_settings():
+    """Merge REFERENCE_CACHE_SETTINGS from settings.py over the defaults."""
+    return {**DEFAULT_REFERENCE_CACHE_SETTINGS, **getattr(settings, 'REFERENCE_CACHE_SETTINGS', {})}
+
+
+class LocalCache:
+    """Thread-safe LRU with per-entry expiry."""
+
+    _missing = object()
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Per-process state; the listener thread does not survive a fork, so it is
+# (re)started lazily by the first read in each worker
+_state = {
+    'local': None,
+    'listener_pid': None,
+    'generation': 0,  # Bumped on every invalidation; guards in-flight reads
+}
+_state_lock = threading.Lock()
+
+
+def local_cache():
+    """This process's local tier."""
+    if _state['local'] is None:
+        config = get_reference_cache_settings()
+        _state['local'] = LocalCache(config['MAX_ENTRIES'], config['LOCAL_TTL'])
+    return _state['local']
+
+
+def _drop_local(keys):
+    _state['generation'] += 1
+    if keys:
+        local_cache().delete(*keys)
+    else:
+        local_cache().clear()
+
+
+def consume(pubsub):
+    """Apply invalidation messages from a subscribed pubsub until it disconnects."""
+    # Messages published while disconnected are lost, so start clean
+    _drop_local(None)
+    for message in pubsub.listen():
+        _drop_local(json.loads(message['data']))
+
+
+def _listen(client, channel):
+    while True:
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(channel)
+            consume(pubsub)
+        except Exception as e:
+            logger.warning(f"Reference cache invalidation listener reconnecting: {str(e)}")
+            time.sleep(1)
+
+
+def start_listener():
+    """Subscribe this process to invalidation messages (once per process)."""
+    pid = os.getpid()
+    if _state['listener_pid'] == pid:
+        return
+    with _state_lock:
+        if _state['listener_pid'] == pid:
+            return
+        _state['listener_pid'] = pid
+        config = get_reference_cache_settings()
+        client = get_redis_client() if config['BACKEND'] == 'redis' else None
+        if client is None:
+            return
+        threading.Thread(
+            target=_listen, args=(client, config['CHANNEL']), daemon=True, name='reference-cache-listener'
+        ).start()
+
+
+def get_or_set(key, compute, shared_ttl=None, local_ttl=None):
+    """
+    Read through the local tier, then the shared cache, then compute().
+
+    Args:
+        key: Cache key
+        compute: Zero-argument callable producing the value
+        shared_ttl: Seconds in the shared cache (REFERENCE_CACHE_SETTINGS['SHARED_TTL'])
+        local_ttl: Seconds in the local tier (REFERENCE_CACHE_SETTINGS['LOCAL_TTL'])
+
+    Returns:
+        The cached or computed value
+    """
+    start_listener()
+    local = local_cache()
+    value = local.get(key, LocalCache._missing)
+    if value is not LocalCache._missing:
+        CACHE_REQUESTS.labels('reference_local', 'hit').inc()
+        return value
+    CACHE_REQUESTS.labels('reference_local', 'miss').inc()
+
+    generation = _state['generation']
+    if shared_ttl is None:
+        shared_ttl = get_reference_cache_settings()['SHARED_TTL']
+    value = get_or_refresh(key, compute, shared_ttl, 0, name='reference')
+    # Skip the local copy if an invalidation arrived while we were reading
+    if _state['generation'] == generation:
+        local.set(key, value, local_ttl)
+    return value
+
+
+def invalidate(*keys):
+    """Drop keys from the shared cache and from every process's local tier."""
+    cache.delete_many(keys)
+    _drop_local(keys)
+    config = get_reference_cache_settings()
+    client = get_redis_client() if config['BACKEND'] == 'redis' else None
+    if client is not None:
+        try:
+            client.publish(config['CHANNEL'], json.dumps(keys))
+        except Exception as e:
+            logger.error(f"Failed to publish reference cache invalidation: {str(e)}")
+
+
+# Model label -> reference keys built from it
+_model_keys = defaultdict(set)
+
+
+def invalidate_model(model):
+    """Invalidate the keys registered for a model, for writes that bypass signals (update())."""
+    keys = tuple(_model_keys.get(model._meta.label, ()))
+    if keys:
+        invalidate(*keys)
+        transaction.on_commit(lambda: invalidate(*keys))
+
+
+def invalidate_on_change(model, *keys):
+    """
+    Invalidate reference keys whenever a model instance is saved or deleted.
+
+    Keys are dropped right away, so the writing transaction reads its own
+    changes, and again after commit, in case another process re-cached the
+    old rows in between.
+
+    Args:
+        model: Model class or 'app_label.ModelName'
+        *keys: Reference cache keys built from the model
+    """
+    if isinstance(model, str):
+        model = apps.get_model(model)
+    _model_keys[model._meta.label].update(keys)
+
+    def handler(sender, **kwargs):
+        invalidate(*keys)
+        transaction.on_commit(lambda: invalidate(*keys))
+
+    uid = f'reference_invalidation:{model._meta.label}'
+    post_save.connect(handler, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(handler, sender=model, weak=False, dispatch_uid=uid)
+
+
+class ReferenceDataService:
+    """Cached reads of the skill catalogue, achievements and courses."""
+
+    SKILLS = 'reference:skills'
+    SKILL_CATEGORIES = 'reference:skill_categories'
+    ACHIEVEMENTS = 'reference:achievements'
+    COURSES = 'reference:courses'
+
+    # Unfiltered list responses of the matching viewsets (ReferenceListMixin)
+    SKILL_LIST = 'reference:skills:list'
+    ACHIEVEMENT_LIST = 'reference:achievements:list'
+    COURSE_LIST = 'reference:courses:list'
+
+    @staticmethod
+    def skills():
+        """All skills as [{'id', 'name', 'category'}], by name."""
+        Skill = apps.get_model('api', 'Skill')
+        return get_or_set(
+            ReferenceDataService.SKILLS,
+            lambda: list(Skill.objects.order_by('name').values('id', 'name', 'category')),
+        )
+
+    @staticmethod
+    def skill_categories():
+        """Keywords of api.ml_utils.SKILLS_DATABASE grouped by category."""
+        def group():
+            from api.ml_utils import SKILLS_DATABASE
+            categories = defaultdict(list)
+            for skill, category in SKILLS_DATABASE.items():
+                categories[category].append(skill)
+            return {category: sorted(skills) for category, skills in sorted(categories.items())}
+
+        # A code constant: no invalidation needed, and no point in the shared tier
+        local = local_cache()
+        categories = local.get(ReferenceDataService.SKILL_CATEGORIES)
+        if categories is None:
+            categories = group()
+            local.set(ReferenceDataService.SKILL_CATEGORIES, categories, ttl=float('inf'))
+        return categories
+
+    @staticmethod
+    def achievements():
+        """All achievement definitions, highest points first."""
+        Achievement = apps.get_model('api', 'Achievement')
+        return get_or_set(
+            ReferenceDataService.ACHIEVEMENTS,
+            lambda: list(Achievement.objects.values('id', 'title', 'description', 'icon', 'points_value')),
+        )
+
+    @staticmethod
+    def courses():
+        """All courses with their rating, newest first."""
+        Course = apps.get_model('api', 'Course')
+        return get_or_set(
+            ReferenceDataService.COURSES,
+            lambda: list(Course.objects.order_by('-created_at').values(
+                'id', 'title', 'category', 'difficulty_level', 'estimated_duration', 'rating', 'total_ratings'
+            )),
+        )
@@ -0,0 +1,144 @@
+"""
+Read-replica routing with read-your-writes.
+
+ReplicaRouter sends reads to REPLICA_SETTINGS['ALIAS'] only inside a
+replica scope: a public method of a service whose module is listed in
+REPLICA_SETTINGS['SERVICES'] (@replica_reads), a Celery task matching
+REPLICA_SETTINGS['TASKS'], or an explicit `with use_replica():`. All other
+reads, and every write, go to the primary.
+
+Replicas lag behind the primary, so once a request or task has written (or
+while it is inside a transaction) its reads stay on the primary.
+ReplicaPinningMiddleware extends this to the client's next PIN_SECONDS with
+a cookie, so a page reloaded right after a POST sees its own change.
+"""
+
+import contextvars
+import functools
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+DEFAULT_REPLICA_SETTINGS = {
+    'ALIAS': None,  # Database alias of the replica; None routes everything to the primary
+    'SERVICES': [],  # Service modules whose reads use the replica
+    'TASKS': [],  # Celery task name prefixes whose reads use the replica
+    'PIN_SECONDS': 5,  # Reads stay on the primary this long after a client writes
+    'COOKIE': 'db_pinned',
+}
+
+
+def get_replica_settings():
+    """Merge REPLICA_SETTINGS from settings.py over the defaults."""
+    return {**DEFAULT_REPLICA_SETTINGS, **getattr(settings, 'REPLICA_SETTINGS', {})}
+
+
+# Whether reads in this context may use the replica
+_replica = contextvars.ContextVar('db_replica', default=False)
+# {'pinned': bool} shared by everything in one request or task, including
+# worker threads started with a copy of its context
+_pin = contextvars.ContextVar('db_pin', default=None)
+
+
+@contextmanager
+def pinning_scope(pinned=False):
+    """A request or task boundary: a write inside pins its remaining reads to the primary."""
+    token = _pin.set({'pinned': pinned})
+    try:
+        yield
+    finally:
+        _pin.reset(token)
+
+
+def is_pinned():
+    pin = _pin.get()
+    return bool(pin and pin['pinned'])
+
+
+@contextmanager
+def use_replica():
+    """Route reads in the block to the replica (unless pinned)."""
+    token = _replica.set(True)
+    pin_token = _pin.set({'pinned': False}) if _pin.get() is None else None
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+        if pin_token is not None:
+            _pin.reset(pin_token)
+
+
+def replica_reads(cls):
+    """Class decorator: run a service's public methods in use_replica() when its module is enabled."""
+    module = cls.__module__
+
+    def route(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if module not in get_replica_settings()['SERVICES']:
+                return function(*args, **kwargs)
+            with use_replica():
+                return function(*args, **kwargs)
+        return wrapper
+
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith('_'):
+            continue
+        if isinstance(value, staticmethod):
+            setattr(cls, attr, staticmethod(route(value.__func__)))
+        elif isinstance(value, classmethod):
+            setattr(cls, attr, classmethod(route(value.__func__)))
+        elif callable(value):
+            setattr(cls, attr, route(value))
+    return cls
+
+
+class ReplicaRouter:
+    """Database router: replica reads inside a replica scope, everything else on the primary."""
+
+    def db_for_read(self, model, **hints):
+        alias = get_replica_settings()['ALIAS']
+        if (
+            alias and _replica.get() and not is_pinned()
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return alias
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        pin = _pin.get()
+        if pin is not None:
+            pin['pinned'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != get_replica_settings()['ALIAS']
+
+
+# ==================== CELERY ====================
+
+_task_scopes = {}
+
+
+def _task_prerun(task_id=None, task=None, **kwargs):
+    if any(task.name.startswith(prefix) for prefix in get_replica_settings()['TASKS']):
+        scope = use_replica()
+        scope.__enter__()
+        _task_scopes[task_id] = scope
+
+
+def _task_postrun(task_id=None, **kwargs):
+    scope = _task_scopes.pop(task_id, None)
+    if scope is not None:
+        scope.__exit__(None, None, None)
+
+
+def route_celery_tasks():
+    """Connect the Celery signal handlers running REPLICA_SETTINGS['TASKS'] in use_replica()."""
+    from celery import signals
+    signals.task_prerun.connect(_task_prerun, weak=False)
+    signals.task_postrun.connect(_task_postrun, weak=False)
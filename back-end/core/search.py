@@ -0,0 +1,267 @@
+"""
+Full-text search for posts, jobs and courses.
+
+On PostgreSQL each searchable table has a weighted `search_vector` tsvector
+column with a GIN index, filled by a BEFORE INSERT/UPDATE trigger. On SQLite
+an external-content FTS5 table (<table>_fts) is kept in sync by triggers.
+Other backends fall back to icontains. install_search_triggers() holds the
+trigger DDL; migrations install the triggers from a frozen copy of it.
+"""
+
+import logging
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import BooleanField, F, FloatField, Q
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+logger = logging.getLogger(__name__)
+
+# Text search configuration for the ranked document vector
+SEARCH_CONFIG = 'english'
+
+# Configuration for single-column filters (locations, categories): no stemming
+FIELD_FILTER_CONFIG = 'simple'
+
+# bm25() column weights on SQLite, mirroring Postgres' default A/B/C/D ratios
+FTS5_WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _vendor(queryset):
+    """Database vendor ('postgresql', 'sqlite', ...) the queryset runs on."""
+    return connections[queryset.db].vendor
+
+
+def fts_table(table):
+    """Name of the SQLite FTS5 table shadowing `table`."""
+    return f"{table}_fts"
+
+
+def _document_sql(fields, row='NEW'):
+    """Weighted tsvector expression over `fields` ({column: weight})."""
+    return ' || '.join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({row}.{column}, '')), '{weight}')"
+        for column, weight in fields.items()
+    )
+
+
+def install_search_triggers(schema_editor, table, fields, filter_fields=()):
+    """
+    Create the vendor-specific search structures for a table and index existing rows.
+
+    Args:
+        schema_editor: Migration schema editor
+        table: Database table name
+        fields: Ordered {column: weight} of the search document ('A' ranks highest)
+        filter_fields: Columns that get their own single-field full-text index
+    """
+    vendor = schema_editor.connection.vendor
+    columns = list(fields)
+
+    if vendor == 'postgresql':
+        function = f"{table}_search_update"
+        schema_editor.execute(f"""
+            CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {_document_sql(fields)};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+        """)
+        schema_editor.execute(f"""
+            CREATE TRIGGER {function}
+            BEFORE INSERT OR UPDATE OF {', '.join(columns)} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {function}();
+        """)
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_search_gin ON {table} USING gin (search_vector)"
+        )
+        for column in filter_fields:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_{column}_fts_gin ON {table} "
+                f"USING gin (to_tsvector('{FIELD_FILTER_CONFIG}', {column}))"
+            )
+        schema_editor.execute(f"UPDATE {table} SET search_vector = {_document_sql(fields, row=table)}")
+
+    elif vendor == 'sqlite':
+        fts = fts_table(table)
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f"new.{column}" for column in columns)
+        old_values = ', '.join(f"old.{column}" for column in columns)
+
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{column_list}, content='{table}', content_rowid='id')"
+        )
+        schema_editor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """)
+        schema_editor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+            END
+        """)
+        schema_editor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """)
+        schema_editor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def uninstall_search_triggers(schema_editor, table, fields, filter_fields=()):
+    """Drop everything install_search_triggers() created."""
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        function = f"{table}_search_update"
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {function} ON {table}")
+        schema_editor.execute(f"DROP FUNCTION IF EXISTS {function}()")
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_search_gin")
+        for column in filter_fields:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{column}_fts_gin")
+
+    elif vendor == 'sqlite':
+        fts = fts_table(table)
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+def fts5_query(text, column=None):
+    """
+    Build a safe FTS5 MATCH expression from user input.
+    Every word is quoted; the last one matches as a prefix.
+
+    Returns:
+        MATCH expression, or '' when the input has no words
+    """
+    tokens = TOKEN_RE.findall(text)
+    if not tokens:
+        return ''
+
+    if column:
+        # Column filter: the words as a phrase, e.g. location : "new york"*
+        return f'{column} : "{" ".join(tokens)}"*'
+
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+class SearchService:
+    """Service for ranked full-text search over SearchableModel querysets."""
+
+    @staticmethod
+    def search(queryset, text, rank=True):
+        """
+        Filter a queryset to rows matching `text`, optionally ordered by relevance.
+
+        Args:
+            queryset: QuerySet of a SearchableModel
+            text: User search input
+            rank: Order by relevance (best first) and annotate `search_rank`
+
+        Returns:
+            Filtered QuerySet
+        """
+        model = queryset.model
+        vendor = _vendor(queryset)
+        table = model._meta.db_table
+        pk_column = f'"{table}"."{model._meta.pk.column}"'
+
+        if vendor == 'postgresql':
+            query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+            queryset = queryset.filter(search_vector=query)
+            if rank:
+                queryset = queryset.annotate(
+                    search_rank=SearchRank(F('search_vector'), query)
+                ).order_by('-search_rank', '-pk')
+            return queryset
+
+        if vendor == 'sqlite':
+            match = fts5_query(text)
+            if not match:
+                return queryset
+            fts = fts_table(table)
+            queryset = queryset.filter(
+                pk__in=RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", [match])
+            )
+            if rank:
+                # bm25() is lower for better matches; negate so higher ranks first
+                weights = ', '.join(str(FTS5_WEIGHTS[weight]) for weight in model.search_document.values())
+                queryset = queryset.annotate(
+                    search_rank=RawSQL(
+                        f"SELECT -bm25({fts}, {weights}) FROM {fts} WHERE {fts} MATCH %s AND rowid = {pk_column}",
+                        [match],
+                        output_field=FloatField(),
+                    )
+                ).order_by('-search_rank', '-pk')
+            return queryset
+
+        conditions = Q()
+        for field in model.search_document:
+            conditions |= Q(**{f'{field}__icontains': text})
+        return queryset.filter(conditions)
+
+    @staticmethod
+    def filter_field(queryset, field, text):
+        """
+        Filter a queryset on one indexed text column (e.g. location, category).
+        All words must appear in the column, the last one as a prefix on SQLite.
+
+        Args:
+            queryset: QuerySet of a SearchableModel
+            field: Column listed in the model's search_filter_fields
+            text: User filter input
+
+        Returns:
+            Filtered QuerySet
+        """
+        model = queryset.model
+        vendor = _vendor(queryset)
+        table = model._meta.db_table
+
+        if vendor == 'postgresql':
+            return queryset.filter(RawSQL(
+                f"to_tsvector('{FIELD_FILTER_CONFIG}', \"{table}\".\"{field}\") "
+                f"@@ plainto_tsquery('{FIELD_FILTER_CONFIG}', %s)",
+                [text],
+                output_field=BooleanField(),
+            ))
+
+        if vendor == 'sqlite':
+            match = fts5_query(text, column=field)
+            if not match:
+                return queryset
+            fts = fts_table(table)
+            return queryset.filter(
+                pk__in=RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", [match])
+            )
+
+        return queryset.filter(**{f'{field}__icontains': text})
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    DRF search backend using SearchService for SearchableModel querysets and
+    the regular icontains search for everything else. Put it after
+    OrderingFilter so results are ranked unless ?ordering= is given.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not hasattr(queryset.model, 'search_document'):
+            return super().filter_queryset(request, queryset, view)
+
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+
+        rank = 'ordering' not in request.query_params
+        return SearchService.search(queryset, text, rank=rank)
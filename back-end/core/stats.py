@@ -0,0 +1,99 @@
+"""
+Conditional-aggregate statistics.
+
+Dashboards used to ask the database one COUNT per number. StatsEngine
+computes every counter for a table in a single aggregate() pass using
+Count(filter=Q(...)), and runs independent passes concurrently (one
+connection per worker thread). Inside a transaction the passes run serially
+on the caller's connection, since other connections cannot see its writes.
+"""
+
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import Count
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATS_SETTINGS = {
+    'CONCURRENT': True,
+    'MAX_WORKERS': 4,  # Concurrent passes (each holds a database connection)
+}
+
+
+def get_stats_settings():
+    """Merge STATS_SETTINGS from settings.py over the defaults."""
+    return {**DEFAULT_STATS_SETTINGS, **getattr(settings, 'STATS_SETTINGS', {})}
+
+
+def count(q=None):
+    """Count rows, optionally only those matching a Q filter (COUNT(*) FILTER (WHERE ...))."""
+    return Count('pk', filter=q)
+
+
+class StatsEngine:
+    """Run aggregate passes over tables, concurrently where possible."""
+
+    @staticmethod
+    def aggregate(queryset, **aggregates):
+        """
+        Compute all aggregates for one table in a single query.
+
+        Args:
+            queryset: Model queryset to aggregate over
+            **aggregates: name -> aggregate expression (e.g. count(Q(status='applied')))
+
+        Returns:
+            Dict mapping each name to its value (counts of empty tables are 0)
+        """
+        return queryset.aggregate(**aggregates)
+
+    @staticmethod
+    def run(passes, concurrent=None):
+        """
+        Evaluate independent passes, each a zero-argument callable issuing its own queries.
+
+        Args:
+            passes: Dict mapping name -> callable
+            concurrent: Override STATS_SETTINGS['CONCURRENT']
+
+        Returns:
+            Dict mapping name -> result
+        """
+        config = get_stats_settings()
+        if concurrent is None:
+            concurrent = config['CONCURRENT']
+        if not concurrent or len(passes) < 2 or connection.in_atomic_block:
+            return {name: compute() for name, compute in passes.items()}
+
+        def run_pass(compute):
+            try:
+                return compute()
+            finally:
+                connections.close_all()  # The worker thread's own connections
+
+        # Each pass runs in a copy of the caller's context, keeping its replica routing
+        with ThreadPoolExecutor(max_workers=min(config['MAX_WORKERS'], len(passes))) as executor:
+            futures = {
+                name: executor.submit(contextvars.copy_context().run, run_pass, compute)
+                for name, compute in passes.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+
+    @staticmethod
+    def tables(**specs):
+        """
+        One aggregate pass per table, run concurrently.
+
+        Args:
+            **specs: name -> (queryset, {counter name: aggregate expression})
+
+        Returns:
+            Dict mapping each table name to its counters
+        """
+        return StatsEngine.run({
+            name: (lambda queryset=queryset, aggregates=aggregates: StatsEngine.aggregate(queryset, **aggregates))
+            for name, (queryset, aggregates) in specs.items()
+        })
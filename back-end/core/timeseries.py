@@ -0,0 +1,238 @@
+"""
+Time-series analytics over model timestamps.
+
+Each series (posts, signups, applications, ...) is a model plus a datetime
+field. Counts per day or month come from a single TruncDate/TruncMonth
+GROUP BY, and empty buckets are filled in Python. Closed days are kept in the
+DailyMetric rollup table, so historical ranges read one row per day instead
+of rescanning the raw rows; days missing from the rollup are computed with
+one GROUP BY and stored on first read.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from django.apps import apps
+from django.db.models import Count
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ('day', 'month')
+
+# name -> (model label, datetime field, extra filters)
+SERIES = {
+    'posts': ('api.CommunityPost', 'created_at', {}),
+    'comments': ('api.Comment', 'created_at', {}),
+    'signups': ('api.User', 'created_at', {}),
+    'applications': ('api.JobApplication', 'applied_at', {}),
+    'course_completions': ('api.UserCourseProgress', 'completed_at', {}),
+    'project_completions': ('api.UserProjectProgress', 'completed_at', {'status': 'completed'}),
+    'achievements': ('api.UserAchievement', 'earned_date', {}),
+}
+
+
+def register_series(name, model_label, date_field, **filters):
+    """
+    Add a series, e.g. register_series('hires', 'api.JobApplication', 'updated_at', status='accepted').
+
+    Args:
+        name: Series name (DailyMetric.metric)
+        model_label: 'app_label.ModelName'
+        date_field: DateTimeField that dates each row
+        **filters: Extra queryset filters
+    """
+    SERIES[name] = (model_label, date_field, filters)
+
+
+# ==================== BUCKETS ====================
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(day, months):
+    """First day of the month `months` after (or before) `day`'s month."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def bucket_range(start, end, granularity='day'):
+    """Every bucket (date of the day or first of the month) from start to end inclusive."""
+    if granularity == 'month':
+        bucket, last = month_start(start), month_start(end)
+        step = lambda day: add_months(day, 1)  # noqa: E731
+    else:
+        bucket, last = start, end
+        step = lambda day: day + timedelta(days=1)  # noqa: E731
+    buckets = []
+    while bucket <= last:
+        buckets.append(bucket)
+        bucket = step(bucket)
+    return buckets
+
+
+def fill_gaps(counts, start, end, granularity='day'):
+    """
+    Complete a sparse {bucket: count} mapping with zeros.
+
+    Returns:
+        Dict of ISO bucket label ('2026-10-18' or '2026-10') to count, oldest first
+    """
+    label = (lambda day: day.strftime('%Y-%m')) if granularity == 'month' else date.isoformat
+    return {label(bucket): counts.get(bucket, 0) for bucket in bucket_range(start, end, granularity)}
+
+
+# ==================== QUERIES ====================
+
+def start_of_day(day):
+    """Aware midnight, so range filters stay index-friendly (no __date cast on the column)."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def series_queryset(name):
+    model_label, date_field, filters = SERIES[name]
+    return apps.get_model(model_label).objects.filter(**filters), date_field
+
+
+def raw_counts(name, start, end, granularity='day'):
+    """
+    Count rows per bucket with one GROUP BY over the raw table.
+
+    Args:
+        name: Series name
+        start, end: Inclusive date range
+        granularity: 'day' or 'month'
+
+    Returns:
+        Dict mapping bucket date to count (empty buckets omitted)
+    """
+    queryset, date_field = series_queryset(name)
+    trunc = TruncMonth if granularity == 'month' else TruncDate
+    rows = (
+        queryset.filter(**{
+            f'{date_field}__gte': start_of_day(start),
+            f'{date_field}__lt': start_of_day(end + timedelta(days=1)),
+        })
+        .annotate(bucket=trunc(date_field))
+        .values('bucket')
+        .annotate(count=Count('pk'))
+        .order_by()
+    )
+    counts = {}
+    for row in rows:
+        bucket = row['bucket']
+        if hasattr(bucket, 'date'):  # TruncMonth on a DateTimeField returns a datetime
+            bucket = timezone.localtime(bucket).date() if timezone.is_aware(bucket) else bucket.date()
+        counts[bucket] = row['count']
+    return counts
+
+
+class TimeSeriesService:
+    """Service for counting events per day or month."""
+
+    @staticmethod
+    def series(name, periods=30, granularity='day', start=None, end=None, use_rollup=True):
+        """
+        Gap-filled event counts for a series.
+
+        Args:
+            name: Series name (see SERIES)
+            periods: Number of buckets ending with the current one (ignored when start is given)
+            granularity: 'day' or 'month'
+            start, end: Explicit inclusive date range (end defaults to today)
+            use_rollup: Read closed days from the DailyMetric rollup
+
+        Returns:
+            Dict of ISO bucket label to count, oldest first
+        """
+        if name not in SERIES:
+            raise ValueError(f"Unknown series '{name}'")
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Granularity must be one of {', '.join(GRANULARITIES)}")
+
+        end = end or timezone.localdate()
+        if start is None:
+            start = end - timedelta(days=periods - 1) if granularity == 'day' else add_months(end, -(periods - 1))
+        if granularity == 'month':
+            start = month_start(start)
+
+        if not use_rollup:
+            return fill_gaps(raw_counts(name, start, end, granularity), start, end, granularity)
+
+        daily = TimeSeriesService.daily_counts(name, start, end)
+        if granularity == 'month':
+            monthly = defaultdict(int)
+            for day, count in daily.items():
+                monthly[month_start(day)] += count
+            return fill_gaps(monthly, start, end, granularity)
+        return fill_gaps(daily, start, end)
+
+    @staticmethod
+    def daily_counts(name, start, end):
+        """
+        Daily counts with closed days served from (and backfilled into) the rollup.
+
+        Returns:
+            Dict mapping date to count
+        """
+        DailyMetric = apps.get_model('api', 'DailyMetric')
+        today = timezone.localdate()
+        closed_end = min(end, today - timedelta(days=1))
+
+        counts = {}
+        if start <= closed_end:
+            counts = dict(
+                DailyMetric.objects.filter(metric=name, date__range=(start, closed_end)).values_list('date', 'count')
+            )
+            missing = [day for day in bucket_range(start, closed_end) if day not in counts]
+            if missing:
+                counts.update(TimeSeriesService.rollup(name, missing[0], missing[-1]))
+
+        # Today is still changing, so it is always counted from the raw rows
+        if end >= today:
+            counts.update(raw_counts(name, max(start, today), today))
+        return counts
+
+    @staticmethod
+    def rollup(name, start, end):
+        """
+        Recompute and store daily counts for closed days (zeros included, so gaps are remembered).
+
+        Args:
+            name: Series name
+            start, end: Inclusive date range; days from today on are skipped
+
+        Returns:
+            Dict mapping date to count for the stored days
+        """
+        DailyMetric = apps.get_model('api', 'DailyMetric')
+        end = min(end, timezone.localdate() - timedelta(days=1))
+        if start > end:
+            return {}
+
+        counts = raw_counts(name, start, end)
+        days = {day: counts.get(day, 0) for day in bucket_range(start, end)}
+        DailyMetric.objects.bulk_create(
+            [DailyMetric(metric=name, date=day, count=count) for day, count in days.items()],
+            update_conflicts=True,
+            unique_fields=['metric', 'date'],
+            update_fields=['count', 'updated_at'],
+        )
+        logger.info(f"Rolled up {len(days)} days of '{name}' ({start} to {end})")
+        return days
+
+    @staticmethod
+    def rollup_all(days=2):
+        """
+        Refresh the rollup for the last `days` closed days of every series.
+
+        Returns:
+            Number of series rolled up
+        """
+        end = timezone.localdate() - timedelta(days=1)
+        start = end - timedelta(days=days - 1)
+        for name in SERIES:
+            TimeSeriesService.rollup(name, start, end)
+        return len(SERIES)
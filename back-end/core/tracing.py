@@ -0,0 +1,257 @@
+"""
+OpenTelemetry tracing for requests, middleware, services, SQL and Celery.
+
+configure_tracing() installs a tracer provider exporting to a JSON-lines file
+or an OTLP collector, then instruments:
+
+- each request (TracingMiddleware) and each middleware in the stack
+- service methods (classes decorated with @trace_service)
+- every ORM query (a connection execute wrapper)
+- Celery publishing and execution, with the W3C traceparent carried in the
+  message headers so a task's spans join the request that enqueued it
+
+Everything is a no-op until tracing is configured (TRACING_SETTINGS['ENABLED']).
+"""
+
+import functools
+import logging
+import os
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+from opentelemetry import context as otel_context, propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACING_SETTINGS = {
+    'ENABLED': False,
+    'SERVICE_NAME': 'career-platform-backend',
+    'EXPORTER': 'file',  # 'file' (JSON lines), 'otlp' (collector) or 'console'
+    'FILE': 'logs/traces.jsonl',  # Relative to BASE_DIR
+    'OTLP_ENDPOINT': 'http://localhost:4318/v1/traces',
+    'SAMPLE_RATIO': 1.0,  # Fraction of new traces recorded; child spans follow the parent
+    'TRACE_MIDDLEWARE': True,
+    'TRACE_QUERIES': True,
+    'MAX_STATEMENT_LENGTH': 2000,
+}
+
+_state = {'enabled': False, 'provider': None, 'instrumented': False}
+
+
+def get_tracing_settings():
+    """Merge TRACING_SETTINGS from settings.py over the defaults."""
+    return {**DEFAULT_TRACING_SETTINGS, **getattr(settings, 'TRACING_SETTINGS', {})}
+
+
+def get_tracer():
+    return trace.get_tracer('career_platform')
+
+
+def is_enabled():
+    return _state['enabled']
+
+
+# ==================== SETUP ====================
+
+def build_exporter(config):
+    """Span exporter for TRACING_SETTINGS['EXPORTER']."""
+    if config['EXPORTER'] == 'otlp':
+        # Optional dependency: opentelemetry-exporter-otlp-proto-http
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=config['OTLP_ENDPOINT'])
+    if config['EXPORTER'] == 'console':
+        return ConsoleSpanExporter()
+
+    path = os.path.join(settings.BASE_DIR, config['FILE'])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return ConsoleSpanExporter(
+        out=open(path, 'a', buffering=1),
+        formatter=lambda span: span.to_json(indent=None) + '\n',
+    )
+
+
+def configure_tracing(exporter=None, span_processor=None):
+    """
+    Install the tracer provider and instrumentation.
+
+    Args:
+        exporter: Span exporter (defaults to the one in TRACING_SETTINGS)
+        span_processor: Processor to add instead of a BatchSpanProcessor (tests)
+
+    Returns:
+        The TracerProvider
+    """
+    config = get_tracing_settings()
+    provider = _state['provider']
+    if provider is None:
+        provider = TracerProvider(
+            resource=Resource.create({'service.name': config['SERVICE_NAME']}),
+            sampler=ParentBased(TraceIdRatioBased(config['SAMPLE_RATIO'])),
+        )
+        trace.set_tracer_provider(provider)
+        _state['provider'] = provider
+    provider.add_span_processor(span_processor or BatchSpanProcessor(exporter or build_exporter(config)))
+
+    if not _state['instrumented']:
+        if config['TRACE_MIDDLEWARE']:
+            instrument_middleware()
+        if config['TRACE_QUERIES']:
+            instrument_queries()
+        instrument_celery()
+        _state['instrumented'] = True
+
+    _state['enabled'] = True
+    return provider
+
+
+def disable_tracing():
+    """Stop creating spans (instrumentation stays installed but idle)."""
+    _state['enabled'] = False
+
+
+# ==================== SERVICES ====================
+
+def traced(name):
+    """Decorator: run the function in a span called `name` when tracing is enabled."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _state['enabled']:
+                return function(*args, **kwargs)
+            with get_tracer().start_as_current_span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_service(cls):
+    """Class decorator: trace every public method of a service as 'ServiceName.method'."""
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith('_'):
+            continue
+        name = f"{cls.__name__}.{attr}"
+        if isinstance(value, staticmethod):
+            setattr(cls, attr, staticmethod(traced(name)(value.__func__)))
+        elif isinstance(value, classmethod):
+            setattr(cls, attr, classmethod(traced(name)(value.__func__)))
+        elif callable(value):
+            setattr(cls, attr, traced(name)(value))
+    return cls
+
+
+# ==================== MIDDLEWARE ====================
+
+def instrument_middleware():
+    """Give every MiddlewareMixin-based middleware its own span (sync or async)."""
+    original_call = MiddlewareMixin.__call__
+    if getattr(original_call, '_traced', False):
+        return
+
+    async def traced_acall(self, request):
+        # Under ASGI original_call returns a coroutine; the span must cover awaiting it
+        with get_tracer().start_as_current_span(f"middleware {type(self).__name__}"):
+            return await original_call(self, request)
+
+    def __call__(self, request):
+        if not _state['enabled']:
+            return original_call(self, request)
+        if iscoroutinefunction(self):
+            return traced_acall(self, request)
+        with get_tracer().start_as_current_span(f"middleware {type(self).__name__}"):
+            return original_call(self, request)
+
+    __call__._traced = True
+    MiddlewareMixin.__call__ = __call__
+
+
+# ==================== DATABASE ====================
+
+def query_span(execute, sql, params, many, context):
+    """execute_wrapper recording each SQL statement as a client span."""
+    if not _state['enabled']:
+        return execute(sql, params, many, context)
+
+    connection = context['connection']
+    operation = sql.split(None, 1)[0].upper() if sql else 'SQL'
+    with get_tracer().start_as_current_span(f"db {operation}", kind=SpanKind.CLIENT) as span:
+        if span.is_recording():
+            span.set_attribute('db.system', connection.vendor)
+            span.set_attribute('db.name', str(connection.settings_dict.get('NAME', '')))
+            span.set_attribute('db.statement', sql[:get_tracing_settings()['MAX_STATEMENT_LENGTH']])
+            span.set_attribute('db.alias', connection.alias)
+        return execute(sql, params, many, context)
+
+
+def _add_query_wrapper(connection, **kwargs):
+    if query_span not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_span)
+
+
+def instrument_queries():
+    """Wrap every current and future database connection."""
+    connection_created.connect(_add_query_wrapper, weak=False, dispatch_uid='tracing_queries')
+    for connection in connections.all():
+        _add_query_wrapper(connection)
+
+
+# ==================== CELERY ====================
+
+class _HeaderGetter:
+    """Read trace headers from a Celery task request (merged headers or request.headers)."""
+
+    def get(self, request, key):
+        value = getattr(request, key, None) or (getattr(request, 'headers', None) or {}).get(key)
+        return [value] if value else None
+
+    def keys(self, request):
+        return list((getattr(request, 'headers', None) or {}).keys())
+
+
+_header_getter = _HeaderGetter()
+_task_spans = {}
+
+
+def _before_task_publish(sender=None, headers=None, **kwargs):
+    if not _state['enabled'] or headers is None:
+        return
+    with get_tracer().start_as_current_span(f"celery.publish {sender}", kind=SpanKind.PRODUCER) as span:
+        span.set_attribute('messaging.system', 'celery')
+        span.set_attribute('messaging.destination', str(sender))
+        propagate.inject(headers)
+
+
+def _task_prerun(task_id=None, task=None, **kwargs):
+    if not _state['enabled']:
+        return
+    parent = propagate.extract(task.request, getter=_header_getter)
+    span = get_tracer().start_span(f"celery.task {task.name}", context=parent, kind=SpanKind.CONSUMER)
+    span.set_attribute('celery.task_id', str(task_id))
+    token = otel_context.attach(trace.set_span_in_context(span, parent))
+    _task_spans[task_id] = (span, token)
+
+
+def _task_postrun(task_id=None, state=None, **kwargs):
+    span, token = _task_spans.pop(task_id, (None, None))
+    if span is None:
+        return
+    span.set_attribute('celery.state', str(state))
+    if state == 'FAILURE':
+        span.set_status(Status(StatusCode.ERROR))
+    otel_context.detach(token)
+    span.end()
+
+
+def instrument_celery():
+    """Propagate trace context through task headers and trace task execution."""
+    from celery import signals
+    signals.before_task_publish.connect(_before_task_publish, weak=False, dispatch_uid='tracing_publish')
+    signals.task_prerun.connect(_task_prerun, weak=False, dispatch_uid='tracing_prerun')
+    signals.task_postrun.connect(_task_postrun, weak=False, dispatch_uid='tracing_postrun')
@@ -0,0 +1,91 @@
+"""
+Hot-score ranking for community posts.
+
+Uses a Reddit-style score: log10 of engagement plus the post's creation time
+scaled so that every HOT_SCORE_DECAY seconds of age is worth one order of
+magnitude of engagement. The score only changes when engagement changes, so it
+is refreshed from like/comment counter flushes instead of recomputed on read.
+"""
+
+import logging
+import math
+from datetime import datetime, timezone as dt_timezone
+from django.dispatch import receiver
+from django.utils import timezone
+from .counters import counters_flushed
+
+logger = logging.getLogger(__name__)
+
+# Fixed reference point so scores stay small floats
+HOT_SCORE_EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+# Seconds of age that offset a 10x difference in engagement (12.5 hours)
+HOT_SCORE_DECAY = 45000
+
+# A comment signals more engagement than a like
+COMMENT_WEIGHT = 2
+
+
+def hot_score(likes_count, comments_count, created_at):
+    """
+    Calculate the time-decayed hot score of a post.
+
+    Args:
+        likes_count: Number of likes
+        comments_count: Number of comments
+        created_at: Post creation datetime
+
+    Returns:
+        Hot score (float); higher ranks first
+    """
+    engagement = max(likes_count + COMMENT_WEIGHT * comments_count, 1)
+    age_seconds = (created_at - HOT_SCORE_EPOCH).total_seconds()
+    return round(math.log10(engagement) + age_seconds / HOT_SCORE_DECAY, 7)
+
+
+class TrendingService:
+    """Service for maintaining community post hot scores."""
+
+    @staticmethod
+    def refresh_posts(post_ids):
+        """
+        Recompute hot scores for the given posts from their current counts.
+
+        Args:
+            post_ids: Iterable of CommunityPost IDs
+
+        Returns:
+            Number of posts updated
+        """
+        from api.models import CommunityPost
+
+        posts = [
+            CommunityPost(id=post_id, hot_score=hot_score(likes, comments, created_at))
+            for post_id, likes, comments, created_at in CommunityPost.objects.filter(
+                id__in=post_ids
+            ).values_list('id', 'likes_count', 'comments_count', 'created_at')
+        ]
+
+        if posts:
+            CommunityPost.objects.bulk_update(posts, ['hot_score'], batch_size=500)
+
+        return len(posts)
+
+    @staticmethod
+    def initial_score(created_at=None):
+        """Hot score of a post with no engagement yet."""
+        return hot_score(0, 0, created_at or timezone.now())
+
+
+@receiver(counters_flushed)
+def refresh_hot_scores(sender, pks, fields, **kwargs):
+    """Refresh hot scores after like/comment counters reach the database."""
+    if sender._meta.label_lower != 'api.communitypost':
+        return
+    if not {'likes_count', 'comments_count'} & set(fields):
+        return
+
+    try:
+        TrendingService.refresh_posts(pks)
+    except Exception as e:
+        logger.error(f"Error refreshing hot scores: {str(e)}")
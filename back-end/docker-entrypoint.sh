@@ -47,10 +47,8 @@ echo "Setup complete! Starting Gunicorn..."
 
 # Start Gunicorn
 exec gunicorn backend.wsgi:application \
-  --bind 0.0.0.0:8000 \
-  --workers 4 \
+  --config gunicorn.conf.py \
   --worker-class sync \
-  --timeout 120 \
   --access-logfile - \
   --error-logfile - \
   "$@"
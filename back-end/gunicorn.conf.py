@@ -0,0 +1,30 @@
+"""
+Gunicorn configuration.
+
+Prometheus metrics run in multiprocess mode: each worker writes its samples
+to mmap files in PROMETHEUS_MULTIPROC_DIR and /metrics aggregates them. The
+directory is emptied on startup and dead workers' live gauges are dropped.
+"""
+
+import os
+import shutil
+
+# Must be set before prometheus_client is imported (workers fork from this process)
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus_multiproc')
+
+from prometheus_client import multiprocess  # noqa: E402
+
+bind = '0.0.0.0:8000'
+workers = int(os.environ.get('GUNICORN_WORKERS', 4))
+timeout = 120
+
+
+def on_starting(server):
+    """Start from an empty metrics directory so old workers' samples are not counted."""
+    directory = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)
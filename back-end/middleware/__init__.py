@@ -17,6 +17,7 @@ MIDDLEWARE = [
     'middleware.analytics_middleware.PerformanceMonitoringMiddleware',
     'middleware.rate_limiting_middleware.RateLimitMiddleware',
     'middleware.rate_limiting_middleware.IPWhitelistMiddleware',
+    'middleware.database_middleware.ReplicaPinningMiddleware',
 ]
 """
 
@@ -44,6 +45,8 @@ from .rate_limiting_middleware import (
     IPWhitelistMiddleware,
 )
 
+from .database_middleware import ReplicaPinningMiddleware
+
 __all__ = [
     # Authentication
     'JWTAuthenticationMiddleware',
@@ -60,4 +63,6 @@ __all__ = [
     # Rate Limiting
     'RateLimitMiddleware',
     'IPWhitelistMiddleware',
+    # Database Routing
+    'ReplicaPinningMiddleware',
 ]
@@ -4,7 +4,10 @@ Tracks user activity, API usage, and performance metrics.
 """
 
 import logging
+import random
 import time
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 from django.core.cache import cache
 from django.utils import timezone
@@ -165,3 +168,230 @@ class PerformanceMonitoringMiddleware(MiddlewareMixin):
             response['X-Response-Time'] = f"{duration:.3f}s"
         
         return response
+
+
+class QueryBudgetMiddleware(MiddlewareMixin):
+    """
+    Development aid that counts SQL queries per request and logs a warning
+    with the offending call sites when a request exceeds the budget.
+    Enabled by QUERY_BUDGET_SETTINGS['ENABLED'] (defaults to DEBUG).
+    
+    Usage: Add 'middleware.analytics_middleware.QueryBudgetMiddleware' to MIDDLEWARE
+    """
+
+    DEFAULT_SETTINGS = {
+        'ENABLED': False,
+        'WARN_THRESHOLD': 30,  # Queries per request
+        'CALL_SITES': 5,  # Call sites listed in the warning
+    }
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        self.config = {**self.DEFAULT_SETTINGS, **getattr(settings, 'QUERY_BUDGET_SETTINGS', {})}
+
+    def process_request(self, request):
+        """Start recording queries."""
+        if not self.config['ENABLED']:
+            return None
+
+        from core.querylog import QueryRecorder
+        request._query_recorder = QueryRecorder(capture_call_sites=True).__enter__()
+        return None
+
+    def process_response(self, request, response):
+        """Stop recording and warn when over budget."""
+        recorder = getattr(request, '_query_recorder', None)
+        if recorder is None:
+            return response
+
+        recorder.__exit__(None, None, None)
+        del request._query_recorder
+
+        response['X-Query-Count'] = str(recorder.count)
+
+        if recorder.count > self.config['WARN_THRESHOLD']:
+            call_sites = '\n'.join(
+                f"  {count:>4} queries  {call_site or '(framework)'}"
+                for call_site, count in recorder.top_call_sites(self.config['CALL_SITES'])
+            )
+            logger.warning(
+                f"Query budget exceeded: {request.method} {request.path} ran {recorder.count} queries "
+                f"({recorder.total_time * 1000:.1f}ms SQL), threshold {self.config['WARN_THRESHOLD']}. "
+                f"Top call sites:\n{call_sites}",
+                extra={
+                    'method': request.method,
+                    'path': request.path,
+                    'query_count': recorder.count,
+                    'sql_time_seconds': recorder.total_time,
+                }
+            )
+
+        return response
+
+
+class ProfilingMiddleware(MiddlewareMixin):
+    """
+    Opt-in request profiling: stack samples (or cProfile) plus the SQL executed.
+    Triggered by staff sending the X-Profile header or by 1-in-N sampling;
+    untriggered requests only pay for a header lookup and a random draw.
+    Profiles are browsable at /api/profiles/ and returned as X-Profile-Id.
+    
+    Usage: Add 'middleware.analytics_middleware.ProfilingMiddleware' to MIDDLEWARE
+    (after the authentication middleware, so staff can be recognised)
+    """
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        from core.profiling import get_profiling_settings
+        self.config = get_profiling_settings()
+        self.header = 'HTTP_' + self.config['HEADER'].upper().replace('-', '_')
+        self.sample_rate = self.config['SAMPLE_RATE']
+
+    def process_request(self, request):
+        """Start profiling when requested or sampled."""
+        requested = request.META.get(self.header)
+        if requested and request.user.is_authenticated and request.user.is_staff:
+            mode = 'cprofile' if requested.lower() == 'cprofile' else 'sample'
+            trigger = 'header'
+        elif self.sample_rate and random.random() * self.sample_rate < 1:
+            mode = self.config['MODE']
+            trigger = 'sampled'
+        else:
+            return None
+
+        from core.profiling import RequestProfile
+        request._profile = RequestProfile(mode, self.config).start()
+        request._profile_trigger = trigger
+        return None
+
+    def process_response(self, request, response):
+        """Stop profiling and store the result."""
+        profile = getattr(request, '_profile', None)
+        if profile is None:
+            return response
+        del request._profile
+
+        from core.profiling import ProfileStore
+        try:
+            data = profile.stop()
+            data.update({
+                'method': request.method,
+                'path': request.get_full_path(),
+                'status_code': response.status_code,
+                'trigger': request._profile_trigger,
+                'user': request.user.username if request.user.is_authenticated else 'Anonymous',
+            })
+            response['X-Profile-Id'] = ProfileStore.save(data, self.config)
+        except Exception as e:
+            logger.error(f"Failed to store request profile: {str(e)}")
+        return response
+
+
+class MetricsMiddleware(MiddlewareMixin):
+    """
+    Records Prometheus request metrics: latency histogram, requests by status
+    code and SQL queries per request, labelled by route name. Exposed with the
+    cache and Celery metrics at /metrics.
+    
+    Usage: Add 'middleware.analytics_middleware.MetricsMiddleware' to the top of MIDDLEWARE
+    """
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        from core.metrics import get_metrics_settings
+        self.enabled = get_metrics_settings()['ENABLED']
+
+    def process_request(self, request):
+        """Start the request timer and query counter."""
+        if not self.enabled:
+            return None
+
+        from core.metrics import QueryCounter
+        request._metrics_queries = QueryCounter().__enter__()
+        request._metrics_start_time = time.perf_counter()
+        return None
+
+    def process_response(self, request, response):
+        """Observe the request."""
+        queries = getattr(request, '_metrics_queries', None)
+        if queries is None:
+            return response
+
+        duration = time.perf_counter() - request._metrics_start_time
+        queries.__exit__(None, None, None)
+        del request._metrics_queries
+
+        from core.metrics import REQUEST_LATENCY, REQUEST_QUERIES, REQUESTS, route_name
+        route = route_name(request)
+        REQUEST_LATENCY.labels(request.method, route).observe(duration)
+        REQUEST_QUERIES.labels(request.method, route).observe(queries.count)
+        REQUESTS.labels(request.method, route, str(response.status_code)).inc()
+        return response
+
+
+class TracingMiddleware(MiddlewareMixin):
+    """
+    Opens the server span for each request (continuing an incoming W3C
+    traceparent), so middleware, service, SQL and Celery publish spans nest
+    under it. Adds an X-Trace-Id response header. Idle unless
+    TRACING_SETTINGS['ENABLED'].
+    
+    Usage: Add 'middleware.analytics_middleware.TracingMiddleware' to the top of MIDDLEWARE
+    """
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        from core import tracing
+        if not tracing.is_enabled():
+            return self.get_response(request)
+
+        with self.start_span(request) as span:
+            response = self.get_response(request)
+            self.finish_span(span, request, response, self.get_user_id(request))
+        return response
+
+    async def __acall__(self, request):
+        """Async variant: keeps the span open across the awaited response."""
+        from core import tracing
+        if not tracing.is_enabled():
+            return await self.get_response(request)
+
+        with self.start_span(request) as span:
+            response = await self.get_response(request)
+            # Resolving request.user may query the database
+            user_id = await sync_to_async(self.get_user_id)(request)
+            self.finish_span(span, request, response, user_id)
+        return response
+
+    def start_span(self, request):
+        from opentelemetry import propagate
+        from opentelemetry.trace import SpanKind
+        from core import tracing
+
+        parent = propagate.extract(request.headers)
+        return tracing.get_tracer().start_as_current_span(
+            f"{request.method} {request.path}", context=parent, kind=SpanKind.SERVER
+        )
+
+    def get_user_id(self, request):
+        user = getattr(request, 'user', None)
+        return user.id if user is not None and user.is_authenticated else None
+
+    def finish_span(self, span, request, response, user_id):
+        from opentelemetry.trace import Status, StatusCode
+        from core.metrics import route_name
+
+        route = route_name(request)
+        span.update_name(f"{request.method} {route}")
+        span.set_attribute('http.method', request.method)
+        span.set_attribute('http.route', route)
+        span.set_attribute('http.target', request.get_full_path())
+        span.set_attribute('http.status_code', response.status_code)
+        if user_id is not None:
+            span.set_attribute('enduser.id', str(user_id))
+        if response.status_code >= 500:
+            span.set_status(Status(StatusCode.ERROR))
+        response['X-Trace-Id'] = format(span.get_span_context().trace_id, '032x')
+
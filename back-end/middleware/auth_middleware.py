@@ -53,7 +53,7 @@ class JWTAuthenticationMiddleware(MiddlewareMixin):
         try:
             from rest_framework_simplejwt.tokens import AccessToken
             decoded_token = AccessToken(token)
-            return dict(decoded_token)
+            return decoded_token.payload
         except Exception as e:
             raise InvalidToken(str(e))
 
@@ -0,0 +1,56 @@
+"""
+Database routing middleware.
+Keeps a client's reads on the primary right after it writes (core.routing).
+"""
+
+from asgiref.sync import iscoroutinefunction
+from django.utils.deprecation import MiddlewareMixin
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaPinningMiddleware(MiddlewareMixin):
+    """
+    Read-your-writes for replica routing. Each request gets its own pinning
+    scope: unsafe methods, requests carrying the pin cookie, and requests
+    that already wrote read from the primary. After a successful unsafe
+    request the client keeps reading from the primary for
+    REPLICA_SETTINGS['PIN_SECONDS'] while the replica catches up.
+    
+    Usage: Add 'middleware.database_middleware.ReplicaPinningMiddleware' near the top of MIDDLEWARE
+    """
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        from core.routing import get_replica_settings, pinning_scope
+
+        config = get_replica_settings()
+        if not config['ALIAS']:
+            return self.get_response(request)
+
+        unsafe = request.method not in SAFE_METHODS
+        with pinning_scope(unsafe or config['COOKIE'] in request.COOKIES):
+            response = self.get_response(request)
+        return self.pin_client(request, response, config)
+
+    async def __acall__(self, request):
+        """Async variant: the scope stays open until the awaited response is ready."""
+        from core.routing import get_replica_settings, pinning_scope
+
+        config = get_replica_settings()
+        if not config['ALIAS']:
+            return await self.get_response(request)
+
+        unsafe = request.method not in SAFE_METHODS
+        # Sync views run in worker threads that copy this context, pin included
+        with pinning_scope(unsafe or config['COOKIE'] in request.COOKIES):
+            response = await self.get_response(request)
+        return self.pin_client(request, response, config)
+
+    def pin_client(self, request, response, config):
+        """Keep a client that just wrote on the primary while the replica catches up."""
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(config['COOKIE'], '1', max_age=config['PIN_SECONDS'], httponly=True, samesite='Lax')
+        return response
@@ -35,6 +35,15 @@ class RateLimitMiddleware(MiddlewareMixin):
     BURST_SIZE = 20  # Requests per burst window
     BURST_WINDOW = 60  # Seconds
 
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        from django.conf import settings
+
+        # RATE_LIMIT_SETTINGS overrides the defaults above
+        for key, value in getattr(settings, 'RATE_LIMIT_SETTINGS', {}).items():
+            if hasattr(self, key):
+                setattr(self, key, value)
+
     def process_request(self, request):
         """Check rate limits before processing request."""
         
@@ -8,10 +8,18 @@ from django.utils import timezone
 from django.db.models import Count
 from api.models import Achievement, UserAchievement, User
 from datetime import timedelta
+from core.caching import cached
+from core.tracing import trace_service
+from .notification_service import NotificationService
 
 logger = logging.getLogger(__name__)
 
+# Refreshed hourly by generate_achievement_stats
+LEADERBOARD_FRESH_FOR = 3600
+LEADERBOARD_STALE_FOR = 600
 
+
+@trace_service
 class AchievementService:
     """Service for managing achievements and gamification."""
 
@@ -158,6 +166,8 @@ class AchievementService:
             user.save()
             
             logger.info(f"Achievement {achievement_key} unlocked for user {user.id}, +{achievement.points_awarded} points")
+            # Pushed to the user's open streams along with the notification
+            NotificationService.notify_achievement_unlocked(user, achievement)
 
     @staticmethod
     def _get_metric_value(user, metric_type):
@@ -244,6 +254,7 @@ class AchievementService:
         return sorted(progress, key=lambda x: x['estimated_percentage'], reverse=True)
 
     @staticmethod
+    @cached('achievement_leaderboard:{limit}', LEADERBOARD_FRESH_FOR, LEADERBOARD_STALE_FOR)
     def get_leaderboard(limit=100):
         """
         Get achievement leaderboard based on points.
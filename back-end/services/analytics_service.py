@@ -8,14 +8,33 @@ from django.utils import timezone
 from django.db.models import Count, Q, F, Sum, Avg
 from api.models import (
     User, CommunityPost, Resume, UserCourseProgress,
-    UserSkill, MentorSession, JobApplication, UserAchievement
+    UserSkill, Mentor, JobApplication, UserAchievement
 )
-from datetime import timedelta, datetime
+from datetime import timedelta
 from django.core.cache import cache
+from core.caching import cached
+from core.stats import StatsEngine, count
+from core.timeseries import TimeSeriesService
+from core.routing import replica_reads
+from core.tracing import trace_service
 
 logger = logging.getLogger(__name__)
 
+# Cached analytics: fresh for an hour (refreshed by cache_platform_analytics),
+# then served stale for up to another hour while one worker recomputes
+ANALYTICS_FRESH_FOR = 3600
+ANALYTICS_STALE_FOR = 3600
 
+# Per-user stats are also dropped whenever the user's data changes (tag user:<id>)
+USER_STATS_FRESH_FOR = 3600
+USER_STATS_STALE_FOR = 600
+
+# UserSkill.proficiency_level is 0-100
+EXPERT_PROFICIENCY = 80
+
+
+@trace_service
+@replica_reads
 class AnalyticsService:
     """Service for tracking analytics and generating reports."""
 
@@ -30,8 +49,55 @@ class AnalyticsService:
         Returns:
             Dictionary of user statistics
         """
-        now = timezone.now()
-        thirty_days_ago = now - timedelta(days=30)
+        stats = AnalyticsService.get_cached_user_stats(user)
+        # Activity changes on every request, so it is read fresh, not cached for the hour
+        last_active = cache.get(f'user_last_activity:{user.id}')
+        return {**stats, 'profile': {**stats['profile'], 'last_active': last_active}}
+
+    @staticmethod
+    @cached('user_stats:{user.id}', USER_STATS_FRESH_FOR, USER_STATS_STALE_FOR, tags=['user:{user.id}'])
+    def get_cached_user_stats(user):
+        """
+        Get the cacheable part of a user's statistics (all but last_active).
+        
+        Args:
+            user: User object
+        
+        Returns:
+            Dictionary of user statistics
+        """
+        thirty_days_ago = timezone.now() - timedelta(days=30)
+        
+        # One aggregate per table; run serially, since this is called per user
+        # and a thread per pass would cost more connections than it saves
+        counters = StatsEngine.run({
+            'achievements': lambda: StatsEngine.aggregate(
+                UserAchievement.objects.filter(user=user), total=count()
+            ),
+            'skills': lambda: StatsEngine.aggregate(
+                UserSkill.objects.filter(user=user),
+                total=count(),
+                expert=count(Q(proficiency_level__gte=EXPERT_PROFICIENCY)),
+                endorsed=count(Q(endorsed_by_count__gt=0)),
+            ),
+            'learning': lambda: StatsEngine.aggregate(
+                UserCourseProgress.objects.filter(user=user),
+                enrolled=count(),
+                completed=count(Q(completed_at__isnull=False)),
+            ),
+            'community': lambda: StatsEngine.aggregate(
+                CommunityPost.objects.filter(user=user),
+                total=count(),
+                likes=Sum('likes_count'),
+                recent=count(Q(created_at__gte=thirty_days_ago)),
+            ),
+            'jobs': lambda: StatsEngine.aggregate(
+                JobApplication.objects.filter(user=user),
+                total=count(),
+                pending=count(Q(status='applied')),
+            ),
+        }, concurrent=False)
+        mentor = Mentor.objects.filter(user=user).values('total_mentees', 'rating').first() if user.is_mentor else None
         
         return {
             'profile': {
@@ -39,67 +105,44 @@ class AnalyticsService:
                 'is_mentor': user.is_mentor,
                 'is_premium': user.is_premium,
                 'joined_date': user.created_at.isoformat(),
-                'last_active': cache.get(f'user_last_activity:{user.id}'),
             },
             'achievements': {
-                'total_achievements': UserAchievement.objects.filter(user=user).count(),
+                'total_achievements': counters['achievements']['total'],
                 'recent_achievements': list(
                     UserAchievement.objects.filter(
                         user=user,
-                        earned_at__gte=thirty_days_ago
-                    ).values('achievement__name', 'earned_at')
+                        earned_date__gte=thirty_days_ago
+                    ).values('achievement__title', 'earned_date')
                 ),
             },
             'skills': {
-                'total_skills': UserSkill.objects.filter(user=user).count(),
-                'expert_skills': UserSkill.objects.filter(
-                    user=user,
-                    proficiency_level='expert'
-                ).count(),
-                'endorsed_skills': UserSkill.objects.filter(
-                    user=user,
-                    endorsements_count__gt=0
-                ).count(),
+                'total_skills': counters['skills']['total'],
+                'expert_skills': counters['skills']['expert'],
+                'endorsed_skills': counters['skills']['endorsed'],
             },
             'learning': {
-                'enrolled_courses': UserCourseProgress.objects.filter(user=user).count(),
-                'completed_courses': UserCourseProgress.objects.filter(
-                    user=user,
-                    status='completed'
-                ).count(),
-                'in_progress_courses': UserCourseProgress.objects.filter(
-                    user=user,
-                    status='in_progress'
-                ).count(),
+                'enrolled_courses': counters['learning']['enrolled'],
+                'completed_courses': counters['learning']['completed'],
+                'in_progress_courses': counters['learning']['enrolled'] - counters['learning']['completed'],
             },
             'community': {
-                'total_posts': CommunityPost.objects.filter(author=user).count(),
-                'total_likes': CommunityPost.objects.filter(author=user).aggregate(
-                    total=Sum('likes_count')
-                )['total'] or 0,
-                'recent_posts': CommunityPost.objects.filter(
-                    author=user,
-                    created_at__gte=thirty_days_ago
-                ).count(),
+                'total_posts': counters['community']['total'],
+                'total_likes': counters['community']['likes'] or 0,
+                'recent_posts': counters['community']['recent'],
             },
             'jobs': {
-                'job_applications': JobApplication.objects.filter(user=user).count(),
-                'pending_applications': JobApplication.objects.filter(
-                    user=user,
-                    status='applied'
-                ).count(),
+                'job_applications': counters['jobs']['total'],
+                'pending_applications': counters['jobs']['pending'],
             },
             'mentoring': {
                 'is_mentor': user.is_mentor,
-                'mentoring_sessions': MentorSession.objects.filter(mentor=user).count() if user.is_mentor else 0,
-                'completed_sessions': MentorSession.objects.filter(
-                    mentor=user,
-                    status='completed'
-                ).count() if user.is_mentor else 0,
+                'total_mentees': mentor['total_mentees'] if mentor else 0,
+                'rating': mentor['rating'] if mentor else None,
             }
         }
 
     @staticmethod
+    @cached('platform_stats', ANALYTICS_FRESH_FOR, ANALYTICS_STALE_FOR)
     def get_platform_stats():
         """
         Get overall platform statistics.
@@ -107,66 +150,70 @@ class AnalyticsService:
         Returns:
             Dictionary of platform statistics
         """
-        now = timezone.now()
-        thirty_days_ago = now - timedelta(days=30)
+        thirty_days_ago = timezone.now() - timedelta(days=30)
+        
+        tables = StatsEngine.tables(
+            users=(User.objects.all(), {
+                'total': count(),
+                'active': count(Q(last_login__gte=thirty_days_ago)),
+                'mentors': count(Q(is_mentor=True)),
+                'premium': count(Q(is_premium=True)),
+                'average_points': Avg('points'),
+            }),
+            posts=(CommunityPost.objects.all(), {
+                'total': count(),
+                'this_month': count(Q(created_at__gte=thirty_days_ago)),
+            }),
+            resumes=(Resume.objects.all(), {'total': count()}),
+            enrollments=(UserCourseProgress.objects.all(), {'total': count()}),
+            achievements=(UserAchievement.objects.all(), {'total': count()}),
+            skills=(UserSkill.objects.all(), {'endorsed': count(Q(endorsed_by_count__gt=0))}),
+            applications=(JobApplication.objects.all(), {
+                'total': count(),
+                'this_month': count(Q(applied_at__gte=thirty_days_ago)),
+            }),
+        )
         
         return {
             'users': {
-                'total_users': User.objects.count(),
-                'active_users': User.objects.filter(
-                    last_login__gte=thirty_days_ago
-                ).count(),
-                'mentors': User.objects.filter(is_mentor=True).count(),
-                'premium_users': User.objects.filter(is_premium=True).count(),
+                'total_users': tables['users']['total'],
+                'active_users': tables['users']['active'],
+                'mentors': tables['users']['mentors'],
+                'premium_users': tables['users']['premium'],
             },
             'content': {
-                'total_posts': CommunityPost.objects.count(),
-                'posts_this_month': CommunityPost.objects.filter(
-                    created_at__gte=thirty_days_ago
-                ).count(),
-                'total_resumes': Resume.objects.count(),
-                'total_courses': UserCourseProgress.objects.count(),
+                'total_posts': tables['posts']['total'],
+                'posts_this_month': tables['posts']['this_month'],
+                'total_resumes': tables['resumes']['total'],
+                'total_courses': tables['enrollments']['total'],
             },
             'engagement': {
-                'average_user_points': User.objects.aggregate(Avg('points'))['points__avg'] or 0,
-                'total_achievements_earned': UserAchievement.objects.count(),
-                'skills_endorsed': UserSkill.objects.filter(endorsements_count__gt=0).count(),
+                'average_user_points': tables['users']['average_points'] or 0,
+                'total_achievements_earned': tables['achievements']['total'],
+                'skills_endorsed': tables['skills']['endorsed'],
             },
             'jobs': {
-                'total_applications': JobApplication.objects.count(),
-                'applications_this_month': JobApplication.objects.filter(
-                    created_at__gte=thirty_days_ago
-                ).count(),
+                'total_applications': tables['applications']['total'],
+                'applications_this_month': tables['applications']['this_month'],
             }
         }
 
     @staticmethod
-    def get_activity_heatmap(days=30):
+    def get_activity_heatmap(days=30, metric='posts'):
         """
         Get user activity heatmap for the last N days.
         
         Args:
             days: Number of days to include
+            metric: Time series to count (see core.timeseries.SERIES)
         
         Returns:
-            Dictionary with daily activity counts
+            Dictionary with daily activity counts, oldest first
         """
-        heatmap = {}
-        
-        for i in range(days):
-            date = timezone.now().date() - timedelta(days=i)
-            day_start = timezone.make_aware(datetime.combine(date, datetime.min.time()))
-            day_end = timezone.make_aware(datetime.combine(date, datetime.max.time()))
-            
-            activity_count = CommunityPost.objects.filter(
-                created_at__range=[day_start, day_end]
-            ).count()
-            
-            heatmap[date.isoformat()] = activity_count
-        
-        return heatmap
+        return TimeSeriesService.series(metric, periods=days)
 
     @staticmethod
+    @cached('skill_analytics', ANALYTICS_FRESH_FOR, ANALYTICS_STALE_FOR)
     def get_skill_analytics():
         """
         Get analytics on skill endorsements and popularity.
@@ -174,26 +221,27 @@ class AnalyticsService:
         Returns:
             Dictionary of skill analytics
         """
-        return {
-            'most_endorsed_skills': list(
+        return StatsEngine.run({
+            'most_endorsed_skills': lambda: list(
                 UserSkill.objects.values('skill__name', 'skill__category') \
-                    .annotate(total_endorsements=Sum('endorsements_count')) \
+                    .annotate(total_endorsements=Sum('endorsed_by_count')) \
                     .order_by('-total_endorsements')[:20]
             ),
-            'most_common_skills': list(
+            'most_common_skills': lambda: list(
                 UserSkill.objects.values('skill__name', 'skill__category') \
                     .annotate(user_count=Count('user')) \
                     .order_by('-user_count')[:20]
             ),
-            'expert_count_by_skill': list(
-                UserSkill.objects.filter(proficiency_level='expert') \
+            'expert_count_by_skill': lambda: list(
+                UserSkill.objects.filter(proficiency_level__gte=EXPERT_PROFICIENCY) \
                     .values('skill__name', 'skill__category') \
                     .annotate(expert_count=Count('user')) \
                     .order_by('-expert_count')[:20]
             ),
-        }
+        })
 
     @staticmethod
+    @cached('course_analytics', ANALYTICS_FRESH_FOR, ANALYTICS_STALE_FOR)
     def get_course_analytics():
         """
         Get analytics on course enrollment and completion.
@@ -201,29 +249,36 @@ class AnalyticsService:
         Returns:
             Dictionary of course analytics
         """
-        return {
-            'most_enrolled_courses': list(
+        results = StatsEngine.run({
+            'most_enrolled_courses': lambda: list(
                 UserCourseProgress.objects.values('course__title', 'course__id') \
                     .annotate(enrollment_count=Count('user')) \
                     .order_by('-enrollment_count')[:10]
             ),
+            'totals': lambda: StatsEngine.aggregate(
+                UserCourseProgress.objects.all(),
+                enrollments=count(),
+                completions=count(Q(completed_at__isnull=False)),
+                average_rating=Avg('course__rating'),
+            ),
+        })
+        totals = results['totals']
+        
+        return {
+            'most_enrolled_courses': results['most_enrolled_courses'],
             'completion_rate': {
-                'total_enrollments': UserCourseProgress.objects.count(),
-                'total_completions': UserCourseProgress.objects.filter(
-                    status='completed'
-                ).count(),
+                'total_enrollments': totals['enrollments'],
+                'total_completions': totals['completions'],
                 'completion_percentage': (
-                    (UserCourseProgress.objects.filter(status='completed').count() /
-                     UserCourseProgress.objects.count() * 100)
-                    if UserCourseProgress.objects.count() > 0 else 0
+                    totals['completions'] / totals['enrollments'] * 100
+                    if totals['enrollments'] else 0
                 )
             },
-            'average_course_rating': UserCourseProgress.objects.aggregate(
-                avg_rating=Avg('course__rating')
-            )['avg_rating'] or 0,
+            'average_course_rating': totals['average_rating'] or 0,
         }
 
     @staticmethod
+    @cached('job_analytics', ANALYTICS_FRESH_FOR, ANALYTICS_STALE_FOR)
     def get_job_analytics():
         """
         Get analytics on job applications and matches.
@@ -231,71 +286,78 @@ class AnalyticsService:
         Returns:
             Dictionary of job analytics
         """
-        return {
-            'total_applications': JobApplication.objects.count(),
-            'application_status': {
-                'applied': JobApplication.objects.filter(status='applied').count(),
-                'interview': JobApplication.objects.filter(status='interview').count(),
-                'rejected': JobApplication.objects.filter(status='rejected').count(),
-                'accepted': JobApplication.objects.filter(status='accepted').count(),
-            },
-            'applications_by_job_type': dict(
+        statuses = [status for status, _ in JobApplication.STATUS_CHOICES]
+        results = StatsEngine.run({
+            'counts': lambda: StatsEngine.aggregate(
+                JobApplication.objects.all(),
+                total=count(),
+                **{status: count(Q(status=status)) for status in statuses}
+            ),
+            'applications_by_job_type': lambda: dict(
                 JobApplication.objects.values('job__job_type') \
                     .annotate(count=Count('id')) \
+                    .order_by() \
                     .values_list('job__job_type', 'count')
             ),
-            'top_applied_locations': list(
+            'top_applied_locations': lambda: list(
                 JobApplication.objects.values('job__location') \
                     .annotate(count=Count('id')) \
                     .order_by('-count')[:10]
             ),
+        })
+        counts = results['counts']
+        
+        return {
+            'total_applications': counts['total'],
+            'application_status': {status: counts[status] for status in statuses},
+            'applications_by_job_type': results['applications_by_job_type'],
+            'top_applied_locations': results['top_applied_locations'],
         }
 
     @staticmethod
-    def get_user_growth():
+    def get_user_growth(months=12, metric='signups'):
         """
         Get user growth analytics.
         
+        Args:
+            months: Number of calendar months to include
+            metric: Time series to count (see core.timeseries.SERIES)
+        
         Returns:
-            Dictionary with user growth data
+            Dictionary with monthly counts keyed 'YYYY-MM', oldest first
         """
-        now = timezone.now()
-        growth = {}
-        
-        for months_back in range(12):
-            month_start = now.replace(day=1) - timedelta(days=30 * months_back)
-            month_end = month_start + timedelta(days=30)
-            
-            month_key = month_start.strftime('%Y-%m')
-            growth[month_key] = User.objects.filter(
-                created_at__range=[month_start, month_end]
-            ).count()
-        
-        return growth
+        return TimeSeriesService.series(metric, periods=months, granularity='month')
 
     @staticmethod
+    @cached('mentoring_analytics', ANALYTICS_FRESH_FOR, ANALYTICS_STALE_FOR)
     def get_mentoring_analytics():
         """
-        Get analytics on mentoring sessions and ratings.
+        Get analytics on mentors and their ratings.
         
         Returns:
             Dictionary of mentoring analytics
         """
-        completed_sessions = MentorSession.objects.filter(status='completed')
+        results = StatsEngine.run({
+            'totals': lambda: StatsEngine.aggregate(
+                Mentor.objects.all(),
+                total=count(),
+                verified=count(Q(verified=True)),
+                mentees=Sum('total_mentees'),
+                average_rating=Avg('rating'),
+            ),
+            'top_mentors': lambda: list(
+                Mentor.objects.order_by('-total_mentees')[:10] \
+                    .values('user_id', 'user__username', 'total_mentees', 'rating')
+            ),
+        })
+        totals = results['totals']
         
         return {
-            'total_sessions': MentorSession.objects.count(),
-            'completed_sessions': completed_sessions.count(),
-            'pending_sessions': MentorSession.objects.filter(status='pending').count(),
-            'average_rating': completed_sessions.aggregate(
-                avg_rating=Avg('rating')
-            )['avg_rating'] or 0,
-            'top_mentors': list(
-                User.objects.filter(mentor__isnull=False) \
-                    .annotate(session_count=Count('mentor__mentees')) \
-                    .order_by('-session_count')[:10] \
-                    .values('id', 'username', 'session_count')
-            ),
+            'total_mentors': totals['total'],
+            'verified_mentors': totals['verified'],
+            'total_mentees': totals['mentees'] or 0,
+            'average_rating': totals['average_rating'] or 0,
+            'top_mentors': results['top_mentors'],
         }
 
     @staticmethod
@@ -322,13 +384,30 @@ class AnalyticsService:
                 'growth': AnalyticsService.get_user_growth(),
             }
 
+    @staticmethod
+    def cached_analytics():
+        """Cache keys of the hourly analytics and the (cached) methods computing them."""
+        return {
+            'platform_stats': AnalyticsService.get_platform_stats,
+            'skill_analytics': AnalyticsService.get_skill_analytics,
+            'course_analytics': AnalyticsService.get_course_analytics,
+            'job_analytics': AnalyticsService.get_job_analytics,
+            'mentoring_analytics': AnalyticsService.get_mentoring_analytics,
+        }
+
     @staticmethod
     def cache_analytics():
         """
-        Cache expensive analytics computations.
+        Recompute all cached analytics. Readers keep getting the previous values
+        meanwhile, and a refresh already running elsewhere is not repeated.
+        
+        Returns:
+            Names of the entries refreshed
         """
-        cache.set('platform_stats', AnalyticsService.get_platform_stats(), timeout=3600)
-        cache.set('skill_analytics', AnalyticsService.get_skill_analytics(), timeout=3600)
-        cache.set('course_analytics', AnalyticsService.get_course_analytics(), timeout=3600)
-        cache.set('job_analytics', AnalyticsService.get_job_analytics(), timeout=3600)
-        logger.info("Analytics cached for 1 hour")
+        refreshed = []
+        for name, method in AnalyticsService.cached_analytics().items():
+            done, _ = method.refresh()
+            if done:
+                refreshed.append(name)
+        logger.info(f"Analytics refreshed: {', '.join(refreshed) or 'none (refresh already running)'}")
+        return refreshed
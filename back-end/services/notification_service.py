@@ -1,43 +1,55 @@
 """
 Notification service.
 Handles user notifications, alerts, and messaging.
+
+Events with many recipients are written with one bulk INSERT per batch. Each
+user's unread count is kept in User.unread_notifications, updated in the same
+transaction as the rows it counts, so badges never COUNT(*) the table. On
+PostgreSQL notifications are partitioned by month (core.partitions), and
+retention drops whole partitions instead of deleting rows. New notifications
+and read receipts are pushed to the user's open event streams (core.push)
+once the transaction commits, so clients do not poll for them. Likes and
+comments are coalesced per recipient and target (core.coalescing) into one
+"Alice and 312 others liked your post" notification per window.
 """
 
 import logging
+from collections import Counter, defaultdict
 from django.utils import timezone
 from django.core.mail import send_mail
 from django.conf import settings
-from api.models import User
+from django.db import transaction
+from django.db.models import Case, Count, F, Value, When
+from django.db.models.functions import Greatest
+from api.models import Notification, User
 from datetime import timedelta
-from django.db import models
+from core.coalescing import Coalescer, get_coalescing_settings
+from core.partitions import ensure_partitions, purge_before, retention_boundary
+from core.push import publish, publish_many
+from core.tracing import trace_service
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_NOTIFICATION_SETTINGS = {
+    'RETENTION_DAYS': 30,  # Notifications older than this are removed (read or not)
+    'PARTITIONS_AHEAD': 2,  # Monthly partitions created ahead of time (PostgreSQL)
+    'BATCH_SIZE': 1000,  # Rows per bulk INSERT and users per unread-count UPDATE
+}
+
+
+def get_notification_settings():
+    """Merge NOTIFICATION_SETTINGS from settings.py over the defaults."""
+    return {**DEFAULT_NOTIFICATION_SETTINGS, **getattr(settings, 'NOTIFICATION_SETTINGS', {})}
 
-class Notification(models.Model):
-    """Model for storing notifications (add to api/models.py)"""
-    NOTIFICATION_TYPES = [
-        ('achievement', 'Achievement Unlocked'),
-        ('mention', 'Mentioned'),
-        ('like', 'Post Liked'),
-        ('comment', 'Comment Added'),
-        ('job_match', 'Job Match'),
-        ('mentor_request', 'Mentor Request'),
-        ('system', 'System Alert'),
-    ]
-    
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
-    notification_type = models.CharField(max_length=20, choices=NOTIFICATION_TYPES)
-    title = models.CharField(max_length=200)
-    message = models.TextField()
-    related_user = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='sent_notifications')
-    is_read = models.BooleanField(default=False)
-    created_at = models.DateTimeField(auto_now_add=True)
-    
-    class Meta:
-        ordering = ['-created_at']
 
+# Coalesced notification types: (title, message) templates
+COALESCED_NOTIFICATIONS = {
+    'like': ('{actors} liked your {target}', 'Check out the engagement on your {target}.'),
+    'comment': ('{actors} commented on your {target}', 'See what they said about your {target}.'),
+}
 
+
+@trace_service
 class NotificationService:
     """Service for managing user notifications."""
 
@@ -56,15 +68,16 @@ class NotificationService:
         Returns:
             Notification object
         """
-        from api.models import Notification
-        
-        notification = Notification.objects.create(
-            user=user,
-            notification_type=notification_type,
-            title=title,
-            message=message,
-            related_user=related_user
-        )
+        with transaction.atomic():
+            notification = Notification.objects.create(
+                user=user,
+                notification_type=notification_type,
+                title=title,
+                message=message,
+                related_user=related_user
+            )
+            NotificationService._adjust_unread({user.pk: 1})
+            publish(user.pk, 'notification', NotificationService._push_payload(notification))
         
         # Send email if user has email notifications enabled
         if hasattr(user, 'notification_preferences') and user.notification_preferences.get('email_enabled', True):
@@ -73,6 +86,163 @@ class NotificationService:
         logger.info(f"Notification created for user {user.id}: {notification_type}")
         return notification
 
+    @staticmethod
+    def create_notifications(notifications):
+        """
+        Create many notifications with bulk INSERTs (in-app only, no email).
+        
+        Args:
+            notifications: Dicts with user_id, notification_type, title, message
+                and optionally related_user_id
+        
+        Returns:
+            List of created Notification objects
+        """
+        objects = [
+            Notification(
+                user_id=data['user_id'],
+                notification_type=data['notification_type'],
+                title=data['title'],
+                message=data['message'],
+                related_user_id=data.get('related_user_id'),
+            )
+            for data in notifications
+        ]
+        if not objects:
+            return []
+        
+        with transaction.atomic():
+            created = Notification.objects.bulk_create(objects, batch_size=get_notification_settings()['BATCH_SIZE'])
+            NotificationService._adjust_unread(Counter(notification.user_id for notification in objects))
+            publish_many([
+                (notification.user_id, 'notification', NotificationService._push_payload(notification))
+                for notification in created
+            ])
+        
+        logger.info(f"Created {len(created)} notifications")
+        return created
+
+    @staticmethod
+    def notify_users(user_ids, notification_type, title, message, related_user=None):
+        """
+        Fan one event out to many recipients.
+        
+        Args:
+            user_ids: Recipient user IDs (duplicates are notified once)
+            notification_type: Type of notification
+            title: Notification title
+            message: Notification message
+            related_user: User who triggered the notification
+        
+        Returns:
+            List of created Notification objects
+        """
+        related_user_id = related_user.pk if related_user else None
+        return NotificationService.create_notifications([
+            {
+                'user_id': user_id,
+                'notification_type': notification_type,
+                'title': title,
+                'message': message,
+                'related_user_id': related_user_id,
+            }
+            for user_id in dict.fromkeys(user_ids)
+        ])
+
+    @staticmethod
+    def notify_coalesced(user_id, notification_type, actor_id, target_type, target_id=None):
+        """
+        Buffer a like or comment; one notification per recipient, type and
+        target is created when its COALESCING_SETTINGS['WINDOW'] ends.
+        
+        Args:
+            user_id: Recipient user ID
+            notification_type: A key of COALESCED_NOTIFICATIONS
+            actor_id: User who liked or commented
+            target_type: What was liked or commented on ('post', 'comment', ...)
+            target_id: Its ID (events without one are grouped per target type)
+        """
+        if notification_type not in COALESCED_NOTIFICATIONS:
+            raise ValueError(f"Notification type {notification_type} is not coalesced")
+        
+        Coalescer.add(f"{user_id}:{notification_type}:{target_type}:{target_id or ''}", actor_id)
+        if not get_coalescing_settings()['WINDOW']:
+            NotificationService.flush_coalesced(force=True)
+        else:
+            Coalescer.start_memory_flusher(NotificationService._emit_coalesced)
+
+    @staticmethod
+    def flush_coalesced(force=False):
+        """
+        Create the notifications of every coalescing window that has ended.
+        
+        Args:
+            force: Also close windows that are still open
+        
+        Returns:
+            Number of notifications created
+        """
+        return Coalescer.flush(NotificationService._emit_coalesced, force)
+
+    @staticmethod
+    def _emit_coalesced(groups):
+        """Create one notification per coalesced group, naming its first actors."""
+        actor_ids = {actor_id for group in groups for actor_id in group['actors']}
+        actors = User.objects.only('username', 'first_name', 'last_name').in_bulk(actor_ids)
+        
+        notifications = []
+        for group in groups:
+            user_id, notification_type, target_type, _ = group['key'].split(':')
+            names = [
+                actors[actor_id].get_full_name() or actors[actor_id].username if actor_id in actors else 'Someone'
+                for actor_id in group['actors']
+            ]
+            actor_count = max(group['actor_count'], len(names))
+            if actor_count == 1:
+                phrase = names[0]
+            elif actor_count == 2 and len(names) == 2:
+                phrase = f'{names[0]} and {names[1]}'
+            else:
+                others = actor_count - 1
+                phrase = f"{names[0]} and {others} {'other' if others == 1 else 'others'}"
+            
+            title, message = COALESCED_NOTIFICATIONS[notification_type]
+            notifications.append({
+                'user_id': int(user_id),
+                'notification_type': notification_type,
+                'title': title.format(actors=phrase, target=target_type),
+                'message': message.format(target=target_type),
+                'related_user_id': group['actors'][0] if group['actors'][0] in actors else None,
+            })
+        NotificationService.create_notifications(notifications)
+
+    @staticmethod
+    def _adjust_unread(deltas):
+        """Apply {user_id: delta} to User.unread_notifications, one UPDATE per distinct delta."""
+        batch_size = get_notification_settings()['BATCH_SIZE']
+        by_delta = defaultdict(list)
+        for user_id, delta in deltas.items():
+            if delta:
+                by_delta[delta].append(user_id)
+        
+        for delta, user_ids in by_delta.items():
+            for start in range(0, len(user_ids), batch_size):
+                User.objects.filter(pk__in=user_ids[start:start + batch_size]).update(
+                    unread_notifications=Greatest(F('unread_notifications') + delta, Value(0))
+                )
+
+    @staticmethod
+    def _push_payload(notification):
+        """The 'notification' event pushed to the recipient's streams."""
+        return {
+            'id': notification.pk,
+            'notification_type': notification.notification_type,
+            'title': notification.title,
+            'message': notification.message,
+            'related_user_id': notification.related_user_id,
+            'created_at': notification.created_at.isoformat(),
+        }
+
     @staticmethod
     def send_email_notification(user, subject, message):
         """
@@ -107,8 +277,8 @@ class NotificationService:
         NotificationService.create_notification(
             user=user,
             notification_type='achievement',
-            title=f'Achievement Unlocked: {achievement.name}',
-            message=f'You earned {achievement.points_awarded} points!',
+            title=f'Achievement Unlocked: {achievement.title}',
+            message=f'You earned {achievement.points_value} points!',
         )
 
     @staticmethod
@@ -146,37 +316,29 @@ class NotificationService:
         )
 
     @staticmethod
-    def notify_post_liked(post_author, liker):
+    def notify_post_liked(post_author, liker, post=None):
         """
-        Notify user when their post is liked.
+        Notify user when their post is liked (coalesced with other likes).
         
         Args:
             post_author: User who created the post
             liker: User who liked the post
+            post: The liked CommunityPost
         """
-        NotificationService.create_notification(
-            user=post_author,
-            notification_type='like',
-            title=f'{liker.get_full_name()} liked your post',
-            message='Check out the reactions to your post.',
-            related_user=liker
-        )
+        NotificationService.notify_coalesced(post_author.pk, 'like', liker.pk, 'post', post.pk if post else None)
 
     @staticmethod
-    def notify_post_comment(post_author, commenter):
+    def notify_post_comment(post_author, commenter, post=None):
         """
-        Notify user when their post gets a comment.
+        Notify user when their post gets a comment (coalesced with other comments).
         
         Args:
             post_author: User who created the post
             commenter: User who commented
+            post: The commented CommunityPost
         """
-        NotificationService.create_notification(
-            user=post_author,
-            notification_type='comment',
-            title=f'{commenter.get_full_name()} commented on your post',
-            message='See what they said about your post.',
-            related_user=commenter
+        NotificationService.notify_coalesced(
+            post_author.pk, 'comment', commenter.pk, 'post', post.pk if post else None
         )
 
     @staticmethod
@@ -210,8 +372,6 @@ class NotificationService:
         Returns:
             QuerySet of notifications
         """
-        from api.models import Notification
-        
         query = Notification.objects.filter(user=user)
         
         if unread_only:
@@ -227,11 +387,17 @@ class NotificationService:
         Args:
             notification_id: Notification ID
         """
-        from api.models import Notification
+        notifications = Notification.objects.filter(id=notification_id)
+        user_id = notifications.values_list('user_id', flat=True).first()
+        if user_id is None:
+            raise Notification.DoesNotExist(f"Notification {notification_id} does not exist")
         
-        notification = Notification.objects.get(id=notification_id)
-        notification.is_read = True
-        notification.save()
+        with transaction.atomic():
+            # Only the request that flips the flag decrements the count
+            if notifications.filter(is_read=False).update(is_read=True):
+                NotificationService._adjust_unread({user_id: -1})
+                # Other tabs clear the notification and decrement their badge
+                publish(user_id, 'read', {'id': int(notification_id)})
         logger.info(f"Notification {notification_id} marked as read")
 
     @staticmethod
@@ -240,12 +406,20 @@ class NotificationService:
         Mark all notifications as read for a user.
         
         Args:
-            user: User object
-        """
-        from api.models import Notification
+            user: User object or ID
         
-        Notification.objects.filter(user=user, is_read=False).update(is_read=True)
-        logger.info(f"All notifications marked as read for user {user.id}")
+        Returns:
+            Number of notifications marked read
+        """
+        user_id = getattr(user, 'pk', user)
+        with transaction.atomic():
+            updated = Notification.objects.filter(user_id=user_id, is_read=False).update(is_read=True)
+            # Subtract what was flipped: unread rows committed meanwhile stay counted
+            NotificationService._adjust_unread({user_id: -updated})
+            if updated:
+                publish(user_id, 'read_all', {'count': updated})
+        logger.info(f"Marked {updated} notifications as read for user {user_id}")
+        return updated
 
     @staticmethod
     def get_notification_count(user):
@@ -253,25 +427,92 @@ class NotificationService:
         Get unread notification count for a user.
         
         Args:
-            user: User object
+            user: User object (request.user is loaded per request, so no
+                query is made) or ID
         
         Returns:
             Unread notification count
         """
-        from api.models import Notification
+        if isinstance(user, User):
+            return user.unread_notifications
+        return User.objects.filter(pk=user).values_list('unread_notifications', flat=True).first() or 0
+
+    @staticmethod
+    def reconcile_unread_counts():
+        """
+        Repair User.unread_notifications where it drifted from the unread rows
+        (e.g. after writes that bypassed this service).
+        
+        Each batch of users is locked while it is counted, so notifications
+        created or read concurrently adjust the repaired value afterwards
+        instead of being lost.
         
-        return Notification.objects.filter(user=user, is_read=False).count()
+        Returns:
+            Number of users whose count was repaired
+        """
+        batch_size = get_notification_settings()['BATCH_SIZE']
+        repaired = 0
+        last_pk = 0
+        while True:
+            with transaction.atomic():
+                stored = dict(
+                    User.objects.select_for_update().filter(pk__gt=last_pk).order_by('pk')
+                    .values_list('pk', 'unread_notifications')[:batch_size]
+                )
+                if not stored:
+                    return repaired
+                actual = dict(
+                    Notification.objects.filter(user_id__in=stored, is_read=False)
+                    .values('user_id').annotate(count=Count('id')).order_by().values_list('user_id', 'count')
+                )
+                drifted = {
+                    user_id: actual.get(user_id, 0)
+                    for user_id, count in stored.items() if count != actual.get(user_id, 0)
+                }
+                if drifted:
+                    User.objects.filter(pk__in=drifted).update(unread_notifications=Case(
+                        *[When(pk=user_id, then=Value(count)) for user_id, count in drifted.items()]
+                    ))
+            if drifted:
+                logger.warning(f"Repaired unread notification counts of {len(drifted)} users")
+            repaired += len(drifted)
+            last_pk = max(stored)
 
     @staticmethod
-    def delete_old_notifications(days=30):
+    def delete_old_notifications(days=None):
         """
-        Delete notifications older than specified days (cleanup task).
+        Remove notifications older than the retention period (cleanup task),
+        read or unread; their users' unread counts drop accordingly. On
+        PostgreSQL whole monthly partitions are dropped, so up to a month more
+        than `days` is kept.
         
         Args:
-            days: Number of days to keep
+            days: Number of days to keep (NOTIFICATION_SETTINGS['RETENTION_DAYS'])
+        
+        Returns:
+            Number of notifications removed (estimated for dropped partitions)
+        """
+        if days is None:
+            days = get_notification_settings()['RETENTION_DAYS']
+        boundary = retention_boundary(Notification, timezone.now() - timedelta(days=days))
+        # Each batch discounts its own unread rows in its own transaction
+        removed = purge_before(Notification, boundary, before_delete=NotificationService._discount_unread)
+        
+        logger.info(f"Removed {removed} notifications created before {boundary.isoformat()}")
+        return removed
+
+    @staticmethod
+    def _discount_unread(notifications):
+        """Subtract the unread ones among `notifications` (about to be deleted) from their users' counts."""
+        expiring_unread = notifications.filter(is_read=False).values('user_id').annotate(count=Count('id')).order_by()
+        NotificationService._adjust_unread({row['user_id']: -row['count'] for row in expiring_unread})
+
+    @staticmethod
+    def maintain_partitions():
         """
-        from api.models import Notification
+        Create the upcoming monthly notification partitions (no-op without partitioning).
         
-        cutoff_date = timezone.now() - timedelta(days=days)
-        deleted_count, _ = Notification.objects.filter(created_at__lt=cutoff_date).delete()
-        logger.info(f"Deleted {deleted_count} old notifications")
+        Returns:
+            Names of the partitions created
+        """
+        return ensure_partitions(Notification, get_notification_settings()['PARTITIONS_AHEAD'])
@@ -4,21 +4,35 @@ Generates job, course, mentor, and skill recommendations for users.
 """
 
 import logging
-from django.db.models import Q, Count, Avg, F
+from django.db.models import Q, Count, F
 from api.models import (
-    JobOpportunity, Course, Mentor, Skill, UserSkill,
+    JobOpportunity, Course, Mentor, UserSkill,
     User, UserCourseProgress, JobApplication
 )
 from collections import defaultdict
 import math
+from core.caching import cached
+from core.reference import ReferenceDataService
+from core.routing import replica_reads
+from core.tracing import trace_service
 
 logger = logging.getLogger(__name__)
 
+# Recommendations are also dropped when the user's data (tag user:<id>) or the
+# recommended catalogue ('jobs', 'courses', 'mentors') changes
+RECOMMENDATION_FRESH_FOR = 3600
+RECOMMENDATION_STALE_FOR = 3600
+DASHBOARD_FRESH_FOR = 86400  # Rebuilt daily by generate_daily_recommendations
 
+
+@trace_service
+@replica_reads
 class RecommendationService:
     """Service for generating personalized recommendations."""
 
     @staticmethod
+    @cached('user_job_recommendations:{user.id}:{limit}', RECOMMENDATION_FRESH_FOR, RECOMMENDATION_STALE_FOR,
+            tags=['user:{user.id}', 'jobs'])
     def recommend_jobs(user, limit=10):
         """
         Recommend jobs based on user's skills and preferences.
@@ -70,6 +84,8 @@ class RecommendationService:
         return recommendations
 
     @staticmethod
+    @cached('user_course_recommendations:{user.id}:{limit}', RECOMMENDATION_FRESH_FOR, RECOMMENDATION_STALE_FOR,
+            tags=['user:{user.id}', 'courses'])
     def recommend_courses(user, limit=10):
         """
         Recommend courses based on skill gaps and interests.
@@ -88,8 +104,8 @@ class RecommendationService:
         gap_skill_ids = [gap['skill_id'] for gap in skill_gaps[:5]]
         
         if not gap_skill_ids:
-            # Recommend trending courses
-            return Course.objects.all().order_by('-rating')[:limit].values(
+            # Recommend top-rated courses
+            return Course.top_rated(limit).values(
                 'id', 'title', 'difficulty', 'duration_hours', 'rating'
             )
         
@@ -97,9 +113,8 @@ class RecommendationService:
         recommended_courses = Course.objects.filter(
             required_skills__in=gap_skill_ids
         ).annotate(
-            matching_skills=Count('required_skills', filter=Q(required_skills__in=gap_skill_ids)),
-            avg_rating=Avg('rating')
-        ).order_by('-matching_skills', '-avg_rating')[:limit]
+            matching_skills=Count('required_skills', filter=Q(required_skills__in=gap_skill_ids))
+        ).order_by('-matching_skills', '-ranking_score')[:limit]
         
         recommendations = []
         for course in recommended_courses:
@@ -120,6 +135,8 @@ class RecommendationService:
         return recommendations
 
     @staticmethod
+    @cached('user_mentor_recommendations:{user.id}:{limit}', RECOMMENDATION_FRESH_FOR, RECOMMENDATION_STALE_FOR,
+            tags=['user:{user.id}', 'mentors'])
     def recommend_mentors(user, limit=5):
         """
         Recommend mentors based on user's skill gaps and career goals.
@@ -139,7 +156,7 @@ class RecommendationService:
         
         if not gap_skill_ids:
             # Recommend top-rated mentors
-            return Mentor.objects.all().order_by('-rating')[:limit].values(
+            return Mentor.top_rated(limit).values(
                 'id', 'user__id', 'user__username', 'user__first_name',
                 'user__last_name', 'specializations', 'hourly_rate', 'rating'
             )
@@ -152,9 +169,8 @@ class RecommendationService:
                 'user__userskill__skill',
                 filter=Q(user__userskill__skill_id__in=gap_skill_ids),
                 distinct=True
-            ),
-            mentor_rating=Avg('rating')
-        ).order_by('-mentor_rating', '-matching_skills')[:limit]
+            )
+        ).order_by('-ranking_score', '-matching_skills')[:limit]
         
         recommendations = []
         for mentor in recommended_mentors:
@@ -173,6 +189,8 @@ class RecommendationService:
         return recommendations
 
     @staticmethod
+    @cached('user_skill_recommendations:{user.id}:{limit}', RECOMMENDATION_FRESH_FOR, RECOMMENDATION_STALE_FOR,
+            tags=['user:{user.id}', 'jobs'])
     def recommend_skills(user, limit=5):
         """
         Recommend skills based on job market demand and career path.
@@ -202,25 +220,25 @@ class RecommendationService:
         # Get user's current skills
         user_skills = set(UserSkill.objects.filter(user=user).values_list('skill_id', flat=True))
         
-        # Rank recommended skills
+        # Rank recommended skills (catalogue lookups come from the in-process cache)
+        catalogue = {skill['id']: skill for skill in ReferenceDataService.skills()}
         recommendations = []
         for skill_id, score in sorted(skill_scores.items(), key=lambda x: x[1], reverse=True):
-            if skill_id not in user_skills:
-                try:
-                    skill = Skill.objects.get(id=skill_id)
-                    recommendations.append({
-                        'skill_id': skill.id,
-                        'skill_name': skill.name,
-                        'category': skill.category,
-                        'demand_score': int(score),
-                        'reason': 'In high demand across job market'
-                    })
-                except Skill.DoesNotExist:
-                    continue
+            skill = catalogue.get(skill_id)
+            if skill and skill_id not in user_skills:
+                recommendations.append({
+                    'skill_id': skill['id'],
+                    'skill_name': skill['name'],
+                    'category': skill['category'],
+                    'demand_score': int(score),
+                    'reason': 'In high demand across job market'
+                })
         
         return recommendations[:limit]
 
     @staticmethod
+    @cached('user_connection_recommendations:{user.id}:{limit}', RECOMMENDATION_FRESH_FOR, RECOMMENDATION_STALE_FOR,
+            tags=['user:{user.id}'])
     def recommend_connections(user, limit=5):
         """
         Recommend users to connect with based on shared interests and skills.
@@ -267,6 +285,8 @@ class RecommendationService:
         return recommendations
 
     @staticmethod
+    @cached('user_recommendations:{user.id}', DASHBOARD_FRESH_FOR, RECOMMENDATION_STALE_FOR,
+            tags=['user:{user.id}', 'jobs', 'courses', 'mentors'])
     def get_personalized_dashboard(user):
         """
         Get all recommendations for user's dashboard.
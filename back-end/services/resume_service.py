@@ -8,10 +8,12 @@ from django.core.files.storage import default_storage
 from api.models import Resume, Skill, UserSkill
 from api.ml_utils import analyze_resume, extract_text_from_resume
 from django.db import transaction
+from core.tracing import trace_service
 
 logger = logging.getLogger(__name__)
 
 
+@trace_service
 class ResumeService:
     """Service for resume processing and analysis."""
 
@@ -6,12 +6,20 @@ Handles skill operations, endorsements, proficiency management, and skill recomm
 import logging
 from django.db.models import Q, Count, Avg, F
 from django.db import transaction
+from django.utils import timezone
 from api.models import Skill, UserSkill, Resume
 from collections import Counter
+from core.caching import cached
+from core.tracing import trace_service
 
 logger = logging.getLogger(__name__)
 
+# Platform-wide skill rankings, read for every skill recommendation
+SKILL_RANKING_FRESH_FOR = 3600
+SKILL_RANKING_STALE_FOR = 3600
 
+
+@trace_service
 class SkillService:
     """Service for skill management and recommendations."""
 
@@ -140,6 +148,7 @@ class SkillService:
         return recommended[:10]  # Top 10 recommendations
 
     @staticmethod
+    @cached('trending_skills', SKILL_RANKING_FRESH_FOR, SKILL_RANKING_STALE_FOR)
     def get_trending_skills():
         """
         Get trending skills across the platform.
@@ -148,12 +157,13 @@ class SkillService:
             List of top trending skills
         """
         trending = UserSkill.objects.values('skill__id', 'skill__name', 'skill__category') \
-            .annotate(user_count=Count('user'), avg_endorsements=Avg('endorsements_count')) \
+            .annotate(user_count=Count('user'), avg_endorsements=Avg('endorsed_by_count')) \
             .order_by('-user_count')[:20]
         
         return list(trending)
 
     @staticmethod
+    @cached('skill_demand', SKILL_RANKING_FRESH_FOR, SKILL_RANKING_STALE_FOR, tags=['jobs'])
     def get_skill_demand():
         """
         Get in-demand skills based on job postings.
@@ -161,12 +171,11 @@ class SkillService:
         Returns:
             List of in-demand skills with job counts
         """
-        from api.models import JobOpportunity
-        
+        now = timezone.now()
         demand = Skill.objects.filter(
-            jobtags__job__status='active'
+            Q(job_opportunities__expires_at__isnull=True) | Q(job_opportunities__expires_at__gte=now)
         ).annotate(
-            job_count=Count('jobtags__job', distinct=True)
+            job_count=Count('job_opportunities', distinct=True)
         ).order_by('-job_count')[:20]
         
         return [{
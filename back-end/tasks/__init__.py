@@ -8,6 +8,7 @@ This package contains Celery tasks for:
 - Achievement checking and unlocking
 - Notification delivery
 - Analytics and reporting
+- Write-behind counter flushing
 """
 
 # Import all tasks so Celery can discover them
@@ -17,6 +18,7 @@ from . import recommendation_tasks
 from . import achievement_tasks
 from . import notification_tasks
 from . import analytics_tasks
+from . import counter_tasks
 
 __all__ = [
     'email_tasks',
@@ -25,4 +27,5 @@ __all__ = [
     'achievement_tasks',
     'notification_tasks',
     'analytics_tasks',
+    'counter_tasks',
 ]
@@ -6,7 +6,7 @@ Checks for and unlocks achievements based on user activity.
 import logging
 from celery import shared_task
 from api.models import User
-from services import AchievementService, NotificationService
+from services import AchievementService
 from tasks.email_tasks import send_achievement_email
 
 logger = logging.getLogger(__name__)
@@ -63,16 +63,13 @@ def unlock_achievement_async(self, user_id, achievement_key):
     try:
         user = User.objects.get(id=user_id)
         
-        # Unlock achievement
+        # Unlock achievement (notifies the user on first unlock)
         AchievementService.unlock_achievement(user, achievement_key)
         
         # Get achievement details
         from api.models import Achievement
         achievement = Achievement.objects.get(key=achievement_key)
         
-        # Send notification
-        NotificationService.notify_achievement_unlocked(user, achievement)
-        
         # Send email asynchronously
         send_achievement_email.delay(user_id, achievement.name, achievement.points_awarded)
         
@@ -89,14 +86,8 @@ def generate_achievement_stats():
     Generate and cache achievement statistics.
     """
     try:
-        from services import AnalyticsService
-        
-        # Get achievement leaderboard
-        leaderboard = AchievementService.get_leaderboard(limit=100)
-        
-        # Cache for 1 hour
-        from django.core.cache import cache
-        cache.set('achievement_leaderboard', leaderboard, timeout=3600)
+        # Recompute the cached leaderboard (skipped if another worker is on it)
+        AchievementService.get_leaderboard.refresh(limit=100)
         
         logger.info("Achievement statistics generated and cached")
     
@@ -14,30 +14,14 @@ logger = logging.getLogger(__name__)
 @shared_task
 def cache_platform_analytics():
     """
-    Cache expensive analytics computations hourly.
+    Refresh the cached platform analytics hourly.
+    Entries stay servable (stale) for another hour, and a refresh already
+    running on another worker is skipped rather than repeated.
     """
     try:
-        # Cache platform stats
-        platform_stats = AnalyticsService.get_platform_stats()
-        cache.set('platform_stats', platform_stats, timeout=3600)
+        refreshed = AnalyticsService.cache_analytics()
         
-        # Cache skill analytics
-        skill_analytics = AnalyticsService.get_skill_analytics()
-        cache.set('skill_analytics', skill_analytics, timeout=3600)
-        
-        # Cache course analytics
-        course_analytics = AnalyticsService.get_course_analytics()
-        cache.set('course_analytics', course_analytics, timeout=3600)
-        
-        # Cache job analytics
-        job_analytics = AnalyticsService.get_job_analytics()
-        cache.set('job_analytics', job_analytics, timeout=3600)
-        
-        # Cache mentoring analytics
-        mentoring_analytics = AnalyticsService.get_mentoring_analytics()
-        cache.set('mentoring_analytics', mentoring_analytics, timeout=3600)
-        
-        logger.info("Platform analytics cached successfully")
+        logger.info(f"Platform analytics cached successfully ({len(refreshed)} refreshed)")
     
     except Exception as exc:
         logger.error(f"Error caching platform analytics: {str(exc)}")
@@ -55,9 +39,9 @@ def cache_user_analytics(user_id):
         from api.models import User
         
         user = User.objects.get(id=user_id)
-        stats = AnalyticsService.get_user_stats(user)
         
-        cache.set(f'user_stats:{user_id}', stats, timeout=3600)
+        # Recompute the cached stats (skipped if another worker is on it)
+        AnalyticsService.get_cached_user_stats.refresh(user)
         
         logger.info(f"User analytics cached for user {user_id}")
     
@@ -169,3 +153,22 @@ def export_analytics_snapshot():
     
     except Exception as exc:
         logger.error(f"Error exporting analytics snapshot: {str(exc)}")
+
+
+@shared_task
+def rollup_daily_metrics(days=2):
+    """
+    Refresh the DailyMetric rollup for recently closed days.
+    
+    Args:
+        days: Closed days to recompute (late writes to yesterday are picked up)
+    """
+    try:
+        from core.timeseries import TimeSeriesService
+        
+        series_count = TimeSeriesService.rollup_all(days=days)
+        
+        logger.info(f"Rolled up {days} days for {series_count} analytics series")
+    
+    except Exception as exc:
+        logger.error(f"Error rolling up daily metrics: {str(exc)}")
@@ -36,6 +36,22 @@ app.conf.beat_schedule = {
         'task': 'tasks.notification_tasks.cleanup_old_notifications',
         'schedule': 86400.0,  # Every day
     },
+    'reconcile-unread-counts': {
+        'task': 'tasks.notification_tasks.reconcile_unread_counts',
+        'schedule': 86400.0,  # Every day
+    },
+    'flush-coalesced-notifications': {
+        'task': 'tasks.notification_tasks.flush_coalesced_notifications',
+        'schedule': 10.0,  # Every 10 seconds
+    },
+    'flush-counters': {
+        'task': 'tasks.counter_tasks.flush_counters',
+        'schedule': 5.0,  # Every 5 seconds
+    },
+    'rollup-daily-metrics': {
+        'task': 'tasks.analytics_tasks.rollup_daily_metrics',
+        'schedule': 86400.0,  # Every day
+    },
     'send-daily-digest': {
         'task': 'tasks.email_tasks.send_daily_digest',
         'schedule': 86400.0,  # Every day at specific time
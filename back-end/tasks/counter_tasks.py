@@ -0,0 +1,26 @@
+"""
+Counter tasks.
+Flushes buffered likes, comments and views counters to the database.
+"""
+
+import logging
+from celery import shared_task
+from core.counters import CounterService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def flush_counters():
+    """
+    Apply pending counter increments in batched F() updates.
+    Periodic task that runs every few seconds.
+    """
+    try:
+        updated = CounterService.flush()
+        
+        if updated:
+            logger.info(f"Flushed counters into {updated} rows")
+    
+    except Exception as exc:
+        logger.error(f"Error flushing counters: {str(exc)}")
@@ -1,21 +1,37 @@
 """
 Email notification tasks.
 Sends emails asynchronously for notifications, digests, and alerts.
+Digests and reports go through core.mailing.send_bulk: recipients are
+streamed in chunks and sent over one pooled SMTP connection.
 """
 
 import logging
 from celery import shared_task
-from django.core.mail import send_mail, send_mass_mail
+from django.core.mail import EmailMultiAlternatives, send_mail
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.conf import settings
 from django.utils import timezone
 from api.models import User
 from datetime import timedelta
+from core.mailing import send_bulk
 
 logger = logging.getLogger(__name__)
 
 
+def _html_email(subject, template, context, recipient):
+    """Build an HTML email with a plain-text alternative from a template."""
+    html_message = render_to_string(template, context)
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=strip_tags(html_message),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[recipient],
+    )
+    message.attach_alternative(html_message, 'text/html')
+    return message
+
+
 @shared_task(bind=True, max_retries=3)
 def send_welcome_email(self, user_id):
     """
@@ -225,42 +241,21 @@ def send_daily_digest():
         users = User.objects.filter(
             last_login__gte=seven_days_ago,
             is_active=True
-        )
-        
-        email_list = []
-        
-        for user in users:
-            try:
-                # Get personalized data
-                recommendations = RecommendationService.get_personalized_dashboard(user)
-                stats = AnalyticsService.get_user_stats(user)
-                
-                context = {
-                    'user': user,
-                    'recommendations': recommendations,
-                    'stats': stats,
-                    'dashboard_url': f"{settings.FRONTEND_URL}/dashboard/",
-                }
-                
-                html_message = render_to_string('emails/daily_digest.html', context)
-                plain_message = strip_tags(html_message)
-                
-                email_list.append((
-                    f'Your Daily Digest - {timezone.now().strftime("%B %d, %Y")}',
-                    plain_message,
-                    settings.DEFAULT_FROM_EMAIL,
-                    [user.email],
-                    html_message
-                ))
-            
-            except Exception as e:
-                logger.warning(f"Error preparing digest for user {user.id}: {str(e)}")
-                continue
-        
-        # Send all emails in batch
-        if email_list:
-            send_mass_mail(email_list, fail_silently=False)
-            logger.info(f"Daily digest emails sent to {len(email_list)} users")
+        ).exclude(email='')
+        subject = f'Your Daily Digest - {timezone.now().strftime("%B %d, %Y")}'
+        
+        def build(user):
+            # Get personalized data
+            context = {
+                'user': user,
+                'recommendations': RecommendationService.get_personalized_dashboard(user),
+                'stats': AnalyticsService.get_user_stats(user),
+                'dashboard_url': f"{settings.FRONTEND_URL}/dashboard/",
+            }
+            return _html_email(subject, 'emails/daily_digest.html', context, user.email)
+        
+        result = send_bulk('daily_digest', users, build)
+        logger.info(f"Daily digest emails sent to {result['sent']} users, {result['failed']} failed")
     
     except Exception as exc:
         logger.error(f"Error sending daily digests: {str(exc)}")
@@ -274,37 +269,19 @@ def send_weekly_report():
     try:
         from services import AnalyticsService
         
-        users = User.objects.filter(is_active=True)
-        email_list = []
-        
-        for user in users:
-            try:
-                stats = AnalyticsService.get_user_stats(user)
-                
-                context = {
-                    'user': user,
-                    'stats': stats,
-                    'report_url': f"{settings.FRONTEND_URL}/analytics/",
-                }
-                
-                html_message = render_to_string('emails/weekly_report.html', context)
-                plain_message = strip_tags(html_message)
-                
-                email_list.append((
-                    f'Your Weekly Report - {timezone.now().strftime("%B %d, %Y")}',
-                    plain_message,
-                    settings.DEFAULT_FROM_EMAIL,
-                    [user.email],
-                    html_message
-                ))
-            
-            except Exception as e:
-                logger.warning(f"Error preparing report for user {user.id}: {str(e)}")
-                continue
-        
-        if email_list:
-            send_mass_mail(email_list, fail_silently=False)
-            logger.info(f"Weekly reports sent to {len(email_list)} users")
+        users = User.objects.filter(is_active=True).exclude(email='')
+        subject = f'Your Weekly Report - {timezone.now().strftime("%B %d, %Y")}'
+        
+        def build(user):
+            context = {
+                'user': user,
+                'stats': AnalyticsService.get_user_stats(user),
+                'report_url': f"{settings.FRONTEND_URL}/analytics/",
+            }
+            return _html_email(subject, 'emails/weekly_report.html', context, user.email)
+        
+        result = send_bulk('weekly_report', users, build)
+        logger.info(f"Weekly reports sent to {result['sent']} users, {result['failed']} failed")
     
     except Exception as exc:
         logger.error(f"Error sending weekly reports: {str(exc)}")
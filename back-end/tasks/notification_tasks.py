@@ -5,8 +5,6 @@ Manages notification delivery, scheduling, and cleanup.
 
 import logging
 from celery import shared_task
-from django.utils import timezone
-from datetime import timedelta
 from api.models import User
 from services import NotificationService
 
@@ -47,28 +45,37 @@ def send_notification_async(self, user_id, notification_type, title, message, re
 
 
 @shared_task
-def cleanup_old_notifications(days=30):
+def cleanup_old_notifications(days=None):
     """
-    Delete notifications older than specified days.
+    Create upcoming notification partitions and drop expired ones.
     
     Args:
-        days: Days to keep
+        days: Days to keep (NOTIFICATION_SETTINGS['RETENTION_DAYS'])
     """
     try:
-        from api.models import Notification
+        NotificationService.maintain_partitions()
+        removed = NotificationService.delete_old_notifications(days)
         
-        cutoff_date = timezone.now() - timedelta(days=days)
-        deleted_count, _ = Notification.objects.filter(
-            created_at__lt=cutoff_date,
-            is_read=True
-        ).delete()
-        
-        logger.info(f"Deleted {deleted_count} old notifications")
+        logger.info(f"Removed {removed} old notifications")
     
     except Exception as exc:
         logger.error(f"Error cleaning up notifications: {str(exc)}")
 
 
+@shared_task
+def reconcile_unread_counts():
+    """
+    Repair drifted unread notification counts.
+    """
+    try:
+        repaired = NotificationService.reconcile_unread_counts()
+        
+        logger.info(f"Reconciled unread notification counts, {repaired} repaired")
+    
+    except Exception as exc:
+        logger.error(f"Error reconciling unread counts: {str(exc)}")
+
+
 @shared_task
 def send_mention_notifications(user_ids, mention_type, content_id):
     """
@@ -80,14 +87,12 @@ def send_mention_notifications(user_ids, mention_type, content_id):
         content_id: ID of content mentioning user
     """
     try:
-        for user_id in user_ids:
-            send_notification_async.delay(
-                user_id=user_id,
-                notification_type='mention',
-                title='You were mentioned',
-                message=f'Someone mentioned you in a {mention_type}',
-                related_user_id=None
-            )
+        NotificationService.notify_users(
+            user_ids,
+            notification_type='mention',
+            title='You were mentioned',
+            message=f'Someone mentioned you in a {mention_type}',
+        )
         
         logger.info(f"Sent mention notifications to {len(user_ids)} users")
     
@@ -96,59 +101,59 @@ def send_mention_notifications(user_ids, mention_type, content_id):
 
 
 @shared_task
-def send_like_notifications(user_id, liker_id, content_type):
+def send_like_notifications(user_id, liker_id, content_type, content_id=None):
     """
-    Send notification when user's content is liked.
+    Notify a user that their content was liked.
+    Likes are coalesced: one notification per content per window.
     
     Args:
         user_id: Content owner user ID
         liker_id: User who liked the content
         content_type: Type of content (post, comment, etc.)
+        content_id: ID of the liked content
     """
     try:
-        liker = User.objects.get(id=liker_id)
-        
-        send_notification_async.delay(
-            user_id=user_id,
-            notification_type='like',
-            title=f'{liker.get_full_name()} liked your {content_type}',
-            message='Check out the engagement on your content',
-            related_user_id=liker_id
-        )
-        
-        logger.info(f"Like notification sent to user {user_id}")
+        NotificationService.notify_coalesced(user_id, 'like', liker_id, content_type, content_id)
     
     except Exception as exc:
         logger.error(f"Error sending like notification: {str(exc)}")
 
 
 @shared_task
-def send_comment_notifications(user_id, commenter_id, content_type):
+def send_comment_notifications(user_id, commenter_id, content_type, content_id=None):
     """
-    Send notification when content receives a comment.
+    Notify a user that their content received a comment.
+    Comments are coalesced: one notification per content per window.
     
     Args:
         user_id: Content owner user ID
         commenter_id: User who commented
         content_type: Type of content
+        content_id: ID of the commented content
     """
     try:
-        commenter = User.objects.get(id=commenter_id)
-        
-        send_notification_async.delay(
-            user_id=user_id,
-            notification_type='comment',
-            title=f'{commenter.get_full_name()} commented on your {content_type}',
-            message='See what they said',
-            related_user_id=commenter_id
-        )
-        
-        logger.info(f"Comment notification sent to user {user_id}")
+        NotificationService.notify_coalesced(user_id, 'comment', commenter_id, content_type, content_id)
     
     except Exception as exc:
         logger.error(f"Error sending comment notification: {str(exc)}")
 
 
+@shared_task
+def flush_coalesced_notifications():
+    """
+    Create the notifications of coalescing windows that have ended.
+    Periodic task that runs every few seconds.
+    """
+    try:
+        created = NotificationService.flush_coalesced()
+        
+        if created:
+            logger.info(f"Created {created} coalesced notifications")
+    
+    except Exception as exc:
+        logger.error(f"Error flushing coalesced notifications: {str(exc)}")
+
+
 @shared_task
 def mark_notifications_read_batch(user_id):
     """
@@ -159,12 +164,7 @@ def mark_notifications_read_batch(user_id):
         user_id: User ID
     """
     try:
-        from api.models import Notification
-        
-        updated_count = Notification.objects.filter(
-            user_id=user_id,
-            is_read=False
-        ).update(is_read=True)
+        updated_count = NotificationService.mark_all_read(user_id)
         
         logger.info(f"Marked {updated_count} notifications as read for user {user_id}")
     
@@ -191,16 +191,9 @@ def send_batch_notifications(notifications_data):
         ]
     """
     try:
-        for notif_data in notifications_data:
-            send_notification_async.delay(
-                user_id=notif_data['user_id'],
-                notification_type=notif_data['notification_type'],
-                title=notif_data['title'],
-                message=notif_data['message'],
-                related_user_id=notif_data.get('related_user_id')
-            )
+        created = NotificationService.create_notifications(notifications_data)
         
-        logger.info(f"Queued {len(notifications_data)} notifications for sending")
+        logger.info(f"Created {len(created)} notifications in batch")
     
     except Exception as exc:
         logger.error(f"Error sending batch notifications: {str(exc)}")
@@ -7,7 +7,6 @@ import logging
 from celery import shared_task
 from api.models import User
 from services import RecommendationService
-from django.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
@@ -23,14 +22,8 @@ def generate_daily_recommendations():
         
         for user in users:
             try:
-                dashboard = RecommendationService.get_personalized_dashboard(user)
-                
-                # Cache recommendations for 24 hours
-                cache.set(
-                    f'user_recommendations:{user.id}',
-                    dashboard,
-                    timeout=86400  # 24 hours
-                )
+                # Recompute the cached dashboard (skipped if another worker is on it)
+                RecommendationService.get_personalized_dashboard.refresh(user)
                 
             except Exception as e:
                 logger.warning(f"Error generating recommendations for user {user.id}: {str(e)}")
@@ -54,16 +47,11 @@ def recommend_jobs_async(user_id, limit=10):
     try:
         user = User.objects.get(id=user_id)
         
-        jobs = RecommendationService.recommend_jobs(user, limit=limit)
-        
-        # Cache recommendations
-        cache.set(
-            f'user_job_recommendations:{user_id}',
-            jobs,
-            timeout=3600  # 1 hour
-        )
+        # Recompute the cached recommendations (skipped if another worker is on it)
+        refreshed, jobs = RecommendationService.recommend_jobs.refresh(user, limit=limit)
         
-        logger.info(f"Generated {len(jobs)} job recommendations for user {user_id}")
+        if refreshed:
+            logger.info(f"Generated {len(jobs)} job recommendations for user {user_id}")
     
     except Exception as exc:
         logger.error(f"Error recommending jobs for user {user_id}: {str(exc)}")
@@ -81,16 +69,11 @@ def recommend_courses_async(user_id, limit=10):
     try:
         user = User.objects.get(id=user_id)
         
-        courses = RecommendationService.recommend_courses(user, limit=limit)
-        
-        # Cache recommendations
-        cache.set(
-            f'user_course_recommendations:{user_id}',
-            courses,
-            timeout=3600  # 1 hour
-        )
+        # Recompute the cached recommendations (skipped if another worker is on it)
+        refreshed, courses = RecommendationService.recommend_courses.refresh(user, limit=limit)
         
-        logger.info(f"Generated {len(courses)} course recommendations for user {user_id}")
+        if refreshed:
+            logger.info(f"Generated {len(courses)} course recommendations for user {user_id}")
     
     except Exception as exc:
         logger.error(f"Error recommending courses for user {user_id}: {str(exc)}")
@@ -108,16 +91,11 @@ def recommend_mentors_async(user_id, limit=5):
     try:
         user = User.objects.get(id=user_id)
         
-        mentors = RecommendationService.recommend_mentors(user, limit=limit)
+        # Recompute the cached recommendations (skipped if another worker is on it)
+        refreshed, mentors = RecommendationService.recommend_mentors.refresh(user, limit=limit)
         
-        # Cache recommendations
-        cache.set(
-            f'user_mentor_recommendations:{user_id}',
-            mentors,
-            timeout=3600  # 1 hour
-        )
-        
-        logger.info(f"Generated {len(mentors)} mentor recommendations for user {user_id}")
+        if refreshed:
+            logger.info(f"Generated {len(mentors)} mentor recommendations for user {user_id}")
     
     except Exception as exc:
         logger.error(f"Error recommending mentors for user {user_id}: {str(exc)}")
@@ -135,16 +113,11 @@ def recommend_skills_async(user_id, limit=5):
     try:
         user = User.objects.get(id=user_id)
         
-        skills = RecommendationService.recommend_skills(user, limit=limit)
-        
-        # Cache recommendations
-        cache.set(
-            f'user_skill_recommendations:{user_id}',
-            skills,
-            timeout=3600  # 1 hour
-        )
+        # Recompute the cached recommendations (skipped if another worker is on it)
+        refreshed, skills = RecommendationService.recommend_skills.refresh(user, limit=limit)
         
-        logger.info(f"Generated {len(skills)} skill recommendations for user {user_id}")
+        if refreshed:
+            logger.info(f"Generated {len(skills)} skill recommendations for user {user_id}")
     
     except Exception as exc:
         logger.error(f"Error recommending skills for user {user_id}: {str(exc)}")
@@ -162,16 +135,11 @@ def recommend_connections_async(user_id, limit=5):
     try:
         user = User.objects.get(id=user_id)
         
-        connections = RecommendationService.recommend_connections(user, limit=limit)
-        
-        # Cache recommendations
-        cache.set(
-            f'user_connection_recommendations:{user_id}',
-            connections,
-            timeout=3600  # 1 hour
-        )
+        # Recompute the cached recommendations (skipped if another worker is on it)
+        refreshed, connections = RecommendationService.recommend_connections.refresh(user, limit=limit)
         
-        logger.info(f"Generated {len(connections)} connection recommendations for user {user_id}")
+        if refreshed:
+            logger.info(f"Generated {len(connections)} connection recommendations for user {user_id}")
     
     except Exception as exc:
         logger.error(f"Error recommending connections for user {user_id}: {str(exc)}")
@@ -0,0 +1,31 @@
+"""
+Shared helper functions used across core, services and tasks.
+"""
+
+import logging
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_redis_client = None
+
+
+def get_redis_client():
+    """
+    Get a shared Redis client built from settings.REDIS_URL.
+
+    Returns:
+        redis.Redis instance, or None when Redis is not configured
+    """
+    global _redis_client
+
+    redis_url = getattr(settings, 'REDIS_URL', '')
+    if not redis_url:
+        return None
+
+    if _redis_client is None:
+        import redis
+        _redis_client = redis.Redis.from_url(redis_url)
+        logger.info("Redis client initialised")
+
+    return _redis_client
@@ -0,0 +1,58 @@
+import { useCallback, useEffect, useRef, useState } from "react";
+
+// Infinite-scroll loader for keyset-paginated endpoints.
+// Follows the API's "next" cursor links instead of ?page=N, so deep pages
+// cost the same as the first one.
+export const useCursorList = (url) => {
+  const [items, setItems] = useState([]);
+  const [nextUrl, setNextUrl] = useState(url);
+  const [isLoading, setIsLoading] = useState(false);
+  const [error, setError] = useState("");
+  const loadingRef = useRef(false);
+
+  const loadMore = useCallback(async () => {
+    if (!nextUrl || loadingRef.current) return;
+
+    loadingRef.current = true;
+    setIsLoading(true);
+    try {
+      const response = await fetch(nextUrl);
+      if (!response.ok) {
+        throw new Error(`Request failed with status ${response.status}`);
+      }
+      const data = await response.json();
+      setItems((prev) => [...prev, ...data.results]);
+      setNextUrl(data.next);
+    } catch (err) {
+      setError(err.message);
+      setNextUrl(null);
+    } finally {
+      loadingRef.current = false;
+      setIsLoading(false);
+    }
+  }, [nextUrl]);
+
+  // First page on mount; later pages come from the sentinel below
+  useEffect(() => {
+    loadMore();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
+  // Attach to an element at the end of the list; loads the next page when it scrolls into view
+  const sentinelRef = useRef(null);
+  useEffect(() => {
+    const node = sentinelRef.current;
+    if (!node) return undefined;
+
+    const observer = new IntersectionObserver(
+      (entries) => {
+        if (entries[0].isIntersecting) loadMore();
+      },
+      { rootMargin: "400px" }
+    );
+    observer.observe(node);
+    return () => observer.disconnect();
+  }, [loadMore]);
+
+  return { items, isLoading, error, hasMore: Boolean(nextUrl), loadMore, sentinelRef };
+};
@@ -1,8 +1,61 @@
 import React from 'react';
 import { Users, Star, MessageSquare, Heart, Send, TrendingUp, ArrowLeft } from 'lucide-react';
+import { useCursorList } from '../hooks/useCursorList';
 
+const POSTS_URL = 'http://127.0.0.1:8000/api/community/posts/?page_size=10';
 
-const CommunityScreen = ({ goTo }) => (
+const SAMPLE_POSTS = [
+  {
+    user: "Sophia Dev",
+    avatar: "🧑‍💻",
+    title: "How do I optimize React performance with hooks?",
+    content: "I'm struggling with re-rendering issues in my dashboard. Any pro tips on memoization or useCallback?",
+    likes: 42,
+    comments: 8,
+    time: "2h ago",
+  },
+  {
+    user: "Artem AI",
+    avatar: "🤖",
+    title: "AI-powered resume scoring — my approach",
+    content: "I built a small GPT-4 API that gives a 0–100 score to resumes. Would love feedback on my weighting algorithm.",
+    likes: 61,
+    comments: 14,
+    time: "5h ago",
+  },
+  {
+    user: "Lina Codes",
+    avatar: "👩‍🎨",
+    title: "TailwindCSS design tips",
+    content: "Sharing my color palette combos for dashboard aesthetics. Hope it helps others building AI apps 💜",
+    likes: 89,
+    comments: 23,
+    time: "1d ago",
+  },
+];
+
+const timeAgo = (iso) => {
+  const hours = Math.floor((Date.now() - new Date(iso).getTime()) / 3600000);
+  if (hours < 1) return 'just now';
+  if (hours < 24) return `${hours}h ago`;
+  return `${Math.floor(hours / 24)}d ago`;
+};
+
+const toCard = (post) => ({
+  user: post.user?.username,
+  avatar: "🧑‍💻",
+  title: post.title,
+  content: post.content,
+  likes: post.likes_count,
+  comments: post.comments_count,
+  time: timeAgo(post.created_at),
+});
+
+const CommunityScreen = ({ goTo }) => {
+  const { items, isLoading, hasMore, sentinelRef } = useCursorList(POSTS_URL);
+  const posts = items.length ? items.map(toCard) : SAMPLE_POSTS;
+
+  return (
   <div className="min-h-screen bg-gradient-to-br from-purple-50 via-white to-indigo-50 pt-32 pb-24 px-6">
     <div className="max-w-7xl mx-auto">
       <div className="text-center mb-16 fade-in">
@@ -19,39 +72,11 @@ const CommunityScreen = ({ goTo }) => (
 
       <div className="grid grid-cols-1 lg:grid-cols-3 gap-10 mb-12">
         <div className="lg:col-span-2 space-y-6">
-          {[
-            {
-              user: "Sophia Dev",
-              avatar: "🧑‍💻",
-              title: "How do I optimize React performance with hooks?",
-              content: "I'm struggling with re-rendering issues in my dashboard. Any pro tips on memoization or useCallback?",
-              likes: 42,
-              comments: 8,
-              time: "2h ago",
-            },
-            {
-              user: "Artem AI",
-              avatar: "🤖",
-              title: "AI-powered resume scoring — my approach",
-              content: "I built a small GPT-4 API that gives a 0–100 score to resumes. Would love feedback on my weighting algorithm.",
-              likes: 61,
-              comments: 14,
-              time: "5h ago",
-            },
-            {
-              user: "Lina Codes",
-              avatar: "👩‍🎨",
-              title: "TailwindCSS design tips",
-              content: "Sharing my color palette combos for dashboard aesthetics. Hope it helps others building AI apps 💜",
-              likes: 89,
-              comments: 23,
-              time: "1d ago",
-            },
-          ].map((post, i) => (
+          {posts.map((post, i) => (
             <div
               key={i}
               className="bg-white p-8 border-2 border-gray-100 rounded-3xl hover:shadow-2xl hover:border-purple-200 transition-all duration-300 slide-up"
-              style={{ animationDelay: `${i * 0.1}s` }}
+              style={{ animationDelay: `${(i % 10) * 0.1}s` }}
             >
               <div className="flex items-center gap-4 mb-5">
                 <div className="w-14 h-14 rounded-full bg-gradient-to-br from-purple-400 to-indigo-500 flex items-center justify-center text-2xl shadow-lg">
@@ -80,6 +105,11 @@ const CommunityScreen = ({ goTo }) => (
               </div>
             </div>
           ))}
+          {hasMore && (
+            <div ref={sentinelRef} className="text-center text-gray-500 py-6">
+              {isLoading ? 'Loading more posts…' : ''}
+            </div>
+          )}
         </div>
 
         <div className="space-y-6">
@@ -159,6 +189,7 @@ const CommunityScreen = ({ goTo }) => (
       </div>
     </div>
   </div>
-);
+  );
+};
 
 export default CommunityScreen;
\ No newline at end of file